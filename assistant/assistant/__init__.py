@@ -0,0 +1,8 @@
+# assistant
+#
+# Randevu backend'ini telefon üzerinden kullanan sesli asistan.
+# Akışlı hat ve aşamalar: assistant.pipeline; ses etkinliği tespiti: assistant.vad;
+# G.711 ve 8k/16k dönüşümü: assistant.codec; eşzamanlı çağrı oturumları: assistant.sessions;
+# niyet, gün ve saat çözümleme: assistant.nlu; müsaitlik ön getirmesi: assistant.prefetch;
+# akışlı TTS ve araya girme: assistant.tts;
+# çevrimdışı ölçüm için yerel yedek aşamalar: assistant.stand_ins
@@ -0,0 +1,276 @@
+# assistant/codec.py
+
+from typing import Any, Optional
+
+import numpy as np
+
+# Telefon sesi için G.711 (μ-law / A-law) kod çözme-kodlama ve 8 kHz <-> 16 kHz örnekleme hızı dönüşümü.
+# Kod çözme 256 girişli, kodlama örneğin uint16 görünümüyle indekslenen 65536 girişli tablolarla tek bir
+# np.take ile yapılır; girdiler np.frombuffer ile kopyalanmadan okunur, çıktılar istenirse out= ile
+# önceden ayrılmış dizilere yazılır. Tablolar modül yüklenirken G.711 referans algoritmasından üretilir.
+
+ULAW = "ulaw"
+ALAW = "alaw"
+LAWS = (ULAW, ALAW)
+
+
+# --- G.711 referans algoritması (tabloları üretmek için) ---
+
+_ULAW_BIAS = 0x84
+_ULAW_CLIP = 8159
+_ULAW_SEGMENT_ENDS = (0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF, 0x1FFF)
+_ALAW_SEGMENT_ENDS = (0x1F, 0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF)
+
+
+def _segment(value: int, ends: tuple) -> int:
+    for segment, end in enumerate(ends):
+        if value <= end:
+            return segment
+    return len(ends)
+
+
+def _ulaw_encode(sample: int) -> int:
+    value = sample >> 2 # 14-bit
+    if value < 0:
+        value, mask = -value, 0x7F
+    else:
+        mask = 0xFF
+    value = min(value, _ULAW_CLIP) + (_ULAW_BIAS >> 2)
+    segment = _segment(value, _ULAW_SEGMENT_ENDS)
+    if segment >= 8:
+        return 0x7F ^ mask
+    return ((segment << 4) | ((value >> (segment + 1)) & 0xF)) ^ mask
+
+
+def _ulaw_decode(code: int) -> int:
+    code = ~code & 0xFF
+    value = (((code & 0x0F) << 3) + _ULAW_BIAS) << ((code & 0x70) >> 4)
+    return _ULAW_BIAS - value if code & 0x80 else value - _ULAW_BIAS
+
+
+def _alaw_encode(sample: int) -> int:
+    value = sample >> 3 # 13-bit
+    if value >= 0:
+        mask = 0xD5
+    else:
+        mask, value = 0x55, -value - 1
+    segment = _segment(value, _ALAW_SEGMENT_ENDS)
+    if segment >= 8:
+        return 0x7F ^ mask
+    shift = 1 if segment < 2 else segment
+    return ((segment << 4) | ((value >> shift) & 0x0F)) ^ mask
+
+
+def _alaw_decode(code: int) -> int:
+    code ^= 0x55
+    value = (code & 0x0F) << 4
+    segment = (code & 0x70) >> 4
+    if segment == 0:
+        value += 8
+    else:
+        value = (value + 0x108) << (segment - 1)
+    return value if code & 0x80 else -value
+
+
+def _encode_table(encode) -> np.ndarray:
+    # İndeks, int16 örneğin uint16 olarak okunmuş değeridir
+    samples = np.arange(65536, dtype=np.uint16).view(np.int16)
+    return np.array([encode(int(sample)) for sample in samples], dtype=np.uint8)
+
+
+_DECODE_TABLES = {
+    ULAW: np.array([_ulaw_decode(code) for code in range(256)], dtype=np.int16),
+    ALAW: np.array([_alaw_decode(code) for code in range(256)], dtype=np.int16),
+}
+_ENCODE_TABLES = {
+    ULAW: _encode_table(_ulaw_encode),
+    ALAW: _encode_table(_alaw_encode),
+}
+
+
+def _as_array(data: Any, dtype: str) -> np.ndarray:
+    return data if isinstance(data, np.ndarray) else np.frombuffer(data, dtype=dtype)
+
+
+def _law_table(tables: dict, law: str) -> np.ndarray:
+    try:
+        return tables[law]
+    except KeyError:
+        raise ValueError(f"Unsupported G.711 law: '{law}'. Expected one of {LAWS}.")
+
+
+def decode(payload: Any, law: str = ULAW, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    G.711 baytlarını 16-bit lineer PCM'e çevirir.
+
+    Args:
+        payload: G.711 baytları (bytes, bytearray, memoryview veya uint8 dizi); kopyalanmadan okunur.
+        law (str): "ulaw" veya "alaw".
+        out (Optional[np.ndarray]): Sonucun yazılacağı int16 dizi (payload ile aynı uzunlukta).
+
+    Returns:
+        np.ndarray: int16 örnekler.
+    Raises:
+        ValueError: Desteklenmeyen law.
+    """
+    codes = _as_array(payload, "u1")
+    return np.take(_law_table(_DECODE_TABLES, law), codes, out=out)
+
+
+def encode(samples: Any, law: str = ULAW, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    16-bit lineer PCM'i G.711 baytlarına çevirir.
+
+    Args:
+        samples: int16 örnekler veya 16-bit little-endian PCM baytları; kopyalanmadan okunur.
+        law (str): "ulaw" veya "alaw".
+        out (Optional[np.ndarray]): Sonucun yazılacağı uint8 dizi (örnek sayısı uzunluğunda).
+
+    Returns:
+        np.ndarray: uint8 G.711 kodları.
+    Raises:
+        ValueError: Desteklenmeyen law.
+    """
+    pcm = _as_array(samples, "<i2")
+    return np.take(_law_table(_ENCODE_TABLES, law), pcm.view(np.uint16), out=out)
+
+
+# --- Örnekleme hızı dönüşümü ---
+
+def lowpass_taps(length: int, cutoff: float, beta: float = 8.0) -> np.ndarray:
+    """
+    Kaiser pencereli sinc alçak geçiren FIR katsayıları.
+
+    Args:
+        length (int): Katsayı sayısı.
+        cutoff (float): Kesim frekansı, örnekleme hızına oranla (0 - 0.5).
+    """
+    n = np.arange(length) - (length - 1) / 2
+    taps = 2 * cutoff * np.sinc(2 * cutoff * n) * np.kaiser(length, beta)
+    return taps / taps.sum()
+
+
+class Resampler:
+    """
+    8 kHz <-> 16 kHz polifaz (polyphase) örnekleme hızı dönüştürücü; bir çağrının bir yönü için durum tutar.
+
+    Yukarı örneklemede (8k -> 16k) filtre iki faza ayrılır ve her giriş örneği için iki çıkış örneği, girdinin
+    kayan pencereleriyle (taps/2, 2) boyutlu faz matrisinin tek bir matris çarpımıyla üretilir; sıfır eklenmiş
+    örnekler hiç çarpılmaz. Aşağı örneklemede (16k -> 8k) yalnızca tutulacak çıkış örnekleri hesaplanır.
+    Önceki çağrıdan kalan filtre geçmişi önceden ayrılmış tamponda tutulur; parçalar arasında süreksizlik olmaz.
+
+    Kullanım:
+        upsampler = Resampler(8000, 16000)
+        pcm16k = upsampler.process(pcm8k)
+    """
+
+    def __init__(self, from_rate: int, to_rate: int, taps: int = 64, max_samples: int = 1600):
+        if (from_rate, to_rate) not in ((8000, 16000), (16000, 8000)):
+            raise ValueError("Only 8000 <-> 16000 Hz resampling is supported.")
+        if taps < 2 or taps % 2:
+            raise ValueError("taps must be a positive even number.")
+        self.from_rate = from_rate
+        self.to_rate = to_rate
+        self.up = to_rate > from_rate
+        # Kesim: düşük hızın Nyquist frekansının biraz altı (3840 Hz); 64 katsayıyla 3400 Hz'e kadar kayıp < 0.2 dB
+        coefficients = lowpass_taps(taps, 0.48 * min(from_rate, to_rate) / max(from_rate, to_rate))
+        if self.up:
+            phases = taps // 2
+            # Sütunlar çift ve tek çıkış örneklerinin fazları; pencere en eski örnekten en yeniye doğru
+            self._kernel = np.stack([coefficients[0::2][::-1], coefficients[1::2][::-1]], axis=1).astype(np.float32) * 2
+            self._history = phases - 1
+        else:
+            self._kernel = coefficients[::-1].astype(np.float32)
+            self._history = taps - 1
+        self._allocate(max_samples)
+
+    def _allocate(self, max_samples: int) -> None:
+        self._max_samples = max_samples
+        self._buffer = np.zeros(self._history + max_samples, dtype=np.float32)
+        outputs = max_samples * 2 if self.up else max_samples // 2
+        self._result = np.empty(outputs, dtype=np.float32)
+        # Tamponun kayan pencereleri bir kez oluşturulur (kopyasız görünüm); her parçada yalnızca dilimlenir
+        windows = np.lib.stride_tricks.sliding_window_view(self._buffer, len(self._kernel))
+        self._windows = windows if self.up else windows[::2]
+
+    def output_length(self, samples: int) -> int:
+        return samples * 2 if self.up else samples // 2
+
+    def process(self, samples: Any, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Bir ses parçasını dönüştürür.
+
+        Args:
+            samples: int16 örnekler veya 16-bit little-endian PCM baytları; kopyalanmadan okunur.
+                Aşağı örneklemede örnek sayısı çift olmalıdır.
+            out (Optional[np.ndarray]): Sonucun yazılacağı int16 dizi (output_length uzunluğunda).
+
+        Returns:
+            np.ndarray: Dönüştürülmüş int16 örnekler.
+        Raises:
+            ValueError: Aşağı örneklemede örnek sayısı tekse.
+        """
+        pcm = _as_array(samples, "<i2")
+        n = len(pcm)
+        if not self.up and n % 2:
+            raise ValueError("Downsampling needs an even number of samples.")
+        if n > self._max_samples:
+            # Nadir: beklenenden uzun parça için tamponlar büyütülür (geçmiş korunur)
+            history = self._buffer[:self._history].copy()
+            self._allocate(n)
+            self._buffer[:self._history] = history
+        history = self._history
+        buffer = self._buffer[:history + n]
+        np.copyto(buffer[history:], pcm)
+
+        result = self._result[:self.output_length(n)]
+        if self.up:
+            # (n, taps/2) @ (taps/2, 2) -> (n, 2); satır sırası çift/tek örnekleri iç içe verir
+            np.dot(self._windows[:n], self._kernel, out=result.reshape(n, 2))
+        else:
+            np.dot(self._windows[:n // 2], self._kernel, out=result)
+        # Sonraki parça için filtre geçmişi
+        buffer[:history] = buffer[n:n + history]
+
+        np.rint(result, out=result)
+        np.minimum(result, 32767, out=result)
+        np.maximum(result, -32768, out=result)
+        if out is None:
+            return result.astype(np.int16)
+        np.copyto(out, result, casting="unsafe")
+        return out
+
+
+class CallAudio:
+    """
+    Bir çağrının ses dönüşümleri: gelen G.711 (8 kHz) -> 16 kHz lineer PCM (tanıma için) ve
+    giden 16 kHz lineer PCM (TTS) -> G.711 (8 kHz). Ara diziler önceden ayrılır ve yeniden kullanılır.
+    """
+
+    def __init__(self, law: str = ULAW, frame_samples: int = 160):
+        _law_table(_DECODE_TABLES, law)
+        self.law = law
+        self._upsampler = Resampler(8000, 16000, max_samples=frame_samples * 10)
+        self._downsampler = Resampler(16000, 8000, max_samples=frame_samples * 20)
+        self._linear = np.empty(frame_samples * 10, dtype=np.int16)
+
+    def _linear_buffer(self, samples: int) -> np.ndarray:
+        if samples > len(self._linear):
+            self._linear = np.empty(samples, dtype=np.int16)
+        return self._linear[:samples]
+
+    def inbound(self, payload: Any, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Gelen G.711 baytlarını 16 kHz int16 örneklere çevirir.
+        """
+        codes = _as_array(payload, "u1")
+        linear = decode(codes, self.law, out=self._linear_buffer(len(codes)))
+        return self._upsampler.process(linear, out=out)
+
+    def outbound(self, samples: Any, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Giden 16 kHz int16 örnekleri G.711 baytlarına çevirir.
+        """
+        pcm = _as_array(samples, "<i2")
+        linear = self._downsampler.process(pcm, out=self._linear_buffer(len(pcm) // 2))
+        return encode(linear, self.law, out=out)
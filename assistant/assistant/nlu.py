@@ -0,0 +1,646 @@
+# assistant/nlu.py
+
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+# Arayan cümlelerinden kurallarla niyet (book / cancel / reschedule), gün ve saat çıkarımı (Türkçe ve İngilizce).
+# Tüm tablolar modül yüklenirken derlenir:
+#   - kelime kökleri için karakter trie'si: Türkçe ekler ("üçte", "salıya", "buçuğa") en uzun kök + izinli ek
+#     olarak ayrılır; ünsüz yumuşaması ("dörde") ve Türkçe karaktersiz yazımlar ("yarin") takma ad olarak eklenir;
+#   - çok kelimeli ifadeler için kelime trie'si ("öğleden sonra", "çeyrek geçe", "day after tomorrow").
+# Çözümleme tek geçişte, etiketlenmiş kelime dizisi üzerinde yapılır; sonuç değişmez (frozen) bir nesnedir ve
+# tekrar eden cümleler için LRU önbellekte tutulur. Tarih hesabı (ör. "önümüzdeki salı" hangi gün) referans
+# zamana bağlı olduğu için önbelleğe alınmaz; candidates() ile ayrıca ve ucuzca yapılır.
+
+# Etiket türleri
+NUM = "num" # Sayı kelimesi ("üç", "three")
+DIGITS = "digits" # Rakamla sayı ("3", "15")
+TIME = "time" # Rakamla saat ("15:30")
+HALF = "half" # "buçuk"
+HALF_PAST = "half_past" # "half past"
+QUARTER_PAST = "quarter_past" # "çeyrek geçe", "quarter past"
+QUARTER_TO = "quarter_to" # "çeyrek var", "quarter to"
+PAST = "past" # "geçe", "past"
+TO = "to" # "var", "to"
+OCLOCK = "oclock"
+HOUR_WORD = "hour_word" # "saat", "at"
+DAY = "day" # Bugünden gün farkı
+WEEKDAY = "weekday" # 0 = pazartesi
+NEXT_WEEK = "next_week"
+PERIOD = "period" # Günün bölümü
+FROM = "from"
+UNTIL = "until"
+AND = "and"
+INTENT = "intent"
+OTHER = "other" # Tanınmayan kelime
+
+# Günün bölümleri ve saat verilmediğinde kullanılan aralıklar (başlangıç, bitiş saati)
+PERIOD_WINDOWS = {
+    "am": (9, 12),
+    "pm": (13, 18),
+    "morning": (9, 12),
+    "noon": (12, 14),
+    "afternoon": (13, 18),
+    "evening": (18, 21),
+    "night": (20, 23),
+}
+BUSINESS_HOURS = (9, 18)
+
+# Niyet önceliği: aynı cümlede birden fazlası varsa en öncelikli olan seçilir ("randevumu iptal et" -> cancel)
+_INTENT_PRIORITY = {"cancel": 0, "reschedule": 1, "book": 2}
+
+# --- Sözlük ---
+
+_PHRASES: Dict[Tuple[str, ...], Tuple[Tuple[str, Any], ...]] = {}
+
+
+def _add(words: str, *tags: Tuple[str, Any]) -> None:
+    _PHRASES[tuple(words.split())] = tags
+
+
+for _index, _word in enumerate("sıfır bir iki üç dört beş altı yedi sekiz dokuz".split()):
+    _add(_word, (NUM, _index))
+for _index, _word in enumerate("zero one two three four five six seven eight nine ten eleven twelve".split()):
+    _add(_word, (NUM, _index))
+for _word, _value in (
+    ("on", 10), ("onbir", 11), ("oniki", 12), ("yirmi", 20), ("otuz", 30), ("kırk", 40), ("elli", 50),
+    ("thirteen", 13), ("fourteen", 14), ("fifteen", 15), ("sixteen", 16), ("seventeen", 17), ("eighteen", 18),
+    ("nineteen", 19), ("twenty", 20), ("thirty", 30), ("forty", 40), ("fifty", 50),
+):
+    _add(_word, (NUM, _value))
+
+_add("buçuk", (HALF, 30))
+_add("yarım", (TIME, (12, 30))) # "yarımda" = 12:30
+_add("çeyrek geçe", (QUARTER_PAST, 15))
+_add("çeyrek var", (QUARTER_TO, 45))
+_add("quarter past", (QUARTER_PAST, 15))
+_add("quarter to", (QUARTER_TO, 45))
+_add("half past", (HALF_PAST, 30))
+_add("geçe", (PAST, None))
+_add("past", (PAST, None))
+_add("var", (TO, None))
+_add("to", (TO, None))
+_add("oclock", (OCLOCK, None))
+_add("saat", (HOUR_WORD, None))
+_add("at", (HOUR_WORD, None))
+
+_add("bugün", (DAY, 0))
+_add("yarın", (DAY, 1))
+_add("öbür gün", (DAY, 2))
+_add("öbürgün", (DAY, 2))
+_add("today", (DAY, 0))
+_add("tomorrow", (DAY, 1))
+_add("day after tomorrow", (DAY, 2))
+_add("tonight", (DAY, 0), (PERIOD, "evening"))
+for _index, _word in enumerate("pazartesi salı çarşamba perşembe cuma cumartesi pazar".split()):
+    _add(_word, (WEEKDAY, _index))
+for _index, _word in enumerate("monday tuesday wednesday thursday friday saturday sunday".split()):
+    _add(_word, (WEEKDAY, _index))
+_add("haftaya", (NEXT_WEEK, 1))
+_add("önümüzdeki hafta", (NEXT_WEEK, 1))
+_add("gelecek hafta", (NEXT_WEEK, 1))
+_add("next week", (NEXT_WEEK, 1))
+
+for _word, _period in (
+    ("sabah", "morning"), ("öğle", "noon"), ("öğlen", "noon"), ("öğleden sonra", "afternoon"),
+    ("akşamüstü", "afternoon"), ("ikindi", "afternoon"), ("akşam", "evening"), ("gece", "night"),
+    ("am", "am"), ("pm", "pm"), ("morning", "morning"), ("noon", "noon"), ("midday", "noon"),
+    ("afternoon", "afternoon"), ("evening", "evening"), ("night", "night"),
+):
+    _add(_word, (PERIOD, _period))
+
+_add("from", (FROM, None))
+_add("between", (FROM, None))
+_add("kadar", (UNTIL, None))
+_add("until", (UNTIL, None))
+_add("till", (UNTIL, None))
+_add("ile", (AND, None))
+_add("and", (AND, None))
+
+_INTENT_STEMS = {
+    "cancel": ("iptal", "vazgeç", "cancel"),
+    "reschedule": ("değiştir", "ertele", "kaydır", "taşı", "güncelle", "reschedule", "move", "change"),
+    "book": ("randevu", "rezervasyon", "ayarla", "ayır", "book", "appointment", "schedule"),
+}
+for _intent, _stems in _INTENT_STEMS.items():
+    for _stem in _stems:
+        _add(_stem, (INTENT, _intent))
+
+# Etiketi olmayan ama tanınan (dolgu) kelimeler; tanınmayan kelimeler gibi ifadeleri bölmezler
+for _word in ("önümüzdeki", "gelecek", "bu", "gün", "hafta", "next", "this", "the", "in", "on", "day", "week", "ara"):
+    _PHRASES.setdefault((_word,), ())
+
+# Sözlükteki kelimeler kök olarak karakter trie'sine girer. Niyet kökleri her eki kabul eder
+# ("iptal" -> "iptali", "randevumu"); diğerleri yalnızca zaman bildiren ekleri.
+_SUFFIX_CLASSES: Dict[str, str] = {"": ""}
+for _class, _suffixes in (
+    ("loc", "te ta de da"),
+    ("dat", "e a ye ya"),
+    ("abl", "ten tan den dan"),
+    ("acc", "i ı u ü yi yı yu yü"),
+    ("other", "ki leyin"),
+):
+    for _suffix in _suffixes.split():
+        _SUFFIX_CLASSES.setdefault(_suffix, _class)
+# Ünsüz yumuşaması ve bitişik yazımlar
+_ALIASES = {"dörd": "dört", "buçuğ": "buçuk", "günü": "gün", "arası": "ara", "arasında": "ara"}
+_FOLD = str.maketrans("çğıöşü", "cgiosu")
+
+_ANY_SUFFIX = {stem for stems in _INTENT_STEMS.values() for stem in stems}
+_LEAF = "" # Trie düğümünde kök bilgisinin anahtarı
+
+
+def _build_trie() -> dict:
+    lemmas = {word for phrase in _PHRASES for word in phrase}
+    surfaces = {lemma: lemma for lemma in lemmas}
+    surfaces.update(_ALIASES)
+    for surface, lemma in list(surfaces.items()):
+        # Türkçe karakter kullanılmadan yazılmış biçimler; başka bir kelimeyle çakışırsa (geçe / gece) eklenmez
+        surfaces.setdefault(surface.translate(_FOLD), lemma)
+    root: dict = {}
+    for surface, lemma in surfaces.items():
+        node = root
+        for char in surface:
+            node = node.setdefault(char, {})
+        node[_LEAF] = (lemma, lemma in _ANY_SUFFIX)
+    return root
+
+
+def _build_phrase_trie() -> dict:
+    root: dict = {}
+    for words, tags in _PHRASES.items():
+        node = root
+        for word in words:
+            node = node.setdefault(word, {})
+        node[_LEAF] = tags
+    return root
+
+
+_TRIE = _build_trie()
+_PHRASE_TRIE = _build_phrase_trie()
+
+_TOKEN = re.compile(r"(\d+)(?:[:.](\d{2}))?([^\W\d_]*)|([^\W\d_]+)")
+_MERIDIEM = re.compile(r"\b([ap])\.\s?m\b\.?")
+_NORMALIZE = str.maketrans({"I": "ı", "İ": "i", "'": None, "’": None})
+
+_WORD_CACHE: Dict[str, Tuple[Optional[str], str]] = {}
+_WORD_CACHE_SIZE = 20_000
+
+
+def _lex_word(word: str) -> Tuple[Optional[str], str]:
+    """
+    Kelimeyi (kök, ek sınıfı) olarak ayırır; en uzun uygun kök seçilir. Tanınmazsa kök None'dır.
+    """
+    cached = _WORD_CACHE.get(word)
+    if cached is not None:
+        return cached
+    node = _TRIE
+    matches = []
+    for position, char in enumerate(word):
+        node = node.get(char)
+        if node is None:
+            break
+        if _LEAF in node:
+            matches.append((position + 1, node[_LEAF]))
+    result: Tuple[Optional[str], str] = (None, "")
+    for length, (lemma, any_suffix) in reversed(matches):
+        suffix = word[length:]
+        if any_suffix:
+            result = (lemma, "")
+            break
+        suffix_class = _SUFFIX_CLASSES.get(suffix)
+        if suffix_class is not None:
+            result = (lemma, suffix_class)
+            break
+    if len(_WORD_CACHE) >= _WORD_CACHE_SIZE:
+        _WORD_CACHE.clear()
+    _WORD_CACHE[word] = result
+    return result
+
+
+def normalize(text: str) -> str:
+    """
+    Türkçe büyük/küçük harf kurallarıyla küçük harfe çevirir, kesme işaretlerini kaldırır ("3'te" -> "3te").
+    """
+    return _MERIDIEM.sub(r"\1m", text.translate(_NORMALIZE).lower())
+
+
+def tokenize(text: str) -> List[Tuple[str, Any, str]]:
+    """
+    Normalleştirilmiş metni (tür, değer, ek sınıfı) etiketlerine çevirir.
+    Çok kelimeli ifadeler en uzun eşleşmeyle birleştirilir; ardışık onlar ve birler basamağı tek sayı olur ("on bir").
+    """
+    words: List[Tuple[Optional[str], str]] = []
+    digits: Dict[int, Tuple[str, Any, str]] = {}
+    for match in _TOKEN.finditer(text):
+        number, minutes, letters, word = match.groups()
+        if word is not None:
+            words.append(_lex_word(word))
+            continue
+        value = int(number)
+        if minutes is not None and value < 24 and int(minutes) < 60:
+            tag = (TIME, (value, int(minutes)), _SUFFIX_CLASSES.get(letters, ""))
+        elif minutes is None and len(number) <= 2:
+            tag = (DIGITS, value, _SUFFIX_CLASSES.get(letters, ""))
+        else:
+            tag = (OTHER, None, "")
+        digits[len(words)] = tag
+        words.append((None, ""))
+        if letters in ("am", "pm"):
+            words.append(("am" if letters == "am" else "pm", ""))
+
+    tokens: List[Tuple[str, Any, str]] = []
+    index, count = 0, len(words)
+    while index < count:
+        lemma, suffix = words[index]
+        if lemma is None:
+            tokens.append(digits.get(index, (OTHER, None, "")))
+            index += 1
+            continue
+        node, best, end = _PHRASE_TRIE, None, index
+        for position in range(index, count):
+            node = node.get(words[position][0])
+            if node is None:
+                break
+            if _LEAF in node:
+                best, end = node[_LEAF], position
+            if words[position][1]:
+                break # Ekli kelime ifadenin son kelimesidir
+        if best is None:
+            tokens.append((OTHER, None, ""))
+            index += 1
+            continue
+        suffix = words[end][1]
+        for kind, value in best:
+            tokens.append((kind, value, suffix))
+        index = end + 1
+
+    # "on bir" -> 11, "twenty five" -> 25
+    merged: List[Tuple[str, Any, str]] = []
+    for token in tokens:
+        if token[0] == NUM and merged:
+            previous = merged[-1]
+            if previous[0] == NUM and not previous[2] and previous[1] in (10, 20, 30, 40, 50) and 0 < token[1] < 10:
+                merged[-1] = (NUM, previous[1] + token[1], token[2])
+                continue
+        merged.append(token)
+    return merged
+
+
+# --- Çözümleme ---
+
+@dataclass(frozen=True, slots=True)
+class ParsedUtterance:
+    """
+    Bir cümlenin referans tarihten bağımsız çözümlemesi. Saatler 24 saat biçimindedir.
+    ambiguous: Saat dilimi belirtilmemiş 1-7 arası saat (öğleden sonra varsayıldı; sabah da olabilir).
+    """
+    intent: Optional[str] = None
+    day_offset: Optional[int] = None
+    weekday: Optional[int] = None
+    week_offset: int = 0
+    hour: Optional[int] = None
+    minute: int = 0
+    end_hour: Optional[int] = None
+    end_minute: int = 0
+    period: Optional[str] = None
+    ambiguous: bool = False
+
+    def slots(self) -> Dict[str, Any]:
+        """
+        Oturum taslağı ve backend için slot sözlüğü (gün farkı referans tarihe göre ayrıca hesaplanır).
+        """
+        slots: Dict[str, Any] = {}
+        if self.hour is not None:
+            slots["hour"], slots["minute"] = self.hour, self.minute
+        if self.end_hour is not None:
+            slots["end_hour"], slots["end_minute"] = self.end_hour, self.end_minute
+        return slots
+
+
+_HOUR_CONTEXT = {HOUR_WORD, FROM, "range"} # "range": aralığın ikinci saati beklenirken ("3 ile 5", "2 to 4")
+_TIME_SUFFIXES = {"loc", "dat", "abl"}
+
+
+def _to_24h(hour: int, period: Optional[str]) -> Tuple[int, bool]:
+    if hour == 24:
+        return 0, False
+    if hour > 12 or hour == 0:
+        return hour, False
+    if period in ("pm", "afternoon", "evening"):
+        return (hour + 12) % 24 if hour < 12 else 12, False
+    if period == "am":
+        return hour % 12, False
+    if period == "noon":
+        return (hour + 12 if hour < 6 else hour), False
+    if period == "night":
+        return (hour + 12 if 6 <= hour < 12 else hour % 12), False
+    if period == "morning":
+        return hour, False
+    # Dilim verilmediyse çalışma saatleri varsayılır: 8-12 öğleden önce, 1-7 öğleden sonra
+    if hour >= 8:
+        return hour, False
+    return hour + 12, True
+
+
+def _time_at(tokens: List[Tuple[str, Any, str]], index: int, previous: Optional[str], range_open: bool):
+    """
+    index'teki saat ifadesini çözer. Returns: (saat, dakika, sonraki indeks, ek sınıfı, hemen ardından gelen dilim) veya None.
+    """
+    count = len(tokens)
+    kind, value, suffix = tokens[index]
+
+    def at(position: int) -> Tuple[str, Any, str]:
+        return tokens[position] if position < count else (OTHER, None, "")
+
+    following = at(index + 1)
+    if kind == TIME:
+        hour, minute = value
+        end = index + 1
+    elif kind in (HALF_PAST, QUARTER_PAST, QUARTER_TO):
+        # İngilizce: "half past four", "quarter to five"
+        if following[0] not in (NUM, DIGITS) or not 1 <= following[1] <= 12:
+            return None
+        hour, minute = following[1], value
+        if kind == QUARTER_TO:
+            hour = hour - 1 or 12
+        suffix, end = following[2], index + 2
+    elif kind in (NUM, DIGITS):
+        second, third = following, at(index + 2)
+        hour, minute, end = value, 0, index + 1
+        if second[0] == HALF:
+            minute, suffix, end = 30, second[2], index + 2
+        elif second[0] == QUARTER_PAST:
+            minute, suffix, end = 15, second[2], index + 2
+        elif second[0] == QUARTER_TO:
+            hour, minute, suffix, end = hour - 1 or 12, 45, second[2], index + 2
+        elif second[0] in (NUM, DIGITS) and third[0] == PAST:
+            minute, suffix, end = second[1], third[2], index + 3 # "dördü yirmi geçe"
+        elif second[0] in (NUM, DIGITS) and third[0] == TO and suffix == "dat":
+            hour, minute, suffix, end = hour - 1 or 12, 60 - second[1], third[2], index + 3 # "dörde yirmi var"
+        elif second[0] == PAST and third[0] in (NUM, DIGITS):
+            hour, minute, suffix, end = third[1], value, third[2], index + 3 # "twenty past four"
+        elif second[0] == TO and third[0] in (NUM, DIGITS) and not range_open and value in (5, 10, 20, 25):
+            hour, minute, suffix, end = third[1] - 1 or 12, 60 - value, third[2], index + 3 # "ten to five"
+        elif second[0] in (NUM, DIGITS) and not suffix and 10 <= second[1] <= 59:
+            minute, suffix, end = second[1], second[2], index + 2 # "üç kırk beş", "three thirty"
+        elif suffix == "acc":
+            return None # "onu" gibi zamir okumaları
+        if end == index + 1 and at(end)[0] not in (OCLOCK, PERIOD) and suffix not in _TIME_SUFFIXES:
+            # Tek başına sayı ancak bağlamla saat sayılır ("saat üç", "at 3", "sabah 9")
+            if previous not in _HOUR_CONTEXT and not (kind == DIGITS and previous == PERIOD):
+                return None
+    else:
+        return None
+
+    if at(end)[0] == OCLOCK:
+        end += 1
+    period = None
+    if at(end)[0] == PERIOD:
+        period = at(end)[1]
+        end += 1
+    if not (0 <= hour <= 24 and 0 <= minute <= 59):
+        return None
+    return hour, minute, end, suffix, period
+
+
+def _parse(text: str) -> ParsedUtterance:
+    tokens = tokenize(text)
+    intent: Optional[str] = None
+    day_offset: Optional[int] = None
+    weekday: Optional[int] = None
+    week_offset = 0
+    current_period: Optional[str] = None
+    last_period: Optional[str] = None
+    start: Optional[list] = None
+    end: Optional[list] = None
+    range_open = expect_end = False
+    previous: Optional[str] = None
+
+    index, count = 0, len(tokens)
+    while index < count:
+        kind, value, suffix = tokens[index]
+        if kind in (NUM, DIGITS, TIME, HALF_PAST, QUARTER_PAST, QUARTER_TO):
+            parsed = _time_at(tokens, index, previous, range_open)
+            if parsed is not None:
+                hour, minute, index, suffix, period = parsed
+                entry = [hour, minute, period or current_period]
+                if period:
+                    last_period = period
+                if suffix == "abl":
+                    start, range_open = entry, True
+                elif expect_end or (suffix == "dat" and range_open):
+                    end, expect_end = entry, False
+                else:
+                    start = entry
+                previous = "dat_time" if suffix == "dat" and entry is start else TIME
+                continue
+        elif kind == INTENT:
+            if intent is None or _INTENT_PRIORITY[value] < _INTENT_PRIORITY[intent]:
+                intent = value
+        elif kind == DAY:
+            day_offset, weekday = value, None
+        elif kind == WEEKDAY:
+            weekday, day_offset = value, None
+        elif kind == NEXT_WEEK:
+            week_offset = value
+        elif kind == PERIOD:
+            current_period = last_period = value
+        elif kind == FROM:
+            range_open = True
+        elif kind == UNTIL:
+            if previous == "dat_time" and end is None:
+                end, start = start, None # "beşe kadar": bitiş saati
+            elif previous != TIME:
+                expect_end = True # "until 5"
+                kind = "range"
+        elif kind in (TO, AND) and (range_open or start is not None):
+            expect_end = True
+            kind = "range"
+        previous = kind
+        index += 1
+
+    # Dilimi olmayan saatler cümledeki son dilimi alır ("üçte, öğleden sonra")
+    hour = end_hour = None
+    minute = end_minute = 0
+    ambiguous = False
+    if start is not None:
+        hour, ambiguous = _to_24h(start[0], start[2] or last_period)
+        minute = start[1]
+    if end is not None:
+        end_hour, _ = _to_24h(end[0], end[2] or last_period)
+        end_minute = end[1]
+        if hour is not None and end_hour * 60 + end_minute <= hour * 60 + minute and end_hour < 12:
+            end_hour += 12 # "dokuzdan beşe" -> 09-17
+    return ParsedUtterance(
+        intent=intent,
+        day_offset=day_offset,
+        weekday=weekday,
+        week_offset=week_offset,
+        hour=hour,
+        minute=minute,
+        end_hour=end_hour,
+        end_minute=end_minute,
+        period=last_period,
+        ambiguous=ambiguous,
+    )
+
+
+class UtteranceParser:
+    """
+    Cümle çözümleyici; sonuçları LRU önbellekte tutar. Önce ham metinle, ıskada normalleştirilmiş metinle bakılır;
+    böylece yalnızca büyük/küçük harf veya kesme işareti farkı olan cümleler de önbellekten döner.
+
+    Kullanım:
+        parser = UtteranceParser()
+        parsed = parser.parse("yarın öğleden sonra üç buçukta")
+        candidates(parsed, datetime.now())
+    """
+
+    def __init__(self, cache_size: int = 10_000):
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, ParsedUtterance]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _remember(self, key: str, result: ParsedUtterance) -> None:
+        self._cache[key] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def parse(self, text: str) -> ParsedUtterance:
+        cache = self._cache
+        result = cache.get(text)
+        if result is not None:
+            cache.move_to_end(text)
+            self.hits += 1
+            return result
+        normalized = normalize(text)
+        result = cache.get(normalized)
+        if result is None:
+            self.misses += 1
+            result = _parse(normalized)
+            if self.cache_size:
+                self._remember(normalized, result)
+        else:
+            self.hits += 1
+        if self.cache_size and normalized != text:
+            self._remember(text, result)
+        return result
+
+    def clear(self) -> None:
+        self._cache.clear()
+        self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._cache), "maxsize": self.cache_size, "hits": self.hits, "misses": self.misses}
+
+    def extract_intent(self, text: str, reference: Optional[datetime] = None) -> tuple:
+        """
+        stand_ins.extract_intent ile aynı biçimde (niyet, slotlar) döndürür; gün farkı reference'a göre hesaplanır.
+        """
+        parsed = self.parse(text)
+        slots = parsed.slots()
+        today = (reference or datetime.now()).date()
+        day = resolve_date(parsed, today)
+        if day is not None:
+            slots["day_offset"] = (day - today).days
+        return parsed.intent, slots
+
+
+def resolve_date(parsed: ParsedUtterance, reference: date) -> Optional[date]:
+    """
+    Cümledeki günü referans tarihe göre hesaplar; gün belirtilmemişse None.
+    Hafta günü tek başına veya "önümüzdeki" ile bugünden sonraki ilk o gündür; "haftaya" / "next week" ile
+    gelecek takvim haftasının (pazartesi başlangıçlı) o günüdür.
+    """
+    if parsed.day_offset is not None:
+        return reference + timedelta(days=parsed.day_offset)
+    if parsed.weekday is not None:
+        if parsed.week_offset:
+            monday = reference - timedelta(days=reference.weekday()) + timedelta(weeks=parsed.week_offset)
+            return monday + timedelta(days=parsed.weekday)
+        return reference + timedelta(days=(parsed.weekday - reference.weekday() - 1) % 7 + 1)
+    if parsed.week_offset:
+        return reference - timedelta(days=reference.weekday()) + timedelta(weeks=parsed.week_offset)
+    return None
+
+
+def candidates(
+    parsed: ParsedUtterance,
+    reference: datetime,
+    duration: timedelta = timedelta(minutes=30)
+) -> List[Tuple[datetime, datetime]]:
+    """
+    Çözümlemeden (appointment_time, end_time) adaylarını olasılık sırasıyla üretir.
+
+    - Saat varsa başlangıç o saattir; bitiş söylenmişse o, yoksa başlangıç + duration.
+      Belirsiz saatte (ör. "üçte") önce öğleden sonra, sonra sabah okuması gelir.
+    - Saat yok, dilim varsa ("salı sabah") dilimin aralığı; yalnızca gün varsa çalışma saatleri döner.
+      Aralık şimdiyi kapsıyorsa şimdiden başlar.
+    - Gün söylenmemişse bugün, saat geçmişse yarın kullanılır. Geçmişte kalan adaylar atılır.
+
+    Args:
+        reference (datetime): Şimdiki zaman; saat dilimi (tzinfo) adaylara aktarılır.
+    """
+    day = resolve_date(parsed, reference.date())
+    tz = reference.tzinfo
+
+    def at(on: date, hour: int, minute: int = 0) -> datetime:
+        return datetime.combine(on, time(hour, minute), tzinfo=tz)
+
+    result: List[Tuple[datetime, datetime]] = []
+    if parsed.hour is None:
+        if parsed.end_hour is not None:
+            window = (BUSINESS_HOURS[0], parsed.end_hour)
+        elif parsed.period is not None:
+            window = PERIOD_WINDOWS[parsed.period]
+        elif day is not None:
+            window = BUSINESS_HOURS
+        else:
+            return result
+        on = day or reference.date()
+        start, end = at(on, window[0]), at(on, window[1], parsed.end_minute if parsed.end_hour is not None else 0)
+        if day is None and end <= reference:
+            start, end = start + timedelta(days=1), end + timedelta(days=1)
+        if end > reference and end > start:
+            result.append((max(start, reference), end))
+        return result
+
+    # Bitiş saati söylenmişse ("üçten beşe") sabah okuması anlamsızdır
+    ambiguous = parsed.ambiguous and parsed.end_hour is None
+    hours = [parsed.hour] + ([parsed.hour - 12] if ambiguous else [])
+    for hour in hours:
+        start = at(day or reference.date(), hour, parsed.minute)
+        if day is None and start <= reference:
+            start += timedelta(days=1)
+        if start <= reference:
+            continue
+        if parsed.end_hour is not None:
+            end = at(start.date(), parsed.end_hour, parsed.end_minute)
+            if end <= start:
+                continue
+        else:
+            end = start + duration
+        result.append((start, end))
+    return result
+
+
+_DEFAULT = UtteranceParser()
+
+
+def parse(text: str) -> ParsedUtterance:
+    """
+    Modül düzeyindeki ortak çözümleyiciyle (önbellekli) çözümler.
+    """
+    return _DEFAULT.parse(text)
+
+
+def extract_intent(text: str, reference: Optional[datetime] = None) -> tuple:
+    """
+    Ortak çözümleyiciyle (niyet, slotlar) döndürür; DialogHandler'ın extract parametresi olarak kullanılabilir.
+    """
+    return _DEFAULT.extract_intent(text, reference)
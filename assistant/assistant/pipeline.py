@@ -0,0 +1,283 @@
+# assistant/pipeline.py
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Akışlı (streaming) sesli asistan hattı.
+# Ses çerçeveleri -> ses etkinliği tespiti (VAD) -> konuşma tanıma -> niyet/slot çıkarımı ->
+# rezervasyon işlemi -> metinden sese (TTS). Her aşama kendi görevinde (task) çalışır ve bir sonrakine
+# sınırlı bir kuyrukla bağlanır; yavaş bir aşama üst aşamaları bekletir (backpressure), bellek büyümez.
+# Aşamalar kısmi sonuçları (ör. ara transkriptler) üretildikleri anda aşağı iletir; böylece bir
+# sonraki aşama cümlenin bitmesini beklemeden çalışmaya başlar.
+
+
+SAMPLE_RATE = 8000 # Telefon hattı örnekleme hızı (Hz)
+FRAME_MS = 20 # Bir ses çerçevesinin süresi
+FRAME_SAMPLES = SAMPLE_RATE * FRAME_MS // 1000 # 160 örnek
+FRAME_BYTES = FRAME_SAMPLES * 2 # 16-bit PCM
+
+
+def now() -> float:
+    """
+    Gecikme ölçümlerinde kullanılan monoton saat (saniye).
+    """
+    return time.perf_counter()
+
+
+# --- Mesajlar ---
+
+@dataclass(slots=True)
+class Turn:
+    """
+    Arayanın tek bir konuşma sırası ve bu sıranın gecikme ölçümleri.
+    Aynı nesne sıranın tüm mesajlarında taşınır; aşamalar kendi zaman damgalarını üzerine yazar.
+    """
+    call_id: str
+    turn_id: int
+    speech_start_at: float = 0.0
+    speech_end_at: Optional[float] = None # Arayanın sustuğu an; sıra gecikmesi buradan ölçülür
+    final_transcript_at: Optional[float] = None
+    final_intent_at: Optional[float] = None
+    reply_at: Optional[float] = None
+    first_audio_at: Optional[float] = None # Yanıtın ilk ses parçasının çalınmaya hazır olduğu an
+    audio_stopped_at: Optional[float] = None # Arayan araya girdiğinde yanıtın sentezinin kesildiği an
+
+    @property
+    def latency(self) -> Optional[float]:
+        """
+        Konuşmanın bitişinden yanıtın ilk sesine kadar geçen süre (saniye).
+        """
+        if self.speech_end_at is None or self.first_audio_at is None:
+            return None
+        return self.first_audio_at - self.speech_end_at
+
+
+@dataclass(slots=True)
+class AudioFrame:
+    """
+    Telefondan gelen tek bir ses çerçevesi (8 kHz, 16-bit lineer PCM).
+    """
+    call_id: str
+    seq: int
+    pcm: bytes
+    received_at: float = field(default_factory=now)
+
+
+@dataclass(slots=True)
+class SpeechStart:
+    turn: Turn
+
+
+@dataclass(slots=True)
+class SpeechChunk:
+    """
+    Konuşma içeren ses parçası (VAD'nin konuşma olarak işaretlediği çerçeveler).
+    """
+    turn: Turn
+    pcm: bytes
+
+
+@dataclass(slots=True)
+class SpeechEnd:
+    turn: Turn
+
+
+@dataclass(slots=True)
+class Transcript:
+    turn: Turn
+    text: str
+    is_final: bool
+
+
+@dataclass(slots=True)
+class Intent:
+    """
+    Transkriptten çıkarılan niyet (book, cancel, reschedule, ...) ve slotlar (tarih, saat, hizmet, ...).
+    Kısmi transkriptlerden de üretilebilir; yalnızca is_final olanlar işleme dönüştürülür.
+    """
+    turn: Turn
+    name: Optional[str]
+    slots: Dict[str, Any]
+    is_final: bool
+
+
+@dataclass(slots=True)
+class Reply:
+    turn: Turn
+    text: str
+
+
+@dataclass(slots=True)
+class AudioOut:
+    """
+    Arayana çalınacak sentezlenmiş ses parçası.
+    """
+    turn: Turn
+    pcm: bytes
+    is_last: bool
+
+
+class _End:
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "END"
+
+
+END = _End() # Akışın bittiğini bildiren işaret; her aşama aldığında kendisi de aşağı iletir
+
+
+# --- Aşamalar ---
+
+class Stage:
+    """
+    Hattın tek bir aşaması.
+    process her girdi için sıfır veya daha fazla çıktı üreten bir async generator'dır; aşamanın
+    işlemediği mesaj türleri değiştirilmeden aşağı iletilmelidir (kontrol mesajları hattın sonuna ulaşır).
+    flush akış bittiğinde bekleyen çıktıları boşaltmak için çağrılır.
+    """
+    name = "stage"
+
+    async def process(self, item: Any) -> AsyncIterator[Any]:
+        yield item
+
+    async def flush(self) -> AsyncIterator[Any]:
+        return
+        yield  # pragma: no cover
+
+
+class PipelineError(RuntimeError):
+    """
+    Bir aşama hata ile sonlandığında hattın çıktısını okuyana iletilir.
+    """
+
+
+class Pipeline:
+    """
+    Aşamaları sınırlı kuyruklarla birbirine bağlayan ve her birini ayrı bir görevde çalıştıran hat.
+
+    Kullanım:
+        pipeline = Pipeline([vad, recognizer, nlu, booking, tts], queue_size=32)
+        async for item in pipeline.run(frames):
+            ...
+    """
+
+    def __init__(self, stages: Sequence[Stage], queue_size: int = 32):
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage.")
+        if queue_size < 1:
+            raise ValueError("queue_size must be at least 1.")
+        self.stages = list(stages)
+        self.queue_size = queue_size
+        self._queues: List[asyncio.Queue] = []
+        self._tasks: List[asyncio.Task] = []
+        self._error: Optional[BaseException] = None
+
+    async def start(self) -> None:
+        """
+        Aşama görevlerini başlatır.
+        """
+        if self._tasks:
+            raise RuntimeError("Pipeline already started.")
+        self._queues = [asyncio.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+        self._tasks = [
+            asyncio.create_task(self._run_stage(stage, self._queues[index], self._queues[index + 1]), name=f"stage:{stage.name}")
+            for index, stage in enumerate(self.stages)
+        ]
+
+    async def push(self, item: Any) -> None:
+        """
+        Hattın başına bir mesaj ekler; ilk kuyruk doluysa yer açılana kadar bekler.
+
+        Raises:
+            PipelineError: Bir aşama hata ile sonlandıysa.
+        """
+        if self._error is not None:
+            raise PipelineError("Pipeline stopped after a stage failed.") from self._error
+        await self._queues[0].put(item)
+
+    async def close(self) -> None:
+        """
+        Girdinin bittiğini bildirir; aşamalar bekleyen işleri bitirip sırayla kapanır.
+        """
+        await self.push(END)
+
+    async def outputs(self) -> AsyncIterator[Any]:
+        """
+        Son aşamanın çıktılarını akış bitene kadar döndürür.
+
+        Raises:
+            PipelineError: Bir aşama hata ile sonlandıysa.
+        """
+        sink = self._queues[-1]
+        while True:
+            item = await sink.get()
+            if item is END:
+                break
+            yield item
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._error is not None:
+            raise PipelineError("A pipeline stage failed.") from self._error
+
+    async def run(self, source: AsyncIterable[Any]) -> AsyncIterator[Any]:
+        """
+        Kaynağı arka planda hatta besler ve çıktıları üretildikçe döndürür.
+        """
+        await self.start()
+
+        async def feed():
+            try:
+                async for item in source:
+                    await self.push(item)
+                await self.close()
+            except PipelineError:
+                pass
+
+        feeder = asyncio.create_task(feed(), name="pipeline:feed")
+        try:
+            async for item in self.outputs():
+                yield item
+        finally:
+            if not feeder.done():
+                feeder.cancel()
+            await self.cancel()
+
+    async def cancel(self) -> None:
+        """
+        Tüm aşama görevlerini iptal eder (ör. çağrı kapandığında).
+        """
+        for task in self._tasks:
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _run_stage(self, stage: Stage, inbox: asyncio.Queue, outbox: asyncio.Queue) -> None:
+        try:
+            while True:
+                item = await inbox.get()
+                if item is END:
+                    async for output in stage.flush():
+                        await outbox.put(output)
+                    await outbox.put(END)
+                    return
+                async for output in stage.process(item):
+                    await outbox.put(output)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.exception("Pipeline stage '%s' failed.", stage.name)
+            self._error = exc
+            current = asyncio.current_task()
+            for task in self._tasks:
+                if task is not current:
+                    task.cancel()
+            # Okuyanın beklemede kalmaması için çıktının sonuna END konur
+            sink = self._queues[-1]
+            while sink.full():
+                sink.get_nowait()
+            sink.put_nowait(END)
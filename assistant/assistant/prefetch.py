@@ -0,0 +1,300 @@
+# assistant/prefetch.py
+
+import asyncio
+import logging
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta
+from functools import partial
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Protocol, Set, Tuple
+
+from assistant.pipeline import Intent, Stage, now
+
+logger = logging.getLogger(__name__)
+
+# Diyalog ile randevu backend'i arasında spekülatif ön getirme (prefetch) katmanı.
+# Arayan bir gün söylediği anda (kısmi transkriptten çıkan kısmi niyet) o günün randevuları ve şirketin
+# hizmet süreleri arka planda istenir; arayan konuşmasını bitirip nihai niyet geldiğinde müsaitlik kontrolü
+# hazır veriden (veya yolda olan isteğe katılarak) yapılır, sıra gecikmesinden bir backend gidiş-dönüşü düşer.
+# Sonuçlar çağrı başına önbellekte tutulur. Arayan günü değiştirirse ("yarın... yok, bugün") eski günün
+# bekleyen isteği iptal edilir; eski sonuçlar max_age'den sonra ve çağrının kendi rezervasyonundan sonra kullanılmaz.
+
+BOOKING_INTENTS = ("book", "reschedule")
+BUSINESS_HOURS = (9, 18)
+
+
+class AvailabilityBackend(Protocol):
+    """
+    Müsaitlik kontrolünün okuduğu backend arayüzü (gerçekte randevu ve hizmet kataloğu API'leri).
+    """
+
+    async def fetch_appointments(self, call_id: str, day: date) -> List[Tuple[datetime, datetime]]:
+        ...
+
+    async def fetch_service_durations(self, call_id: str) -> Dict[str, int]:
+        ...
+
+
+class CallPrefetch:
+    """
+    Bir çağrının ön getirme önbelleği: gün -> randevular isteği, bir de hizmet süreleri isteği.
+    İstekler asyncio.Task olarak tutulur; tamamlanmış bir görev önbellekteki sonuçtur.
+    """
+    __slots__ = ("days", "services", "used", "started_at")
+
+    def __init__(self):
+        self.days: "OrderedDict[date, asyncio.Task]" = OrderedDict()
+        self.services: Optional[asyncio.Task] = None
+        self.used: Set[asyncio.Task] = set() # Sonucu en az bir kez kullanılan görevler (boşa giden iş sayımı için)
+        self.started_at: Dict[asyncio.Task, float] = {}
+
+
+class SpeculativePrefetcher:
+    """
+    Çağrı başına ön getirme önbelleklerini yönetir; PrefetchStage kısmi niyetlerle besler,
+    AvailabilityCheckingBackend nihai niyette sonuçları okur.
+
+    Args:
+        backend (AvailabilityBackend): Randevu ve hizmet verilerinin okunduğu backend.
+        max_days (int): Çağrı başına önbellekte tutulan en fazla gün; en eski kullanılan gün düşer.
+        max_age (float): Bu süreden (saniye) eski sonuçlar yeniden istenir (başka çağrıların rezervasyonları).
+        today (Callable[[], date]): day_offset'in referans tarihi.
+    """
+
+    def __init__(
+        self,
+        backend: AvailabilityBackend,
+        max_days: int = 3,
+        max_age: float = 30.0,
+        today: Callable[[], date] = date.today
+    ):
+        self.backend = backend
+        self.max_days = max_days
+        self.max_age = max_age
+        self.today = today
+        self._calls: Dict[str, CallPrefetch] = {}
+        self.started = 0 # Başlatılan spekülatif istek
+        self.hits = 0 # Nihai niyette sonucu hazır bulunan istek
+        self.joins = 0 # Nihai niyette henüz yolda olan ve beklenen istek
+        self.misses = 0 # Ön getirilmemiş, nihai niyette istenen veri
+        self.cancelled = 0 # Gün değiştiği veya çağrı bittiği için iptal edilen istek
+        self.unused = 0 # Tamamlanmış ama hiç kullanılmamış istek (boşa giden backend yükü)
+
+    def day_for(self, slots: Dict[str, Any]) -> date:
+        """
+        Slotlardaki gün farkını tarihe çevirir; gün söylenmemişse bugün.
+        """
+        return self.today() + timedelta(days=slots.get("day_offset") or 0)
+
+    def observe(self, call_id: str, intent: Optional[str], slots: Dict[str, Any]) -> None:
+        """
+        Kısmi veya nihai niyete göre gerekecek verinin isteğini başlatır, artık gerekmeyenleri iptal eder.
+        Gün veya saat henüz söylenmemişse bir şey yapılmaz.
+        """
+        if intent is not None and intent not in BOOKING_INTENTS:
+            self.cancel_pending(call_id) # ör. iptal isteği: müsaitlik gerekmeyecek
+            return
+        if "day_offset" not in slots and "hour" not in slots:
+            return
+        day = self.day_for(slots)
+        self.cancel_pending(call_id, keep=day)
+        self.prefetch(call_id, day)
+
+    def prefetch(self, call_id: str, day: date) -> None:
+        """
+        Günün randevularını ve (henüz yoksa) hizmet sürelerini arka planda istemeye başlar.
+        """
+        cache = self._calls.get(call_id)
+        if cache is None:
+            cache = self._calls[call_id] = CallPrefetch()
+        if cache.services is None or self._stale(cache, cache.services):
+            cache.services = self._start(cache, self.backend.fetch_service_durations(call_id))
+        task = cache.days.get(day)
+        if task is not None and not self._stale(cache, task):
+            cache.days.move_to_end(day)
+            return
+        self._drop(cache, cache.days.pop(day, None))
+        cache.days[day] = self._start(cache, self.backend.fetch_appointments(call_id, day))
+        while len(cache.days) > self.max_days:
+            _, oldest = cache.days.popitem(last=False)
+            self._drop(cache, oldest)
+
+    async def appointments(self, call_id: str, day: date) -> List[Tuple[datetime, datetime]]:
+        """
+        Günün randevularını önbellekten, yolda olan isteği bekleyerek veya doğrudan backend'den döndürür.
+        """
+        cache = self._calls.get(call_id)
+        task = cache.days.get(day) if cache is not None else None
+        fetch = partial(self.backend.fetch_appointments, call_id, day)
+        if task is None or self._stale(cache, task):
+            self.misses += 1
+            return await fetch()
+        cache.days.move_to_end(day)
+        return await self._result(cache, task, fetch)
+
+    async def service_durations(self, call_id: str) -> Dict[str, int]:
+        """
+        Şirketin hizmet sürelerini (dakika) önbellekten veya backend'den döndürür.
+        """
+        cache = self._calls.get(call_id)
+        task = cache.services if cache is not None else None
+        fetch = partial(self.backend.fetch_service_durations, call_id)
+        if task is None or self._stale(cache, task):
+            self.misses += 1
+            return await fetch()
+        return await self._result(cache, task, fetch)
+
+    def invalidate(self, call_id: str, day: date) -> None:
+        """
+        Günün önbellekteki randevularını düşürür (ör. bu çağrıda o güne rezervasyon yapıldıktan sonra).
+        """
+        cache = self._calls.get(call_id)
+        if cache is not None:
+            self._drop(cache, cache.days.pop(day, None))
+
+    def cancel_pending(self, call_id: str, keep: Optional[date] = None) -> None:
+        """
+        Çağrının keep dışındaki günler için bekleyen isteklerini iptal eder; tamamlanmış sonuçlar kalır.
+        """
+        cache = self._calls.get(call_id)
+        if cache is None:
+            return
+        for day in [day for day, task in cache.days.items() if day != keep and not task.done()]:
+            self._drop(cache, cache.days.pop(day))
+
+    def close(self, call_id: str) -> None:
+        """
+        Çağrı bittiğinde bekleyen istekleri iptal eder ve önbelleği bırakır.
+        """
+        cache = self._calls.pop(call_id, None)
+        if cache is None:
+            return
+        for task in list(cache.days.values()) + [cache.services]:
+            self._drop(cache, task)
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "calls": len(self._calls),
+            "started": self.started,
+            "hits": self.hits,
+            "joins": self.joins,
+            "misses": self.misses,
+            "cancelled": self.cancelled,
+            "unused": self.unused,
+        }
+
+    def _start(self, cache: CallPrefetch, coroutine: Awaitable) -> asyncio.Task:
+        task = asyncio.ensure_future(coroutine)
+        task.add_done_callback(_retrieve_exception)
+        cache.started_at[task] = now()
+        self.started += 1
+        return task
+
+    def _stale(self, cache: CallPrefetch, task: asyncio.Task) -> bool:
+        return task.done() and (task.cancelled() or task.exception() is not None or now() - cache.started_at[task] > self.max_age)
+
+    def _drop(self, cache: CallPrefetch, task: Optional[asyncio.Task]) -> None:
+        if task is None:
+            return
+        if not task.done():
+            task.cancel()
+            self.cancelled += 1
+        elif task not in cache.used and not task.cancelled():
+            self.unused += 1
+        cache.used.discard(task)
+        cache.started_at.pop(task, None)
+
+    async def _result(self, cache: CallPrefetch, task: asyncio.Task, fetch: Callable[[], Awaitable]) -> Any:
+        if task.done():
+            self.hits += 1
+        else:
+            self.joins += 1
+        cache.used.add(task)
+        try:
+            # shield: bekleyen iptal edilirse (ör. araya girme) ortak istek diğer bekleyenler için sürer
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.cancelled():
+                raise
+        except Exception as exc:
+            logger.debug("Prefetch failed (%s); fetching again.", exc)
+        return await fetch()
+
+
+def _retrieve_exception(task: asyncio.Task) -> None:
+    # Kimsenin beklemediği başarısız ön getirmeler "exception was never retrieved" uyarısı üretmesin
+    if not task.cancelled():
+        task.exception()
+
+
+class PrefetchStage(Stage):
+    """
+    NLU ile rezervasyon aşaması arasına girer: kısmi ve nihai niyetleri ön getiriciye bildirir,
+    mesajları değiştirmeden iletir. Akış bittiğinde gördüğü çağrıların önbelleklerini kapatır.
+    """
+    name = "prefetch"
+
+    def __init__(self, prefetcher: SpeculativePrefetcher):
+        self.prefetcher = prefetcher
+        self._calls: Set[str] = set()
+
+    async def process(self, item: Any) -> AsyncIterator[Any]:
+        if isinstance(item, Intent):
+            self._calls.add(item.turn.call_id)
+            self.prefetcher.observe(item.turn.call_id, item.name, item.slots)
+        yield item
+
+    async def flush(self) -> AsyncIterator[Any]:
+        for call_id in self._calls:
+            self.prefetcher.close(call_id)
+        self._calls.clear()
+        return
+        yield  # pragma: no cover
+
+
+class AvailabilityCheckingBackend:
+    """
+    Rezervasyon isteklerini backend'e iletmeden önce müsaitliği kontrol eden sarmalayıcı.
+    Saat doluysa rezervasyon yapılmaz, aynı gün en yakın boş saat önerilir. Randevular ve hizmet süreleri
+    ön getiriciden okunur; ön getirme yapılmadıysa aynı veriler o anda istenir.
+    """
+
+    def __init__(self, backend: Any, prefetcher: SpeculativePrefetcher, default_duration: int = 30, step_minutes: int = 15):
+        self.backend = backend
+        self.prefetcher = prefetcher
+        self.default_duration = default_duration
+        self.step_minutes = step_minutes
+
+    async def handle(self, call_id: str, intent: Optional[str], slots: Dict[str, Any]) -> str:
+        if intent not in BOOKING_INTENTS or "hour" not in slots:
+            return await self.backend.handle(call_id, intent, slots)
+        day = self.prefetcher.day_for(slots)
+        busy, durations = await asyncio.gather(
+            self.prefetcher.appointments(call_id, day), self.prefetcher.service_durations(call_id)
+        )
+        duration = timedelta(minutes=durations.get(slots.get("service"), self.default_duration))
+        start = datetime.combine(day, time(slots["hour"], slots.get("minute", 0)))
+        if _overlaps(busy, start, start + duration):
+            free = self._next_free(busy, start, duration)
+            if free is None:
+                return "O gün için boş saat kalmadı. Başka bir gün söyleyebilir misiniz?"
+            return f"Saat {start:%H:%M} dolu. En yakın boş saat {free:%H:%M}, uygun mu?"
+        reply = await self.backend.handle(call_id, intent, slots)
+        self.prefetcher.invalidate(call_id, day) # Yeni randevu önbellekteki günü eskitti
+        return reply
+
+    def _next_free(self, busy: List[Tuple[datetime, datetime]], start: datetime, duration: timedelta) -> Optional[datetime]:
+        closing = datetime.combine(start.date(), time(BUSINESS_HOURS[1]))
+        step = timedelta(minutes=self.step_minutes)
+        candidate = start + step
+        while candidate + duration <= closing:
+            if not _overlaps(busy, candidate, candidate + duration):
+                return candidate
+            candidate += step
+        return None
+
+
+def _overlaps(busy: List[Tuple[datetime, datetime]], start: datetime, end: datetime) -> bool:
+    return any(busy_start < end and start < busy_end for busy_start, busy_end in busy)
@@ -0,0 +1,526 @@
+# assistant/sessions.py
+
+import asyncio
+import enum
+import heapq
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Protocol, Tuple
+
+from assistant.pipeline import FRAME_BYTES, FRAME_MS, SpeechEnd, SpeechStart, Turn, now
+from assistant.vad import VADBank, VADConfig
+
+logger = logging.getLogger(__name__)
+
+# Tek süreçte çok sayıda eşzamanlı çağrıyı yöneten oturum yöneticisi.
+# Çağrı başına durum küçük, __slots__'lu nesnelerde tutulur; gelen ses tamponları (VAD halka tamponları)
+# yönetici oluşturulurken kapasite kadar satırla önceden ayrılır ve çağrıya bir satır (slot) verilir.
+# Çağrı sayısından bağımsız olarak sabit sayıda görev çalışır:
+#   - tick görevi: her 20 ms'de tüm çağrıların sesini VAD'den geçirir, giden sesi çalar, zamanlayıcıları tetikler;
+#   - workers adet işçi: olayı olan oturumları sırayla işler. Bir oturumun olayları aynı anda tek işçide işlenir;
+#     her olay handler_timeout ile sınırlıdır, böylece takılan bir çağrı en fazla bir işçiyi o süre kadar tutar.
+# Kuyruklar sınırlıdır: oturum olay kuyruğu dolarsa yeni olay düşürülür ve sayılır; giden ses kuyruğu
+# max_outbound_seconds'ı aşarsa play yer açılana kadar bekler.
+
+
+class DialogState(str, enum.Enum):
+    GREETING = "greeting"
+    LISTENING = "listening"
+    THINKING = "thinking"
+    SPEAKING = "speaking"
+    ENDED = "ended"
+
+
+class TimerKind(str, enum.Enum):
+    NO_INPUT = "no_input" # Arayan belirli süre konuşmadı
+    MAX_DURATION = "max_duration" # Çağrı en uzun süreye ulaştı
+
+
+@dataclass(slots=True)
+class CallStarted:
+    """
+    Oturum açıldı (karşılama mesajı için).
+    """
+
+
+@dataclass(slots=True)
+class TimerFired:
+    kind: TimerKind
+
+
+@dataclass(slots=True)
+class PlaybackFinished:
+    """
+    Giden ses kuyruğu boşaldı (yanıtın tamamı çalındı).
+    """
+
+
+@dataclass(slots=True)
+class BookingDraft:
+    """
+    Görüşme boyunca biriken, henüz backend'e gönderilmemiş rezervasyon bilgisi.
+    """
+    intent: Optional[str] = None
+    day_offset: Optional[int] = None
+    hour: Optional[int] = None
+    minute: Optional[int] = None
+    service: Optional[str] = None
+
+    def update(self, intent: Optional[str], slots: Dict[str, Any]) -> None:
+        if intent is not None:
+            self.intent = intent
+        for name in ("day_offset", "hour", "minute", "service"):
+            if name in slots:
+                setattr(self, name, slots[name])
+
+    def slots(self) -> Dict[str, Any]:
+        return {
+            name: value
+            for name, value in (("day_offset", self.day_offset), ("hour", self.hour), ("minute", self.minute), ("service", self.service))
+            if value is not None
+        }
+
+
+class CallSession:
+    """
+    Bir çağrının durumu. Gelen sesin tamponu yöneticinin önceden ayrılmış VAD dizilerindeki slot satırıdır;
+    giden ses parçaları kopyalanmadan (memoryview) kuyruğa alınır.
+    """
+    __slots__ = (
+        "call_id", "slot", "state", "draft", "turn_count", "turn", "inbox", "scheduled", "pending_since",
+        "opened_at", "no_input_at", "hangup_at", "reprompts", "outbound", "outbound_offset", "outbound_bytes",
+        "dropped_events", "dropped_frames", "timeouts"
+    )
+
+    def __init__(self, call_id: str, slot: int, opened_at: float):
+        self.call_id = call_id
+        self.slot = slot
+        self.state = DialogState.GREETING
+        self.draft = BookingDraft()
+        self.turn_count = 0
+        self.turn: Optional[Turn] = None
+        self.inbox: Deque[Tuple[float, Any]] = deque() # (kuyruğa girdiği an, olay)
+        self.scheduled = False
+        self.pending_since = 0.0
+        self.opened_at = opened_at
+        self.no_input_at: Optional[float] = None
+        self.hangup_at: Optional[float] = None
+        self.reprompts = 0
+        self.outbound: Optional[Deque[memoryview]] = None # Çalınacak ses parçaları; yalnızca konuşurken oluşturulur
+        self.outbound_offset = 0 # İlk parçada gönderilmiş bayt sayısı
+        self.outbound_bytes = 0 # Kuyrukta bekleyen toplam bayt
+        self.dropped_events = 0
+        self.dropped_frames = 0
+        self.timeouts = 0
+
+
+class SessionLimitError(RuntimeError):
+    """
+    Yönetici kapasitesi dolduğunda yeni çağrı açılamaz.
+    """
+
+
+Handler = Callable[["SessionManager", CallSession, Any], Awaitable[None]]
+
+
+class SessionManager:
+    """
+    Çağrı oturumlarını, ortak VAD'yi, giden ses tamponlarını, zamanlayıcıları ve işçi görevlerini yönetir.
+
+    Kullanım:
+        manager = SessionManager(capacity=500, handler=DialogHandler(...), send_audio=send)
+        await manager.start()
+        session = manager.open("call-1")
+        manager.feed("call-1", pcm)  # her 20 ms'lik çerçeve geldiğinde
+        ...
+        manager.close("call-1")
+        await manager.stop()
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        handler: Handler,
+        send_audio: Optional[Callable[[str, bytes], None]] = None,
+        workers: int = 64,
+        queue_size: int = 16,
+        max_outbound_seconds: float = 30.0,
+        handler_timeout: float = 5.0,
+        no_input_timeout: float = 8.0,
+        max_call_seconds: float = 900.0,
+        vad_config: Optional[VADConfig] = None
+    ):
+        if workers < 1:
+            raise ValueError("workers must be at least 1.")
+        if queue_size < 1:
+            raise ValueError("queue_size must be at least 1.")
+        self.capacity = capacity
+        self.handler = handler
+        self.send_audio = send_audio
+        self.workers = workers
+        self.queue_size = queue_size
+        self.handler_timeout = handler_timeout
+        self.no_input_timeout = no_input_timeout
+        self.max_call_seconds = max_call_seconds
+        self.max_outbound_bytes = int(max_outbound_seconds * 1000 / FRAME_MS) * FRAME_BYTES
+
+        self.vad = VADBank(capacity, vad_config)
+        self._frame = bytearray(FRAME_BYTES) # Parça sınırına denk gelen giden çerçeveyi birleştirmek için
+        self._sessions: Dict[str, CallSession] = {}
+        self._by_slot: List[Optional[CallSession]] = [None] * capacity
+        self._speaking: Dict[str, CallSession] = {}
+        self._timers: List[Tuple[float, int, str, TimerKind]] = []
+        self._timer_seq = 0
+        self._ready: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+        # Ölçümler
+        self.scheduling_latency: Deque[float] = deque(maxlen=100_000) # Olayın kuyruğa girişinden işlenmeye başlamasına
+        self.tick_lag: Deque[float] = deque(maxlen=100_000) # Tick'in planlanan zamandan gecikmesi
+        self.handler_timeouts = 0
+
+    # --- Yaşam döngüsü ---
+
+    async def start(self) -> None:
+        if self._tasks:
+            raise RuntimeError("Session manager already started.")
+        # Sınırsız: açık oturumlar kuyruğa en fazla bir kez girer, ama kapatılan bir oturum işçi onu alana kadar
+        # kuyrukta kalır ve slotu yeni oturuma verilmiş olabilir; boyut zaten oturum sayısıyla sınırlıdır
+        self._ready = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._tick_loop(), name="sessions:tick")]
+        self._tasks += [asyncio.create_task(self._worker(), name=f"sessions:worker-{index}") for index in range(self.workers)]
+        logger.info("Session manager started: capacity=%s, workers=%s", self.capacity, self.workers)
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for call_id in list(self._sessions):
+            self.close(call_id)
+        logger.info("Session manager stopped.")
+
+    # --- Oturumlar ---
+
+    def open(self, call_id: str) -> CallSession:
+        """
+        Yeni bir çağrı oturumu açar.
+
+        Raises:
+            SessionLimitError: Kapasite doluysa.
+            ValueError: Aynı call_id ile açık bir oturum varsa.
+        """
+        if call_id in self._sessions:
+            raise ValueError(f"Session '{call_id}' is already open.")
+        try:
+            slot = self.vad.open()
+        except RuntimeError:
+            raise SessionLimitError(f"Session limit of {self.capacity} reached.")
+        session = CallSession(call_id, slot, now())
+        self._sessions[call_id] = session
+        self._by_slot[slot] = session
+        self._set_timer(session, TimerKind.MAX_DURATION, self.max_call_seconds)
+        if self._ready is not None:
+            self.post(session, CallStarted())
+        logger.debug("Session opened: %s (slot %s)", call_id, slot)
+        return session
+
+    def close(self, call_id: str) -> None:
+        session = self._sessions.pop(call_id, None)
+        if session is None:
+            return
+        session.state = DialogState.ENDED
+        session.inbox.clear()
+        self._speaking.pop(call_id, None)
+        self._by_slot[session.slot] = None
+        self.vad.close(session.slot)
+        logger.debug("Session closed: %s", call_id)
+
+    def get(self, call_id: str) -> Optional[CallSession]:
+        return self._sessions.get(call_id)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def feed(self, call_id: str, pcm: Any) -> bool:
+        """
+        Çağrıdan gelen ses çerçevelerini VAD tamponuna yazar; bir sonraki tick'te işlenir.
+        Beklemez: çağrının tamponu doluysa (çağrı geride kalmışsa) çerçeveler düşürülür.
+
+        Returns:
+            bool: Çerçeveler kabul edildiyse True.
+        """
+        session = self._sessions.get(call_id)
+        if session is None:
+            return False
+        try:
+            self.vad.write(session.slot, pcm)
+        except OverflowError:
+            session.dropped_frames += len(pcm) // FRAME_BYTES
+            return False
+        return True
+
+    def post(self, session: CallSession, event: Any) -> bool:
+        """
+        Oturuma olay ekler ve oturumu işlenmek üzere sıraya koyar.
+        Olay kuyruğu doluysa olay düşürülür.
+
+        Returns:
+            bool: Olay kabul edildiyse True.
+        """
+        if session.state is DialogState.ENDED:
+            return False
+        if len(session.inbox) >= self.queue_size:
+            session.dropped_events += 1
+            logger.warning("Session %s inbox is full; dropping %s.", session.call_id, type(event).__name__)
+            return False
+        at = now()
+        session.inbox.append((at, event))
+        if not session.scheduled:
+            session.pending_since = at
+            self._ready.put_nowait(session)
+            session.scheduled = True # Kuyruğa girdikten sonra; aksi halde oturum bir daha sıraya konmaz
+        return True
+
+    # --- Giden ses ---
+
+    async def play(self, session: CallSession, pcm: Any) -> None:
+        """
+        Yanıt sesini (8 kHz, 16-bit PCM) çağrının giden ses kuyruğuna ekler; kopyalanmaz, her tick'te bir
+        çerçeve gönderilir. Kuyrukta max_outbound_seconds'tan fazla ses varsa yer açılana kadar bekler.
+        Kuyruk boşalınca oturuma PlaybackFinished gelir.
+        """
+        view = memoryview(pcm).cast("B")
+        while session.outbound_bytes >= self.max_outbound_bytes and session.state is not DialogState.ENDED:
+            await asyncio.sleep(FRAME_MS / 1000)
+        if session.state is DialogState.ENDED or not len(view):
+            return
+        if session.outbound is None:
+            session.outbound = deque()
+        session.outbound.append(view)
+        session.outbound_bytes += len(view)
+        session.state = DialogState.SPEAKING
+        self._speaking[session.call_id] = session
+
+    def stop_playback(self, session: CallSession) -> None:
+        """
+        Çalınmakta olan yanıtı keser (arayan araya girdiğinde).
+        """
+        session.outbound = None
+        session.outbound_offset = session.outbound_bytes = 0
+        self._speaking.pop(session.call_id, None)
+
+    def _next_frame(self, session: CallSession) -> bytes:
+        # Kuyruğun başından bir çerçeve alır; parça sınırındaysa çerçeve ara tamponda birleştirilir
+        chunks, offset = session.outbound, session.outbound_offset
+        head = chunks[0]
+        if len(head) - offset >= FRAME_BYTES:
+            frame = bytes(head[offset:offset + FRAME_BYTES])
+            offset += FRAME_BYTES
+        else:
+            frame_buffer, filled = self._frame, 0
+            while chunks and filled < FRAME_BYTES:
+                head = chunks[0]
+                count = min(len(head) - offset, FRAME_BYTES - filled)
+                frame_buffer[filled:filled + count] = head[offset:offset + count]
+                filled += count
+                offset += count
+                if offset == len(head) and len(chunks) > 1:
+                    chunks.popleft()
+                    offset = 0
+            frame_buffer[filled:] = bytes(FRAME_BYTES - filled) # Son çerçeve sessizlikle tamamlanır
+            frame = bytes(frame_buffer)
+        if offset == len(chunks[0]):
+            chunks.popleft()
+            offset = 0
+        session.outbound_offset = offset
+        session.outbound_bytes = max(0, session.outbound_bytes - FRAME_BYTES)
+        return frame
+
+    # --- Zamanlayıcılar ---
+
+    def _set_timer(self, session: CallSession, kind: TimerKind, seconds: float) -> None:
+        deadline = now() + seconds
+        if kind is TimerKind.NO_INPUT:
+            session.no_input_at = deadline
+        else:
+            session.hangup_at = deadline
+        self._timer_seq += 1
+        heapq.heappush(self._timers, (deadline, self._timer_seq, session.call_id, kind))
+
+    def set_no_input_timer(self, session: CallSession) -> None:
+        self._set_timer(session, TimerKind.NO_INPUT, self.no_input_timeout)
+
+    def clear_no_input_timer(self, session: CallSession) -> None:
+        # Yığındaki kayıt, tetiklendiğinde oturumdaki değerle eşleşmeyeceği için yok sayılır
+        session.no_input_at = None
+
+    def _fire_timers(self, current: float) -> None:
+        timers = self._timers
+        while timers and timers[0][0] <= current:
+            deadline, _, call_id, kind = heapq.heappop(timers)
+            session = self._sessions.get(call_id)
+            if session is None:
+                continue
+            active = session.no_input_at if kind is TimerKind.NO_INPUT else session.hangup_at
+            if active != deadline:
+                continue
+            if kind is TimerKind.NO_INPUT:
+                session.no_input_at = None
+            else:
+                session.hangup_at = None
+            self.post(session, TimerFired(kind))
+
+    # --- Görevler ---
+
+    def tick(self) -> None:
+        """
+        Bir 20 ms'lik adım: VAD olaylarını oturumlara dağıtır, giden sesten birer çerçeve gönderir, zamanlayıcıları tetikler.
+        """
+        current = now()
+        frame_seconds = FRAME_MS / 1000
+        for slot, event in self.vad.step():
+            session = self._by_slot[slot]
+            if session is None:
+                continue
+            # Olay çerçevesinin başlangıç anı (VAD kararı onset/hangover kadar geriden gelir)
+            at = current - int(self.vad.frames_seen[slot] - event.frame) * frame_seconds
+            if event.kind == "start":
+                session.turn = Turn(session.call_id, session.turn_count, speech_start_at=at)
+                session.turn_count += 1
+                self.post(session, SpeechStart(session.turn))
+            elif session.turn is not None:
+                session.turn.speech_end_at = at
+                self.post(session, SpeechEnd(session.turn))
+                session.turn = None
+
+        finished: List[CallSession] = []
+        for session in self._speaking.values():
+            if session.outbound:
+                frame = self._next_frame(session)
+                if self.send_audio is not None:
+                    self.send_audio(session.call_id, frame)
+            if not session.outbound:
+                finished.append(session)
+        for session in finished:
+            del self._speaking[session.call_id]
+            session.outbound = None
+            session.outbound_offset = session.outbound_bytes = 0
+            self.post(session, PlaybackFinished())
+
+        self._fire_timers(current)
+
+    async def _tick_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        interval = FRAME_MS / 1000
+        next_at = loop.time()
+        while True:
+            next_at += interval
+            delay = next_at - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            lag = loop.time() - next_at
+            self.tick_lag.append(lag)
+            if lag > 5 * interval:
+                # Çok geride kalındıysa kaçırılan tick'ler toplu yapılmaz; VAD bekleyen çerçeveleri bir sonraki adımda işler
+                next_at = loop.time()
+            try:
+                self.tick()
+            except Exception:
+                logger.exception("Session manager tick failed.")
+
+    async def _worker(self) -> None:
+        while True:
+            session: CallSession = await self._ready.get()
+            self.scheduling_latency.append(now() - session.pending_since)
+            # Adil paylaşım: bir seferde en fazla birkaç olay, ardından oturum sıranın sonuna geçer
+            for _ in range(4):
+                if not session.inbox or session.state is DialogState.ENDED:
+                    break
+                _, event = session.inbox.popleft()
+                try:
+                    await asyncio.wait_for(self.handler(self, session, event), timeout=self.handler_timeout)
+                except asyncio.TimeoutError:
+                    session.timeouts += 1
+                    self.handler_timeouts += 1
+                    logger.warning("Session %s handler timed out on %s.", session.call_id, type(event).__name__)
+                except Exception:
+                    logger.exception("Session %s handler failed on %s.", session.call_id, type(event).__name__)
+            session.scheduled = False
+            if session.inbox and session.state is not DialogState.ENDED:
+                session.pending_since = session.inbox[0][0]
+                self._ready.put_nowait(session)
+                session.scheduled = True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sessions": len(self._sessions),
+            "speaking": len(self._speaking),
+            "handler_timeouts": self.handler_timeouts,
+            "dropped_events": sum(session.dropped_events for session in self._sessions.values()),
+            "dropped_frames": sum(session.dropped_frames for session in self._sessions.values()),
+        }
+
+
+class Transcriber(Protocol):
+    async def transcribe(self, call_id: str, turn: Turn) -> str:
+        ...
+
+
+class DialogHandler:
+    """
+    Oturum olaylarını diyalog durumuna göre işleyen varsayılan işleyici:
+    konuşma başlayınca dinlemeye geçer (yanıt çalıyorsa keser), konuşma bitince transkripti alır,
+    niyeti taslağa işler, backend'den yanıtı alır ve sentezlenen sesi çalar; sessizlikte tekrar sorar.
+    """
+
+    def __init__(
+        self,
+        transcriber: Transcriber,
+        backend: Any,
+        synthesize: Callable[[str], bytes],
+        extract: Callable[[str], tuple],
+        greeting: str = "Merhaba, randevu asistanına hoş geldiniz. Size nasıl yardımcı olabilirim?",
+        reprompt: str = "Sizi duyamadım. Randevu için gün ve saat söyleyebilirsiniz.",
+        max_reprompts: int = 2
+    ):
+        self.transcriber = transcriber
+        self.backend = backend
+        self.synthesize = synthesize
+        self.extract = extract
+        self.greeting = greeting
+        self.reprompt = reprompt
+        self.max_reprompts = max_reprompts
+
+    async def __call__(self, manager: SessionManager, session: CallSession, event: Any) -> None:
+        if isinstance(event, CallStarted):
+            await manager.play(session, self.synthesize(self.greeting))
+        elif isinstance(event, SpeechStart):
+            if session.state is DialogState.SPEAKING:
+                manager.stop_playback(session)
+            manager.clear_no_input_timer(session)
+            session.state = DialogState.LISTENING
+        elif isinstance(event, SpeechEnd):
+            session.state = DialogState.THINKING
+            text = await self.transcriber.transcribe(session.call_id, event.turn)
+            event.turn.final_transcript_at = now()
+            intent, slots = self.extract(text)
+            session.draft.update(intent, slots)
+            event.turn.final_intent_at = now()
+            reply = await self.backend.handle(session.call_id, session.draft.intent, session.draft.slots())
+            event.turn.reply_at = now()
+            session.reprompts = 0
+            audio = self.synthesize(reply)
+            event.turn.first_audio_at = now()
+            await manager.play(session, audio)
+        elif isinstance(event, PlaybackFinished):
+            if session.state is DialogState.SPEAKING:
+                session.state = DialogState.LISTENING
+                manager.set_no_input_timer(session)
+        elif isinstance(event, TimerFired):
+            if event.kind is TimerKind.MAX_DURATION or session.reprompts >= self.max_reprompts:
+                manager.close(session.call_id)
+                return
+            session.reprompts += 1
+            await manager.play(session, self.synthesize(self.reprompt))
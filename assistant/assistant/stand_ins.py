@@ -0,0 +1,390 @@
+# assistant/stand_ins.py
+
+import asyncio
+import math
+import random
+import re
+from array import array
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional, Protocol, Sequence, Tuple
+
+from assistant.pipeline import (
+    FRAME_BYTES, FRAME_MS, FRAME_SAMPLES, SAMPLE_RATE,
+    AudioFrame, AudioOut, Intent, Reply, SpeechChunk, SpeechEnd, SpeechStart, Stage, Transcript, Turn, now
+)
+from assistant.prefetch import AvailabilityCheckingBackend, PrefetchStage, SpeculativePrefetcher
+from assistant.tts import BargeInStage, StreamingSynthesizer
+from assistant.vad import VADStage
+
+# Hattın uçtan uca gecikmesini çevrimdışı ölçmek için yerel yedek (stand-in) aşamalar.
+# Gerçek konuşma tanıma / TTS servisleri yerine gecikmeleri ayarlanabilir, senaryoya bağlı
+# aşamalar kullanılır; hat yapısı ve aşama arayüzü gerçek servislerle aynıdır.
+
+
+def _tone_frame(amplitude: int, frequency: float = 440.0) -> bytes:
+    samples = array("h", (int(amplitude * math.sin(2 * math.pi * frequency * n / SAMPLE_RATE)) for n in range(FRAME_SAMPLES)))
+    return samples.tobytes()
+
+
+SPEECH_FRAME = _tone_frame(8000) # Konuşma yerine geçen ton
+SILENCE_FRAME = _tone_frame(40) # Hat gürültüsü seviyesinde sessizlik
+
+
+class ScriptedCaller:
+    """
+    Önceden yazılmış cümleleri söyleyen sahte arayan.
+    Her cümle için kelime sayısıyla orantılı süre boyunca konuşma, ardından pause saniye sessizlik
+    çerçevesi üretir; realtime=True iken çerçeveler gerçek telefon hızında (20 ms'de bir) gönderilir.
+    """
+
+    def __init__(
+        self,
+        call_id: str,
+        utterances: Sequence[str],
+        words_per_second: float = 2.5,
+        pause: float = 1.5,
+        realtime: bool = True
+    ):
+        self.call_id = call_id
+        self.utterances = list(utterances)
+        self.words_per_second = words_per_second
+        self.pause = pause
+        self.realtime = realtime
+
+    def speech_frames(self, utterance: str) -> int:
+        seconds = len(utterance.split()) / self.words_per_second
+        return max(1, round(seconds * 1000 / FRAME_MS))
+
+    async def frames(self) -> AsyncIterator[AudioFrame]:
+        seq = 0
+        started = now()
+        silence_frames = round(self.pause * 1000 / FRAME_MS)
+        for utterance in self.utterances:
+            pattern = [SPEECH_FRAME] * self.speech_frames(utterance) + [SILENCE_FRAME] * silence_frames
+            for pcm in pattern:
+                if self.realtime:
+                    # Çerçeveler birikmeden, başlangıca göre sabit aralıklarla gönderilir
+                    delay = started + seq * FRAME_MS / 1000 - now()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                yield AudioFrame(self.call_id, seq, pcm)
+                seq += 1
+
+    def __aiter__(self) -> AsyncIterator[AudioFrame]:
+        return self.frames()
+
+
+class ScriptedRecognizer(Stage):
+    """
+    Senaryodaki metni ses süresiyle orantılı olarak ortaya çıkaran sahte konuşma tanıma.
+
+    streaming=True: Konuşma sürerken her kelimenin sesi tamamlandıkça kısmi transkript üretir;
+        konuşma bittiğinde yalnızca final_delay kadar (son kelimenin kesinleşmesi) bekler.
+    streaming=False: Tüm sesi toplar ve konuşma bittikten sonra ses süresi * real_time_factor kadar
+        çözümleme yapıp tek bir sonuç üretir (toplu / batch tanıma).
+    """
+    name = "asr"
+
+    def __init__(
+        self,
+        scripts: Dict[str, Sequence[str]],
+        words_per_second: float = 2.5,
+        streaming: bool = True,
+        final_delay: float = 0.05,
+        real_time_factor: float = 0.25
+    ):
+        self.scripts = scripts
+        self.words_per_second = words_per_second
+        self.streaming = streaming
+        self.final_delay = final_delay
+        self.real_time_factor = real_time_factor
+        self._frames = 0
+        self._emitted = 0
+
+    def _words(self, turn: Turn) -> List[str]:
+        script = self.scripts.get(turn.call_id, ())
+        return script[turn.turn_id].split() if turn.turn_id < len(script) else []
+
+    async def process(self, item: Any) -> AsyncIterator[Any]:
+        if isinstance(item, SpeechStart):
+            self._frames = 0
+            self._emitted = 0
+        elif isinstance(item, SpeechChunk):
+            self._frames += len(item.pcm) // FRAME_BYTES
+            if self.streaming:
+                words = self._words(item.turn)
+                heard = min(len(words), int(self._frames * FRAME_MS * self.words_per_second / 1000 + 1e-9))
+                if heard > self._emitted:
+                    self._emitted = heard
+                    yield Transcript(item.turn, " ".join(words[:heard]), is_final=False)
+            return # Ses parçaları bu aşamada tüketilir
+        elif isinstance(item, SpeechEnd):
+            if self.streaming:
+                await asyncio.sleep(self.final_delay)
+            else:
+                await asyncio.sleep(self._frames * FRAME_MS / 1000 * self.real_time_factor)
+            item.turn.final_transcript_at = now()
+            yield Transcript(item.turn, " ".join(self._words(item.turn)), is_final=True)
+        yield item
+
+
+class ScriptedTranscriber:
+    """
+    Oturum yöneticisi için sahte konuşma tanıma: sıranın senaryodaki metnini delay kadar bekleyip döndürür.
+    """
+
+    def __init__(self, scripts: Dict[str, Sequence[str]], delay: float = 0.05, default: Sequence[str] = ()):
+        self.scripts = scripts
+        self.delay = delay
+        self.default = default
+
+    async def transcribe(self, call_id: str, turn: Turn) -> str:
+        await asyncio.sleep(self.delay)
+        script = self.scripts.get(call_id, self.default)
+        return script[turn.turn_id % len(script)] if script else ""
+
+
+_INTENT_KEYWORDS = {
+    "cancel": ("iptal", "cancel"),
+    "reschedule": ("değiştir", "ertele", "kaydır", "reschedule", "move"),
+    "book": ("randevu", "ayarla", "book", "appointment"),
+}
+_DAY_WORDS = {"bugün": 0, "today": 0, "yarın": 1, "tomorrow": 1}
+_HOUR_WORDS = {
+    "bir": 1, "iki": 2, "üç": 3, "dört": 4, "beş": 5, "altı": 6, "yedi": 7, "sekiz": 8,
+    "dokuz": 9, "on": 10, "onbir": 11, "oniki": 12
+}
+_TIME_PATTERN = re.compile(r"^(\d{1,2})(?:[:.](\d{2}))?$")
+
+
+def extract_intent(text: str) -> tuple:
+    """
+    Anahtar kelimelerle niyet ve slotları (day_offset, hour, minute) çıkarır.
+
+    Returns:
+        tuple: (niyet adı veya None, slot sözlüğü)
+    """
+    words = text.lower().replace(",", " ").split()
+    name = None
+    for candidate, keywords in _INTENT_KEYWORDS.items():
+        if any(word.startswith(keywords) for word in words):
+            name = candidate
+            break
+    slots: Dict[str, Any] = {}
+    for index, word in enumerate(words):
+        if word in _DAY_WORDS:
+            slots["day_offset"] = _DAY_WORDS[word]
+        match = _TIME_PATTERN.match(word)
+        if match:
+            slots["hour"] = int(match.group(1))
+            slots["minute"] = int(match.group(2) or 0)
+        elif word in _HOUR_WORDS and index + 1 < len(words) and words[index + 1].startswith(("buçuk", "buçuğ")):
+            slots["hour"] = _HOUR_WORDS[word]
+            slots["minute"] = 30
+    return name, slots
+
+
+class KeywordIntentStage(Stage):
+    """
+    Transkriptlerden anahtar kelime kurallarıyla niyet/slot çıkaran sahte NLU aşaması.
+    Her çözümleme parse_delay kadar sürer (model çağrısı yerine). Kısmi transkriptler de çözümlenir;
+    son kısmi transkript nihai metinle aynıysa sonucu yeniden kullanılır ve nihai niyet beklemeden üretilir.
+    """
+    name = "nlu"
+
+    def __init__(self, parse_delay: float = 0.03):
+        self.parse_delay = parse_delay
+        self._last_text: Optional[str] = None
+        self._last_result: Optional[tuple] = None
+
+    async def _parse(self, text: str) -> tuple:
+        if text == self._last_text:
+            return self._last_result
+        await asyncio.sleep(self.parse_delay)
+        self._last_text, self._last_result = text, extract_intent(text)
+        return self._last_result
+
+    async def process(self, item: Any) -> AsyncIterator[Any]:
+        if not isinstance(item, Transcript):
+            yield item
+            return
+        name, slots = await self._parse(item.text)
+        if item.is_final:
+            item.turn.final_intent_at = now()
+            self._last_text = self._last_result = None
+        yield Intent(item.turn, name, dict(slots), item.is_final)
+
+
+class BookingBackend(Protocol):
+    """
+    Rezervasyon aşamasının kullandığı backend arayüzü (gerçekte randevu API'si).
+    """
+
+    async def handle(self, call_id: str, intent: Optional[str], slots: Dict[str, Any]) -> str:
+        ...
+
+
+class InMemoryBookingBackend:
+    """
+    Randevu API'si yerine geçen, istekleri latency kadar bekleyip bellekte işleyen backend.
+    """
+
+    def __init__(self, latency: float = 0.08):
+        self.latency = latency
+        self.bookings: Dict[str, Dict[str, Any]] = {}
+
+    async def handle(self, call_id: str, intent: Optional[str], slots: Dict[str, Any]) -> str:
+        await asyncio.sleep(self.latency)
+        if intent is None:
+            return "Sizi anlayamadım. Randevu almak, değiştirmek veya iptal etmek için söyleyebilirsiniz."
+        if intent == "cancel":
+            if self.bookings.pop(call_id, None) is None:
+                return "Adınıza kayıtlı bir randevu bulamadım."
+            return "Randevunuz iptal edildi."
+        if "hour" not in slots:
+            return "Hangi gün ve saatte gelmek istersiniz?"
+        booking = self.bookings.setdefault(call_id, {})
+        booking.update(slots)
+        day = "Bugün" if booking.get("day_offset", 0) == 0 else "Yarın"
+        verb = "güncellendi" if intent == "reschedule" else "oluşturuldu"
+        return f"{day} saat {booking['hour']:02d}:{booking.get('minute', 0):02d} için randevunuz {verb}."
+
+
+class InMemoryAvailabilityBackend:
+    """
+    Randevu listesi ve hizmet kataloğu API'leri yerine geçen backend. Her çağrının şirketi için her gün
+    tohumlu rastgele dolu aralıklar üretir; istekler appointments_latency / services_latency kadar sürer.
+    fetches, istenen veri türlerini sayar (boşa giden ön getirmeleri görmek için).
+    """
+
+    SERVICES = {"saç kesimi": 30, "sakal tıraşı": 20, "saç boyama": 90, "manikür": 45}
+
+    def __init__(self, appointments_latency: float = 0.15, services_latency: float = 0.08, per_day: int = 8, seed: int = 0):
+        self.appointments_latency = appointments_latency
+        self.services_latency = services_latency
+        self.per_day = per_day
+        self.seed = seed
+        self.fetches: Counter = Counter()
+
+    async def fetch_appointments(self, call_id: str, day: date) -> List[Tuple[datetime, datetime]]:
+        self.fetches["appointments"] += 1
+        await asyncio.sleep(self.appointments_latency)
+        rng = random.Random(f"{self.seed}:{call_id}:{day.isoformat()}")
+        starts = sorted(rng.sample(range(9 * 4, 17 * 4), self.per_day))
+        return [
+            (datetime.combine(day, time(quarter // 4, quarter % 4 * 15)), datetime.combine(day, time(quarter // 4, quarter % 4 * 15)) + timedelta(minutes=30))
+            for quarter in starts
+        ]
+
+    async def fetch_service_durations(self, call_id: str) -> Dict[str, int]:
+        self.fetches["services"] += 1
+        await asyncio.sleep(self.services_latency)
+        return dict(self.SERVICES)
+
+
+class BookingActionStage(Stage):
+    """
+    Nihai niyetleri backend'e ileten ve yanıt metnini üreten aşama; kısmi niyetler tüketilir.
+    """
+    name = "booking"
+
+    def __init__(self, backend: BookingBackend):
+        self.backend = backend
+
+    async def process(self, item: Any) -> AsyncIterator[Any]:
+        if not isinstance(item, Intent):
+            yield item
+            return
+        if not item.is_final:
+            return
+        text = await self.backend.handle(item.turn.call_id, item.name, item.slots)
+        item.turn.reply_at = now()
+        yield Reply(item.turn, text)
+
+
+class StandInSynthesizer(Stage):
+    """
+    Sahte metinden sese (TTS) aşaması.
+    Yanıtın tamamı first_chunk_delay + karakter başına char_delay sürede sentezlenir ve
+    chunk_ms uzunluğunda ses parçaları halinde gönderilir.
+    """
+    name = "tts"
+
+    def __init__(self, first_chunk_delay: float = 0.05, char_delay: float = 0.001, chunk_ms: int = 200, ms_per_char: int = 60):
+        self.first_chunk_delay = first_chunk_delay
+        self.char_delay = char_delay
+        self.chunk_ms = chunk_ms
+        self.ms_per_char = ms_per_char
+
+    async def process(self, item: Any) -> AsyncIterator[Any]:
+        if not isinstance(item, Reply):
+            yield item
+            return
+        await asyncio.sleep(self.first_chunk_delay + self.char_delay * len(item.text))
+        total_ms = max(self.chunk_ms, len(item.text) * self.ms_per_char)
+        chunk = SILENCE_FRAME * (self.chunk_ms // FRAME_MS)
+        chunks = math.ceil(total_ms / self.chunk_ms)
+        item.turn.first_audio_at = now()
+        for index in range(chunks):
+            yield AudioOut(item.turn, chunk, is_last=index == chunks - 1)
+
+
+def stand_in_speech(text: str, ms_per_char: int = 60) -> bytes:
+    """
+    Yanıt metninin uzunluğuyla orantılı sürede sahte sentezlenmiş ses (8 kHz, 16-bit PCM).
+    """
+    return SILENCE_FRAME * max(1, len(text) * ms_per_char // FRAME_MS)
+
+
+class StandInChunkSynthesizer:
+    """
+    Sahte parça sentezleyici (StreamingSynthesizer ile kullanılır).
+    Her istek request_delay + karakter başına char_delay sürer; StandInSynthesizer ile aynı maliyet modeli
+    parça başına uygulanır. İptal edilen istekler sayılır.
+    """
+
+    def __init__(self, request_delay: float = 0.05, char_delay: float = 0.001, ms_per_char: int = 60):
+        self.request_delay = request_delay
+        self.char_delay = char_delay
+        self.ms_per_char = ms_per_char
+        self.requests = 0
+        self.cancelled = 0
+
+    async def synthesize(self, text: str) -> bytes:
+        self.requests += 1
+        try:
+            await asyncio.sleep(self.request_delay + self.char_delay * len(text))
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return stand_in_speech(text, self.ms_per_char)
+
+
+def stand_in_stages(
+    scripts: Dict[str, Sequence[str]],
+    streaming: bool = True,
+    backend: Optional[BookingBackend] = None,
+    words_per_second: float = 2.5,
+    prefetcher: Optional[SpeculativePrefetcher] = None,
+    synthesizer: Optional[StreamingSynthesizer] = None
+) -> List[Stage]:
+    """
+    Tek bir çağrı için VAD ve yedek aşamalardan oluşan tam hattı (VAD -> ASR -> NLU -> rezervasyon -> TTS) kurar.
+    prefetcher verilirse NLU ile rezervasyon arasına ön getirme aşaması eklenir ve rezervasyonlar
+    müsaitlik kontrolünden geçer. synthesizer verilirse yanıtlar onunla akışlı sentezlenir ve
+    VAD'nin ardına araya girme (barge-in) aşaması eklenir.
+    """
+    backend = backend or InMemoryBookingBackend()
+    stages: List[Stage] = [VADStage()]
+    if synthesizer is not None:
+        stages.append(BargeInStage(synthesizer))
+    stages += [
+        ScriptedRecognizer(scripts, words_per_second=words_per_second, streaming=streaming),
+        KeywordIntentStage(),
+    ]
+    if prefetcher is not None:
+        stages.append(PrefetchStage(prefetcher))
+        backend = AvailabilityCheckingBackend(backend, prefetcher)
+    stages += [BookingActionStage(backend), synthesizer or StandInSynthesizer()]
+    return stages
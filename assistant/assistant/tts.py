@@ -0,0 +1,256 @@
+# assistant/tts.py
+
+import asyncio
+import logging
+import re
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Protocol
+
+from assistant.pipeline import FRAME_BYTES, FRAME_MS, AudioOut, Reply, SpeechStart, Stage, now
+
+logger = logging.getLogger(__name__)
+
+# Akışlı metinden sese (TTS).
+# Yanıt metni cümle ve yan cümle sınırlarından parçalara bölünür; ilk parça kısa tutulur ki arayan ilk sesi
+# yanıtın geri kalanı sentezlenmeden duysun. Parçalar sırayla, en fazla lookahead kadarı aynı anda
+# sentezlenir: bir parça çalınırken sonraki hazırlanır. Arayan araya girdiğinde (barge-in) BargeInStage
+# VAD'nin hemen ardından sentezleyiciyi uyarır; yoldaki tüm sentez istekleri iptal edilir ve kalan ses üretilmez.
+
+SENTENCE_MARKS = ".!?…"
+# Sonundaki nokta cümle bitirmeyen kısaltmalar (küçük harfle)
+ABBREVIATIONS = frozenset(("dr", "prof", "doç", "av", "sn", "bkz", "vb", "vs", "no", "tel", "dk", "mr", "mrs", "ms", "st", "yy"))
+
+_BOUNDARY = re.compile(r"([.!?…]+|[,;:])(?=\s|$)")
+_WORD_BEFORE = re.compile(r"(\w+)$")
+
+
+def _sentences(text: str) -> List[List[str]]:
+    """
+    Metni cümlelere, her cümleyi yan cümlelere böler (noktalama parçada kalır).
+    Kısaltmalardan ve sayılardan sonraki noktalar ("Dr.", "10.30") sınır sayılmaz.
+    """
+    sentences: List[List[str]] = []
+    clauses: List[str] = []
+    start = 0
+    for match in _BOUNDARY.finditer(text):
+        mark = match.group(1)
+        if mark[0] == ".":
+            word = _WORD_BEFORE.search(text, 0, match.start())
+            if word is not None and word.group(1).lower() in ABBREVIATIONS:
+                continue
+        piece = text[start:match.end()].strip()
+        start = match.end()
+        if piece:
+            clauses.append(piece)
+        if mark[0] in SENTENCE_MARKS and clauses:
+            sentences.append(clauses)
+            clauses = []
+    tail = text[start:].strip()
+    if tail:
+        clauses.append(tail)
+    if clauses:
+        sentences.append(clauses)
+    return sentences
+
+
+def _pack(pieces: List[str], max_chars: int) -> List[str]:
+    # Parçaları max_chars'ı aşmadan birleştirir; tek başına uzun olan parça kelime sınırından bölünür
+    chunks: List[str] = []
+    current = ""
+    for piece in pieces:
+        words = [piece] if len(piece) <= max_chars else piece.split()
+        for word in words:
+            candidate = f"{current} {word}" if current else word
+            if len(candidate) <= max_chars or not current:
+                current = candidate
+            else:
+                chunks.append(current)
+                current = word
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def split_for_speech(text: str, first_min_chars: int = 12, max_chars: int = 120) -> List[str]:
+    """
+    Yanıtı sentezlenecek parçalara böler.
+
+    İlk parça ilk yan cümledir (first_min_chars'tan kısaysa sonraki yan cümlelerle birleştirilir);
+    böylece ilk ses mümkün olan en kısa metinden üretilir. Sonraki parçalar tam cümlelerdir; max_chars'ı
+    aşan cümleler yan cümle, gerekirse kelime sınırlarından bölünür.
+
+    Args:
+        text (str): Yanıt metni.
+        first_min_chars (int): İlk parçanın en az uzunluğu (tek kelimelik "Tamam," gibi parçalar birleştirilir).
+        max_chars (int): Bir parçanın en fazla uzunluğu.
+
+    Returns:
+        List[str]: Konuşma sırasıyla parçalar.
+    """
+    sentences = _sentences(text)
+    if not sentences:
+        return []
+    first = sentences[0]
+    head = ""
+    taken = 0
+    while taken < len(first) and (len(head) < first_min_chars or not head):
+        head = f"{head} {first[taken]}" if head else first[taken]
+        taken += 1
+    chunks = _pack([head], max_chars)
+    if taken < len(first):
+        chunks += _pack(first[taken:], max_chars)
+    for clauses in sentences[1:]:
+        sentence = " ".join(clauses)
+        chunks += [sentence] if len(sentence) <= max_chars else _pack(clauses, max_chars)
+    return chunks
+
+
+class ChunkSynthesizer(Protocol):
+    """
+    Tek bir metin parçasını sese çeviren servis arayüzü (8 kHz, 16-bit PCM döndürür).
+    """
+
+    async def synthesize(self, text: str) -> bytes:
+        ...
+
+
+class StreamingSynthesizer(Stage):
+    """
+    Yanıtları parça parça sentezleyip ses olarak ileten TTS aşaması.
+
+    Her parçanın sesi hazır olur olmaz audio_chunk_ms'lik AudioOut mesajlarına bölünerek iletilir;
+    sonraki parçalar bu sırada sentezlenir (aynı anda en fazla lookahead). Sentez çalmanın yalnızca buffer_ms
+    önünde tutulur: ses ilk parçadan itibaren gerçek zamanlı çalınıyor varsayılır ve çalınmamış ses buffer_ms'i
+    aştığında yeni parça başlatılmaz; böylece araya girilen yanıtın geri kalanı hiç sentezlenmez.
+    interrupt() (BargeInStage) çağrının yanıtını keser:
+    yoldaki sentez görevleri iptal edilir, kalan ses iletilmez ve turn.audio_stopped_at işaretlenir.
+    Kesilen yanıt is_last=True ile bitmez; çalan taraf SpeechStart'ta kendi tamponunu boşaltır.
+    """
+    name = "tts"
+
+    def __init__(
+        self,
+        synthesizer: ChunkSynthesizer,
+        lookahead: int = 2,
+        buffer_ms: int = 1000,
+        audio_chunk_ms: int = 200,
+        first_min_chars: int = 12,
+        max_chars: int = 120
+    ):
+        if lookahead < 1:
+            raise ValueError("lookahead must be at least 1.")
+        self.synthesizer = synthesizer
+        self.lookahead = lookahead
+        self.buffer_ms = buffer_ms
+        self.audio_chunk_bytes = audio_chunk_ms // FRAME_MS * FRAME_BYTES
+        self.first_min_chars = first_min_chars
+        self.max_chars = max_chars
+        self._active: Dict[str, asyncio.Event] = {} # call_id -> çalan yanıtın kesme işareti
+        self.replies = 0
+        self.interrupted = 0
+        self.synthesized_chunks = 0
+        self.cancelled_chunks = 0 # Araya girme nedeniyle sentezi iptal edilen veya hiç başlatılmayan parça
+
+    def interrupt(self, call_id: str) -> bool:
+        """
+        Çağrının o an üretilen yanıtını keser.
+
+        Returns:
+            bool: Kesilecek bir yanıt varsa True.
+        """
+        cancel = self._active.get(call_id)
+        if cancel is None or cancel.is_set():
+            return False
+        cancel.set()
+        return True
+
+    async def process(self, item: Any) -> AsyncIterator[Any]:
+        if not isinstance(item, Reply):
+            yield item
+            return
+        turn = item.turn
+        pieces = split_for_speech(item.text, self.first_min_chars, self.max_chars)
+        cancel = asyncio.Event()
+        self._active[turn.call_id] = cancel
+        self.replies += 1
+        pending: Deque[asyncio.Task] = deque()
+        started = 0
+        playback_started = None
+        sent_ms = 0
+        try:
+            for index in range(len(pieces)):
+                if not pending and playback_started is not None:
+                    # Çalınmamış ses buffer_ms'e inene (veya yanıt kesilene) kadar bekle
+                    ahead = sent_ms - (now() - playback_started) * 1000
+                    if ahead > self.buffer_ms:
+                        await self._wait(cancel, (ahead - self.buffer_ms) / 1000)
+                    if cancel.is_set():
+                        break
+                while started < len(pieces) and len(pending) < self.lookahead:
+                    if pending and playback_started is not None and sent_ms - (now() - playback_started) * 1000 > self.buffer_ms:
+                        break
+                    pending.append(asyncio.create_task(self.synthesizer.synthesize(pieces[started])))
+                    started += 1
+                task = pending.popleft()
+                if not task.done():
+                    stop = asyncio.create_task(cancel.wait())
+                    await asyncio.wait((task, stop), return_when=asyncio.FIRST_COMPLETED)
+                    stop.cancel()
+                if cancel.is_set():
+                    task.cancel()
+                    pending.appendleft(task)
+                    break
+                pcm = task.result()
+                self.synthesized_chunks += 1
+                if playback_started is None:
+                    playback_started = now()
+                    if turn.first_audio_at is None:
+                        turn.first_audio_at = playback_started
+                sent_ms += len(pcm) // FRAME_BYTES * FRAME_MS
+                last_piece = index == len(pieces) - 1
+                for offset in range(0, len(pcm), self.audio_chunk_bytes):
+                    if cancel.is_set():
+                        break
+                    last = last_piece and offset + self.audio_chunk_bytes >= len(pcm)
+                    yield AudioOut(turn, pcm[offset:offset + self.audio_chunk_bytes], is_last=last)
+        finally:
+            for task in pending:
+                task.cancel()
+            if cancel.is_set():
+                self.interrupted += 1
+                self.cancelled_chunks += len(pending) + len(pieces) - started
+                turn.audio_stopped_at = now()
+                logger.debug("Reply for call %s interrupted after %s of %s pieces.", turn.call_id, started - len(pending), len(pieces))
+            if self._active.get(turn.call_id) is cancel:
+                del self._active[turn.call_id]
+
+    @staticmethod
+    async def _wait(cancel: asyncio.Event, timeout: float) -> None:
+        try:
+            await asyncio.wait_for(cancel.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "replies": self.replies,
+            "interrupted": self.interrupted,
+            "synthesized_chunks": self.synthesized_chunks,
+            "cancelled_chunks": self.cancelled_chunks,
+        }
+
+
+class BargeInStage(Stage):
+    """
+    VAD'nin hemen ardına konur: arayan konuşmaya başladığında (SpeechStart) TTS aşamasındaki yanıtı keser.
+    TTS aşaması kendi kuyruğunu beklemeden, ara aşamalardan (tanıma, NLU, rezervasyon) geçmeyi beklemeden uyarılır.
+    """
+    name = "barge_in"
+
+    def __init__(self, synthesizer: StreamingSynthesizer):
+        self.synthesizer = synthesizer
+
+    async def process(self, item: Any) -> AsyncIterator[Any]:
+        if isinstance(item, SpeechStart) and self.synthesizer.interrupt(item.turn.call_id):
+            logger.debug("Barge-in on call %s.", item.turn.call_id)
+        yield item
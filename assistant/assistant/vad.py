@@ -0,0 +1,569 @@
+# assistant/vad.py
+
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, List, Optional, Tuple
+
+import numpy as np
+
+from assistant.pipeline import (
+    FRAME_BYTES, FRAME_MS, FRAME_SAMPLES, SAMPLE_RATE,
+    AudioFrame, SpeechChunk, SpeechEnd, SpeechStart, Stage, Turn, now
+)
+
+# 8 kHz telefon sesi için ses etkinliği tespiti (VAD).
+# Her çağrının kendi dedektörü vardır; dedektör son ring_frames çerçevelik sesi ve özellik
+# geçmişini önceden ayrılmış halka tamponlarda (ring buffer) tutar. Gelen çerçeveler toplu (batch)
+# işlenir: enerji, sıfır geçiş oranı (ZCR) ve spektral düzlük tüm çerçeveler için tek seferde NumPy
+# ile, önceden ayrılmış çalışma dizilerine (out=) yazılarak hesaplanır. Konuşma başlangıç/bitiş
+# kararları da çerçeve başına Python döngüsü olmadan, koşu uzunlukları (run length) üzerinden verilir;
+# Python döngüsü yalnızca olaylar (başlangıç/bitiş) üzerinde döner.
+
+DFT_SIZE = 256 # Spektrum çözünürlüğü (31.25 Hz)
+_SCALE = np.float32(1.0 / 32768.0)
+_EPS = np.float32(1e-10)
+
+
+def _band_basis(band_hz: tuple) -> np.ndarray:
+    """
+    Konuşma bandındaki DFT bileşenlerini (Hann pencereli cos ve sin) sütun olarak içeren matris.
+    Çerçeveler bu matrisle çarpılınca FFT'nin yalnızca gereken kısmı tek bir matris çarpımıyla elde edilir.
+    """
+    low, high = band_hz
+    bins = np.arange(int(low * DFT_SIZE / SAMPLE_RATE), int(high * DFT_SIZE / SAMPLE_RATE) + 1)
+    angles = 2 * np.pi * np.outer(np.arange(FRAME_SAMPLES), bins) / DFT_SIZE
+    window = np.hanning(FRAME_SAMPLES)[:, None]
+    return np.hstack([window * np.cos(angles), window * np.sin(angles)]).astype(np.float32)
+
+
+@dataclass(slots=True)
+class VADConfig:
+    """
+    Dedektör ayarları. Süreler çerçeve (20 ms) cinsindendir.
+    """
+    onset_frames: int = 3 # Konuşma başlangıcı için art arda gereken konuşma çerçevesi
+    hangover_frames: int = 10 # Konuşma bitişi için art arda gereken sessiz çerçeve (200 ms)
+    ring_frames: int = 100 # Saklanan ses geçmişi (2 s); konuşma başlangıcından öncesi buradan alınır
+    noise_frames: int = 150 # Gürültü tabanının izlendiği enerji geçmişi (3 s)
+    max_batch: int = 50 # Tek seferde işlenen en fazla çerçeve
+    margin_db: float = 9.0 # Gürültü tabanının üzerinde konuşma sayılacak enerji farkı
+    min_energy_db: float = -50.0 # Eşiğin alt sınırı (hat sessizliği)
+    max_energy_db: float = -30.0 # Eşiğin üst sınırı; bunun üzerindeki enerji her zaman yeterli sayılır
+    flatness_max: float = 0.3 # Bunun altındaki spektral düzlük tonal (sesli) konuşma sayılır
+    zcr_max: float = 0.25 # Bunun altındaki sıfır geçiş oranı gürültü dışı sayılır
+    band_hz: tuple = (300.0, 3400.0) # Spektral düzlüğün hesaplandığı konuşma bandı
+
+    def __post_init__(self):
+        if self.onset_frames < 1 or self.hangover_frames < 1:
+            raise ValueError("onset_frames and hangover_frames must be at least 1.")
+        if not 1 <= self.max_batch <= self.ring_frames:
+            raise ValueError("max_batch must be between 1 and ring_frames.")
+        if self.onset_frames > self.ring_frames:
+            raise ValueError("onset_frames cannot exceed ring_frames.")
+
+
+@dataclass(slots=True)
+class VADEvent:
+    """
+    Konuşma başlangıcı ("start") veya bitişi ("end").
+    frame, dedektörün gördüğü ilk çerçeveden itibaren mutlak çerçeve numarasıdır: başlangıçta ilk
+    konuşma çerçevesi, bitişte konuşmadan sonraki ilk sessiz çerçeve.
+    """
+    kind: str
+    frame: int
+
+
+def _write_ring(ring: np.ndarray, position: int, values: np.ndarray) -> None:
+    # Değerleri halkaya (ilk eksen) en fazla iki dilim kopyasıyla yazar
+    capacity = len(ring)
+    start = position % capacity
+    first = min(len(values), capacity - start)
+    ring[start:start + first] = values[:first]
+    if first < len(values):
+        ring[:len(values) - first] = values[first:]
+
+
+class FrameFeatures:
+    """
+    Çerçeve özelliklerinin (enerji, ZCR, spektral düzlük) önceden ayrılmış dizilerle toplu hesaplanması.
+    Satırlar tek bir çağrının ardışık çerçeveleri veya birçok çağrının birer çerçevesi olabilir.
+    """
+
+    def __init__(self, rows: int, config: VADConfig):
+        self.config = config
+        self._basis = _band_basis(config.band_hz)
+        band_bins = self._basis.shape[1] // 2
+        self._x = np.empty((rows, FRAME_SAMPLES), dtype=np.float32)
+        self._square = np.empty((rows, FRAME_SAMPLES), dtype=np.float32)
+        self._signs = np.empty((rows, FRAME_SAMPLES), dtype=bool)
+        self._crossings = np.empty((rows, FRAME_SAMPLES - 1), dtype=bool)
+        self._projection = np.empty((rows, 2 * band_bins), dtype=np.float32)
+        self._power = np.empty((rows, band_bins), dtype=np.float32)
+        self._log_power = np.empty((rows, band_bins), dtype=np.float32)
+        self._geometric = np.empty(rows, dtype=np.float32)
+        self._flags = np.empty(rows, dtype=bool)
+        self.energy_db = np.empty(rows, dtype=np.float32)
+        self.zcr = np.empty(rows, dtype=np.float32)
+        self.flatness = np.empty(rows, dtype=np.float32)
+        self.speech = np.empty(rows, dtype=bool)
+
+    def compute(self, frames: np.ndarray) -> None:
+        """
+        Çerçevelerin (int16, satır başına bir çerçeve) özelliklerini energy_db, zcr ve flatness dizilerinin ilk satırlarına yazar.
+        """
+        n = len(frames)
+        # Ortalamalar np.mean yerine ufunc reduce ile alınır (out= ile ek dizi ayırmadan ve daha az yükle)
+        x = self._x[:n]
+        np.multiply(frames, _SCALE, out=x)
+
+        # Enerji (dBFS)
+        square = self._square[:n]
+        np.square(x, out=square)
+        energy = self.energy_db[:n]
+        np.add.reduce(square, axis=1, out=energy)
+        np.multiply(energy, 1.0 / FRAME_SAMPLES, out=energy)
+        np.add(energy, _EPS, out=energy)
+        np.log10(energy, out=energy)
+        np.multiply(energy, 10, out=energy)
+
+        # Sıfır geçiş oranı
+        signs = self._signs[:n]
+        np.signbit(x, out=signs)
+        crossings = self._crossings[:n]
+        np.not_equal(signs[:, 1:], signs[:, :-1], out=crossings)
+        zcr = self.zcr[:n]
+        np.add.reduce(crossings, axis=1, out=zcr, dtype=np.float32)
+        np.multiply(zcr, 1.0 / (FRAME_SAMPLES - 1), out=zcr)
+
+        # Spektral düzlük: konuşma bandındaki güç spektrumunun geometrik / aritmetik ortalaması
+        projection = self._projection[:n]
+        np.matmul(x, self._basis, out=projection)
+        np.square(projection, out=projection)
+        bins = projection.shape[1] // 2
+        power = self._power[:n]
+        np.add(projection[:, :bins], projection[:, bins:], out=power)
+        np.add(power, _EPS, out=power)
+        log_power = self._log_power[:n]
+        np.log(power, out=log_power)
+        geometric = self._geometric[:n]
+        np.add.reduce(log_power, axis=1, out=geometric)
+        np.multiply(geometric, 1.0 / bins, out=geometric)
+        np.exp(geometric, out=geometric)
+        flatness = self.flatness[:n]
+        np.add.reduce(power, axis=1, out=flatness)
+        np.multiply(flatness, 1.0 / bins, out=flatness)
+        np.divide(geometric, flatness, out=flatness)
+
+    def classify(self, n: int, threshold: Any) -> np.ndarray:
+        """
+        İlk n satırın konuşma olup olmadığını döndürür: enerji eşiği (tek değer veya satır başına) aşılmalı ve
+        çerçeve tonal (düşük spektral düzlük) ya da düşük ZCR'lı olmalıdır; beyaz gürültü ikisini de sağlamaz.
+        """
+        config = self.config
+        speech = self.speech[:n]
+        flags = self._flags[:n]
+        np.less(self.flatness[:n], config.flatness_max, out=speech)
+        np.less(self.zcr[:n], config.zcr_max, out=flags)
+        np.logical_or(speech, flags, out=speech)
+        np.greater(self.energy_db[:n], threshold, out=flags)
+        np.logical_and(speech, flags, out=speech)
+        return speech
+
+
+class VoiceActivityDetector:
+    """
+    Tek bir çağrının ses etkinliği dedektörü.
+
+    Kullanım:
+        detector = VoiceActivityDetector()
+        for event in detector.process(pcm):  # 16-bit lineer PCM, tam çerçeveler
+            ...
+    """
+
+    def __init__(self, config: Optional[VADConfig] = None):
+        config = config or VADConfig()
+        self.config = config
+        self.frames_seen = 0
+        self.in_speech = False
+        self._run_value = False # Son koşunun değeri (konuşma / sessizlik) ve uzunluğu
+        self._run_length = 0
+
+        # Halka tamponlar
+        self._ring = np.zeros((config.ring_frames, FRAME_SAMPLES), dtype=np.int16)
+        # Gürültü tabanı bilinmediği sürece eşik max_energy_db'dir; geçmiş gözlenen çerçevelerle dolar
+        self._noise = np.zeros(config.noise_frames, dtype=np.float32)
+        self._noise_count = 0
+
+        # Toplu işlem çalışma dizileri
+        batch = config.max_batch
+        self.features = FrameFeatures(batch, config)
+        self._change = np.empty(batch, dtype=bool)
+        self._first_run = np.empty(batch, dtype=bool)
+        self._index = np.arange(batch, dtype=np.int64)
+        self._run_start = np.empty(batch, dtype=np.int64)
+        self._run_len = np.empty(batch, dtype=np.int64)
+
+    def process(self, pcm: Any) -> List[VADEvent]:
+        """
+        Ses çerçevelerini işler ve bu çerçevelerde oluşan konuşma olaylarını döndürür.
+
+        Args:
+            pcm: 16-bit little-endian lineer PCM (bytes, bytearray, memoryview veya int16 dizi);
+                uzunluğu çerçeve boyutunun katı olmalıdır. Veri kopyalanmadan okunur.
+
+        Returns:
+            List[VADEvent]: Oluşma sırasıyla olaylar.
+        Raises:
+            ValueError: Veri tam çerçevelerden oluşmuyorsa.
+        """
+        samples = pcm if isinstance(pcm, np.ndarray) else np.frombuffer(pcm, dtype="<i2")
+        if samples.size % FRAME_SAMPLES:
+            raise ValueError(f"PCM length must be a multiple of {FRAME_BYTES} bytes.")
+        frames = samples.reshape(-1, FRAME_SAMPLES)
+        events: List[VADEvent] = []
+        for offset in range(0, len(frames), self.config.max_batch):
+            self._process_batch(frames[offset:offset + self.config.max_batch], events)
+        return events
+
+    def audio(self, start_frame: int, end_frame: int) -> bytes:
+        """
+        Halka tampondaki [start_frame, end_frame) çerçevelerinin sesini döndürür.
+
+        Raises:
+            ValueError: İstenen aralık artık tamponda değilse.
+        """
+        capacity = self.config.ring_frames
+        if start_frame < max(0, self.frames_seen - capacity) or end_frame > self.frames_seen or start_frame > end_frame:
+            raise ValueError("Requested frames are not in the ring buffer.")
+        start, end = start_frame % capacity, end_frame % capacity
+        if start < end or start_frame == end_frame:
+            return self._ring[start:end].tobytes()
+        return self._ring[start:].tobytes() + self._ring[:end].tobytes()
+
+    def _threshold(self, energy: np.ndarray) -> float:
+        # Gürültü tabanı: son noise_frames çerçevedeki en düşük enerji
+        config = self.config
+        recent = energy[-len(self._noise):]
+        _write_ring(self._noise, self._noise_count + len(energy) - len(recent), recent)
+        self._noise_count += len(energy)
+        floor = float(np.minimum.reduce(self._noise))
+        return min(max(floor + config.margin_db, config.min_energy_db), config.max_energy_db)
+
+    def _run_lengths(self, speech: np.ndarray, n: int) -> np.ndarray:
+        # Her çerçevede, o çerçevede biten aynı değerli koşunun uzunluğu (önceki toplu işlemden devreden dahil)
+        change = self._change[:n]
+        change[0] = speech[0] != self._run_value
+        np.not_equal(speech[1:], speech[:-1], out=change[1:])
+        index = self._index[:n]
+        run_start = self._run_start[:n]
+        np.multiply(index, change, out=run_start)
+        np.maximum.accumulate(run_start, out=run_start)
+        run_len = self._run_len[:n]
+        np.subtract(index, run_start, out=run_len)
+        np.add(run_len, 1, out=run_len)
+        first_run = self._first_run[:n]
+        np.logical_or.accumulate(change, out=first_run)
+        np.logical_not(first_run, out=first_run)
+        # İlk koşu önceki toplu işlemden devam ediyorsa devreden uzunluk eklenir
+        np.add(run_len, self._run_length, out=run_len, where=first_run)
+        self._run_value = bool(speech[-1])
+        self._run_length = int(run_len[-1])
+        return run_len
+
+    def _process_batch(self, frames: np.ndarray, events: List[VADEvent]) -> None:
+        n = len(frames)
+        base = self.frames_seen
+        _write_ring(self._ring, base, frames)
+        features = self.features
+        features.compute(frames)
+        speech = features.classify(n, self._threshold(features.energy_db[:n]))
+        run_len = self._run_lengths(speech, n)
+        self.frames_seen += n
+
+        # Eşik sayısına tam ulaşılan çerçeveler olay adaylarıdır; her koşuda en fazla bir kez oluşur
+        onset, hangover = self.config.onset_frames, self.config.hangover_frames
+        flags = self._change[:n]
+        np.equal(run_len, onset, out=flags)
+        np.logical_and(flags, speech, out=flags)
+        starts = np.flatnonzero(flags)
+        np.equal(run_len, hangover, out=flags)
+        np.logical_not(speech, out=speech)
+        np.logical_and(flags, speech, out=flags)
+        ends = np.flatnonzero(flags)
+
+        position = 0
+        while True:
+            candidates = ends if self.in_speech else starts
+            k = int(np.searchsorted(candidates, position))
+            if k == len(candidates):
+                break
+            index = int(candidates[k])
+            if self.in_speech:
+                events.append(VADEvent("end", base + index - hangover + 1))
+            else:
+                events.append(VADEvent("start", base + index - onset + 1))
+            self.in_speech = not self.in_speech
+            position = index + 1
+
+
+class VADBank:
+    """
+    Birçok çağrının dedektörünü tek bir dizi kümesinde tutan ve her tick'te tüm çağrıların bekleyen
+    çerçevelerini birlikte işleyen VAD.
+    Her çağrıya bir satır (slot) ayrılır; satırın kendi ses ve gürültü halka tamponları ile durum değerleri
+    vardır. 20 ms'lik tek çerçeveyle gelen telefon sesinde NumPy çağrı maliyeti çerçeve başına değil tick
+    başına ödenir; kararlar VoiceActivityDetector ile aynıdır.
+
+    Kullanım:
+        bank = VADBank(capacity=500)
+        slot = bank.open()
+        bank.write(slot, pcm)  # çağrı başına, çerçeve geldikçe
+        for slot, event in bank.step():  # her 20 ms'de bir
+            ...
+        bank.close(slot)
+    """
+
+    def __init__(self, capacity: int, config: Optional[VADConfig] = None):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1.")
+        config = config or VADConfig()
+        self.config = config
+        self.capacity = capacity
+        self._free = list(range(capacity - 1, -1, -1))
+        self._active = np.zeros(capacity, dtype=bool)
+        self._ring = np.zeros((capacity, config.ring_frames, FRAME_SAMPLES), dtype=np.int16)
+        self._noise = np.zeros((capacity, config.noise_frames), dtype=np.float32)
+        self.frames_written = np.zeros(capacity, dtype=np.int64)
+        self.frames_seen = np.zeros(capacity, dtype=np.int64)
+        self.in_speech = np.zeros(capacity, dtype=bool)
+        self._run_value = np.zeros(capacity, dtype=bool)
+        self._run_length = np.zeros(capacity, dtype=np.int64)
+
+        self.features = FrameFeatures(capacity, config)
+        self._frames = np.empty((capacity, FRAME_SAMPLES), dtype=np.int16)
+        self._flat_ring = self._ring.reshape(capacity * config.ring_frames, FRAME_SAMPLES)
+        self._flat_noise = self._noise.reshape(-1)
+        # Tick başına çalışma dizileri: seçili satırlar bunlara np.take(out=) ile toplanır, ara sonuçlar out= ile yazılır.
+        # take mode="clip" ile çağrılır: varsayılan "raise" modunda out her seferinde geçici diziye kopyalanır (indeksler zaten geçerlidir)
+        self._pending = np.empty(capacity, dtype=bool)
+        self._offsets = np.empty(capacity, dtype=np.int64)
+        self._positions = np.empty(capacity, dtype=np.int64)
+        self._seen = np.empty(capacity, dtype=np.int64)
+        self._run = np.empty(capacity, dtype=np.int64)
+        self._noise_rows = np.empty((capacity, config.noise_frames), dtype=np.float32)
+        self._floor = np.empty(capacity, dtype=np.float32)
+        self._previous = np.empty(capacity, dtype=bool)
+        self._speaking = np.empty(capacity, dtype=bool)
+        self._same = np.empty(capacity, dtype=bool)
+        self._negated = np.empty(capacity, dtype=bool)
+        self._starts = np.empty(capacity, dtype=bool)
+        self._ends = np.empty(capacity, dtype=bool)
+        self._changes = np.empty(capacity, dtype=bool)
+
+    def open(self) -> int:
+        """
+        Yeni bir çağrı için satır ayırır ve sıfırlar.
+
+        Raises:
+            RuntimeError: Boş satır yoksa.
+        """
+        if not self._free:
+            raise RuntimeError("VAD bank is full.")
+        slot = self._free.pop()
+        self._active[slot] = True
+        self._noise[slot] = 0
+        self.frames_written[slot] = self.frames_seen[slot] = 0
+        self.in_speech[slot] = self._run_value[slot] = False
+        self._run_length[slot] = 0
+        return slot
+
+    def close(self, slot: int) -> None:
+        if self._active[slot]:
+            self._active[slot] = False
+            self._free.append(slot)
+
+    def write(self, slot: int, pcm: Any) -> None:
+        """
+        Çağrının ses çerçevelerini halka tamponuna kopyalar; bir sonraki step'te işlenir.
+
+        Raises:
+            ValueError: Veri tam çerçevelerden oluşmuyorsa.
+            OverflowError: İşlenmemiş çerçeveler halka tamponu aşacaksa.
+        """
+        samples = pcm if isinstance(pcm, np.ndarray) else np.frombuffer(pcm, dtype="<i2")
+        if samples.size % FRAME_SAMPLES:
+            raise ValueError(f"PCM length must be a multiple of {FRAME_BYTES} bytes.")
+        frames = samples.reshape(-1, FRAME_SAMPLES)
+        written = int(self.frames_written[slot])
+        if written + len(frames) - int(self.frames_seen[slot]) > self.config.ring_frames - self.config.onset_frames:
+            raise OverflowError("VAD bank slot has too many unprocessed frames.")
+        _write_ring(self._ring[slot], written, frames)
+        self.frames_written[slot] = written + len(frames)
+
+    def step(self) -> List[Tuple[int, VADEvent]]:
+        """
+        Tüm çağrıların bekleyen çerçevelerini işler. Her turda çağrı başına bir çerçeve, tüm çağrılar için
+        birlikte işlenir; tur sayısı en çok bekleyen çağrının çerçeve sayısı kadardır (normalde 1).
+
+        Returns:
+            List[Tuple[int, VADEvent]]: (slot, olay) çiftleri, her çağrı için oluşma sırasıyla.
+        """
+        events: List[Tuple[int, VADEvent]] = []
+        pending = self._pending
+        while True:
+            np.greater(self.frames_written, self.frames_seen, out=pending)
+            np.logical_and(pending, self._active, out=pending)
+            slots = np.flatnonzero(pending)
+            if not len(slots):
+                return events
+            self._step_slots(slots, events)
+
+    def audio(self, slot: int, start_frame: int, end_frame: int) -> bytes:
+        """
+        Çağrının halka tamponundaki [start_frame, end_frame) çerçevelerinin sesini döndürür.
+
+        Raises:
+            ValueError: İstenen aralık artık tamponda değilse.
+        """
+        capacity = self.config.ring_frames
+        written = int(self.frames_written[slot])
+        if start_frame < max(0, written - capacity) or end_frame > written or start_frame > end_frame:
+            raise ValueError("Requested frames are not in the ring buffer.")
+        ring = self._ring[slot]
+        start, end = start_frame % capacity, end_frame % capacity
+        if start < end or start_frame == end_frame:
+            return ring[start:end].tobytes()
+        return ring[start:].tobytes() + ring[:end].tobytes()
+
+    def _step_slots(self, slots: np.ndarray, events: List[Tuple[int, VADEvent]]) -> None:
+        # Tüm ara sonuçlar önceden ayrılmış dizilere yazılır; tick başına yalnızca olay listesi büyür
+        config = self.config
+        n = len(slots)
+        seen = self._seen[:n]
+        np.take(self.frames_seen, slots, out=seen, mode="clip")
+        positions = self._positions[:n]
+
+        # Her çağrının sıradaki çerçevesi halka tampondan çalışma dizisine toplanır
+        offsets = self._offsets[:n]
+        np.multiply(slots, config.ring_frames, out=offsets)
+        np.remainder(seen, config.ring_frames, out=positions)
+        np.add(offsets, positions, out=offsets)
+        frames = self._frames[:n]
+        np.take(self._flat_ring, offsets, axis=0, out=frames, mode="clip")
+        features = self.features
+        features.compute(frames)
+        energy = features.energy_db[:n]
+
+        # Çağrı başına gürültü tabanı ve eşik
+        np.multiply(slots, config.noise_frames, out=offsets)
+        np.remainder(seen, config.noise_frames, out=positions)
+        np.add(offsets, positions, out=offsets)
+        self._flat_noise[offsets] = energy
+        floor = self._floor[:n]
+        if n == self.capacity:
+            # Tüm satırlar seçiliyse (slots = 0..capacity-1) gürültü geçmişi kopyalanmadan indirgenir
+            np.minimum.reduce(self._noise, axis=1, out=floor)
+        else:
+            noise = self._noise_rows[:n]
+            np.take(self._noise, slots, axis=0, out=noise, mode="clip")
+            np.minimum.reduce(noise, axis=1, out=floor)
+        np.add(floor, config.margin_db, out=floor)
+        np.clip(floor, config.min_energy_db, config.max_energy_db, out=floor)
+        speech = features.classify(n, floor)
+
+        # Koşu uzunlukları: aynı değer devam ediyorsa bir artar, değiştiyse 1'den başlar
+        previous = self._previous[:n]
+        np.take(self._run_value, slots, out=previous, mode="clip")
+        same = self._same[:n]
+        np.equal(speech, previous, out=same)
+        negated = self._negated[:n]
+        run_length = self._run[:n]
+        np.take(self._run_length, slots, out=run_length, mode="clip")
+        np.add(run_length, 1, out=run_length, where=same)
+        np.copyto(run_length, 1, where=np.logical_not(same, out=negated))
+        self._run_length[slots] = run_length
+        self._run_value[slots] = speech
+
+        in_speech = self._speaking[:n]
+        np.take(self.in_speech, slots, out=in_speech, mode="clip")
+        starts = self._starts[:n]
+        np.equal(run_length, config.onset_frames, out=starts)
+        np.logical_and(starts, speech, out=starts)
+        np.logical_and(starts, np.logical_not(in_speech, out=negated), out=starts)
+        ends = self._ends[:n]
+        np.equal(run_length, config.hangover_frames, out=ends)
+        np.logical_and(ends, np.logical_not(speech, out=negated), out=ends)
+        np.logical_and(ends, in_speech, out=ends)
+        changes = self._changes[:n]
+        np.logical_or(starts, ends, out=changes)
+
+        if changes.any():
+            for index in np.flatnonzero(changes):
+                slot, frame = int(slots[index]), int(seen[index])
+                if starts[index]:
+                    events.append((slot, VADEvent("start", frame - config.onset_frames + 1)))
+                else:
+                    events.append((slot, VADEvent("end", frame - config.hangover_frames + 1)))
+            np.logical_xor(in_speech, changes, out=in_speech)
+            self.in_speech[slots] = in_speech
+        np.add(seen, 1, out=seen)
+        self.frames_seen[slots] = seen
+
+
+class VADStage(Stage):
+    """
+    Ses çerçevelerini VAD olaylarına göre SpeechStart / SpeechChunk / SpeechEnd mesajlarına çeviren aşama.
+    Konuşma başlangıcı geriye dönük tespit edildiği için (onset_frames) başlangıçtan önceki çerçeveler
+    halka tampondan alınıp ilk SpeechChunk'a eklenir.
+    """
+    name = "vad"
+
+    def __init__(self, config: Optional[VADConfig] = None):
+        self.detector = VoiceActivityDetector(config)
+        self._turn: Optional[Turn] = None
+        self._turn_count = 0
+
+    async def process(self, item: Any) -> AsyncIterator[Any]:
+        if not isinstance(item, AudioFrame):
+            yield item
+            return
+        # Uzun parçalar, başlangıç öncesi ses halka tampondan düşmeden alınabilsin diye max_batch'lik dilimlerle işlenir
+        pcm = memoryview(item.pcm)
+        step = self.detector.config.max_batch * FRAME_BYTES
+        frame_seconds = FRAME_MS / 1000
+        for offset in range(0, len(pcm), step):
+            part = pcm[offset:offset + step]
+            # Dilimin son örneğinin geldiği an
+            part_end_at = item.received_at - (len(pcm) - offset - len(part)) // FRAME_BYTES * frame_seconds
+            for output in self._segment(item.call_id, part, part_end_at):
+                yield output
+
+    def _segment(self, call_id: str, pcm: memoryview, end_at: float) -> List[Any]:
+        detector = self.detector
+        first = detector.frames_seen
+        events = detector.process(pcm)
+        last = detector.frames_seen
+        frame_seconds = FRAME_MS / 1000
+        outputs: List[Any] = []
+        cursor = first
+        for event in events:
+            at = end_at - (last - event.frame) * frame_seconds # Olay çerçevesinin başlangıç anı
+            if event.kind == "start":
+                self._turn = Turn(call_id, self._turn_count, speech_start_at=at)
+                self._turn_count += 1
+                outputs.append(SpeechStart(self._turn))
+            elif self._turn is not None:
+                if cursor < event.frame:
+                    outputs.append(SpeechChunk(self._turn, detector.audio(cursor, event.frame)))
+                self._turn.speech_end_at = at
+                outputs.append(SpeechEnd(self._turn))
+                self._turn = None
+            cursor = event.frame
+        if self._turn is not None and cursor < last:
+            outputs.append(SpeechChunk(self._turn, detector.audio(cursor, last)))
+        return outputs
+
+    async def flush(self) -> AsyncIterator[Any]:
+        if self._turn is not None:
+            self._turn.speech_end_at = now()
+            yield SpeechEnd(self._turn)
+            self._turn = None
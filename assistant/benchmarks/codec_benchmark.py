@@ -0,0 +1,123 @@
+"""
+G.711 ve örnekleme hızı dönüşümü ölçümü.
+
+  - Doğruluk: kodlama/kod çözme tüm 16-bit değerler ve 256 kod için Python'un audioop modülüyle karşılaştırılır;
+    yeniden örneklemenin bant içi kazancı ve yansıma (imaging) bastırması ölçülür.
+  - Hız: 20 ms'lik çerçevelerle çağrı başına gelen (G.711 -> 16 kHz) ve giden (16 kHz -> G.711) yön;
+    tek çekirdekte saniyede işlenen çerçeve ve buna göre gerçek zamanlı çağrı sayısı.
+    Karşılaştırma için audioop (ulaw2lin + ratecv) ile aynı işlem.
+
+Çalıştırma (assistant/ dizininden):
+    python -m benchmarks.codec_benchmark
+"""
+
+import argparse
+import time
+import warnings
+
+import numpy as np
+
+from assistant import codec
+from assistant.pipeline import FRAME_SAMPLES
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    try:
+        import audioop
+    except ImportError: # Python 3.13+
+        audioop = None
+
+
+def check_exactness() -> None:
+    if audioop is None:
+        print("audioop not available; skipping bit-exactness check")
+        return
+    pcm = np.arange(-32768, 32768, dtype="<i2").tobytes()
+    codes = bytes(range(256))
+    for law, lin2, to_lin in ((codec.ULAW, audioop.lin2ulaw, audioop.ulaw2lin), (codec.ALAW, audioop.lin2alaw, audioop.alaw2lin)):
+        encode_ok = codec.encode(pcm, law).tobytes() == lin2(pcm, 2)
+        decode_ok = codec.decode(codes, law).tobytes() == to_lin(codes, 2)
+        print(f"{law}: encode matches audioop={encode_ok}  decode matches audioop={decode_ok}")
+
+
+def check_response() -> None:
+    t = np.arange(8000) / 8000
+    print("tone     8k->16k gain  image      round-trip gain")
+    for frequency in (300, 1000, 3000, 3400):
+        tone = (8000 * np.sin(2 * np.pi * frequency * t)).astype(np.int16)
+        upsampler, downsampler = codec.Resampler(8000, 16000), codec.Resampler(16000, 8000)
+        up = np.concatenate([upsampler.process(tone[i:i + FRAME_SAMPLES]) for i in range(0, len(tone), FRAME_SAMPLES)])
+        down = np.concatenate([downsampler.process(up[i:i + 2 * FRAME_SAMPLES]) for i in range(0, len(up), 2 * FRAME_SAMPLES)])
+        steady = up[200:].astype(float)
+        spectrum = np.abs(np.fft.rfft(steady * np.hanning(len(steady))))
+        frequencies = np.fft.rfftfreq(len(steady), 1 / 16000)
+        signal = spectrum[np.argmin(np.abs(frequencies - frequency))]
+        image = spectrum[np.argmin(np.abs(frequencies - (8000 - frequency)))]
+        print(
+            f"{frequency:>4} Hz  {np.std(steady) / np.std(tone):12.3f}  {20 * np.log10(image / signal):5.0f} dB  "
+            f"{np.std(down[200:]) / np.std(tone):15.3f}"
+        )
+
+
+def throughput(calls: int, seconds: float) -> None:
+    rng = np.random.default_rng(7)
+    frames = int(seconds * 50)
+    inbound = [rng.integers(0, 256, FRAME_SAMPLES * frames, dtype=np.uint8).tobytes() for _ in range(calls)]
+    outbound = [rng.integers(-8000, 8000, 2 * FRAME_SAMPLES * frames, dtype=np.int16).tobytes() for _ in range(calls)]
+    total = calls * frames
+
+    converters = [codec.CallAudio(codec.ULAW) for _ in range(calls)]
+    pcm16k = np.empty(2 * FRAME_SAMPLES, dtype=np.int16)
+    payload = np.empty(FRAME_SAMPLES, dtype=np.uint8)
+    started = time.process_time()
+    for index in range(frames):
+        start, end = index * FRAME_SAMPLES, (index + 1) * FRAME_SAMPLES
+        for converter, data in zip(converters, inbound):
+            converter.inbound(memoryview(data)[start:end], out=pcm16k)
+    inbound_rate = total / (time.process_time() - started)
+    started = time.process_time()
+    for index in range(frames):
+        start, end = index * 4 * FRAME_SAMPLES, (index + 1) * 4 * FRAME_SAMPLES
+        for converter, data in zip(converters, outbound):
+            converter.outbound(memoryview(data)[start:end], out=payload)
+    outbound_rate = total / (time.process_time() - started)
+    both = 1 / (1 / inbound_rate + 1 / outbound_rate)
+    print(f"codec    inbound {inbound_rate:>9,.0f} frames/s  outbound {outbound_rate:>9,.0f} frames/s  -> ~{both / 50:,.0f} full-duplex calls per core")
+
+    if audioop is None:
+        return
+    states = [None] * calls
+    started = time.process_time()
+    for index in range(frames):
+        start, end = index * FRAME_SAMPLES, (index + 1) * FRAME_SAMPLES
+        for call, data in enumerate(inbound):
+            linear = audioop.ulaw2lin(data[start:end], 2)
+            _, states[call] = audioop.ratecv(linear, 2, 1, 8000, 16000, states[call])
+    inbound_rate = total / (time.process_time() - started)
+    states = [None] * calls
+    started = time.process_time()
+    for index in range(frames):
+        start, end = index * 4 * FRAME_SAMPLES, (index + 1) * 4 * FRAME_SAMPLES
+        for call, data in enumerate(outbound):
+            linear, states[call] = audioop.ratecv(data[start:end], 2, 1, 16000, 8000, states[call])
+            audioop.lin2ulaw(linear, 2)
+    outbound_rate = total / (time.process_time() - started)
+    both = 1 / (1 / inbound_rate + 1 / outbound_rate)
+    print(f"audioop  inbound {inbound_rate:>9,.0f} frames/s  outbound {outbound_rate:>9,.0f} frames/s  -> ~{both / 50:,.0f} full-duplex calls per core (linear interpolation, no anti-aliasing filter)")
+
+
+def main(calls: int, seconds: float) -> None:
+    check_exactness()
+    print()
+    check_response()
+    print()
+    print(f"{calls} calls x {seconds:.0f} s of 20 ms frames")
+    throughput(calls, seconds)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200, help="Eşzamanlı çağrı sayısı")
+    parser.add_argument("--seconds", type=float, default=5, help="Çağrı başına ses süresi")
+    args = parser.parse_args()
+    main(args.calls, args.seconds)
@@ -0,0 +1,227 @@
+"""
+Cümle çözümleyici ölçümü: doğruluk ve hız.
+
+Şablonlardan (Türkçe ve İngilizce; niyet + gün + saat ifadeleri) beklenen sonucu bilinen, tohumlu
+rastgele bir cümle derlemi üretilir (varsayılan 100k). Ölçülenler:
+  - doğruluk: niyet, gün ve saat alanlarının beklenenle tam eşleşme oranı
+  - soğuk: önbellek kapalı, her cümle baştan çözümlenir (karakter trie'si, ifade trie'si, kurallar)
+  - sıcak: LRU önbellek açık; gerçek görüşmelerdeki gibi aynı kalıplar tekrar eder
+  - cümle başına gecikme p50/p99 ve candidates() (tarih hesabı) maliyeti
+Karşılaştırma için stand_ins.extract_intent (anahtar kelime kuralları) de aynı derlemde ölçülür.
+
+Çalıştırma (assistant/ dizininden):
+    python -m benchmarks.nlu_benchmark --count 100000
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from assistant import nlu, stand_ins
+
+# Saat kelimeleri: (yalın, bulunma, yönelme, belirtme, ayrılma)
+TR_HOURS = {
+    1: ("bir", "birde", "bire", "biri", "birden"),
+    2: ("iki", "ikide", "ikiye", "ikiyi", "ikiden"),
+    3: ("üç", "üçte", "üçe", "üçü", "üçten"),
+    4: ("dört", "dörtte", "dörde", "dördü", "dörtten"),
+    5: ("beş", "beşte", "beşe", "beşi", "beşten"),
+    6: ("altı", "altıda", "altıya", "altıyı", "altıdan"),
+    7: ("yedi", "yedide", "yediye", "yediyi", "yediden"),
+    8: ("sekiz", "sekizde", "sekize", "sekizi", "sekizden"),
+    9: ("dokuz", "dokuzda", "dokuza", "dokuzu", "dokuzdan"),
+    10: ("on", "onda", "ona", "onu", "ondan"),
+    11: ("on bir", "on birde", "on bire", "on biri", "on birden"),
+    12: ("on iki", "on ikide", "on ikiye", "on ikiyi", "on ikiden"),
+}
+EN_HOURS = "one two three four five six seven eight nine ten eleven twelve".split()
+
+TR_INTENTS = {
+    "book": ["randevu almak istiyorum", "randevu ayarlayabilir misiniz", "rezervasyon yaptırmak istiyorum", "bir randevu lütfen"],
+    "cancel": ["randevumu iptal etmek istiyorum", "randevuyu iptal edin lütfen", "vazgeçtim randevuyu iptal et"],
+    "reschedule": ["randevumu değiştirmek istiyorum", "randevuyu ertelemek istiyorum", "randevumu kaydırabilir miyiz"],
+}
+EN_INTENTS = {
+    "book": ["I'd like to book an appointment", "can I schedule an appointment", "book me in please"],
+    "cancel": ["please cancel my appointment", "I need to cancel"],
+    "reschedule": ["I want to reschedule", "can we move my appointment", "I'd like to change my appointment"],
+}
+TR_WEEKDAYS = "pazartesi salı çarşamba perşembe cuma cumartesi pazar".split()
+EN_WEEKDAYS = "monday tuesday wednesday thursday friday saturday sunday".split()
+
+Expected = Dict[str, Optional[int]]
+
+
+def _business_hour(hour: int) -> int:
+    # Çözümleyicinin dilimsiz saat varsayımı: 1-7 öğleden sonra
+    return hour + 12 if hour < 8 else hour
+
+
+def _turkish_day(rng: random.Random) -> Tuple[str, Expected]:
+    choice = rng.randrange(6)
+    if choice == 0:
+        return "bugün", {"day_offset": 0}
+    if choice == 1:
+        return "yarın", {"day_offset": 1}
+    if choice == 2:
+        return "öbür gün", {"day_offset": 2}
+    weekday = rng.randrange(7)
+    if choice == 3:
+        return f"önümüzdeki {TR_WEEKDAYS[weekday]}", {"weekday": weekday}
+    if choice == 4:
+        return f"haftaya {TR_WEEKDAYS[weekday]}", {"weekday": weekday, "week_offset": 1}
+    return f"{TR_WEEKDAYS[weekday]} günü", {"weekday": weekday}
+
+
+def _turkish_time(rng: random.Random) -> Tuple[str, Expected]:
+    choice = rng.randrange(8)
+    hour = rng.randint(1, 12)
+    words = TR_HOURS[hour]
+    if choice == 0:
+        hour, minute = rng.randint(9, 18), rng.choice((0, 15, 30, 45))
+        return f"saat {hour}:{minute:02d}'{rng.choice(('de', 'da', 'te'))}", {"hour": hour, "minute": minute}
+    if choice == 1:
+        return f"saat {words[1]}", {"hour": _business_hour(hour), "minute": 0}
+    if choice == 2:
+        return f"{words[0]} buçukta", {"hour": _business_hour(hour), "minute": 30}
+    if choice == 3:
+        hour = rng.randint(1, 6)
+        return f"öğleden sonra {TR_HOURS[hour][1]}", {"hour": hour + 12, "minute": 0}
+    if choice == 4:
+        hour = rng.randint(8, 11)
+        return f"sabah {TR_HOURS[hour][1]}", {"hour": hour, "minute": 0}
+    if choice == 5:
+        return f"{words[3]} çeyrek geçe", {"hour": _business_hour(hour), "minute": 15}
+    if choice == 6:
+        return f"{words[2]} çeyrek var", {"hour": _business_hour(hour - 1 or 12), "minute": 45}
+    hour = rng.randint(9, 16)
+    return f"saat {hour}:00'dan {hour + 1}:00'a kadar", {"hour": hour, "minute": 0, "end_hour": hour + 1}
+
+
+def _english_day(rng: random.Random) -> Tuple[str, Expected]:
+    choice = rng.randrange(5)
+    if choice == 0:
+        return "today", {"day_offset": 0}
+    if choice == 1:
+        return "tomorrow", {"day_offset": 1}
+    if choice == 2:
+        return "the day after tomorrow", {"day_offset": 2}
+    weekday = rng.randrange(7)
+    if choice == 3:
+        return f"next {EN_WEEKDAYS[weekday]}", {"weekday": weekday}
+    return f"{EN_WEEKDAYS[weekday]} next week", {"weekday": weekday, "week_offset": 1}
+
+
+def _english_time(rng: random.Random) -> Tuple[str, Expected]:
+    choice = rng.randrange(6)
+    hour = rng.randint(1, 11)
+    if choice == 0:
+        return f"at {hour} pm", {"hour": hour + 12, "minute": 0}
+    if choice == 1:
+        minute = rng.choice((15, 30, 45))
+        return f"at {hour}:{minute} am", {"hour": hour, "minute": minute}
+    if choice == 2:
+        return f"at half past {EN_HOURS[hour - 1]}", {"hour": _business_hour(hour), "minute": 30}
+    if choice == 3:
+        return f"at quarter to {EN_HOURS[hour - 1]}", {"hour": _business_hour(hour - 1 or 12), "minute": 45}
+    if choice == 4:
+        hour = rng.randint(8, 11)
+        return f"at {hour} in the morning", {"hour": hour, "minute": 0}
+    hour = rng.randint(1, 4)
+    return f"from {hour} to {hour + 2} pm", {"hour": hour + 12, "minute": 0, "end_hour": hour + 14}
+
+
+def make_corpus(count: int, seed: int = 7) -> List[Tuple[str, Expected]]:
+    """
+    Beklenen sonuçlarıyla birlikte cümle derlemi. Her cümle bir niyet, çoğunlukla bir gün ve bir saat içerir.
+    """
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(count):
+        turkish = rng.random() < 0.7
+        intents, day, clock = (TR_INTENTS, _turkish_day, _turkish_time) if turkish else (EN_INTENTS, _english_day, _english_time)
+        intent = rng.choice(list(intents))
+        expected: Expected = {"intent": intent}
+        parts = [rng.choice(intents[intent])]
+        if rng.random() < 0.85:
+            text, values = day(rng)
+            parts.insert(0 if turkish else 1, text)
+            expected.update(values)
+        if intent != "cancel" and rng.random() < 0.85:
+            text, values = clock(rng)
+            parts.insert(len(parts) - 1 if turkish else len(parts), text)
+            expected.update(values)
+        utterance = " ".join(parts)
+        if rng.random() < 0.2:
+            # Türkçe büyük harf: i -> İ, ı -> I
+            utterance = {"i": "İ", "ı": "I"}.get(utterance[0], utterance[0].upper()) + utterance[1:]
+        corpus.append((utterance, expected))
+    return corpus
+
+
+def matches(parsed: nlu.ParsedUtterance, expected: Expected) -> bool:
+    return (
+        parsed.intent == expected["intent"]
+        and parsed.day_offset == expected.get("day_offset")
+        and parsed.weekday == expected.get("weekday")
+        and parsed.week_offset == expected.get("week_offset", 0)
+        and parsed.hour == expected.get("hour")
+        and parsed.minute == expected.get("minute", 0)
+        and parsed.end_hour == expected.get("end_hour")
+    )
+
+
+def accuracy(corpus: List[Tuple[str, Expected]], show: int) -> None:
+    parser = nlu.UtteranceParser()
+    failures = [(text, expected) for text, expected in corpus if not matches(parser.parse(text), expected)]
+    print(f"exact match {1 - len(failures) / len(corpus):.4f}  ({len(failures)} of {len(corpus):,} wrong)")
+    for text, expected in failures[:show]:
+        print(f"  {text!r}: expected {expected}, got {parser.parse(text)}")
+
+
+def speed(corpus: List[Tuple[str, Expected]]) -> None:
+    texts = [text for text, _ in corpus]
+    reference = datetime(2026, 10, 19, 10, 0)
+    print(f"{len(set(texts)):,} distinct utterances")
+    for label, parser in (("cold (no cache)", nlu.UtteranceParser(cache_size=0)), ("warm (LRU 10k)", nlu.UtteranceParser())):
+        nlu._WORD_CACHE.clear()
+        latencies = []
+        clock = time.perf_counter
+        started = time.process_time()
+        for text in texts:
+            begin = clock()
+            parser.parse(text)
+            latencies.append(clock() - begin)
+        elapsed = time.process_time() - started
+        latencies.sort()
+        hit_ratio = parser.hits / max(parser.hits + parser.misses, 1)
+        print(
+            f"{label:<16} {len(texts) / elapsed:>10,.0f} utterances/s  p50 {latencies[len(latencies) // 2] * 1e6:6.1f} us  "
+            f"p99 {latencies[int(len(latencies) * 0.99)] * 1e6:6.1f} us  cache hit ratio {hit_ratio:.2f}"
+        )
+    parsed = [parser.parse(text) for text in texts]
+    started = time.process_time()
+    for item in parsed:
+        nlu.candidates(item, reference)
+    print(f"{'candidates()':<16} {len(parsed) / (time.process_time() - started):>10,.0f} utterances/s")
+    started = time.process_time()
+    for text in texts:
+        stand_ins.extract_intent(text)
+    print(f"{'keyword stand-in':<16} {len(texts) / (time.process_time() - started):>10,.0f} utterances/s  (intent + digits only)")
+
+
+def main(count: int, show: int) -> None:
+    corpus = make_corpus(count)
+    accuracy(corpus, show)
+    print()
+    speed(corpus)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=100_000, help="Derlemdeki cümle sayısı")
+    parser.add_argument("--show", type=int, default=10, help="Gösterilecek hatalı cümle sayısı")
+    args = parser.parse_args()
+    main(args.count, args.show)
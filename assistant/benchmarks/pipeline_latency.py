@@ -0,0 +1,65 @@
+"""
+Uçtan uca sıra gecikmesi ölçümü (konuşmanın bitişi -> yanıtın ilk sesi).
+
+Yedek aşamalarla kurulan hat, gerçek zamanlı hızda konuşan birden fazla sahte arayanla eşzamanlı
+çalıştırılır ve akışlı (kısmi sonuçlar aşağı iletilir) ile toplu (her aşama cümlenin bitmesini bekler)
+tanıma karşılaştırılır.
+
+Çalıştırma (assistant/ dizininden):
+    python -m benchmarks.pipeline_latency --calls 20
+"""
+
+import argparse
+import asyncio
+import statistics
+from typing import Dict, List
+
+from assistant.pipeline import AudioOut, Pipeline, Turn
+from assistant.stand_ins import ScriptedCaller, stand_in_stages
+
+SCRIPT = [
+    "merhaba yarın saat 15:30 için randevu almak istiyorum",
+    "pardon onu yarın dört buçuğa değiştirebilir miyiz",
+    "teşekkürler aslında randevumu iptal etmek istiyorum",
+]
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run_call(call_id: str, streaming: bool, words_per_second: float) -> List[Turn]:
+    scripts = {call_id: SCRIPT}
+    caller = ScriptedCaller(call_id, SCRIPT, words_per_second=words_per_second)
+    pipeline = Pipeline(stand_in_stages(scripts, streaming=streaming, words_per_second=words_per_second))
+    turns: Dict[int, Turn] = {}
+    async for item in pipeline.run(caller):
+        if isinstance(item, AudioOut):
+            turns[item.turn.turn_id] = item.turn
+    return list(turns.values())
+
+
+async def run_mode(calls: int, streaming: bool, words_per_second: float) -> List[float]:
+    results = await asyncio.gather(*(run_call(f"call-{index}", streaming, words_per_second) for index in range(calls)))
+    return [turn.latency for turns in results for turn in turns if turn.latency is not None]
+
+
+async def main(calls: int, words_per_second: float) -> None:
+    expected = calls * len(SCRIPT)
+    for label, streaming in (("batch", False), ("streaming", True)):
+        latencies = await run_mode(calls, streaming, words_per_second)
+        print(
+            f"{label:<10} turns={len(latencies)}/{expected} "
+            f"p50={percentile(latencies, 50) * 1000:.0f}ms p99={percentile(latencies, 99) * 1000:.0f}ms "
+            f"mean={statistics.fmean(latencies) * 1000:.0f}ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=20, help="Eşzamanlı çağrı sayısı")
+    parser.add_argument("--words-per-second", type=float, default=2.5, help="Arayanın konuşma hızı")
+    args = parser.parse_args()
+    asyncio.run(main(args.calls, args.words_per_second))
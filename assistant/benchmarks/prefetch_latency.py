@@ -0,0 +1,91 @@
+"""
+Spekülatif müsaitlik ön getirmesinin sıra gecikmesine etkisi.
+
+pipeline_latency ile aynı çevrimdışı hat (yedek aşamalar, gerçek zamanlı konuşan sahte arayanlar) iki biçimde
+çalıştırılır; her ikisinde de rezervasyonlar müsaitlik kontrolünden geçer (günün randevuları + hizmet süreleri):
+  - on demand: veriler nihai niyet geldikten sonra istenir
+  - prefetch: arayan günü veya saati söylediği anda (kısmi niyet) istenir, nihai niyette hazır veri kullanılır
+Senaryoda arayan ikinci cümlede günü değiştirir ("yarın değil bugün"); eski günün işi iptal edilir veya boşa gider.
+
+Raporlanan değerler: müsaitlik gerektiren sıraların ve tüm sıraların gecikmesi (konuşma sonu -> ilk ses)
+p50/p99, backend'e giden veri isteği sayısı ve ön getirme sayaçları (hits / joins / misses / cancelled / unused).
+
+Çalıştırma (assistant/ dizininden):
+    python -m benchmarks.prefetch_latency --calls 20
+"""
+
+import argparse
+import asyncio
+import statistics
+from typing import Dict, List, Tuple
+
+from assistant.pipeline import AudioOut, Pipeline, Turn
+from assistant.prefetch import BOOKING_INTENTS, AvailabilityCheckingBackend, SpeculativePrefetcher
+from assistant.stand_ins import InMemoryAvailabilityBackend, InMemoryBookingBackend, ScriptedCaller, extract_intent, stand_in_stages
+
+SCRIPT = [
+    "merhaba yarın saat 15:30 için randevu almak istiyorum",
+    "pardon yarın değil bugün dört buçuğa değiştirebilir miyiz",
+    "teşekkürler aslında randevumu iptal etmek istiyorum",
+]
+# Müsaitlik kontrolü gerektiren sıralar (rezervasyon niyeti ve saat içerenler)
+CHECKED_TURNS = {
+    index for index, text in enumerate(SCRIPT)
+    if extract_intent(text)[0] in BOOKING_INTENTS and "hour" in extract_intent(text)[1]
+}
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run_call(call_id: str, prefetcher: SpeculativePrefetcher, speculative: bool, words_per_second: float) -> List[Turn]:
+    scripts = {call_id: SCRIPT}
+    caller = ScriptedCaller(call_id, SCRIPT, words_per_second=words_per_second)
+    if speculative:
+        stages = stand_in_stages(scripts, words_per_second=words_per_second, prefetcher=prefetcher)
+    else:
+        backend = AvailabilityCheckingBackend(InMemoryBookingBackend(), prefetcher)
+        stages = stand_in_stages(scripts, words_per_second=words_per_second, backend=backend)
+    turns: Dict[int, Turn] = {}
+    async for item in Pipeline(stages).run(caller):
+        if isinstance(item, AudioOut):
+            turns[item.turn.turn_id] = item.turn
+    return list(turns.values())
+
+
+async def run_mode(calls: int, speculative: bool, words_per_second: float, latency: Tuple[float, float]) -> None:
+    availability = InMemoryAvailabilityBackend(appointments_latency=latency[0], services_latency=latency[1])
+    prefetcher = SpeculativePrefetcher(availability)
+    results = await asyncio.gather(*(
+        run_call(f"call-{index}", prefetcher, speculative, words_per_second) for index in range(calls)
+    ))
+    turns = [turn for call_turns in results for turn in call_turns if turn.latency is not None]
+    checked = [turn.latency for turn in turns if turn.turn_id in CHECKED_TURNS]
+    everything = [turn.latency for turn in turns]
+    label = "prefetch" if speculative else "on demand"
+    print(
+        f"{label:<10} checked turns={len(checked)} p50={percentile(checked, 50) * 1000:4.0f}ms p99={percentile(checked, 99) * 1000:4.0f}ms  "
+        f"all turns={len(everything)}/{calls * len(SCRIPT)} p50={percentile(everything, 50) * 1000:4.0f}ms "
+        f"mean={statistics.fmean(everything) * 1000:4.0f}ms"
+    )
+    print(f"{'':<10} backend fetches {dict(availability.fetches)}  prefetcher {prefetcher.stats()}")
+    return statistics.median(checked)
+
+
+async def main(calls: int, words_per_second: float, latency: Tuple[float, float]) -> None:
+    baseline = await run_mode(calls, False, words_per_second, latency)
+    speculative = await run_mode(calls, True, words_per_second, latency)
+    print(f"saved on checked turns: p50 {(baseline - speculative) * 1000:.0f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=20, help="Eşzamanlı çağrı sayısı")
+    parser.add_argument("--words-per-second", type=float, default=2.5, help="Arayanın konuşma hızı")
+    parser.add_argument("--appointments-latency", type=float, default=0.15, help="Günün randevularını getirme süresi (s)")
+    parser.add_argument("--services-latency", type=float, default=0.08, help="Hizmet sürelerini getirme süresi (s)")
+    args = parser.parse_args()
+    asyncio.run(main(args.calls, args.words_per_second, (args.appointments_latency, args.services_latency)))
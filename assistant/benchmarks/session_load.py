@@ -0,0 +1,156 @@
+"""
+Oturum yöneticisi için sentetik yük testi.
+
+Her seviyede (varsayılan 100, 500, 1000 eşzamanlı çağrı) tüm çağrılar gerçek zamanlı 20 ms'lik çerçeveler
+gönderir: yaklaşık 1.6 s konuşma, 3.4 s sessizlik. Konuşma sonunda yedek tanıma (50 ms), yedek backend (80 ms)
+ve yedek TTS ile yanıt çalınır. Çağrıların %1'inde tanıma hiç dönmez (takılan çağrı); handler_timeout
+bu çağrıların diğerlerini bekletmediğini göstermelidir.
+
+Raporlanan değerler:
+  - memory/call: slot başına önceden ayrılmış diziler + açık oturum nesneleri (tracemalloc)
+  - sched p50/p99: olayın oturum kuyruğuna girişinden bir işçinin işlemeye başlamasına kadar geçen süre
+  - tick lag p50/p99: 20 ms'lik tick'in planlanan zamandan gecikmesi
+  - turn p50/p99: konuşmanın bitişinden yanıt sesinin kuyruğa girmesine kadar geçen süre
+  - cpu: süreç CPU zamanı / duvar saati
+
+Çalıştırma (assistant/ dizininden):
+    python -m benchmarks.session_load --levels 100 500 1000 --seconds 10
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+import tracemalloc
+from typing import Any, List, Set
+
+import numpy as np
+
+from assistant.pipeline import FRAME_MS, SpeechEnd, Turn
+from assistant.sessions import CallSession, DialogHandler, SessionManager
+from assistant.stand_ins import (
+    SILENCE_FRAME, SPEECH_FRAME, InMemoryBookingBackend, ScriptedTranscriber, extract_intent, stand_in_speech
+)
+
+UTTERANCES = [
+    "yarın saat 15:30 için randevu almak istiyorum",
+    "onu yarın dört buçuğa değiştirebilir miyiz",
+    "randevumu iptal etmek istiyorum",
+]
+SPEECH_FRAMES = 80 # 1.6 s
+CYCLE_FRAMES = 250 # 5 s
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))]
+
+
+class StuckTranscriber(ScriptedTranscriber):
+    """
+    Belirli çağrılarda hiç dönmeyen tanıma (ör. yanıt vermeyen dış servis).
+    """
+
+    def __init__(self, stuck: Set[str], **kwargs):
+        super().__init__({}, default=UTTERANCES, **kwargs)
+        self.stuck = stuck
+
+    async def transcribe(self, call_id: str, turn: Turn) -> str:
+        if call_id in self.stuck:
+            await asyncio.sleep(3600)
+        return await super().transcribe(call_id, turn)
+
+
+def make_manager(calls: int, stuck: Set[str], turn_latencies: List[float]) -> SessionManager:
+    dialog = DialogHandler(
+        StuckTranscriber(stuck, delay=0.05),
+        InMemoryBookingBackend(latency=0.08),
+        lambda text: stand_in_speech(text, ms_per_char=40),
+        extract_intent,
+    )
+
+    async def handler(manager: SessionManager, session: CallSession, event: Any) -> None:
+        await dialog(manager, session, event)
+        if isinstance(event, SpeechEnd) and event.turn.latency is not None:
+            turn_latencies.append(event.turn.latency)
+
+    return SessionManager(capacity=calls, handler=handler, workers=64, handler_timeout=1.0)
+
+
+def array_bytes(owner: Any) -> int:
+    # Görünümler (ör. halka tamponun düzleştirilmiş hali) sahibi olan diziyle birlikte sayılmış olur
+    return sum(
+        value.nbytes for value in vars(owner).values() if isinstance(value, np.ndarray) and value.base is None
+    )
+
+
+def memory_per_call(calls: int) -> tuple:
+    manager = make_manager(calls, set(), [])
+    preallocated = array_bytes(manager.vad) + array_bytes(manager.vad.features)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for index in range(calls):
+        manager.open(f"call-{index}")
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    objects = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return preallocated / calls, objects / calls
+
+
+async def run_level(calls: int, seconds: float) -> None:
+    preallocated, objects = memory_per_call(calls)
+    rng = random.Random(calls)
+    stuck = {f"call-{index}" for index in rng.sample(range(calls), max(1, calls // 100))}
+    turn_latencies: List[float] = []
+    manager = make_manager(calls, stuck, turn_latencies)
+    await manager.start()
+    call_ids = [f"call-{index}" for index in range(calls)]
+    for call_id in call_ids:
+        manager.open(call_id)
+    # Çağrılar döngünün farklı noktalarından başlar; hepsi aynı anda konuşmaz
+    phases = [rng.randrange(CYCLE_FRAMES) for _ in call_ids]
+
+    loop = asyncio.get_running_loop()
+    interval = FRAME_MS / 1000
+    frames = int(seconds * 1000 / FRAME_MS)
+    wall, cpu = time.perf_counter(), time.process_time()
+    next_at = loop.time()
+    for index in range(frames):
+        next_at += interval
+        delay = next_at - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        for call_id, phase in zip(call_ids, phases):
+            position = (index + phase) % CYCLE_FRAMES
+            manager.feed(call_id, SPEECH_FRAME if position < SPEECH_FRAMES else SILENCE_FRAME)
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    stats = manager.stats()
+    await manager.stop()
+
+    scheduling = list(manager.scheduling_latency)
+    lag = list(manager.tick_lag)
+    print(
+        f"{calls:>5} calls  memory/call {preallocated / 1024:5.1f} KiB prealloc + {objects / 1024:4.1f} KiB objects  "
+        f"sched p50 {percentile(scheduling, 50) * 1000:5.1f} ms p99 {percentile(scheduling, 99) * 1000:6.1f} ms  "
+        f"tick lag p50 {percentile(lag, 50) * 1000:4.1f} ms p99 {percentile(lag, 99) * 1000:5.1f} ms  "
+        f"turn p50 {percentile(turn_latencies, 50) * 1000:4.0f} ms p99 {percentile(turn_latencies, 99) * 1000:5.0f} ms "
+        f"({len(turn_latencies)} turns)  timeouts {stats['handler_timeouts']}  dropped frames {stats['dropped_frames']}  "
+        f"cpu {cpu / wall:4.0%}"
+    )
+
+
+async def main(levels: List[int], seconds: float) -> None:
+    for calls in levels:
+        await run_level(calls, seconds)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--levels", type=int, nargs="+", default=[100, 500, 1000], help="Eşzamanlı çağrı sayıları")
+    parser.add_argument("--seconds", type=float, default=10, help="Her seviyenin süresi")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+    asyncio.run(main(args.levels, args.seconds))
@@ -0,0 +1,151 @@
+"""
+Akışlı TTS'nin ilk ses gecikmesine ve araya girmeye (barge-in) etkisi.
+
+pipeline_latency ile aynı çevrimdışı hat, çok cümleli yanıtlar üreten bir backend ile iki biçimde çalıştırılır:
+  - whole reply: yanıtın tamamı tek istekte sentezlenir (StandInSynthesizer)
+  - streaming: yanıt cümle / yan cümle parçalarına bölünür, ilk parça çalınırken sonrakiler sentezlenir
+    (StreamingSynthesizer + BargeInStage)
+Her iki modda da aynı maliyet modeli kullanılır (istek başına 50 ms + karakter başına 1 ms sentez, karakter başına
+60 ms ses). Hattın sonunda çağrı başına gerçek zamanlı bir çalar bulunur; arayan her yanıtın ortasında konuşmaya
+başlar (son yanıt hariç), çalar SpeechStart aldığında tamponunu boşaltır.
+
+Raporlanan değerler:
+  - ilk ses: sıra gecikmesi (konuşma sonu -> ilk ses) ve sentez beklemesi (yanıt metni -> ilk ses) p50/p99
+  - araya girme: konuşma başlangıcından çaların durmasına ve TTS'nin sentezi kesmesine kadar geçen süre p50/p99
+    (konuşma başlangıcı VAD'nin geriye dönük tespit ettiği an olduğundan onset_frames süresi (60 ms) dahildir)
+  - boşa giden iş: sentezlenip çalınmayan ses ve iptal edilen / hiç başlatılmayan sentez parçaları
+
+Çalıştırma (assistant/ dizininden):
+    python -m benchmarks.tts_latency --calls 20
+"""
+
+import argparse
+import asyncio
+import statistics
+from typing import Any, Dict, List, Optional, Tuple
+
+from assistant.pipeline import FRAME_BYTES, FRAME_MS, AudioOut, Pipeline, SpeechStart, Turn, now
+from assistant.stand_ins import InMemoryBookingBackend, ScriptedCaller, StandInChunkSynthesizer, stand_in_stages
+from assistant.tts import StreamingSynthesizer
+
+SCRIPT = [
+    "merhaba yarın saat 15:30 için randevu almak istiyorum",
+    "pardon onu yarın dört buçuğa değiştirebilir miyiz",
+    "teşekkürler aslında randevumu iptal etmek istiyorum",
+]
+# Asistanın yanıtlarına eklenen açıklamalar (gerçek hatta LLM'in ürettiği uzun yanıtların yerine)
+DETAILS = (
+    "Randevunuzdan on beş dakika önce salonda olmanızı rica ederiz. "
+    "Gecikmeniz durumunda sıradaki müşterilerimizi bekletmemek için randevunuz kısaltılabilir. "
+    "Randevu saatinden bir gün öncesine kadar ücretsiz olarak değişiklik yapabilirsiniz. "
+    "Başka bir konuda yardımcı olabileceğim bir şey var mı?"
+)
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class VerboseBookingBackend(InMemoryBookingBackend):
+    """
+    Her yanıtın sonuna DETAILS ekleyen backend.
+    """
+
+    async def handle(self, call_id: str, intent: Optional[str], slots: Dict[str, Any]) -> str:
+        return f"{await super().handle(call_id, intent, slots)} {DETAILS}"
+
+
+class Player:
+    """
+    Çağrının hoparlörü: gelen sesi tamponlar ve gerçek zamanlı çalar; SpeechStart'ta tamponu boşaltır.
+    """
+
+    def __init__(self):
+        self.playing_until = 0.0
+        self.turn_id = -1
+        self.barge_ins: List[Tuple[Turn, float]] = [] # (yeni sıra, çaların durduğu an)
+        self.wasted = 0.0 # Sentezlenip çalınmayan ses (s)
+
+    def feed(self, item: Any) -> None:
+        at = now()
+        if isinstance(item, SpeechStart):
+            self.turn_id = item.turn.turn_id
+            if self.playing_until > at:
+                self.wasted += self.playing_until - at
+                self.playing_until = at
+                self.barge_ins.append((item.turn, at))
+        elif isinstance(item, AudioOut):
+            seconds = len(item.pcm) // FRAME_BYTES * FRAME_MS / 1000
+            if item.turn.turn_id < self.turn_id:
+                # Arayan konuşmaya başladıktan sonra gelen eski yanıtın sesi çalınmaz
+                self.wasted += seconds
+                return
+            self.playing_until = max(self.playing_until, at) + seconds
+
+
+async def run_call(call_id: str, streaming: bool, synthesizer: StandInChunkSynthesizer) -> Tuple[List[Turn], Player, Dict[str, int]]:
+    scripts = {call_id: SCRIPT}
+    caller = ScriptedCaller(call_id, SCRIPT)
+    tts = StreamingSynthesizer(synthesizer) if streaming else None
+    pipeline = Pipeline(stand_in_stages(scripts, backend=VerboseBookingBackend(), synthesizer=tts))
+    player = Player()
+    turns: Dict[int, Turn] = {}
+    async for item in pipeline.run(caller):
+        player.feed(item)
+        if isinstance(item, AudioOut):
+            turns[item.turn.turn_id] = item.turn
+    return list(turns.values()), player, tts.stats() if tts is not None else {}
+
+
+def ms(values: List[float], q: float) -> str:
+    return f"{percentile(values, q) * 1000:4.0f}ms" if values else "   -  "
+
+
+async def run_mode(calls: int, streaming: bool) -> float:
+    synthesizer = StandInChunkSynthesizer()
+    results = await asyncio.gather(*(run_call(f"call-{index}", streaming, synthesizer) for index in range(calls)))
+    turns = [turn for call_turns, _, _ in results for turn in call_turns]
+    latencies = [turn.latency for turn in turns if turn.latency is not None]
+    synthesis = [turn.first_audio_at - turn.reply_at for turn in turns if turn.first_audio_at is not None]
+    players = [player for _, player, _ in results]
+    stops = [at - turn.speech_start_at for player in players for turn, at in player.barge_ins]
+    # Araya girilen yanıt -> araya giren sıranın konuşma başlangıcı
+    barge_in_at = {(turn.call_id, turn.turn_id - 1): turn.speech_start_at for player in players for turn, _ in player.barge_ins}
+    cut = [
+        turn.audio_stopped_at - barge_in_at[(turn.call_id, turn.turn_id)]
+        for turn in turns if turn.audio_stopped_at is not None and (turn.call_id, turn.turn_id) in barge_in_at
+    ]
+    counters: Dict[str, int] = {}
+    for _, _, stats in results:
+        for key, value in stats.items():
+            counters[key] = counters.get(key, 0) + value
+    label = "streaming" if streaming else "whole reply"
+    print(
+        f"{label:<12} first audio: turn p50={ms(latencies, 50)} p99={ms(latencies, 99)}  "
+        f"synthesis wait p50={ms(synthesis, 50)} p99={ms(synthesis, 99)}  turns={len(latencies)}/{calls * len(SCRIPT)}"
+    )
+    print(
+        f"{'':<12} barge-in: {len(barge_in_at)} replies  player stop p50={ms(stops, 50)} p99={ms(stops, 99)}  "
+        f"synthesis cut p50={ms(cut, 50)} p99={ms(cut, 99)}"
+    )
+    print(
+        f"{'':<12} wasted: {sum(player.wasted for player in players):.1f}s synthesized audio not played  "
+        f"synth requests={synthesizer.requests} cancelled in flight={synthesizer.cancelled}  {counters or ''}"
+    )
+    return statistics.median(latencies)
+
+
+async def main(calls: int) -> None:
+    print(f"each reply + {len(DETAILS)} chars of details (~{len(DETAILS) * 60 / 1000:.0f}s audio), caller pause 1.5s")
+    whole = await run_mode(calls, False)
+    streaming = await run_mode(calls, True)
+    print(f"saved on first audio: p50 {(whole - streaming) * 1000:.0f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=20, help="Eşzamanlı çağrı sayısı")
+    args = parser.parse_args()
+    asyncio.run(main(args.calls))
@@ -0,0 +1,108 @@
+"""
+VAD ölçümü: tek çekirdekte saniyede işlenen çerçeve sayısı ve sentetik kliplerde doğruluk.
+
+Hız üç şekilde ölçülür:
+  - detector/20ms: her çağrının kendi dedektörü vardır, çerçeveler telefondaki gibi 20 ms'lik tek tek gelir.
+  - detector/1s: çerçeveler 1 saniyelik (50 çerçeve) parçalar halinde işlenir.
+  - bank/20ms: tüm çağrılar tek bir VADBank'te; her tick'te her çağrının bir çerçevesi birlikte işlenir.
+Doğruluk, olaylardan (başlangıç/bitiş) çıkarılan konuşma bölümlerinin çerçeve etiketleriyle karşılaştırılmasıdır.
+
+Çalıştırma (assistant/ dizininden):
+    python -m benchmarks.vad_benchmark
+"""
+
+import argparse
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from assistant.pipeline import FRAME_BYTES
+from assistant.vad import VADBank, VoiceActivityDetector
+from benchmarks.vad_clips import BACKGROUNDS, Clip, make_clips
+
+
+def detected_labels(clip: Clip, chunk_frames: int = 1) -> np.ndarray:
+    detector = VoiceActivityDetector()
+    pcm = memoryview(clip.pcm)
+    step = chunk_frames * FRAME_BYTES
+    events = []
+    for offset in range(0, len(pcm), step):
+        events.extend(detector.process(pcm[offset:offset + step]))
+    labels = np.zeros(len(clip.labels), dtype=bool)
+    start = None
+    for event in events:
+        if event.kind == "start":
+            start = event.frame
+        else:
+            labels[start:event.frame] = True
+            start = None
+    if start is not None:
+        labels[start:] = True
+    return labels
+
+
+def accuracy(clips: List[Clip]) -> None:
+    per_background: Dict[str, List[np.ndarray]] = {background: [] for background in BACKGROUNDS}
+    totals = np.zeros(4, dtype=np.int64) # tp, fp, fn, tn
+    for clip in clips:
+        detected = detected_labels(clip)
+        truth = clip.labels
+        counts = np.array([
+            np.sum(detected & truth), np.sum(detected & ~truth), np.sum(~detected & truth), np.sum(~detected & ~truth)
+        ])
+        totals += counts
+        per_background[clip.name.rsplit("-", 1)[0]].append(counts)
+    print("background  frame-acc  precision  recall")
+    for background, rows in list(per_background.items()) + [("all", [totals])]:
+        tp, fp, fn, tn = np.sum(rows, axis=0)
+        print(f"{background:<10}  {(tp + tn) / (tp + fp + fn + tn):9.3f}  {tp / max(tp + fp, 1):9.3f}  {tp / max(tp + fn, 1):6.3f}")
+
+
+def throughput(clips: List[Clip], chunk_frames: int, calls: int) -> float:
+    # Her çağrının kendi dedektörü; çağrılar sırayla birer parça işler (çok çağrılı sunucudaki gibi)
+    detectors = [VoiceActivityDetector() for _ in range(calls)]
+    streams = [memoryview(clips[index % len(clips)].pcm) for index in range(calls)]
+    step = chunk_frames * FRAME_BYTES
+    length = min(len(stream) for stream in streams) // step * step
+    started = time.process_time()
+    for offset in range(0, length, step):
+        for detector, stream in zip(detectors, streams):
+            detector.process(stream[offset:offset + step])
+    elapsed = time.process_time() - started
+    return calls * length / FRAME_BYTES / elapsed
+
+
+def bank_throughput(clips: List[Clip], calls: int) -> float:
+    bank = VADBank(calls)
+    slots = [bank.open() for _ in range(calls)]
+    streams = [memoryview(clips[index % len(clips)].pcm) for index in range(calls)]
+    length = min(len(stream) for stream in streams) // FRAME_BYTES * FRAME_BYTES
+    started = time.process_time()
+    for offset in range(0, length, FRAME_BYTES):
+        for slot, stream in zip(slots, streams):
+            bank.write(slot, stream[offset:offset + FRAME_BYTES])
+        bank.step()
+    elapsed = time.process_time() - started
+    return calls * length / FRAME_BYTES / elapsed
+
+
+def main(calls: int) -> None:
+    clips = make_clips()
+    accuracy(clips)
+    print()
+    print(f"{calls} calls")
+    rates = [
+        ("detector/20ms", throughput(clips, 1, calls)),
+        ("detector/1s", throughput(clips, 50, calls)),
+        ("bank/20ms", bank_throughput(clips, calls)),
+    ]
+    for label, rate in rates:
+        print(f"{label:<14} {rate:>10,.0f} frames/s/core  (~{rate / 50:,.0f} real-time calls per core)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=100, help="Ölçümde eşzamanlı çağrı sayısı")
+    args = parser.parse_args()
+    main(args.calls)
@@ -0,0 +1,119 @@
+"""
+VAD doğruluk ölçümü için sentetik 8 kHz test klipleri.
+
+Klipler sabit tohumla (seed) üretilir; her çalıştırmada aynı ses ve aynı çerçeve etiketleri elde edilir.
+Konuşma yerine, perdesi kayan harmonik seriler (sesli harfler) ve bant geçiren gürültü patlamaları
+(sürtünmeli ünsüzler) hece zarfıyla birleştirilir; aralara farklı uzunlukta sessizlikler konur.
+Arka plan: beyaz gürültü (20 / 10 dB SNR), pembe gürültü, 50 Hz şebeke uğultusu ve temiz hat.
+"""
+
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+
+from assistant.pipeline import FRAME_SAMPLES, SAMPLE_RATE
+
+SPEECH_RMS = 0.1 # Konuşmanın ortalama seviyesi (-20 dBFS)
+
+
+@dataclass
+class Clip:
+    name: str
+    pcm: bytes
+    labels: np.ndarray # Çerçeve başına gerçek değer (True = konuşma)
+
+
+def _voiced(rng: np.random.Generator, samples: int) -> np.ndarray:
+    t = np.arange(samples) / SAMPLE_RATE
+    f0 = rng.uniform(100, 220) * (1 + 0.15 * np.sin(2 * np.pi * rng.uniform(0.5, 2) * t))
+    phase = 2 * np.pi * np.cumsum(f0) / SAMPLE_RATE
+    signal = np.zeros(samples)
+    harmonics = int(3400 // f0.max())
+    # Formant benzeri vurgu için harmonik genlikleri rastgele tepe frekanslarına göre ağırlıklandırılır
+    formants = rng.uniform([500, 1200], [900, 2400])
+    for k in range(1, harmonics + 1):
+        frequency = k * f0.mean()
+        weight = sum(np.exp(-((frequency - f) / 250) ** 2) for f in formants) + 0.2 / k
+        signal += weight * np.sin(k * phase)
+    return signal
+
+
+def _fricative(rng: np.random.Generator, samples: int) -> np.ndarray:
+    spectrum = np.fft.rfft(rng.standard_normal(samples))
+    frequencies = np.fft.rfftfreq(samples, 1 / SAMPLE_RATE)
+    spectrum[(frequencies < 2000) | (frequencies > 3800)] = 0
+    return np.fft.irfft(spectrum, samples)
+
+
+def _utterance(rng: np.random.Generator, samples: int) -> np.ndarray:
+    signal = _voiced(rng, samples)
+    # Hece zarfı: 3-6 Hz, heceler arasında enerji düşer ama sıfıra inmez
+    t = np.arange(samples) / SAMPLE_RATE
+    envelope = 0.35 + 0.65 * np.sin(np.pi * rng.uniform(3, 6) * t) ** 2
+    signal *= envelope
+    # Bazı hecelerin başına sürtünmeli ünsüz eklenir
+    for start in rng.choice(max(1, samples - 800), size=rng.integers(1, 4), replace=False):
+        length = int(rng.uniform(0.05, 0.1) * SAMPLE_RATE)
+        burst = _fricative(rng, length)
+        signal[start:start + length] += burst * (np.std(signal) / max(np.std(burst), 1e-9)) * 0.6
+    # Başlangıç ve bitişte yumuşak geçiş
+    ramp = min(samples // 4, int(0.03 * SAMPLE_RATE))
+    signal[:ramp] *= np.linspace(0, 1, ramp)
+    signal[-ramp:] *= np.linspace(1, 0, ramp)
+    return signal / np.sqrt(np.mean(signal ** 2)) * SPEECH_RMS
+
+
+def _background(rng: np.random.Generator, kind: str, samples: int) -> np.ndarray:
+    if kind == "clean":
+        return rng.standard_normal(samples) * 10 ** (-70 / 20)
+    if kind.startswith("white"):
+        snr = float(kind.split("_")[1])
+        return rng.standard_normal(samples) * SPEECH_RMS * 10 ** (-snr / 20)
+    if kind == "pink":
+        spectrum = np.fft.rfft(rng.standard_normal(samples))
+        spectrum /= np.sqrt(np.maximum(np.fft.rfftfreq(samples, 1 / SAMPLE_RATE), 20))
+        noise = np.fft.irfft(spectrum, samples)
+        return noise / np.sqrt(np.mean(noise ** 2)) * SPEECH_RMS * 10 ** (-15 / 20)
+    if kind == "hum":
+        t = np.arange(samples) / SAMPLE_RATE
+        hum = sum(np.sin(2 * np.pi * 50 * k * t) / k for k in (1, 3, 5, 7))
+        return hum / np.sqrt(np.mean(hum ** 2)) * SPEECH_RMS * 10 ** (-20 / 20)
+    raise ValueError(f"Unknown background: {kind}")
+
+
+BACKGROUNDS = ("clean", "white_20", "white_10", "pink", "hum")
+
+
+def make_clip(rng: np.random.Generator, name: str, background: str, seconds: float = 8.0) -> Clip:
+    """
+    Sessizlik ve konuşma bölümleri dönüşümlü olan bir klip ve çerçeve etiketlerini üretir.
+    """
+    frames = int(seconds * SAMPLE_RATE) // FRAME_SAMPLES
+    samples = frames * FRAME_SAMPLES
+    signal = np.zeros(samples)
+    labels = np.zeros(frames, dtype=bool)
+    position = int(rng.uniform(0.3, 1.0) * SAMPLE_RATE)
+    segments: List[Tuple[int, int]] = []
+    while True:
+        length = int(rng.uniform(0.6, 2.2) * SAMPLE_RATE)
+        if position + length >= samples - int(0.3 * SAMPLE_RATE):
+            break
+        signal[position:position + length] = _utterance(rng, length)
+        segments.append((position, position + length))
+        position += length + int(rng.uniform(0.4, 1.5) * SAMPLE_RATE)
+    for start, end in segments:
+        # Yarısından fazlası konuşma olan çerçeveler konuşma sayılır
+        labels[(start + FRAME_SAMPLES // 2) // FRAME_SAMPLES:(end + FRAME_SAMPLES // 2) // FRAME_SAMPLES] = True
+    signal += _background(rng, background, samples)
+    pcm = np.clip(np.round(signal * 32768), -32768, 32767).astype("<i2").tobytes()
+    return Clip(name, pcm, labels)
+
+
+def make_clips(per_background: int = 8, seed: int = 20240601) -> List[Clip]:
+    rng = np.random.default_rng(seed)
+    return [
+        make_clip(rng, f"{background}-{index}", background)
+        for background in BACKGROUNDS
+        for index in range(per_background)
+    ]
@@ -1,5 +1,45 @@
+import asyncio
+import logging
+
+from assistant.pipeline import AudioOut, Pipeline, Reply, Stage, Transcript
+from assistant.stand_ins import ScriptedCaller, stand_in_stages
+
+DEMO_SCRIPT = [
+    "merhaba yarın saat 15:30 için randevu almak istiyorum",
+    "aslında randevumu iptal etmek istiyorum",
+]
+
+
+class _Printer(Stage):
+    # Nihai transkriptleri ve yanıt metinlerini yazdırıp değiştirmeden ileten aşama
+    name = "print"
+
+    async def process(self, item):
+        if isinstance(item, Transcript) and item.is_final:
+            print(f"arayan  : {item.text}")
+        elif isinstance(item, Reply):
+            print(f"asistan : {item.text}")
+        yield item
+
+
+async def run_demo() -> None:
+    """
+    Yedek aşamalarla tek bir örnek görüşmeyi gerçek zamanlı çalıştırır ve sıra gecikmelerini yazdırır.
+    """
+    scripts = {"demo": DEMO_SCRIPT}
+    stages = stand_in_stages(scripts)
+    # Transkriptler NLU'dan, yanıtlar TTS'ten önce görülür
+    stages.insert(2, _Printer())
+    stages.insert(len(stages) - 1, _Printer())
+    pipeline = Pipeline(stages)
+    async for item in pipeline.run(ScriptedCaller("demo", DEMO_SCRIPT)):
+        if isinstance(item, AudioOut) and item.is_last:
+            print(f"          (ilk ses gecikmesi: {item.turn.latency * 1000:.0f} ms)")
+
+
 def main():
-    print("Hello from assistant!")
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_demo())
 
 
 if __name__ == "__main__":
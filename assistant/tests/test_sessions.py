@@ -0,0 +1,35 @@
+# tests/test_sessions.py
+
+import asyncio
+
+from assistant.sessions import CallStarted, SessionManager, TimerFired, TimerKind
+
+
+def test_reopening_a_closed_slot_keeps_the_new_session_scheduled():
+    """
+    Kapatılan oturum henüz kuyruktan alınmadan slotu yeni oturuma verildiğinde open() hata vermemeli
+    ve yeni oturumun sonraki olayları da işlenmeli (capacity=2: open a, open b, close a, open c).
+    """
+    async def run():
+        seen = []
+
+        async def handler(manager, session, event):
+            seen.append((session.call_id, type(event).__name__))
+
+        manager = SessionManager(capacity=2, handler=handler, workers=1)
+        await manager.start()
+        try:
+            manager.open("a")
+            manager.open("b")
+            manager.close("a")
+            session = manager.open("c")
+            await asyncio.sleep(0.05)
+            assert manager.post(session, TimerFired(TimerKind.NO_INPUT))
+            await asyncio.sleep(0.05)
+        finally:
+            await manager.stop()
+        return seen
+
+    seen = asyncio.run(run())
+    assert ("a", CallStarted.__name__) not in seen # Kapatılan oturumun olayları işlenmez
+    assert [event for call_id, event in seen if call_id == "c"] == [CallStarted.__name__, TimerFired.__name__]
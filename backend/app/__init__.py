@@ -3,6 +3,7 @@ import app.models.company
 import app.models.appointment
 import app.models.company_service
 import app.models.appointment_service
+import app.models.appointment_rollup
 
 from fastapi import FastAPI
 from app.core.database.database import engine # veya session
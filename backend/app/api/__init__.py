@@ -5,7 +5,7 @@ from fastapi import APIRouter
 # Endpoint router'larını içe aktarın
 # Bu dosyalar henüz oluşturulmadıysa, bu satırlar hata verecektir.
 # Ancak API endpoint'lerini oluşturduğunuzda bu hatalar gidecektir.
-from app.api.endpoints.v1 import auth
+from app.api.endpoints.v1 import auth, appointments, metrics, reports, calls
 
 # Ana API yönlendiricisini oluşturun
 api_router = APIRouter()
@@ -14,3 +14,7 @@ api_router = APIRouter()
 # prefix: Bu router'daki tüm endpoint'lerin başına eklenecek yol.
 # tags: Swagger UI'da bu endpoint'leri gruplamak için kullanılır.
 api_router.include_router(auth.router, prefix="/auth", tags=["Auth"])
+api_router.include_router(appointments.router, prefix="/appointments", tags=["Appointments"])
+api_router.include_router(metrics.router, prefix="/metrics", tags=["Metrics"])
+api_router.include_router(reports.router, prefix="/reports", tags=["Reports"])
+api_router.include_router(calls.router, prefix="/calls", tags=["Calls"])
@@ -0,0 +1,238 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import sessionmaker
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Literal, Optional, Sequence, Type
+from datetime import datetime
+from uuid import UUID
+
+from app.core.database.database import get_db, get_session_factory
+from app.core.config import get_settings
+from app.core.security import get_current_active_user, get_current_manager_user, scope_company_id, scope_user_id # Aktif kullanıcı, yönetici ve şirket/kullanıcı kapsamı kontrolleri
+from app.models.user import User
+from app.schemas.availability import AvailableSlot
+from app.schemas.appointment import AppointmentBulkCreate, AppointmentBulkCreateResult, AppointmentCalendarItem, AppointmentPartialRead
+from app.schemas.common import CursorPage
+from app.schemas.company_service import CompanyServiceRead
+from app.schemas.user import UserRead
+from app.models.appointment import Appointment, AppointmentStatus
+from app.core.pagination import next_cursor
+from app.core.responses import adapter_response
+from app.bussines_logics.availability import get_available_slots
+from app.bussines_logics.appointment_export import EXPORT_FORMATS
+from app.crud.crud_appointment import (
+    bulk_create_appointments, get_appointments, get_appointment_calendar, stream_appointment_export,
+    APPOINTMENT_KEYSET, APPOINTMENT_FIELDS, DEFAULT_APPOINTMENT_RELATIONS
+)
+import logging
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+settings = get_settings()
+
+# Büyük liste yanıtları için bir kez oluşturulan adapter'lar (bkz. app.core.responses.adapter_response)
+APPOINTMENT_PAGE_ADAPTER = TypeAdapter(CursorPage[AppointmentPartialRead])
+CALENDAR_PAGE_ADAPTER = TypeAdapter(CursorPage[AppointmentCalendarItem])
+AVAILABLE_SLOTS_ADAPTER = TypeAdapter(List[AvailableSlot])
+
+def _split_names(value: Optional[str]) -> Optional[List[str]]:
+    # "a,b , c" -> ["a", "b", "c"]; parametre verilmediyse None (varsayılan projeksiyon)
+    if value is None:
+        return None
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+def _read_once(converted: Dict[int, BaseModel], schema: Type[BaseModel], instance: Any) -> Optional[BaseModel]:
+    # Aynı sayfada birçok randevunun paylaştığı kullanıcı/hizmet nesneleri (oturumun identity map'i
+    # sayesinde aynı Python nesnesidir) şemaya bir kez çevrilir; örn. EmailStr doğrulaması her satırda tekrarlanmaz.
+    if instance is None:
+        return None
+    key = id(instance)
+    if key not in converted:
+        converted[key] = schema.model_validate(instance)
+    return converted[key]
+
+def _project(
+    appointment: Appointment,
+    fields: Optional[Sequence[str]],
+    include: Optional[Sequence[str]],
+    converted: Dict[int, BaseModel]
+) -> Dict[str, Any]:
+    """
+    Randevunun yalnızca yüklenen (istenen) alanlarını sözlüğe çevirir.
+    Yüklenmemiş alanlara erişmek async oturumda ek (lazy) sorgu gerektireceği için okunmaz.
+    """
+    names = APPOINTMENT_FIELDS.keys() if fields is None else ["id", *fields]
+    data = {name: getattr(appointment, name) for name in names}
+    relations = DEFAULT_APPOINTMENT_RELATIONS if include is None else include
+    if "user" in relations:
+        data["user"] = _read_once(converted, UserRead, appointment.user)
+    if "services" in relations:
+        data["services"] = [_read_once(converted, CompanyServiceRead, service) for service in appointment.services]
+    if "appointment_services" in relations:
+        data["appointment_services"] = appointment.appointment_services
+    return data
+
+@router.get("", response_model=CursorPage[AppointmentPartialRead], response_model_exclude_unset=True)
+async def list_appointments(
+    user_id: Optional[UUID] = Query(None, description="Kullanıcıya göre filtre."),
+    company_id: Optional[int] = Query(None, description="Şirkete göre filtre."),
+    start_date: Optional[datetime] = Query(None, description="Bu zamandan sonra başlayan randevular."),
+    end_date: Optional[datetime] = Query(None, description="Bu zamandan önce biten randevular."),
+    status: Optional[AppointmentStatus] = Query(None, description="Randevu durumuna göre filtre."),
+    skip: int = Query(0, ge=0, description="Atlanacak kayıt sayısı (cursor verilmediğinde)."),
+    limit: int = Query(100, ge=1, le=1000, description="Döndürülecek kayıt sayısı."),
+    cursor: Optional[str] = Query(None, description="Önceki yanıttaki next_cursor değeri."),
+    fields: Optional[str] = Query(None, description="Virgülle ayrılmış alanlar (örn. appointment_time,end_time,status); verilmezse tümü."),
+    include: Optional[str] = Query(None, description="Virgülle ayrılmış ilişkiler (user, services, appointment_services); verilmezse user,services. Boş değer ilişki yüklemez."),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Randevuları (appointment_time, id) sırasıyla listeler.
+    Derin sayfalar için skip yerine yanıttaki next_cursor değeri kullanılmalıdır.
+    fields ve include ile yalnızca istenen sütunlar ve ilişkiler yüklenir ve döndürülür.
+    Admin olmayan kullanıcılar yalnızca kendi şirketlerinin randevularını görür.
+    """
+    company_id = scope_company_id(current_user, company_id)
+    field_names = _split_names(fields)
+    relation_names = _split_names(include)
+    appointments = await get_appointments(
+        db,
+        user_id=user_id,
+        company_id=company_id,
+        start_date=start_date,
+        end_date=end_date,
+        status=status,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        fields=field_names,
+        include=relation_names
+    )
+    converted: Dict[int, BaseModel] = {}
+    return adapter_response(APPOINTMENT_PAGE_ADAPTER, {
+        "items": [_project(appointment, field_names, relation_names, converted) for appointment in appointments],
+        "next_cursor": next_cursor(appointments, limit, APPOINTMENT_KEYSET)
+    }, exclude_unset=True)
+
+@router.get("/calendar", response_model=CursorPage[AppointmentCalendarItem])
+async def read_appointment_calendar(
+    user_id: Optional[UUID] = Query(None, description="Kullanıcıya göre filtre."),
+    company_id: Optional[int] = Query(None, description="Şirkete göre filtre."),
+    start_date: Optional[datetime] = Query(None, description="Bu zamandan sonra başlayan randevular."),
+    end_date: Optional[datetime] = Query(None, description="Bu zamandan önce biten randevular."),
+    status: Optional[AppointmentStatus] = Query(None, description="Randevu durumuna göre filtre."),
+    limit: int = Query(500, ge=1, le=5000, description="Döndürülecek kayıt sayısı."),
+    cursor: Optional[str] = Query(None, description="Önceki yanıttaki next_cursor değeri."),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Takvim ızgaraları için randevuların yalnızca zaman ve durum bilgilerini döndürür.
+    İlişki yüklenmez; sayfa başına tek sorgu çalışır. Admin olmayan kullanıcılar yalnızca kendi şirketlerini görür.
+    """
+    company_id = scope_company_id(current_user, company_id)
+    rows = await get_appointment_calendar(
+        db,
+        user_id=user_id,
+        company_id=company_id,
+        start_date=start_date,
+        end_date=end_date,
+        status=status,
+        limit=limit,
+        cursor=cursor
+    )
+    return adapter_response(CALENDAR_PAGE_ADAPTER, {
+        "items": rows,
+        "next_cursor": next_cursor(rows, limit, APPOINTMENT_KEYSET)
+    })
+
+@router.get("/export")
+async def export_appointments(
+    format: Literal["csv", "ndjson"] = Query("csv", description="Dışa aktarma biçimi."),
+    user_id: Optional[UUID] = Query(None, description="Kullanıcıya göre filtre."),
+    company_id: Optional[int] = Query(None, description="Şirkete göre filtre."),
+    start_date: Optional[datetime] = Query(None, description="Bu zamandan sonra başlayan randevular."),
+    end_date: Optional[datetime] = Query(None, description="Bu zamandan önce biten randevular."),
+    status: Optional[AppointmentStatus] = Query(None, description="Randevu durumuna göre filtre."),
+    session_factory: sessionmaker = Depends(get_session_factory),
+    current_user: User = Depends(get_current_manager_user)
+):
+    """
+    Randevuları hizmet adları ve toplam tutarlarıyla birlikte CSV veya NDJSON olarak akış halinde dışa aktarır.
+    Satırlar sunucu tarafı imleçle parça parça okunur ve yazılır; bellek kullanımı satır sayısından bağımsızdır.
+    Yöneticiler yalnızca kendi şirketlerini dışa aktarabilir; şirket verilmezse tüm şirketler yalnızca adminlere açıktır.
+    """
+    company_id = scope_company_id(current_user, company_id)
+    logger.info("Appointment export (%s) requested by %s: company_id=%s, user_id=%s, %s - %s", format, current_user.id, company_id, user_id, start_date, end_date)
+    encode, media_type = EXPORT_FORMATS[format]
+
+    async def body():
+        # Yanıt gövdesi uç nokta döndükten sonra üretilir; bu yüzden oturum burada açılır
+        async with session_factory() as session:
+            batches = stream_appointment_export(
+                session,
+                user_id=user_id,
+                company_id=company_id,
+                start_date=start_date,
+                end_date=end_date,
+                status=status,
+                batch_size=settings.EXPORT_BATCH_SIZE
+            )
+            async for chunk in encode(batches):
+                yield chunk
+
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="appointments.{format}"'}
+    )
+
+@router.get("/availability", response_model=List[AvailableSlot])
+async def read_available_slots(
+    start: datetime = Query(..., description="Aranan aralığın başlangıcı (ISO 8601)."),
+    end: datetime = Query(..., description="Aranan aralığın bitişi (ISO 8601)."),
+    duration_minutes: int = Query(..., ge=1, le=1440, description="İstenen toplam hizmet süresi (dakika)."),
+    company_id: Optional[int] = Query(None, description="Şirket bazlı arama için şirket ID'si."),
+    user_id: Optional[UUID] = Query(None, description="Kullanıcı bazlı arama için kullanıcı ID'si."),
+    slot_step_minutes: int = Query(15, ge=1, le=1440, description="Slot başlangıçları arasındaki adım (dakika)."),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Bir şirket veya kullanıcı için verilen aralıktaki tüm boş randevu slotlarını döndürür.
+    Adminler dışındaki kullanıcılar yalnızca kendi şirketlerini ve şirketlerinin çalışanlarını sorgulayabilir;
+    şirket veya kullanıcı verilmezse kendi şirketleri aranır.
+    """
+    if user_id is not None:
+        user_id = await scope_user_id(db, current_user, user_id)
+    if user_id is None or company_id is not None:
+        company_id = scope_company_id(current_user, company_id)
+    logger.debug("Availability requested by %s: company_id=%s, user_id=%s, %s - %s, duration=%s", current_user.id, company_id, user_id, start, end, duration_minutes)
+    slots = await get_available_slots(
+        db,
+        range_start=start,
+        range_end=end,
+        duration_minutes=duration_minutes,
+        company_id=company_id,
+        user_id=user_id,
+        slot_step_minutes=slot_step_minutes
+    )
+    return adapter_response(AVAILABLE_SLOTS_ADAPTER, slots)
+
+@router.post("/bulk", response_model=AppointmentBulkCreateResult)
+async def bulk_create(
+    bulk_in: AppointmentBulkCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_manager_user)
+):
+    """
+    Randevuları toplu olarak içe aktarır.
+    Geçerli satırlar oluşturulur; reddedilen satırlar sıraları ve nedenleriyle raporlanır.
+    Yöneticiler yalnızca kendi şirketlerine içe aktarabilir; başka şirkete ait satır varsa istek reddedilir.
+    """
+    for company_id in {appointment_in.company_id for appointment_in in bulk_in.appointments}:
+        scope_company_id(current_user, company_id)
+    logger.info("Bulk appointment import of %s rows requested by %s", len(bulk_in.appointments), current_user.id)
+    return await bulk_create_appointments(db, bulk_in.appointments)
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Response, Request # Request de eklendi
 from fastapi.responses import JSONResponse
-from supabase import create_client, Client
 from app.core.config import get_settings
+from app.core.supabase_client import run_auth_call
 from app.schemas.auth import UserRegister, UserLogin, ChangePassword
 from app.schemas.user import UserRead # /me endpoint'i için
 from app.models.user import User # get_current_user bağımlılığı için
@@ -12,22 +12,23 @@ from uuid import UUID # UUID tipi için
 import logging
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/auth", tags=["Auth"])
+router = APIRouter() # prefix ve tags app/api/__init__.py içinde verilir
 
 settings = get_settings()
-supabase: Client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+# Supabase Auth çağrıları paylaşılan asenkron istemci üzerinden, eşzamanlılık sınırı ve zaman aşımıyla yapılır.
+# Bkz. app/core/supabase_client.py
 
 @router.post("/register", status_code=status.HTTP_201_CREATED)
 async def register_user(user_in: UserRegister, db: AsyncSession = Depends(get_db)):
     """
     Yeni bir kullanıcıyı Supabase Auth'a kaydeder ve yerel veritabanına profilini ekler.
     """
-    logger.info(f"Registering new user: {user_in.email}")
+    logger.info("Registering new user: %s", user_in.email)
     try:
         # Supabase Auth üzerinden kayıt
         # 'options.data' içinde ek kullanıcı meta verileri (full_name, role) gönderilir.
         # Bu meta veriler Supabase'in 'auth.users' tablosunda 'raw_user_meta_data' altında saklanır.
-        response = supabase.auth.sign_up(
+        response = await run_auth_call("sign_up", lambda supabase: supabase.auth.sign_up(
             {
                 "email": user_in.email,
                 "password": user_in.password,
@@ -38,11 +39,11 @@ async def register_user(user_in: UserRegister, db: AsyncSession = Depends(get_db
                     }
                 }
             }
-        )
+        ))
         
         supabase_user = response.user
         if not supabase_user:
-            logger.error(f"Supabase sign_up did not return a user object for {user_in.email}")
+            logger.error("Supabase sign_up did not return a user object for %s", user_in.email)
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Supabase registration failed unexpectedly.")
 
         # Kendi veritabanımıza kullanıcı profilini kaydet
@@ -57,11 +58,13 @@ async def register_user(user_in: UserRegister, db: AsyncSession = Depends(get_db
             user_in=user_in, # user_in içinde name, email, phone, company_id, role var
             supabase_user_id=UUID(supabase_user.id) # Supabase user ID'yi UUID objesine dönüştür
         )
-        logger.info(f"User {user_in.email} registered and local profile created with ID: {db_user.id}")
+        logger.info("User %s registered and local profile created with ID: %s", user_in.email, db_user.id)
         return {"message": "User registered successfully", "user_id": db_user.id}
 
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error during user registration for {user_in.email}: {e}", exc_info=True)
+        logger.error("Error during user registration for %s: %s", user_in.email, e, exc_info=True)
         # Supabase hatalarını yakalayın (örn: email already registered)
         if "user already registered" in str(e).lower() or "duplicate key value violates unique constraint" in str(e).lower():
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered.")
@@ -73,15 +76,15 @@ async def login_user(response: Response, user_in: UserLogin):
     """
     Kullanıcıyı Supabase Auth ile giriş yapar ve JWT token'ı HTTP-only cookie olarak ayarlar.
     """
-    logger.info(f"Attempting login for user: {user_in.email}")
+    logger.info("Attempting login for user: %s", user_in.email)
     try:
-        supabase_response = supabase.auth.sign_in_with_password(
+        supabase_response = await run_auth_call("sign_in_with_password", lambda supabase: supabase.auth.sign_in_with_password(
             {"email": user_in.email, "password": user_in.password}
-        )
+        ))
         token = supabase_response.session.access_token if supabase_response.session else None
         
         if not token:
-            logger.warning(f"Login failed for {user_in.email}: No token received from Supabase.")
+            logger.warning("Login failed for %s: No token received from Supabase.", user_in.email)
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials or session not found.")
 
         # JWT token'ı HTTP-only cookie olarak ayarla
@@ -93,10 +96,12 @@ async def login_user(response: Response, user_in: UserLogin):
             # secure= False, # TODO Üretimde HTTPS için True olmalı
             max_age=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60 # Saniye cinsinden
         )
-        logger.info(f"User {user_in.email} logged in successfully.")
+        logger.info("User %s logged in successfully.", user_in.email)
         return {"message": "Login successful"}
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error during login for {user_in.email}: {e}", exc_info=True)
+        logger.error("Error during login for %s: %s", user_in.email, e, exc_info=True)
         # Supabase Auth hatalarını yakalayın (örn: Invalid login credentials)
         if "Invalid login credentials" in str(e) or "invalid_grant" in str(e): # Supabase'in döndürebileceği hata kodları
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials.")
@@ -107,7 +112,7 @@ async def read_current_user(current_user: User = Depends(get_current_active_user
     """
     Mevcut kimliği doğrulanmış kullanıcının bilgilerini döndürür.
     """
-    logger.debug(f"Fetching current user details for ID: {current_user.id}")
+    logger.debug("Fetching current user details for ID: %s", current_user.id)
     return current_user
 
 @router.post("/logout")
@@ -132,10 +137,10 @@ async def logout_user(response: Response, request: Request): # Request objesi de
             # Bazı durumlarda token'ı da göndermek gerekebilir.
             # Eğer token'ı göndermek gerekiyorsa, supabase client'ı token ile initialize etmeniz gerekebilir.
             # Ancak çoğu durumda sadece client.auth.sign_out() yeterlidir.
-            supabase.auth.sign_out()
+            await run_auth_call("sign_out", lambda supabase: supabase.auth.sign_out())
             logger.info("Supabase session signed out.")
         except Exception as e:
-            logger.warning(f"Failed to sign out from Supabase: {e}", exc_info=True)
+            logger.warning("Failed to sign out from Supabase: %s", e, exc_info=True)
     else:
         logger.warning("No Authorization header found for Supabase sign out.")
 
@@ -151,7 +156,7 @@ async def change_password(
     Mevcut kullanıcının parolasını değiştirir.
     Bu işlem Supabase Auth üzerinden yönetilir.
     """
-    logger.info(f"Attempting password change for user: {current_user.email} (ID: {current_user.id})")
+    logger.info("Attempting password change for user: %s (ID: %s)", current_user.email, current_user.id)
     try:
         # Supabase Auth'ta parola değiştirme için genellikle `update_user` kullanılır.
         # ÖNEMLİ: Supabase'in `update_user` metodu genellikle `current_password`'ü doğrulamaz.
@@ -162,19 +167,19 @@ async def change_password(
 
         # Eğer doğrudan update_user kullanacaksak, mevcut oturum üzerinden yapılır.
         # Bu, kullanıcının zaten giriş yapmış olduğu varsayımına dayanır.
-        supabase_user_update_response = supabase.auth.update_user(
+        supabase_user_update_response = await run_auth_call("update_user", lambda supabase: supabase.auth.update_user(
             {"password": password_data.new_password}
-        )
+        ))
         
         if not supabase_user_update_response.user:
-            logger.error(f"Supabase password update failed for user {current_user.id}: No user object returned.")
+            logger.error("Supabase password update failed for user %s: No user object returned.", current_user.id)
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Password update failed in Supabase.")
 
-        logger.info(f"Password changed successfully for user: {current_user.email}")
+        logger.info("Password changed successfully for user: %s", current_user.email)
         return {"message": "Password changed successfully"}
     except HTTPException as e:
-        logger.error(f"HTTPException during password change for user {current_user.id}: {e.detail}")
+        logger.error("HTTPException during password change for user %s: %s", current_user.id, e.detail)
         raise e # FastAPI'nin kendi HTTPException'ını tekrar fırlat
     except Exception as e:
-        logger.error(f"An unexpected error occurred during password change for user {current_user.id}: {e}", exc_info=True)
+        logger.error("An unexpected error occurred during password change for user %s: %s", current_user.id, e, exc_info=True)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Password change failed: {e}")
\ No newline at end of file
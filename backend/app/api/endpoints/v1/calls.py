@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from app.core.database.database import get_db
+from app.core.security import get_current_admin_user # Çağrı santrali (telefon ağ geçidi) servis hesabıyla çağırır
+from app.crud.crud_caller_id import resolve_call
+from app.models.user import User
+from app.schemas.caller_id import CallerIdResolution
+import logging
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+@router.get("/resolve", response_model=CallerIdResolution)
+async def resolve_incoming_call(
+    dialed: str = Query(..., max_length=255, description="Aranan numara (E.164, ulusal biçim veya SIP/tel URI)."),
+    caller: Optional[str] = Query(None, max_length=255, description="Arayan numara; gizli numaralarda boş bırakılır."),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Gelen bir çağrının aranan numarasından şirketi, arayan numarasından kayıtlı kullanıcıyı çözümler.
+    Süreç içi numara dizininden yanıtlanır; ilk karşılama anonsundan önce çağrılabilecek kadar hızlıdır.
+    """
+    return await resolve_call(db, dialed, caller)
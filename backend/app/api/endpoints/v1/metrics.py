@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Depends
+
+from app.core.database.database import get_pool_metrics
+from app.core.security import get_current_admin_user # Metrikler yalnızca yöneticilere açıktır
+from app.models.user import User
+from app.schemas.metrics import PoolMetrics
+import logging
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+@router.get("/db-pool", response_model=PoolMetrics)
+async def read_pool_metrics(current_user: User = Depends(get_current_admin_user)):
+    """
+    Veritabanı bağlantı havuzunun anlık durumunu ve bağlantı bekleme istatistiklerini döndürür.
+    """
+    return get_pool_metrics()
@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status as http_status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Optional
+from datetime import date
+
+from app.core.database.database import get_db
+from app.core.security import get_current_manager_user, scope_company_id # Raporlar yönetici ve adminlere açıktır
+from app.crud.crud_appointment_rollup import get_appointment_rollups
+from app.models.appointment import AppointmentStatus
+from app.models.user import User
+from app.schemas.report import AppointmentRollupReport, AppointmentStatusTotal
+import logging
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+MAX_REPORT_DAYS = 366 # Tek raporda istenebilecek en uzun dönem
+
+@router.get("/appointments/daily", response_model=AppointmentRollupReport)
+async def read_appointment_daily_report(
+    company_id: int = Query(..., description="Raporu alınacak şirketin ID'si."),
+    start_day: date = Query(..., description="Raporun ilk günü (dahil, UTC)."),
+    end_day: date = Query(..., description="Raporun son günü (dahil, UTC)."),
+    status: Optional[AppointmentStatus] = Query(None, description="Yalnızca bu durumdaki randevular."),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_manager_user)
+):
+    """
+    Bir şirketin günlük randevu sayısı, doluluk (dolu dakika) ve gelir raporunu durum bazında döndürür.
+    Yalnızca özet tablosu okunur; sorgu süresi randevu sayısından bağımsızdır.
+    Yöneticiler yalnızca kendi şirketlerinin raporunu alabilir; adminler tüm şirketlerinkini.
+    """
+    company_id = scope_company_id(current_user, company_id)
+    if end_day < start_day:
+        raise HTTPException(status_code=http_status.HTTP_400_BAD_REQUEST, detail="end_day must not be before start_day.")
+    if (end_day - start_day).days >= MAX_REPORT_DAYS:
+        raise HTTPException(status_code=http_status.HTTP_400_BAD_REQUEST, detail=f"Report period cannot exceed {MAX_REPORT_DAYS} days.")
+
+    rows = await get_appointment_rollups(db, company_id, start_day, end_day, status)
+    totals: Dict[str, AppointmentStatusTotal] = {}
+    for row in rows:
+        total = totals.setdefault(row.status, AppointmentStatusTotal(status=row.status, appointment_count=0, booked_minutes=0, revenue=0))
+        total.appointment_count += row.appointment_count
+        total.booked_minutes += row.booked_minutes
+        total.revenue += row.revenue
+    return AppointmentRollupReport(
+        company_id=company_id,
+        start_day=start_day,
+        end_day=end_day,
+        days=rows,
+        totals=sorted(totals.values(), key=lambda total: total.status.value)
+    )
@@ -0,0 +1,75 @@
+# app/bussines_logics/appointment_export.py
+
+import csv
+import io
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, Dict, List
+from uuid import UUID
+
+from sqlalchemy import Row
+
+try:  # orjson kurulu değilse standart json kodlayıcısı kullanılır
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# Randevu dışa aktarma biçimleri (CSV / NDJSON).
+# stream_appointment_export'tan gelen satır parçaları tek tek bayt parçalarına çevrilir;
+# bellekte aynı anda yalnızca bir parça ve onun kodlanmış hali bulunur.
+
+EXPORT_COLUMNS = (
+    "id", "appointment_time", "end_time", "status", "user_id", "user_name",
+    "company_id", "service_names", "total_price", "notes"
+)
+
+
+def _format_value(value: Any) -> Any:
+    # Tutarlar yuvarlama hatası olmaması için ondalık metin olarak yazılır
+    if isinstance(value, Decimal):
+        return f"{value:.2f}"
+    if isinstance(value, float):
+        return f"{Decimal(str(value)):.2f}"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _row_dict(row: Row) -> Dict[str, Any]:
+    return {name: _format_value(value) for name, value in zip(EXPORT_COLUMNS, row)}
+
+
+async def csv_chunks(batches: AsyncIterator[List[Row]]) -> AsyncIterator[bytes]:
+    """
+    Satır parçalarını başlık satırıyla birlikte CSV bayt parçalarına çevirir.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    async for batch in batches:
+        writer.writerows([_format_value(value) for value in row] for row in batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():  # Hiç satır yoksa yalnızca başlık
+        yield buffer.getvalue().encode("utf-8")
+
+
+async def ndjson_chunks(batches: AsyncIterator[List[Row]]) -> AsyncIterator[bytes]:
+    """
+    Satır parçalarını her satırı bir JSON nesnesi olan NDJSON bayt parçalarına çevirir.
+    """
+    async for batch in batches:
+        if orjson is not None:
+            yield b"".join(orjson.dumps(_row_dict(row)) + b"\n" for row in batch)
+        else:  # pragma: no cover
+            yield "".join(json.dumps(_row_dict(row)) + "\n" for row in batch).encode("utf-8")
+
+
+EXPORT_FORMATS = {
+    "csv": (csv_chunks, "text/csv; charset=utf-8"),
+    "ndjson": (ndjson_chunks, "application/x-ndjson"),
+}
@@ -0,0 +1,160 @@
+# app/bussines_logics/availability.py
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.crud_appointment_rollup import as_utc
+from app.schemas.availability import AvailableSlot
+import logging
+logger = logging.getLogger(__name__)
+
+Interval = Tuple[datetime, datetime]
+
+MAX_AVAILABILITY_DAYS = 31 # Tek istekte aranabilecek en uzun aralık
+MAX_SLOT_STARTS = MAX_AVAILABILITY_DAYS * 24 * 4 # Izgaradaki en fazla slot başlangıcı (15 dakikalık adımla bir ay)
+
+
+class IntervalIndex:
+    """
+    Dolu zaman aralıklarını sıralı ve birleştirilmiş (merge) halde tutan hafif bir yapı.
+    Çakışma sorgusu ve boşluk (gap) hesaplaması bisect ile O(log n) başlar,
+    veritabanına tekrar gitmeye gerek kalmaz.
+    Aralıklar aware UTC olarak saklanır (naive zamanlar UTC kabul edilir); overlaps ve gaps'e verilen
+    zamanlar da aware olmalıdır (bkz. as_utc).
+    """
+    __slots__ = ("_starts", "_ends")
+
+    def __init__(self, intervals: Iterable[Interval] = ()):
+        starts: List[datetime] = []
+        ends: List[datetime] = []
+        for start, end in sorted((as_utc(start), as_utc(end)) for start, end in intervals):
+            # Üst üste binen veya uç uca değen aralıkları tek aralıkta birleştir
+            if ends and start <= ends[-1]:
+                if end > ends[-1]:
+                    ends[-1] = end
+            else:
+                starts.append(start)
+                ends.append(end)
+        self._starts = starts
+        self._ends = ends
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def overlaps(self, start: datetime, end: datetime) -> bool:
+        """
+        Verilen [start, end) aralığının dolu bir aralıkla çakışıp çakışmadığını döndürür.
+        """
+        # end'den önce başlayan son aralık; aralıklar ayrık olduğundan bitişleri de sıralıdır
+        idx = bisect_left(self._starts, end) - 1
+        return idx >= 0 and self._ends[idx] > start
+
+    def gaps(self, range_start: datetime, range_end: datetime) -> Iterator[Interval]:
+        """
+        [range_start, range_end) içindeki boş aralıkları sırayla üretir.
+        """
+        cursor = range_start
+        idx = bisect_right(self._ends, range_start)
+        while idx < len(self._starts) and self._starts[idx] < range_end:
+            if self._starts[idx] > cursor:
+                yield cursor, self._starts[idx]
+            if self._ends[idx] > cursor:
+                cursor = self._ends[idx]
+            idx += 1
+        if cursor < range_end:
+            yield cursor, range_end
+
+
+def find_free_slots(
+    busy: IntervalIndex,
+    range_start: datetime,
+    range_end: datetime,
+    duration: timedelta,
+    step: timedelta
+) -> Iterator[Interval]:
+    """
+    Boş aralıklara sığan, range_start'tan itibaren `step` ızgarasına hizalanmış slotları üretir.
+    Aralık uçları aware UTC'ye çevrilir; üretilen slotlar da aware UTC'dir.
+
+    Args:
+        busy (IntervalIndex): Dolu aralıklar.
+        range_start (datetime): Aranan aralığın başlangıcı (ızgaranın da başlangıcı).
+        range_end (datetime): Aranan aralığın bitişi.
+        duration (timedelta): İstenen toplam hizmet süresi.
+        step (timedelta): Slot başlangıçları arasındaki adım.
+
+    Returns:
+        Iterator[Interval]: (başlangıç, bitiş) çiftleri.
+    """
+    range_start, range_end = as_utc(range_start), as_utc(range_end)
+    for gap_start, gap_end in busy.gaps(range_start, range_end):
+        # Boşluğun başlangıcını bir sonraki ızgara noktasına yuvarla
+        offset = gap_start - range_start
+        slot_start = range_start + -(-offset // step) * step
+        while slot_start + duration <= gap_end:
+            yield slot_start, slot_start + duration
+            slot_start += step
+
+
+async def get_available_slots(
+    db: AsyncSession,
+    range_start: datetime,
+    range_end: datetime,
+    duration_minutes: int,
+    company_id: Optional[int] = None,
+    user_id: Optional[UUID] = None,
+    slot_step_minutes: int = 15
+) -> List[AvailableSlot]:
+    """
+    Bir şirketin (aktif çalışanlarının herhangi biri) veya tek bir kullanıcının
+    verilen tarih aralığındaki tüm boş randevu slotlarını döndürür.
+    Aralıktaki randevular tek sorguda yüklenir, boşluklar bellekte hesaplanır.
+
+    Args:
+        db (AsyncSession): Veritabanı oturumu.
+        range_start (datetime): Aralığın başlangıcı (naive ise UTC kabul edilir).
+        range_end (datetime): Aralığın bitişi (naive ise UTC kabul edilir).
+        duration_minutes (int): İstenen toplam hizmet süresi (dakika).
+        company_id (Optional[int]): Şirket bazlı arama için şirket ID'si.
+        user_id (Optional[UUID]): Tek kullanıcı bazlı arama için kullanıcı ID'si.
+        slot_step_minutes (int): Slot başlangıçları arasındaki adım (dakika).
+
+    Returns:
+        List[AvailableSlot]: Başlangıç zamanına göre sıralı boş slotlar ve o slotta boş olan kullanıcılar.
+    Raises:
+        ValueError: Parametreler geçersizse veya aralık MAX_AVAILABILITY_DAYS / MAX_SLOT_STARTS sınırını aşıyorsa.
+    """
+    if (company_id is None) == (user_id is None):
+        raise ValueError("Exactly one of company_id or user_id must be provided.")
+    # Naive zamanlar UTC kabul edilir; PostgreSQL'den gelen aware aralıklarla karşılaştırılabilsin
+    range_start, range_end = as_utc(range_start), as_utc(range_end)
+    if range_end <= range_start:
+        raise ValueError("Range end must be after range start.")
+    if duration_minutes <= 0 or slot_step_minutes <= 0:
+        raise ValueError("Duration and slot step must be positive.")
+    # Bellekte üretilecek slot sayısını sınırla (uzun aralık + küçük adım milyonlarca slot demektir)
+    if range_end - range_start > timedelta(days=MAX_AVAILABILITY_DAYS):
+        raise ValueError(f"Availability range cannot exceed {MAX_AVAILABILITY_DAYS} days.")
+    if (range_end - range_start) // timedelta(minutes=slot_step_minutes) > MAX_SLOT_STARTS:
+        raise ValueError(f"Availability range is too long for a {slot_step_minutes}-minute slot step (at most {MAX_SLOT_STARTS} slot starts).")
+
+    from app.crud.crud_appointment import get_busy_intervals
+    busy_by_user = await get_busy_intervals(db, range_start, range_end, company_id=company_id, user_id=user_id)
+
+    duration = timedelta(minutes=duration_minutes)
+    step = timedelta(minutes=slot_step_minutes)
+    free_users_by_slot: Dict[Interval, List[UUID]] = {}
+    for busy_user_id, intervals in busy_by_user.items():
+        busy = IntervalIndex(intervals)
+        for slot in find_free_slots(busy, range_start, range_end, duration, step):
+            free_users_by_slot.setdefault(slot, []).append(busy_user_id)
+
+    logger.debug("Computed %s free slots for company_id=%s, user_id=%s between %s and %s", len(free_users_by_slot), company_id, user_id, range_start, range_end)
+    return [
+        AvailableSlot(start_time=start, end_time=end, user_ids=user_ids)
+        for (start, end), user_ids in sorted(free_users_by_slot.items())
+    ]
@@ -0,0 +1,173 @@
+# app/bussines_logics/caller_id.py
+
+import re
+from typing import Dict, Iterable, Optional, Tuple
+from uuid import UUID
+
+import logging
+logger = logging.getLogger(__name__)
+
+# Gelen çağrıda aranan numaradan şirketi, arayan numaradan kayıtlı kullanıcıyı bulmak için
+# telefon numarası normalleştirme ve süreç içi numara dizini.
+# Numaralar E.164 biçiminde ("+905551234567") anahtarlanır; aynı numaranın "0555 123 45 67",
+# "+90 (555) 123-45-67" veya "sip:905551234567@gw" gibi yazımları aynı anahtara iner.
+
+E164_MAX_DIGITS = 15
+E164_MIN_DIGITS = 8
+
+_URI_SCHEME = re.compile(r"^\s*(?:sips?|tel):", re.IGNORECASE)
+_EXTENSION = re.compile(r"(?:;ext=|\s*(?:ext\.?|x|#)\s*\d+\s*$)", re.IGNORECASE)
+_NON_DIGITS = re.compile(r"\D+")
+
+
+def normalize_phone(raw: Optional[str], country_code: str = "90", national_length: int = 10) -> Optional[str]:
+    """
+    Telefon numarasını E.164 biçimine getirir.
+
+    Uluslararası önekli ("+90...", "0090...") numaralar olduğu gibi, ulusal önekli ("0555...")
+    ve öneksiz ulusal numaralar ("555...") varsayılan ülke koduyla tamamlanır. Ülke kodu ile
+    başlayıp '+' içermeyen numaralar ("90555...", çağrı sinyalleşmesinde yaygın) de tanınır.
+    SIP/tel URI'leri ve dahili numaralar ("ext. 12") ayıklanır.
+
+    Args:
+        raw (Optional[str]): Ham telefon numarası.
+        country_code (str): Ülke kodu belirtilmemiş numaralar için varsayılan ülke kodu.
+        national_length (int): Varsayılan ülkede ulusal numaranın (alan kodu dahil) hane sayısı.
+
+    Returns:
+        Optional[str]: "+<rakamlar>" biçiminde numara; numara boşsa veya geçerli uzunlukta değilse None.
+    """
+    if not raw:
+        return None
+    text = _URI_SCHEME.sub("", raw).split("@", 1)[0]
+    text = _EXTENSION.split(text, 1)[0].strip()
+    digits = _NON_DIGITS.sub("", text)
+    if not digits:
+        return None
+
+    if text.startswith("+"):
+        number = digits
+    elif digits.startswith("00"):
+        number = digits[2:]
+    elif digits.startswith("0"):
+        number = country_code + digits[1:]
+    elif len(digits) == national_length:
+        number = country_code + digits
+    else:
+        number = digits # Ülke koduyla başlayan, '+' içermeyen numara
+
+    if not E164_MIN_DIGITS <= len(number) <= E164_MAX_DIGITS or number.startswith("0"):
+        return None
+    return "+" + number
+
+
+class CallerIdDirectory:
+    """
+    Aktif şirketlerin ve kullanıcıların E.164 numaralarından ID'lerine giden bellek içi dizin.
+    Bir çağrının çözümlenmesi iki sözlük okumasıdır; veritabanına gidilmez.
+
+    Dizin load() ile bütün olarak doldurulur, ardından set_company()/set_user() ile kayıt
+    bazında güncel tutulur. Aynı numara birden fazla kayıtta bulunabilir (ör. aynı hattı
+    paylaşan çalışanlar); bu yüzden her numara için sahiplerin listesi tutulur.
+    """
+    __slots__ = ("_companies", "_users", "_company_phones", "_user_phones", "loaded_at")
+
+    def __init__(self):
+        # Numara başına sahipler küçük, sıralı demetlerde tutulur (numaraların neredeyse tamamının tek
+        # sahibi vardır; demet, küme veya sözlükten birkaç kat daha az bellek kullanır).
+        self._companies: Dict[str, Tuple[int, ...]] = {} # e164 -> şirket ID'leri (artan sırada)
+        self._users: Dict[str, Tuple[Tuple[UUID, int], ...]] = {} # e164 -> ((user_id, company_id), ...)
+        self._company_phones: Dict[int, str] = {} # company_id -> e164 (güncelleme ve silme için ters dizin)
+        self._user_phones: Dict[UUID, str] = {}
+        self.loaded_at: Optional[float] = None # Son tam yükleme zamanı (monotonic); None ise dizin henüz yüklenmedi
+
+    def __len__(self) -> int:
+        return len(self._company_phones) + len(self._user_phones)
+
+    @property
+    def loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    def load(
+        self,
+        companies: Iterable[Tuple[int, Optional[str]]],
+        users: Iterable[Tuple[UUID, int, Optional[str]]],
+        loaded_at: float
+    ) -> None:
+        """
+        Dizini verilen kayıtlarla baştan kurar.
+
+        Args:
+            companies (Iterable[Tuple[int, Optional[str]]]): (company_id, phone_e164) çiftleri.
+            users (Iterable[Tuple[UUID, int, Optional[str]]]): (user_id, company_id, phone_e164) üçlüleri.
+            loaded_at (float): Yükleme zamanı (monotonic).
+        """
+        self._companies.clear()
+        self._users.clear()
+        self._company_phones.clear()
+        self._user_phones.clear()
+        for company_id, phone in companies:
+            self.set_company(company_id, phone)
+        for user_id, company_id, phone in users:
+            self.set_user(user_id, company_id, phone)
+        self.loaded_at = loaded_at
+
+    def set_company(self, company_id: int, phone: Optional[str]) -> None:
+        """
+        Şirketin numarasını ekler veya değiştirir; phone None ise şirketi dizinden çıkarır
+        (numarası silinen veya pasifleştirilen şirketler).
+        """
+        previous = self._company_phones.pop(company_id, None)
+        if previous is not None:
+            ids = tuple(owner for owner in self._companies[previous] if owner != company_id)
+            if ids:
+                self._companies[previous] = ids
+            else:
+                del self._companies[previous]
+        if phone is not None:
+            self._company_phones[company_id] = phone
+            ids = self._companies.get(phone)
+            self._companies[phone] = tuple(sorted(ids + (company_id,))) if ids else (company_id,)
+
+    def set_user(self, user_id: UUID, company_id: int, phone: Optional[str]) -> None:
+        """
+        Kullanıcının numarasını ekler veya değiştirir; phone None ise kullanıcıyı dizinden çıkarır.
+        """
+        previous = self._user_phones.pop(user_id, None)
+        if previous is not None:
+            owners = tuple(owner for owner in self._users[previous] if owner[0] != user_id)
+            if owners:
+                self._users[previous] = owners
+            else:
+                del self._users[previous]
+        if phone is not None:
+            self._user_phones[user_id] = phone
+            self._users[phone] = self._users.get(phone, ()) + ((user_id, company_id),)
+
+    def resolve_company(self, phone: Optional[str]) -> Optional[int]:
+        """
+        Aranan numaranın şirketini döndürür; numara birden fazla şirkette kayıtlıysa en küçük ID.
+        """
+        ids = self._companies.get(phone)
+        return ids[0] if ids else None
+
+    def resolve_user(self, phone: Optional[str], company_id: Optional[int] = None) -> Optional[Tuple[UUID, int]]:
+        """
+        Arayan numaranın kullanıcısını döndürür.
+
+        Numara birden fazla kullanıcıda kayıtlıysa aranan şirketin kullanıcısı tercih edilir;
+        yine de tek bir aday kalmıyorsa yanlış kişiyle eşleştirmemek için None döner.
+
+        Returns:
+            Optional[Tuple[UUID, int]]: (user_id, company_id) veya None.
+        """
+        owners = self._users.get(phone)
+        if not owners:
+            return None
+        if len(owners) == 1:
+            return owners[0]
+        in_company = [owner for owner in owners if owner[1] == company_id]
+        if len(in_company) == 1:
+            return in_company[0]
+        logger.debug("Caller number %s is shared by %s users; not resolving.", phone, len(owners))
+        return None
@@ -0,0 +1,131 @@
+# app/bussines_logics/service_matching.py
+
+import heapq
+import re
+from collections import Counter
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+
+import logging
+logger = logging.getLogger(__name__)
+
+# Konuşma tanıma transkriptlerini şirket hizmet adlarıyla eşleştirmek için karakter n-gram dizini.
+# "saç kesim", "sac kesimi", "Saç Kesimi" aynı hizmete gitmelidir: adlar Türkçe kurallarıyla küçük harfe
+# çevrilir, Türkçe karakterler ASCII karşılıklarına indirgenir ve her kelime kenarları işaretlenmiş
+# trigramlara bölünür. Her gram için o grami içeren hizmetlerin listesi (inverted list) tutulur;
+# sorgu yalnızca kendi gramlarının listelerini dolaşır, şirketin tüm hizmetlerini taramaz.
+
+GRAM_SIZE = 3
+
+_LOWER = str.maketrans({"I": "ı", "İ": "i"})
+_FOLD = str.maketrans("çğıöşüâîû", "cgiosuaiu")
+_SEPARATORS = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_service_name(name: str) -> str:
+    """
+    Hizmet adını veya transkripti karşılaştırma biçimine getirir: "Saç Kesimi & Fön" -> "sac kesimi fon".
+    """
+    folded = name.translate(_LOWER).lower().translate(_FOLD)
+    return _SEPARATORS.sub(" ", folded).strip()
+
+
+def name_grams(name: str) -> FrozenSet[str]:
+    """
+    Normalleştirilmiş metnin kelime bazlı trigramları; kelime başı ve sonu '#' ile işaretlenir
+    ("sac" -> "#sa", "sac", "ac#"), böylece kelime sırası skoru etkilemez.
+    """
+    grams: Set[str] = set()
+    for word in name.split():
+        padded = f"#{word}#"
+        for index in range(max(1, len(padded) - GRAM_SIZE + 1)):
+            grams.add(padded[index:index + GRAM_SIZE])
+    return frozenset(grams)
+
+
+class ServiceNameIndex:
+    """
+    Bir şirketin aktif hizmet adları için n-gram dizini. Hizmet eklemek, yeniden adlandırmak ve
+    çıkarmak yalnızca o hizmetin gramlarını günceller; dizin baştan kurulmaz.
+
+    Skor 0-1 arasıdır: Dice benzerliği (2·ortak / (sorgu + ad)) ile adın sorguda bulunan gram oranının
+    ortalaması. Böylece hem kısa sorgular ("saç kesim") hem de adı içeren uzun cümleler
+    ("yarın saç kesimi için randevu") doğru hizmeti üst sıraya taşır.
+    """
+    __slots__ = ("_postings", "_services")
+
+    def __init__(self, services: Iterable[Tuple[int, str]] = ()):
+        self._postings: Dict[str, Set[int]] = {}
+        self._services: Dict[int, Tuple[str, FrozenSet[str]]] = {} # service_id -> (ad, gramlar)
+        for service_id, name in services:
+            self.add(service_id, name)
+
+    def __len__(self) -> int:
+        return len(self._services)
+
+    def __contains__(self, service_id: int) -> bool:
+        return service_id in self._services
+
+    def add(self, service_id: int, name: str) -> None:
+        """
+        Hizmeti ekler; aynı ID zaten varsa adını günceller.
+        """
+        if service_id in self._services:
+            if self._services[service_id][0] == name:
+                return
+            self.discard(service_id)
+        grams = name_grams(normalize_service_name(name))
+        self._services[service_id] = (name, grams)
+        postings = self._postings
+        for gram in grams:
+            ids = postings.get(gram)
+            if ids is None:
+                postings[gram] = {service_id}
+            else:
+                ids.add(service_id)
+
+    def discard(self, service_id: int) -> None:
+        """
+        Hizmeti (varsa) dizinden çıkarır.
+        """
+        entry = self._services.pop(service_id, None)
+        if entry is None:
+            return
+        postings = self._postings
+        for gram in entry[1]:
+            ids = postings[gram]
+            ids.discard(service_id)
+            if not ids:
+                del postings[gram]
+
+    def match(self, query: str, limit: int = 5, min_score: float = 0.3) -> List[Tuple[int, str, float]]:
+        """
+        Sorguya en çok benzeyen hizmetleri skor sırasıyla döndürür.
+
+        Args:
+            query (str): Transkript veya hizmet adı.
+            limit (int): En fazla kaç aday döneceği.
+            min_score (float): Bunun altındaki adaylar atılır.
+
+        Returns:
+            List[Tuple[int, str, float]]: (service_id, ad, skor) listesi.
+        """
+        query_grams = name_grams(normalize_service_name(query))
+        if not query_grams:
+            return []
+        counts: Counter = Counter()
+        postings = self._postings
+        for gram in query_grams:
+            ids = postings.get(gram)
+            if ids:
+                counts.update(ids) # Sayma C tarafında yapılır
+        query_size = len(query_grams)
+        services = self._services
+        scored = []
+        for service_id, common in counts.items():
+            name, grams = services[service_id]
+            size = len(grams)
+            score = (2 * common / (query_size + size) + common / size) / 2
+            if score >= min_score:
+                scored.append((score, -service_id, name))
+        best = heapq.nlargest(limit, scored)
+        return [(-negative_id, name, round(score, 4)) for score, negative_id, name in best]
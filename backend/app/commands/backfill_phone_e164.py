@@ -0,0 +1,27 @@
+# app/commands/backfill_phone_e164.py
+#
+# Şirket ve kullanıcıların phone_e164 sütunlarını phone sütunlarından doldurur.
+# Sütunlar ilk eklendiğinde (migrations/0004_phone_e164.sql), varsayılan ülke ayarları değiştiğinde ve
+# numaralar veritabanına uygulama dışından yazıldığında çalıştırılır.
+#
+#   python -m app.commands.backfill_phone_e164 [--batch-size 1000]
+
+import argparse
+import asyncio
+
+from app.core.database.database import AsyncSessionLocal, engine
+from app.crud.crud_caller_id import backfill_phone_e164
+
+
+async def main(batch_size: int) -> None:
+    async with AsyncSessionLocal() as session:
+        rows = await backfill_phone_e164(session, batch_size=batch_size)
+    await engine.dispose()
+    print(f"Updated phone_e164 on {rows} rows.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill E.164 phone columns for companies and users.")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per UPDATE statement.")
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size))
@@ -0,0 +1,30 @@
+# app/commands/rebuild_rollups.py
+#
+# Randevu özet (rollup) tablosunu appointments tablosundan yeniden hesaplar.
+# Özet tablosu ilk oluşturulduğunda (migrations/0003_appointment_daily_rollups.sql) ve
+# veritabanına uygulama dışından yazıldığında (elle düzeltme, veri taşıma) çalıştırılır.
+#
+#   python -m app.commands.rebuild_rollups [--company-id 1] [--start-day 2025-01-01] [--end-day 2025-12-31]
+
+import argparse
+import asyncio
+from datetime import date
+
+from app.core.database.database import AsyncSessionLocal, engine
+from app.crud.crud_appointment_rollup import rebuild_appointment_rollups
+
+
+async def main(company_id, start_day, end_day) -> None:
+    async with AsyncSessionLocal() as session:
+        rows = await rebuild_appointment_rollups(session, company_id=company_id, start_day=start_day, end_day=end_day)
+    await engine.dispose()
+    print(f"Rebuilt {rows} rollup rows.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild appointment daily rollups from the appointments table.")
+    parser.add_argument("--company-id", type=int, default=None, help="Only rebuild this company.")
+    parser.add_argument("--start-day", type=date.fromisoformat, default=None, help="First day to rebuild (inclusive, UTC).")
+    parser.add_argument("--end-day", type=date.fromisoformat, default=None, help="Last day to rebuild (inclusive, UTC).")
+    args = parser.parse_args()
+    asyncio.run(main(args.company_id, args.start_day, args.end_day))
@@ -0,0 +1,96 @@
+# app/core/cache.py
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+# Süreç içi (in-process) önbellek yardımcıları.
+# Önbellekler tek bir event loop içinden kullanılır; bu yüzden kilit tutulmaz.
+
+
+class TTLCache:
+    """
+    TTL (yaşam süresi) ve LRU tahliyesine sahip, isabet/ıska sayaçlı basit bir önbellek.
+    Her kayıt kendi son kullanma zamanını taşır; set() ile kayıt bazında TTL verilebilir.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Kaydı döndürür ve en son kullanılan olarak işaretler; yoksa veya süresi dolmuşsa None.
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._data[key]
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Kaydı ekler veya günceller. Kapasite aşılırsa en az yakın zamanda kullanılan kayıt atılır.
+        """
+        lifetime = self.ttl if ttl is None else ttl
+        if lifetime <= 0:
+            self._data.pop(key, None)
+            return
+        self._data[key] = (self._clock() + lifetime, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Kaydı (varsa) önbellekten siler.
+        """
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Önbellek sayaçlarını döndürür.
+        """
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+def detached_copy(instance: Any) -> Any:
+    """
+    Bir ORM nesnesinin sütun değerlerini taşıyan, hiçbir oturuma bağlı olmayan (detached) kopyasını üretir.
+    Kopya önbellekte güvenle paylaşılabilir ve `await db.merge(kopya, load=False)` ile
+    sorgu çalıştırmadan başka bir oturuma bağlanabilir.
+    """
+    mapper = sa_inspect(instance).mapper
+    copy = mapper.class_()
+    for attr in mapper.column_attrs:
+        setattr(copy, attr.key, getattr(instance, attr.key))
+    make_transient_to_detached(copy)
+    return copy
@@ -6,11 +6,23 @@ from typing import Optional # SUPABASE_SERVICE_KEY için Optional
 class Settings(BaseSettings):
     # Veritabanı Ayarları
     DATABASE_URL: str
+    DB_ECHO: bool = False # True ise tüm SQL ifadeleri loglanır (yalnızca geliştirme için)
+    DB_POOL_SIZE: int = 5 # Havuzda sürekli açık tutulan bağlantı sayısı
+    DB_MAX_OVERFLOW: int = 10 # Havuz dolduğunda açılabilecek ek (geçici) bağlantı sayısı
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0 # Havuzdan bağlantı beklerken vazgeçme süresi
+    DB_POOL_RECYCLE_SECONDS: int = 1800 # Bu süreden eski bağlantılar yeniden açılır (-1: kapalı)
+    DB_POOL_PRE_PING: bool = True # Bağlantı havuzdan alınırken canlılığı kontrol edilir
+    DB_STATEMENT_TIMEOUT_MS: Optional[int] = 30000 # PostgreSQL statement_timeout (ms); None ise sunucu varsayılanı
 
     # Supabase Ayarları
     SUPABASE_URL: str
     SUPABASE_KEY: str # <-- BU SATIRIN OLDUĞUNDAN EMİN OLUN
     SUPABASE_SERVICE_KEY: Optional[str] = None # Sunucu tarafı işlemler için, isteğe bağlı
+    SUPABASE_HTTP_TIMEOUT_SECONDS: float = 10.0 # Supabase'e yapılan tek bir HTTP isteğinin zaman aşımı
+    SUPABASE_HTTP_MAX_CONNECTIONS: int = 20 # Supabase bağlantı havuzundaki en fazla bağlantı sayısı
+    SUPABASE_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 10 # Havuzda açık tutulacak (keep-alive) bağlantı sayısı
+    SUPABASE_AUTH_MAX_CONCURRENCY: int = 20 # Aynı anda yürütülebilecek en fazla Supabase Auth çağrısı
+    SUPABASE_AUTH_CALL_TIMEOUT_SECONDS: float = 15.0 # Sırada bekleme dahil bir Auth çağrısının toplam süre sınırı
 
     # JWT Ayarları (Supabase Auth'tan gelen JWT'yi doğrulamak için)
     # Bu, Supabase projenizin "JWT Secret" anahtarı olmalıdır, "Service Role Key" değil!
@@ -20,6 +32,25 @@ class Settings(BaseSettings):
 
     # Uygulama Ayarları
     DEBUG: bool = False # Geliştirme için True, üretimde False
+    RESPONSE_COMPRESSION_MIN_BYTES: int = 1024 # Bu boyutun altındaki yanıtlar sıkıştırılmaz
+    RESPONSE_GZIP_LEVEL: int = 6 # gzip sıkıştırma seviyesi (1-9)
+    RESPONSE_BROTLI_QUALITY: int = 4 # brotli kalite seviyesi (0-11); yüksek değerler CPU maliyetini hızla artırır
+
+    # Rezervasyon Ayarları
+    BOOKING_LOCK_STRIPES: int = 1024 # Kullanıcı bazlı süreç içi rezervasyon kilidi şeridi sayısı
+    EXPORT_BATCH_SIZE: int = 2000 # Dışa aktarmada sunucu tarafı imleçten tek seferde çekilen satır sayısı
+
+    # Önbellek Ayarları
+    SERVICE_CATALOG_CACHE_TTL_SECONDS: int = 300 # Şirket hizmet kataloğunun önbellekte kalma süresi
+    SERVICE_CATALOG_CACHE_MAX_COMPANIES: int = 1024 # Önbellekte tutulacak en fazla şirket sayısı
+    AUTH_TOKEN_CACHE_MAX_ENTRIES: int = 10000 # Doğrulanmış JWT önbelleğinin kapasitesi (kayıtlar token'ın exp anında düşer)
+    AUTH_USER_CACHE_TTL_SECONDS: int = 30 # Kimliği doğrulanmış kullanıcının önbellekte kalma süresi
+    AUTH_USER_CACHE_MAX_ENTRIES: int = 10000 # Önbellekte tutulacak en fazla kullanıcı sayısı
+    CALLER_ID_DIRECTORY_TTL_SECONDS: int = 300 # Numara dizininin tamamen yeniden yüklenme aralığı (diğer süreçlerin yazımları için)
+
+    # Telefon Numarası Ayarları
+    PHONE_DEFAULT_COUNTRY_CODE: str = "90" # Ülke kodu içermeyen numaralar için varsayılan ülke kodu
+    PHONE_NATIONAL_NUMBER_LENGTH: int = 10 # Varsayılan ülkede ulusal numaranın (alan kodu dahil) hane sayısı
 
     # Ortam değişkenlerini .env dosyasından yüklemek için yapılandırma
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
@@ -1,13 +1,39 @@
 # app/core/database.py
 
+from typing import Any, Dict
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import declarative_base, sessionmaker
 from app.core.config import get_settings # Ayarlarımızı içeren config.py dosyasını import ediyoruz
+from app.core.database.pool import InstrumentedAsyncQueuePool
 settings=get_settings()
 
 DATABASE_URL = settings.DATABASE_URL
 
-engine = create_async_engine(DATABASE_URL, echo=True)
+def _engine_options(database_url: str) -> Dict[str, Any]:
+    """
+    Ayarlardan motor (engine) ve bağlantı havuzu seçeneklerini üretir.
+    SQLite (testler/benchmark'lar) kendi havuzunu kullanır; havuz ayarları yalnızca sunucu veritabanlarına uygulanır.
+    """
+    options: Dict[str, Any] = {"echo": settings.DB_ECHO}
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        return options
+
+    options.update(
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    if settings.DB_STATEMENT_TIMEOUT_MS is not None and url.get_driver_name() == "asyncpg":
+        # Her bağlantı açılırken sunucu tarafı sorgu zaman aşımı ayarlanır
+        options["connect_args"] = {"server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}}
+    return options
+
+engine = create_async_engine(DATABASE_URL, **_engine_options(DATABASE_URL))
 
 Base = declarative_base()
 
@@ -21,4 +47,24 @@ AsyncSessionLocal = sessionmaker(
 
 async def get_db():
     async with AsyncSessionLocal() as session:
-        yield session
\ No newline at end of file
+        yield session
+
+def get_session_factory() -> sessionmaker:
+    """
+    Oturum fabrikasını döndürür.
+    Yanıt gövdesi uç nokta döndükten sonra üretilen akış (streaming) yanıtları, get_db oturumu
+    kapatıldıktan sonra da çalıştığı için kendi oturumlarını bu fabrikadan açar.
+    """
+    return AsyncSessionLocal
+
+def get_pool_metrics() -> Dict[str, Any]:
+    """
+    Uygulama motorunun bağlantı havuzu metriklerini döndürür.
+
+    Raises:
+        ValueError: Kullanılan veritabanı için havuz metrikleri yoksa (örn. SQLite).
+    """
+    pool = engine.pool
+    if not isinstance(pool, InstrumentedAsyncQueuePool):
+        raise ValueError("Connection pool metrics are not available for this database backend.")
+    return pool.metrics()
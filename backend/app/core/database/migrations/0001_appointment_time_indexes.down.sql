@@ -0,0 +1,8 @@
+-- 0001_appointment_time_indexes.down.sql
+-- 0001_appointment_time_indexes.sql ile eklenen indeksleri kaldırır.
+
+drop index concurrently if exists public.ix_appointment_service_company_service_id;
+drop index concurrently if exists public.ix_appointments_active_user_id_appointment_time;
+drop index concurrently if exists public.ix_appointments_appointment_time_id;
+drop index concurrently if exists public.ix_appointments_company_id_appointment_time;
+drop index concurrently if exists public.ix_appointments_user_id_appointment_time;
@@ -0,0 +1,33 @@
+-- 0001_appointment_time_indexes.sql
+-- Randevu sorgularının sıcak yolları için zaman aralığı indeksleri.
+-- Karşılıkları: app/models/appointment.py ve app/models/appointment_service.py (__table_args__)
+--
+-- CREATE INDEX CONCURRENTLY tabloyu yazmaya kilitlemez ancak bir transaction bloğu içinde
+-- çalıştırılamaz; dosya psql ile (veya SQL editöründe ifadeler tek tek) çalıştırılmalıdır:
+--   psql "$DATABASE_URL" -f 0001_appointment_time_indexes.sql
+-- Geri almak için: 0001_appointment_time_indexes.down.sql
+
+-- get_appointments(user_id=..., start_date/end_date=...) ve kullanıcı bazlı keyset sayfalama
+create index concurrently if not exists ix_appointments_user_id_appointment_time
+  on public.appointments (user_id, appointment_time, id);
+
+-- get_appointments(company_id=..., start_date/end_date=...) ve şirket bazlı keyset sayfalama
+create index concurrently if not exists ix_appointments_company_id_appointment_time
+  on public.appointments (company_id, appointment_time, id);
+
+-- Filtresiz keyset sayfalama: ORDER BY appointment_time, id
+create index concurrently if not exists ix_appointments_appointment_time_id
+  on public.appointments (appointment_time, id);
+
+-- check_appointment_conflict, get_busy_intervals ve toplu içe aktarma çakışma taraması.
+-- İptal edilen randevular indekse girmez; end_time sayesinde çakışma koşulu indeksten değerlendirilir.
+create index concurrently if not exists ix_appointments_active_user_id_appointment_time
+  on public.appointments (user_id, appointment_time, end_time)
+  where status <> 'cancelled';
+
+-- Hizmet tarafındaki aramalar ve company_service silinirken ON DELETE RESTRICT kontrolü
+create index concurrently if not exists ix_appointment_service_company_service_id
+  on public.appointment_service (company_service_id);
+
+analyze public.appointments;
+analyze public.appointment_service;
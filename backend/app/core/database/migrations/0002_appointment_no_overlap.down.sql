@@ -0,0 +1,4 @@
+-- 0002_appointment_no_overlap.down.sql
+-- 0002_appointment_no_overlap.sql ile eklenen exclusion kısıtını kaldırır (btree_gist eklentisi bırakılır).
+
+alter table public.appointments drop constraint if exists ex_appointments_user_no_overlap;
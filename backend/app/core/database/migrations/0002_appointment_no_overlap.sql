@@ -0,0 +1,27 @@
+-- 0002_appointment_no_overlap.sql
+-- Aynı kullanıcının iptal edilmemiş randevularının zaman aralıklarının çakışmasını veritabanı seviyesinde engeller.
+-- Uygulama katmanındaki rezervasyon kilitleri (app/crud/crud_appointment.py: _reserve_booking) çakışmaları
+-- kullanıcıya anlamlı bir hata ile döndürür; bu kısıt ise kilitleri atlayan her yazım için son güvencedir.
+-- İhlal edildiğinde hata mesajı kısıt adını (ex_appointments_user_no_overlap) içerir.
+--
+-- Uygulamadan önce mevcut çakışmalar temizlenmelidir; aşağıdaki sorgu çakışan çiftleri listeler:
+--   select a.id, b.id, a.user_id
+--   from public.appointments a
+--   join public.appointments b
+--     on a.user_id = b.user_id and a.id < b.id
+--    and a.status <> 'cancelled' and b.status <> 'cancelled'
+--    and a.appointment_time < b.end_time and a.end_time > b.appointment_time;
+--
+-- Geri almak için: 0002_appointment_no_overlap.down.sql
+
+-- uuid eşitliğini GiST indeksinde kullanabilmek için
+create extension if not exists btree_gist;
+
+-- [başlangıç, bitiş) yarı açık aralık: arka arkaya gelen randevular (bitiş = sonraki başlangıç) çakışma sayılmaz
+alter table public.appointments
+  add constraint ex_appointments_user_no_overlap
+  exclude using gist (
+    user_id with =,
+    tstzrange(appointment_time, end_time, '[)') with &&
+  )
+  where (status <> 'cancelled');
@@ -0,0 +1,4 @@
+-- 0003_appointment_daily_rollups.down.sql
+-- 0003_appointment_daily_rollups.sql ile eklenen özet tablosunu kaldırır.
+
+drop table if exists public.appointment_daily_rollups;
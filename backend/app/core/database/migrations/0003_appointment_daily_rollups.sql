@@ -0,0 +1,19 @@
+-- 0003_appointment_daily_rollups.sql
+-- Şirket / gün / durum bazında randevu sayısı, dolu dakika ve gelir özet (rollup) tablosu.
+-- Karşılığı: app/models/appointment_rollup.py
+-- Tablo, randevu yazımlarıyla aynı transaction içinde artımlı güncellenir (app/crud/crud_appointment_rollup.py).
+--
+-- Oluşturduktan sonra mevcut randevular için doldurmak (backfill) gerekir:
+--   python -m app.commands.rebuild_rollups
+-- Geri almak için: 0003_appointment_daily_rollups.down.sql
+
+create table if not exists public.appointment_daily_rollups (
+  company_id integer not null references public.companies (id) on delete cascade,
+  day date not null, -- appointment_time'ın UTC tarihi
+  status varchar(20) not null,
+  appointment_count integer not null default 0,
+  booked_minutes integer not null default 0,
+  revenue numeric(14, 2) not null default 0,
+  updated_at timestamptz not null default now(),
+  constraint pk_appointment_daily_rollups primary key (company_id, day, status)
+);
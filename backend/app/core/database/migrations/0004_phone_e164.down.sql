@@ -0,0 +1,7 @@
+-- 0004_phone_e164.down.sql
+-- 0004_phone_e164.sql ile eklenen indeksleri ve sütunları kaldırır.
+
+drop index concurrently if exists public.ix_users_phone_e164;
+drop index concurrently if exists public.ix_companies_phone_e164;
+alter table public.users drop column if exists phone_e164;
+alter table public.companies drop column if exists phone_e164;
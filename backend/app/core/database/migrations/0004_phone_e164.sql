@@ -0,0 +1,24 @@
+-- 0004_phone_e164.sql
+-- Gelen çağrıda numaradan şirket ve kullanıcı çözümlemesi için E.164 biçimli telefon sütunları ve indeksleri.
+-- Karşılıkları: app/models/company.py ve app/models/user.py (phone_e164, __table_args__)
+--
+-- Sütunlar uygulama tarafından phone ile birlikte yazılır (app/bussines_logics/caller_id.py: normalize_phone).
+-- Mevcut kayıtlar için sütunları ekledikten sonra doldurmak (backfill) gerekir:
+--   python -m app.commands.backfill_phone_e164
+--
+-- CREATE INDEX CONCURRENTLY bir transaction bloğu içinde çalıştırılamaz; dosya psql ile çalıştırılmalıdır:
+--   psql "$DATABASE_URL" -f 0004_phone_e164.sql
+-- Geri almak için: 0004_phone_e164.down.sql
+
+alter table public.companies add column if not exists phone_e164 varchar(16) null;
+alter table public.users add column if not exists phone_e164 varchar(16) null;
+
+-- Aranan numara -> şirket (numarası olmayan kayıtlar indekse girmez)
+create index concurrently if not exists ix_companies_phone_e164
+  on public.companies (phone_e164)
+  where phone_e164 is not null;
+
+-- Arayan numara -> kullanıcı
+create index concurrently if not exists ix_users_phone_e164
+  on public.users (phone_e164)
+  where phone_e164 is not null;
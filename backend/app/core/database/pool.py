@@ -0,0 +1,79 @@
+# app/core/database/pool.py
+
+import time
+from collections import deque
+from typing import Any, Deque, Dict
+
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Bağlantı havuzu metrikleri.
+# Havuzdan bağlantı alma süresi sorgu süresinden ayrı ölçülür; böylece havuzun tükenmesi
+# (bağlantı beklemek) ile yavaş sorgular birbirinden ayırt edilebilir.
+
+WAIT_SAMPLE_SIZE = 1024 # Yüzdelik hesapları için tutulan son bekleme örneği sayısı
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    Bağlantı alma (checkout) sürelerini, havuz tükendiğinde bekleyen istekleri ve
+    zaman aşımlarını sayan AsyncAdaptedQueuePool.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.acquisitions = 0
+        self.exhausted_waits = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.overflow_high_water = 0
+        self._wait_samples: Deque[float] = deque(maxlen=WAIT_SAMPLE_SIZE)
+
+    def _do_get(self):
+        # Boşta bağlantı yoksa ve taşma sınırına ulaşıldıysa istek bir bağlantının iadesini bekler
+        exhausted = self.checkedin() == 0 and self._max_overflow > -1 and self._overflow >= self._max_overflow
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except sa_exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+            self._wait_samples.append(waited)
+            if exhausted:
+                self.exhausted_waits += 1
+        self.acquisitions += 1
+        self.overflow_high_water = max(self.overflow_high_water, self.overflow())
+        return connection
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Havuzun anlık durumunu ve birikmiş bekleme istatistiklerini döndürür.
+        """
+        samples = sorted(self._wait_samples)
+        attempts = self.acquisitions + self.timeouts
+
+        def percentile(pct: float) -> float:
+            if not samples:
+                return 0.0
+            return samples[min(len(samples) - 1, int(round(pct / 100.0 * (len(samples) - 1))))]
+
+        return {
+            "pool_size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_out": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "overflow_high_water": max(self.overflow_high_water, 0),
+            "acquisitions": self.acquisitions,
+            "exhausted_waits": self.exhausted_waits,
+            "timeouts": self.timeouts,
+            "wait_ms_avg": self.wait_seconds_total / attempts * 1000 if attempts else 0.0,
+            "wait_ms_p50": percentile(50) * 1000,
+            "wait_ms_p99": percentile(99) * 1000,
+            "wait_ms_max": self.wait_seconds_max * 1000,
+        }
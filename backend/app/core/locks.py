@@ -0,0 +1,40 @@
+# app/core/locks.py
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Hashable, List
+
+
+class KeyedLockStripes:
+    """
+    Anahtar bazlı asenkron kilitler için sabit sayıda kilitten oluşan şeritler (lock striping).
+    Her anahtar hash'ine göre bir kilide düşer; farklı anahtarlar büyük olasılıkla farklı kilitleri
+    kullandığı için birbirini beklemez ve kilit sayısı anahtar sayısıyla büyümez.
+    Kilitler süreç içidir; süreçler arası koruma veritabanı kilitleriyle sağlanmalıdır.
+    """
+
+    def __init__(self, stripes: int):
+        if stripes < 1:
+            raise ValueError("stripes must be at least 1.")
+        self._locks: List[asyncio.Lock] = [asyncio.Lock() for _ in range(stripes)]
+
+    def _index(self, key: Hashable) -> int:
+        return hash(key) % len(self._locks)
+
+    @asynccontextmanager
+    async def hold(self, *keys: Hashable) -> AsyncIterator[None]:
+        """
+        Verilen anahtarların kilitlerini alır ve blok sonunda bırakır.
+        Birden fazla anahtar için kilitler her zaman aynı (artan) sırayla alınır; böylece
+        kesişen anahtar kümeleriyle eşzamanlı çağrılar birbirini kilitleyemez (deadlock).
+        """
+        indexes = sorted({self._index(key) for key in keys})
+        acquired: List[int] = []
+        try:
+            for index in indexes:
+                await self._locks[index].acquire()
+                acquired.append(index)
+            yield
+        finally:
+            for index in reversed(acquired):
+                self._locks[index].release()
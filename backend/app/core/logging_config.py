@@ -1,15 +1,22 @@
 # app/core/logging_config.py
 
+import atexit
 import os
+import queue
+import random
+import threading
+import time
 from datetime import datetime
 import logging.config
 import logging
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, List, Optional
 # python-json-logger kütüphanesini import edin
 from pythonjsonlogger import jsonlogger # <-- Bu satırın olduğundan emin olun
 
 # Proje kök dizinini bulmak için
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-LOG_DIR = os.path.join(BASE_DIR, "logs")
+LOG_DIR = os.environ.get("LOG_DIR", os.path.join(BASE_DIR, "logs")) # Benchmark/test için ortam değişkeniyle değiştirilebilir
 
 # Log dizinini oluştur (eğer yoksa)
 os.makedirs(LOG_DIR, exist_ok=True)
@@ -22,6 +29,115 @@ LOG_FILE_PATH = os.path.join(LOG_DIR, LOG_FILE_NAME)
 ERROR_LOG_FILE_NAME = "error.log"
 ERROR_LOG_FILE_PATH = os.path.join(LOG_DIR, ERROR_LOG_FILE_NAME)
 
+# DEBUG kayıtları için örnekleme ve hız sınırı.
+# Anahtar logger adı (veya öneki), değer (örnekleme oranı 0-1, saniyede en fazla kayıt sayısı).
+# En uzun eşleşen önek kullanılır; "" tüm loggerlar için varsayılandır. INFO ve üstü kayıtlar hiçbir zaman atılmaz.
+DEBUG_SAMPLING = {
+    "": (1.0, 200),
+    "app.crud": (0.1, 50), # Her istekte çalışan CRUD sorgu logları
+    "app.core.security": (0.1, 20), # Her kimlik doğrulamada yazılan loglar
+    "app.api": (0.5, 50),
+}
+
+class DebugSamplingFilter(logging.Filter):
+    """
+    Yüksek hacimli DEBUG kayıtlarını logger bazında örnekler ve saniyelik hız sınırı uygular.
+    Kayıtlar kuyruğa girmeden önce elendiği için atılan kayıtların mesajı hiç biçimlendirilmez.
+    """
+
+    def __init__(self, rules: Optional[Dict[str, tuple]] = None):
+        super().__init__()
+        self.rules = dict(DEBUG_SAMPLING if rules is None else rules)
+        self.dropped = 0
+        self._windows: Dict[str, List[float]] = {} # logger adı -> [pencere başlangıcı, penceredeki kayıt sayısı]
+        self._resolved: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def _rule_for(self, name: str) -> tuple:
+        rule = self._resolved.get(name)
+        if rule is None:
+            prefix = max(
+                (key for key in self.rules if key == "" or name == key or name.startswith(key + ".")),
+                key=len
+            )
+            rule = self._resolved[name] = self.rules[prefix]
+        return rule
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+        sample_rate, max_per_second = self._rule_for(record.name)
+        if sample_rate < 1.0 and random.random() >= sample_rate:
+            self.dropped += 1
+            return False
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.setdefault(record.name, [now, 0])
+            if now - window[0] >= 1.0:
+                window[0], window[1] = now, 0
+            if window[1] >= max_per_second:
+                self.dropped += 1
+                return False
+            window[1] += 1
+        return True
+
+class _RecordQueueHandler(QueueHandler):
+    """
+    Kaydı kuyruğa koymadan önce yalnızca mesajı birleştirir; biçimlendirme (JSON, zaman damgası vb.)
+    ve dosya G/Ç'si dinleyici thread'inde yapılır.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            # Traceback nesneleri thread'ler arasında tutulmaz; metin hali yeterlidir
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+_listeners: List[QueueListener] = []
+
+def setup_logging(config: Optional[dict] = None, queued: bool = True) -> None:
+    """
+    Loglama yapılandırmasını yükler.
+    queued=True iken her logger'ın handler'ları bir kuyruk arkasına alınır: event loop kaydı yalnızca
+    kuyruğa koyar, biçimlendirme ve dosya/konsol yazımı ayrı bir dinleyici thread'inde yapılır.
+    Aynı handler kümesini paylaşan loggerlar aynı kuyruğu ve dinleyiciyi kullanır.
+    """
+    shutdown_logging()
+    config = LOGGING_CONFIG if config is None else config
+    logging.config.dictConfig(config)
+    if not queued:
+        return
+
+    sampling_filter = DebugSamplingFilter()
+    queue_handlers: Dict[tuple, QueueHandler] = {}
+    for name in config.get("loggers", {}):
+        target = logging.getLogger(name or None)
+        handlers = tuple(target.handlers)
+        if not handlers:
+            continue
+        queue_handler = queue_handlers.get(handlers)
+        if queue_handler is None:
+            record_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+            queue_handler = _RecordQueueHandler(record_queue)
+            queue_handler.addFilter(sampling_filter)
+            listener = QueueListener(record_queue, *handlers, respect_handler_level=True)
+            listener.start()
+            _listeners.append(listener)
+            queue_handlers[handlers] = queue_handler
+        target.handlers = [queue_handler]
+
+def shutdown_logging() -> None:
+    """
+    Dinleyici thread'lerini durdurur; kuyrukta bekleyen kayıtlar önce yazılır.
+    """
+    while _listeners:
+        _listeners.pop().stop()
+
+atexit.register(shutdown_logging)
+
 LOGGING_CONFIG = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -88,7 +204,7 @@ LOGGING_CONFIG = {
         },
         "sqlalchemy": {
             "handlers": ["file"],
-            "level": "INFO",
+            "level": "WARNING", # SQL ifadeleri yalnızca DB_ECHO=True iken loglanır
             "propagate": False,
         },
         "supabase": {
@@ -0,0 +1,78 @@
+# app/core/pagination.py
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import tuple_
+
+# Keyset (cursor) sayfalama yardımcıları.
+# İmleç (cursor), son döndürülen kaydın sıralama anahtarlarının base64 ile kodlanmış halidir;
+# istemci için opak bir değerdir. Bir sonraki sayfa, OFFSET yerine
+# "(k1, k2) > (son_k1, son_k2)" koşuluyla indeks üzerinden doğrudan bulunur.
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Sıralama anahtarı değerlerini opak bir imlece dönüştürür.
+    """
+    payload = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, parsers: Sequence[Callable[[Any], Any]]) -> Tuple[Any, ...]:
+    """
+    İmleci sıralama anahtarı değerlerine geri çevirir.
+
+    Args:
+        cursor (str): encode_cursor ile üretilmiş imleç.
+        parsers (Sequence[Callable]): Her anahtar için dönüştürücü (örn. datetime.fromisoformat, UUID, int).
+
+    Returns:
+        Tuple[Any, ...]: Anahtar değerleri.
+    Raises:
+        ValueError: İmleç bozuksa veya beklenen anahtar sayısıyla uyuşmuyorsa.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(parsers):
+            raise ValueError
+        return tuple(parse(value) for parse, value in zip(parsers, values))
+    except (ValueError, TypeError, UnicodeError):
+        raise ValueError("Invalid pagination cursor.")
+
+
+def keyset_after(columns: Sequence, values: Sequence[Any]):
+    """
+    Verilen anahtar değerlerinden sonra gelen satırları seçen satır karşılaştırması (row value) filtresi.
+    """
+    if len(columns) == 1:
+        return columns[0] > values[0]
+    return tuple_(*columns) > tuple_(*values)
+
+
+def cursor_for(instance: Any, columns: Sequence) -> str:
+    """
+    Bir ORM nesnesi için, verilen sıralama sütunlarına göre imleç üretir.
+    """
+    return encode_cursor([getattr(instance, column.key) for column in columns])
+
+
+def next_cursor(items: List[Any], limit: int, columns: Sequence) -> Optional[str]:
+    """
+    Sayfa doluysa son kayıttan bir sonraki sayfanın imlecini, değilse None döndürür.
+    """
+    if not items or len(items) < limit:
+        return None
+    return cursor_for(items[-1], columns)
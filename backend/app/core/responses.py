@@ -0,0 +1,56 @@
+# app/core/responses.py
+
+from typing import Any, Dict, Optional
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+try:  # orjson kurulu değilse standart json kodlayıcısı kullanılır
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# Hızlı JSON yanıtları.
+# FastAPI'nin varsayılan yolu, response_model ile dönen değeri önce doğrular, ardından
+# jsonable_encoder ve json.dumps ile iki kez Python nesnesine çevirir. Büyük liste yanıtlarında
+# bunun yerine önceden oluşturulmuş bir TypeAdapter ile doğrulama ve JSON üretimi
+# tek adımda pydantic-core (Rust) içinde yapılır.
+
+
+if orjson is not None:
+    class FastJSONResponse(JSONResponse):
+        """
+        İçeriği orjson ile kodlayan varsayılan yanıt sınıfı.
+        """
+
+        def render(self, content: Any) -> bytes:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+else:  # pragma: no cover
+    FastJSONResponse = JSONResponse
+
+
+def adapter_response(
+    adapter: TypeAdapter,
+    content: Any,
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None,
+    **dump_kwargs: Any
+) -> Response:
+    """
+    İçeriği verilen TypeAdapter ile doğrulayıp doğrudan JSON baytlarına çeviren bir yanıt döndürür.
+    ORM nesneleri öznitelikleri üzerinden okunur (from_attributes).
+    Uç noktanın response_model'i yalnızca OpenAPI dokümantasyonu için kullanılır.
+
+    Args:
+        adapter (TypeAdapter): Yanıt şeması için modül düzeyinde bir kez oluşturulmuş adapter.
+        content (Any): Yanıt içeriği (sözlük, ORM nesneleri, model örnekleri).
+        status_code (int): HTTP durum kodu.
+        headers (Optional[Dict[str, str]]): Ek yanıt başlıkları.
+        **dump_kwargs: dump_json'a iletilecek seçenekler (örn. exclude_unset=True).
+
+    Returns:
+        Response: application/json yanıtı.
+    """
+    body = adapter.dump_json(adapter.validate_python(content, from_attributes=True), **dump_kwargs)
+    return Response(content=body, status_code=status_code, headers=headers, media_type="application/json")
@@ -1,12 +1,16 @@
 from jose import jwt, JWTError
 from datetime import datetime, timedelta
+import hashlib
+import time
 from app.core.config import get_settings
+from app.core.cache import TTLCache
 from app.models.user import User, UserRole # UserRole'u da import edelim
 from app.core.database.database import get_db
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from uuid import UUID # UUID tipi için
+from typing import Optional
 import logging
 logger = logging.getLogger(__name__)
 
@@ -14,10 +18,23 @@ logger = logging.getLogger(__name__)
 # tokenUrl, frontend'in token'ı alacağı login endpoint'ini işaret eder.
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
 
+# Doğrulanmış JWT payload'larının önbelleği: sha256(token) -> payload
+# Token'ın kendisi saklanmaz; her kayıt token'ın 'exp' anında düşer. Başarısız doğrulamalar önbelleğe alınmaz.
+token_cache = TTLCache(maxsize=get_settings().AUTH_TOKEN_CACHE_MAX_ENTRIES, ttl=0)
+
+def _token_cache_key(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
 async def verify_supabase_jwt(token: str) -> dict:
     """
     Supabase tarafından verilen JWT token'ını doğrular ve payload'unu döndürür.
+    Daha önce doğrulanmış ve süresi dolmamış token'lar için önbellekteki payload döndürülür.
     """
+    cache_key = _token_cache_key(token)
+    cached_payload = token_cache.get(cache_key)
+    if cached_payload is not None:
+        return cached_payload
+
     settings = get_settings()
     try:
         # ÖNEMLİ: settings.JWT_SECRET_KEY, Supabase projenizin JWT Secret'ı olmalıdır.
@@ -42,21 +59,22 @@ async def verify_supabase_jwt(token: str) -> dict:
             # Unix timestamp'i datetime objesine çevir
             expiry_datetime = datetime.fromtimestamp(expires_at)
             if expiry_datetime < datetime.utcnow():
-                logger.warning(f"JWT expired for user ID: {user_id}")
+                logger.warning("JWT expired for user ID: %s", user_id)
                 raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expired.")
         else:
-            logger.warning(f"JWT payload missing 'exp' (expiration) claim for user ID: {user_id}")
+            logger.warning("JWT payload missing 'exp' (expiration) claim for user ID: %s", user_id)
             # 'exp' alanı yoksa, yine de token'ı geçersiz sayabiliriz veya farklı bir politika izleyebiliriz.
             # Güvenlik için, 'exp' alanı olmayan token'ları reddetmek daha iyidir.
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload: Missing expiration time.")
 
-        logger.debug(f"JWT verified successfully for user ID: {user_id}")
+        logger.debug("JWT verified successfully for user ID: %s", user_id)
+        token_cache.set(cache_key, payload, ttl=expires_at - time.time())
         return payload
     except JWTError as e:
-        logger.error(f"JWT verification failed: {e}", exc_info=True)
+        logger.error("JWT verification failed: %s", e, exc_info=True)
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate credentials.")
     except Exception as e:
-        logger.error(f"An unexpected error occurred during JWT verification: {e}", exc_info=True)
+        logger.error("An unexpected error occurred during JWT verification: %s", e, exc_info=True)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="An unexpected error occurred during authentication.")
 
 
@@ -74,19 +92,20 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession
     try:
         user_id_uuid = UUID(user_id_str) # String UUID'yi Python UUID objesine çevir
     except ValueError:
-        logger.error(f"Invalid UUID format in token 'sub' claim: {user_id_str}")
+        logger.error("Invalid UUID format in token 'sub' claim: %s", user_id_str)
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid user ID format in token.")
 
     # Kendi DB'nizdeki kullanıcıyı Supabase user ID'sine (UUID) göre bulun
     # Dairesel bağımlılığı önlemek için burada içe aktarma yapıyoruz.
-    from app.crud.crud_user import get_user_by_id 
-    user = await get_user_by_id(db, user_id=user_id_uuid)
+    # Kullanıcı kısa bir süre önbellekte tutulur; update_user/delete_user kaydı geçersiz kılar.
+    from app.crud.crud_user import get_user_by_id_cached
+    user = await get_user_by_id_cached(db, user_id=user_id_uuid)
 
     if user is None:
-        logger.warning(f"User with ID {user_id_uuid} found in token but not in local DB.")
+        logger.warning("User with ID %s found in token but not in local DB.", user_id_uuid)
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found in local database.")
     
-    logger.debug(f"Current user retrieved: {user.email} (ID: {user.id})")
+    logger.debug("Current user retrieved: %s (ID: %s)", user.email, user.id)
     return user
 
 async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
@@ -94,27 +113,75 @@ async def get_current_active_user(current_user: User = Depends(get_current_user)
     Mevcut kullanıcının aktif olup olmadığını kontrol eder.
     """
     if not current_user.is_active:
-        logger.warning(f"Inactive user attempted to access: {current_user.email} (ID: {current_user.id})")
+        logger.warning("Inactive user attempted to access: %s (ID: %s)", current_user.email, current_user.id)
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user.")
-    logger.debug(f"Active user: {current_user.email}")
+    logger.debug("Active user: %s", current_user.email)
     return current_user
 
 async def get_current_admin_user(current_user: User = Depends(get_current_active_user)) -> User:
     """
     Mevcut kullanıcının 'admin' rolüne sahip olup olmadığını kontrol eder.
     """
-    if current_user.role != UserRole.admin: # Enum ile karşılaştırma
-        logger.warning(f"User {current_user.email} (ID: {current_user.id}) attempted admin access without admin role.")
+    if current_user.role != UserRole.admin.value: # role sütunu string olarak saklanır
+        logger.warning("User %s (ID: %s) attempted admin access without admin role.", current_user.email, current_user.id)
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized. Admin role required.")
-    logger.debug(f"Admin user: {current_user.email}")
+    logger.debug("Admin user: %s", current_user.email)
     return current_user
 
 async def get_current_manager_user(current_user: User = Depends(get_current_active_user)) -> User:
     """
     Mevcut kullanıcının 'manager' veya 'admin' rolüne sahip olup olmadığını kontrol eder.
     """
-    if current_user.role not in [UserRole.admin, UserRole.manager]: # Enum ile karşılaştırma
-        logger.warning(f"User {current_user.email} (ID: {current_user.id}) attempted manager access without manager/admin role.")
+    if current_user.role not in [UserRole.admin.value, UserRole.manager.value]: # role sütunu string olarak saklanır
+        logger.warning("User %s (ID: %s) attempted manager access without manager/admin role.", current_user.email, current_user.id)
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized. Manager or Admin role required.")
-    logger.debug(f"Manager user: {current_user.email}")
-    return current_user
\ No newline at end of file
+    logger.debug("Manager user: %s", current_user.email)
+    return current_user
+
+def scope_company_id(current_user: User, company_id: Optional[int]) -> Optional[int]:
+    """
+    Şirket (kiracı) verisine erişen uç noktalar için sorgulanacak şirketi belirler.
+    Adminler istedikleri şirketi (None ise tüm şirketleri) sorgulayabilir; diğer kullanıcılar yalnızca
+    kendi şirketlerini görür. Kullanıcı (user_id) filtreleri bu şirket filtresiyle birlikte uygulandığından
+    başka bir şirketin kullanıcısı istenirse sonuç boş döner.
+
+    Args:
+        current_user (User): İstek sahibi kullanıcı.
+        company_id (Optional[int]): İstekte verilen şirket ID'si.
+
+    Returns:
+        Optional[int]: Sorguya uygulanacak şirket ID'si (yalnızca adminler için None olabilir).
+    Raises:
+        HTTPException: Admin olmayan kullanıcı başka bir şirketin verisini isterse (403).
+    """
+    if current_user.role == UserRole.admin.value:
+        return company_id
+    if company_id is not None and company_id != current_user.company_id:
+        logger.warning("User %s (ID: %s) attempted to access company %s data.", current_user.email, current_user.id, company_id)
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized for this company.")
+    return current_user.company_id
+
+async def scope_user_id(db: AsyncSession, current_user: User, user_id: UUID) -> UUID:
+    """
+    Tek bir kullanıcının (çalışanın) verisine erişen uç noktalar için kullanıcının istek sahibinin şirketine
+    ait olduğunu doğrular. Adminler her kullanıcıyı sorgulayabilir.
+
+    Args:
+        db (AsyncSession): Veritabanı oturumu.
+        current_user (User): İstek sahibi kullanıcı.
+        user_id (UUID): İstekte verilen kullanıcı ID'si.
+
+    Returns:
+        UUID: Doğrulanmış kullanıcı ID'si.
+    Raises:
+        HTTPException: Admin olmayan kullanıcı başka bir şirketin (veya var olmayan) kullanıcısını isterse (403).
+    """
+    if current_user.role == UserRole.admin.value or user_id == current_user.id:
+        return user_id
+    from app.crud.crud_user import get_user_by_id_cached
+    user = await get_user_by_id_cached(db, user_id=user_id)
+    if user is None or user.company_id != current_user.company_id:
+        # Var olmayan kullanıcı da 403 döner; böylece başka şirketlerin kullanıcı ID'leri yoklanamaz
+        logger.warning("User %s (ID: %s) attempted to access user %s data.", current_user.email, current_user.id, user_id)
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized for this user.")
+    return user_id
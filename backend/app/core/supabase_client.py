@@ -0,0 +1,91 @@
+# app/core/supabase_client.py
+
+import asyncio
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import httpx
+from fastapi import HTTPException, status
+from supabase import AsyncClient, AsyncClientOptions, acreate_client
+
+from app.core.config import get_settings
+import logging
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Supabase Auth çağrıları için paylaşılan asenkron istemci.
+# Senkron istemci async handler'lar içinde event loop'u bloklar; asenkron istemci ise
+# bağlantıları keep-alive havuzunda tutan tek bir httpx.AsyncClient üzerinden çalışır.
+# İstemci ilk kullanımda oluşturulur ve uygulama kapanırken close_supabase_client ile kapatılır.
+_client: Optional[AsyncClient] = None
+_http_client: Optional[httpx.AsyncClient] = None
+_client_lock = asyncio.Lock()
+_auth_semaphore: Optional[asyncio.Semaphore] = None
+
+
+async def get_supabase_client() -> AsyncClient:
+    """
+    Paylaşılan asenkron Supabase istemcisini döndürür; gerekirse oluşturur.
+    """
+    global _client, _http_client, _auth_semaphore
+    if _client is not None:
+        return _client
+    async with _client_lock:
+        if _client is None:
+            settings = get_settings()
+            _http_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(settings.SUPABASE_HTTP_TIMEOUT_SECONDS),
+                limits=httpx.Limits(
+                    max_connections=settings.SUPABASE_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.SUPABASE_HTTP_MAX_KEEPALIVE_CONNECTIONS
+                )
+            )
+            _auth_semaphore = asyncio.Semaphore(settings.SUPABASE_AUTH_MAX_CONCURRENCY)
+            # Sunucu tarafında arka planda token yenileme zamanlayıcısına ihtiyaç yoktur.
+            _client = await acreate_client(
+                settings.SUPABASE_URL,
+                settings.SUPABASE_KEY,
+                options=AsyncClientOptions(auto_refresh_token=False, httpx_client=_http_client)
+            )
+            logger.info("Supabase async client initialized.")
+    return _client
+
+
+async def run_auth_call(operation: str, call: Callable[[AsyncClient], Awaitable[T]]) -> T:
+    """
+    Bir Supabase Auth çağrısını eşzamanlılık sınırı ve zaman aşımı ile çalıştırır.
+    Sınır doluysa çağrı sırada bekler; bekleme süresi de zaman aşımına dahildir.
+
+    Args:
+        operation (str): Loglarda kullanılacak işlem adı (örn. "sign_in_with_password").
+        call (Callable): İstemciyi alıp Supabase çağrısını yapan coroutine fonksiyonu.
+
+    Returns:
+        T: Çağrının sonucu.
+    Raises:
+        HTTPException: Çağrı zaman aşımına uğrarsa (504).
+    """
+    client = await get_supabase_client()
+    settings = get_settings()
+
+    async def _guarded() -> T:
+        async with _auth_semaphore:
+            return await call(client)
+
+    try:
+        return await asyncio.wait_for(_guarded(), timeout=settings.SUPABASE_AUTH_CALL_TIMEOUT_SECONDS)
+    except (asyncio.TimeoutError, httpx.TimeoutException):
+        logger.warning("Supabase auth call '%s' timed out.", operation)
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="Authentication service timed out.")
+
+
+async def close_supabase_client() -> None:
+    """
+    Paylaşılan istemciyi ve bağlantı havuzunu kapatır.
+    """
+    global _client, _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        logger.info("Supabase async client closed.")
+    _client = None
+    _http_client = None
@@ -1,40 +1,190 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import exc as sa_exc, and_, or_, delete as sa_delete # SQLAlchemy exceptions and operators
-from sqlalchemy.orm import selectinload # İlişkili objeleri eager load etmek için
+from sqlalchemy import exc as sa_exc, and_, func, literal, text, bindparam, insert as sa_insert # SQLAlchemy exceptions and operators
+from sqlalchemy.orm import selectinload, load_only # İlişkili objeleri eager load etmek ve sütun seçmek için
+from sqlalchemy import inspect as sa_inspect, Row, BigInteger
+from sqlalchemy.dialects.postgresql import ARRAY # Advisory lock anahtar dizisi için
+from sqlalchemy.orm.attributes import set_committed_value # İlişkileri sorgusuz doldurmak için
 
 from app.models.appointment import Appointment, AppointmentStatus
 from app.models.appointment_service import AppointmentService
+from app.models.company import Company # Şirketin varlığını kontrol etmek için
 from app.models.company_service import CompanyService # Hizmetlerin varlığını kontrol etmek için
 from app.models.user import User # Kullanıcının varlığını kontrol etmek için
-from app.schemas.appointment import AppointmentCreate, AppointmentUpdate, AppointmentServiceSchema
-from typing import Optional, List
+from app.schemas.appointment import (
+    AppointmentCreate, AppointmentUpdate, AppointmentServiceSchema,
+    AppointmentBulkCreateResult, AppointmentBulkRowError
+)
+from app.core.pagination import decode_cursor, keyset_after
+from app.crud.crud_appointment_rollup import RollupDelta, apply_rollup_delta, as_utc, services_revenue
+from app.core.locks import KeyedLockStripes
+from app.core.config import get_settings
+from app.bussines_logics.availability import IntervalIndex # Toplu çakışma taramasında kullanılır
+from typing import AsyncIterator, Optional, List, Dict, Sequence, Tuple
+from contextlib import asynccontextmanager
 from datetime import datetime
-from uuid import UUID
+from uuid import UUID, uuid4
 import logging
 logger = logging.getLogger(__name__)
 
-async def get_appointment_by_id(db: AsyncSession, appointment_id: UUID) -> Optional[Appointment]:
+# İptal edilmemiş randevular. Değer bind parametresi yerine SQL'e gömülür; böylece planlayıcı
+# "status <> 'cancelled'" koşullu kısmi indeksi (ix_appointments_active_user_id_appointment_time)
+# hazırlanmış (prepared) sorgularda da kullanabilir.
+NOT_CANCELLED = Appointment.status != literal(AppointmentStatus.cancelled.value, literal_execute=True)
+
+settings = get_settings()
+
+# Çift rezervasyonu önlemek için kullanıcı bazlı rezervasyon kilitleri.
+# Çakışma kontrolü ile commit arasında aynı kullanıcı için ikinci bir rezervasyon araya giremez;
+# farklı kullanıcıların rezervasyonları (büyük olasılıkla farklı şeritlerde) paralel ilerler.
+# Süreç içi kilitler, PostgreSQL'de süreçler arası koruma sağlayan advisory lock'larla birlikte kullanılır
+# (bkz. _lock_users_for_booking). Son güvence ex_appointments_user_no_overlap exclusion kısıtıdır.
+booking_locks = KeyedLockStripes(settings.BOOKING_LOCK_STRIPES)
+
+# Exclusion kısıtı ihlali (migrations/0002_appointment_no_overlap.sql)
+NO_OVERLAP_CONSTRAINT = "ex_appointments_user_no_overlap"
+
+# Projeksiyon (sparse fieldset) için seçilebilen sütunlar ve ilişkiler.
+# id ve sıralama anahtarı sütunları (APPOINTMENT_KEYSET) her zaman yüklenir.
+APPOINTMENT_FIELDS = {
+    column.key: column for column in (
+        Appointment.id, Appointment.user_id, Appointment.company_id, Appointment.appointment_time,
+        Appointment.end_time, Appointment.status, Appointment.notes, Appointment.created_at, Appointment.updated_at
+    )
+}
+APPOINTMENT_RELATIONS = ("user", "services", "appointment_services")
+DEFAULT_APPOINTMENT_RELATIONS = ("user", "services") # AppointmentRead'in ihtiyaç duyduğu ilişkiler
+
+# Takvim görünümleri için yalnızca sütun seçen hızlı yol (ORM nesnesi ve ilişki yüklenmez)
+CALENDAR_COLUMNS = (Appointment.id, Appointment.user_id, Appointment.appointment_time, Appointment.end_time, Appointment.status)
+
+APPOINTMENT_KEYSET = (Appointment.appointment_time, Appointment.id) # Keyset sayfalama sıralama anahtarı
+APPOINTMENT_KEYSET_PARSERS = (datetime.fromisoformat, UUID)
+
+def _projection_options(fields: Optional[Sequence[str]], include: Optional[Sequence[str]]) -> list:
+    """
+    İstenen sütun ve ilişkiler için yükleme seçeneklerini (load_only / selectinload) üretir.
+
+    Args:
+        fields (Optional[Sequence[str]]): Yüklenecek sütunlar; None ise tüm sütunlar.
+        include (Optional[Sequence[str]]): Yüklenecek ilişkiler; None ise DEFAULT_APPOINTMENT_RELATIONS.
+
+    Returns:
+        list: Sorguya eklenecek loader seçenekleri.
+    Raises:
+        ValueError: Bilinmeyen bir alan veya ilişki istenirse.
+    """
+    options = []
+    if fields is not None:
+        unknown = sorted(set(fields) - APPOINTMENT_FIELDS.keys())
+        if unknown:
+            raise ValueError(f"Unknown appointment field(s): {', '.join(unknown)}.")
+        columns = {column.key: column for column in APPOINTMENT_KEYSET}
+        columns.update((name, APPOINTMENT_FIELDS[name]) for name in fields)
+        options.append(load_only(*columns.values()))
+
+    relations = DEFAULT_APPOINTMENT_RELATIONS if include is None else include
+    unknown = sorted(set(relations) - set(APPOINTMENT_RELATIONS))
+    if unknown:
+        raise ValueError(f"Unknown appointment relation(s): {', '.join(unknown)}.")
+    if "user" in relations:
+        options.append(selectinload(Appointment.user))
+    if "appointment_services" in relations:
+        # Ara tablo satırları hizmetleriyle birlikte yüklenir; "services" ayrıca istenirse
+        # aynı ilişki ikinci kez sorgulanmaz, _fill_services ile bu satırlardan doldurulur.
+        options.append(selectinload(Appointment.appointment_services).selectinload(AppointmentService.service))
+    elif "services" in relations:
+        options.append(selectinload(Appointment.services))
+    return options
+
+def _fill_services(appointments: Sequence[Appointment], include: Optional[Sequence[str]]) -> None:
+    """
+    "services" ve "appointment_services" birlikte istendiğinde services ilişkisini
+    yüklenmiş ara tablo satırlarından sorgusuz doldurur.
+    """
+    if include is None or "services" not in include or "appointment_services" not in include:
+        return
+    for appointment in appointments:
+        set_committed_value(appointment, "services", [row.service for row in appointment.appointment_services])
+
+def _apply_appointment_filters(
+    query,
+    user_id: Optional[UUID] = None,
+    company_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    status: Optional[AppointmentStatus] = None
+):
+    """
+    Liste ve dışa aktarma sorgularına ortak filtreleri uygular.
+    """
+    if user_id:
+        query = query.filter(Appointment.user_id == user_id)
+    if company_id:
+        query = query.filter(Appointment.company_id == company_id)
+    if start_date:
+        query = query.filter(Appointment.appointment_time >= start_date)
+    if end_date:
+        query = query.filter(Appointment.end_time <= end_date)
+    if status:
+        query = query.filter(Appointment.status == status.value)
+    return query
+
+def _filter_appointments(
+    query,
+    user_id: Optional[UUID] = None,
+    company_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    status: Optional[AppointmentStatus] = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None
+):
+    """
+    Liste sorgularına ortak filtreleri, (appointment_time, id) sıralamasını ve sayfalamayı uygular.
+    """
+    query = _apply_appointment_filters(
+        query, user_id=user_id, company_id=company_id, start_date=start_date, end_date=end_date, status=status
+    )
+    query = query.order_by(*APPOINTMENT_KEYSET)
+    if cursor:
+        query = query.filter(keyset_after(APPOINTMENT_KEYSET, decode_cursor(cursor, APPOINTMENT_KEYSET_PARSERS)))
+    else:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+async def get_appointment_by_id(
+    db: AsyncSession,
+    appointment_id: UUID,
+    fields: Optional[Sequence[str]] = None,
+    include: Optional[Sequence[str]] = None
+) -> Optional[Appointment]:
     """
     Veritabanından UUID ID'sine göre bir randevu getirir.
-    İlişkili kullanıcı ve hizmet detaylarını da yükler.
+    Varsayılan olarak ilişkili kullanıcı ve hizmet detaylarını da yükler.
 
     Args:
         db (AsyncSession): Veritabanı oturumu.
         appointment_id (UUID): Aranacak randevunun UUID ID'si.
+        fields (Optional[Sequence[str]]): Yalnızca bu sütunları yükle (APPOINTMENT_FIELDS); None ise tümü.
+        include (Optional[Sequence[str]]): Yüklenecek ilişkiler (APPOINTMENT_RELATIONS); None ise kullanıcı ve hizmetler.
 
     Returns:
         Optional[Appointment]: Bulunursa Appointment nesnesi, aksi takdirde None.
+    Raises:
+        ValueError: Bilinmeyen bir alan veya ilişki istenirse.
     """
-    logger.debug(f"Getting appointment by ID: {appointment_id}")
+    logger.debug("Getting appointment by ID: %s", appointment_id)
     result = await db.execute(
         select(Appointment)
         .filter(Appointment.id == appointment_id)
-        .options(selectinload(Appointment.user)) # Kullanıcıyı eager load et
-        .options(selectinload(Appointment.services)) # Hizmetleri eager load et
-        .options(selectinload(Appointment.appointment_services)) # Ara tabloyu eager load et
+        .options(*_projection_options(fields, include))
     )
-    return result.scalars().first()
+    appointment = result.scalars().first()
+    if appointment is not None:
+        _fill_services([appointment], include)
+    return appointment
 
 async def get_appointments(
     db: AsyncSession,
@@ -44,11 +194,17 @@ async def get_appointments(
     end_date: Optional[datetime] = None,
     status: Optional[AppointmentStatus] = None,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+    include: Optional[Sequence[str]] = None
 ) -> List[Appointment]:
     """
     Randevuları filtreleme ve sayfalama ile listeler.
-    İlişkili kullanıcı ve hizmet detaylarını da yükler.
+    Varsayılan olarak ilişkili kullanıcı ve hizmet detaylarını da yükler; fields ve include ile
+    yalnızca istenen sütunlar ve ilişkiler yüklenir (yüklenmeyen alanlara erişilmemelidir).
+    Sonuçlar her zaman (appointment_time, id) sırasıyla döner; cursor verilirse
+    OFFSET yerine keyset sayfalama kullanılır ve skip dikkate alınmaz.
 
     Args:
         db (AsyncSession): Veritabanı oturumu.
@@ -59,29 +215,218 @@ async def get_appointments(
         status (Optional[AppointmentStatus]): Randevu durumuna göre filtrelemek için.
         skip (int): Kaç kaydın atlanacağı.
         limit (int): Kaç kaydın döndürüleceği.
+        cursor (Optional[str]): Önceki sayfanın son kaydından üretilmiş opak imleç.
+        fields (Optional[Sequence[str]]): Yalnızca bu sütunları yükle (APPOINTMENT_FIELDS); None ise tümü.
+        include (Optional[Sequence[str]]): Yüklenecek ilişkiler (APPOINTMENT_RELATIONS); None ise kullanıcı ve hizmetler.
 
     Returns:
         List[Appointment]: Randevuların listesi.
+    Raises:
+        ValueError: İmleç geçersizse veya bilinmeyen bir alan ya da ilişki istenirse.
     """
-    logger.debug(f"Getting appointments with filters: user_id={user_id}, company_id={company_id}, start_date={start_date}, end_date={end_date}, status={status}, skip={skip}, limit={limit}")
-    query = select(Appointment) \
-        .options(selectinload(Appointment.user)) \
-        .options(selectinload(Appointment.services)) \
-        .options(selectinload(Appointment.appointment_services))
+    logger.debug("Getting appointments with filters: user_id=%s, company_id=%s, start_date=%s, end_date=%s, status=%s, skip=%s, limit=%s, cursor=%s, fields=%s, include=%s", user_id, company_id, start_date, end_date, status, skip, limit, cursor, fields, include)
+    query = _filter_appointments(
+        select(Appointment).options(*_projection_options(fields, include)),
+        user_id=user_id, company_id=company_id, start_date=start_date, end_date=end_date,
+        status=status, skip=skip, limit=limit, cursor=cursor
+    )
+    result = await db.execute(query)
+    appointments = result.scalars().all()
+    _fill_services(appointments, include)
+    return appointments
 
-    if user_id:
-        query = query.filter(Appointment.user_id == user_id)
-    if company_id:
-        query = query.filter(Appointment.company_id == company_id)
-    if start_date:
-        query = query.filter(Appointment.appointment_time >= start_date)
-    if end_date:
-        query = query.filter(Appointment.end_time <= end_date)
-    if status:
-        query = query.filter(Appointment.status == status)
-    
-    result = await db.execute(query.offset(skip).limit(limit))
-    return result.scalars().all()
+async def get_appointment_calendar(
+    db: AsyncSession,
+    user_id: Optional[UUID] = None,
+    company_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    status: Optional[AppointmentStatus] = None,
+    limit: int = 500,
+    cursor: Optional[str] = None
+) -> List[Row]:
+    """
+    Takvim ızgaraları için randevuların yalnızca zaman ve durum sütunlarını döndürür.
+    ORM nesnesi oluşturulmaz ve ilişki yüklenmez; tek bir sorgu çalışır.
+    Filtreleme, sıralama ve keyset sayfalama get_appointments ile aynıdır.
+
+    Args:
+        db (AsyncSession): Veritabanı oturumu.
+        user_id (Optional[UUID]): Belirli bir kullanıcıya ait randevuları filtrelemek için.
+        company_id (Optional[int]): Belirli bir şirkete ait randevuları filtrelemek için.
+        start_date (Optional[datetime]): Randevu başlangıç zamanının bu tarihten sonra olması için.
+        end_date (Optional[datetime]): Randevu bitiş zamanının bu tarihten önce olması için.
+        status (Optional[AppointmentStatus]): Randevu durumuna göre filtrelemek için.
+        limit (int): Kaç kaydın döndürüleceği.
+        cursor (Optional[str]): Önceki sayfanın son kaydından üretilmiş opak imleç.
+
+    Returns:
+        List[Row]: CALENDAR_COLUMNS sütunlarını içeren satırlar.
+    Raises:
+        ValueError: İmleç geçersizse.
+    """
+    logger.debug("Getting appointment calendar: user_id=%s, company_id=%s, start_date=%s, end_date=%s, status=%s, limit=%s, cursor=%s", user_id, company_id, start_date, end_date, status, limit, cursor)
+    query = _filter_appointments(
+        select(*CALENDAR_COLUMNS),
+        user_id=user_id, company_id=company_id, start_date=start_date, end_date=end_date,
+        status=status, limit=limit, cursor=cursor
+    )
+    result = await db.execute(query)
+    return result.all()
+
+async def stream_appointment_export(
+    db: AsyncSession,
+    user_id: Optional[UUID] = None,
+    company_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    status: Optional[AppointmentStatus] = None,
+    batch_size: int = 1000
+) -> AsyncIterator[List[Row]]:
+    """
+    Dışa aktarma (muhasebe) için randevuları, hizmet adları ve toplam tutarlarıyla birlikte
+    (appointment_time, id) sırasıyla parça parça döndürür.
+    Sorgu sunucu tarafı imleçle (stream + yield_per) çalışır; bellekte aynı anda en fazla
+    bir parça tutulur ve ORM nesnesi oluşturulmaz. Hizmet adları ve tutarlar randevu başına
+    ara tablonun birincil anahtar indeksi üzerinden ilişkili alt sorgularla hesaplanır.
+
+    Args:
+        db (AsyncSession): Dışa aktarma boyunca açık kalacak veritabanı oturumu.
+        user_id (Optional[UUID]): Belirli bir kullanıcıya ait randevuları filtrelemek için.
+        company_id (Optional[int]): Belirli bir şirkete ait randevuları filtrelemek için.
+        start_date (Optional[datetime]): Randevu başlangıç zamanının bu tarihten sonra olması için.
+        end_date (Optional[datetime]): Randevu bitiş zamanının bu tarihten önce olması için.
+        status (Optional[AppointmentStatus]): Randevu durumuna göre filtrelemek için.
+        batch_size (int): Veritabanından tek seferde çekilecek satır sayısı.
+
+    Yields:
+        List[Row]: En fazla batch_size satırlık parçalar.
+    """
+    logger.debug("Streaming appointment export: user_id=%s, company_id=%s, start_date=%s, end_date=%s, status=%s, batch_size=%s", user_id, company_id, start_date, end_date, status, batch_size)
+    service_names = (
+        select(func.aggregate_strings(CompanyService.name, ", "))
+        .select_from(AppointmentService)
+        .join(CompanyService, CompanyService.id == AppointmentService.company_service_id)
+        .where(AppointmentService.appointment_id == Appointment.id)
+        .scalar_subquery()
+    )
+    total_price = (
+        select(func.coalesce(func.sum(AppointmentService.price_at_booking * AppointmentService.quantity), 0))
+        .where(AppointmentService.appointment_id == Appointment.id)
+        .scalar_subquery()
+    )
+    query = _apply_appointment_filters(
+        select(
+            Appointment.id, Appointment.appointment_time, Appointment.end_time, Appointment.status,
+            Appointment.user_id, User.name.label("user_name"), Appointment.company_id,
+            service_names.label("service_names"), total_price.label("total_price"), Appointment.notes
+        ).outerjoin(User, User.id == Appointment.user_id),
+        user_id=user_id, company_id=company_id, start_date=start_date, end_date=end_date, status=status
+    ).order_by(*APPOINTMENT_KEYSET)
+
+    result = await db.stream(query.execution_options(yield_per=batch_size))
+    exported = 0
+    async for partition in result.partitions():
+        exported += len(partition)
+        yield partition
+    logger.info("Appointment export finished with %s rows.", exported)
+
+def _conflict_clause(
+    user_id: UUID,
+    appointment_time: datetime,
+    end_time: datetime,
+    exclude_appointment_id: Optional[UUID] = None
+):
+    """
+    Kullanıcının verilen aralıkla çakışan, iptal edilmemiş randevularını seçen filtre ifadesini döndürür.
+    """
+    clause = and_(
+        Appointment.user_id == user_id,
+        NOT_CANCELLED, # İptal edilmiş randevuları dikkate alma
+        # Randevu zaman aralıklarının çakışıp çakışmadığını kontrol et
+        # (StartA < EndB) AND (EndA > StartB)
+        Appointment.appointment_time < end_time,
+        Appointment.end_time > appointment_time
+    )
+    if exclude_appointment_id:
+        clause = and_(clause, Appointment.id != exclude_appointment_id)
+    return clause
+
+def _advisory_lock_key(user_id: UUID) -> int:
+    # UUID'nin ilk 8 baytı, pg_advisory_xact_lock'un beklediği işaretli 64-bit anahtara çevrilir
+    return int.from_bytes(user_id.bytes[:8], "big", signed=True)
+
+async def _lock_users_for_booking(db: AsyncSession, user_ids) -> None:
+    """
+    PostgreSQL'de verilen kullanıcılar için transaction süreli advisory lock alır.
+    Kilitler commit/rollback ile otomatik bırakılır; böylece farklı süreçlerdeki (worker) eşzamanlı
+    rezervasyonlar da aynı kullanıcı için sırayla çakışma kontrolü yapar. Anahtarlar sıralı alınır (deadlock önlenir).
+    Diğer veritabanlarında (SQLite, tek yazar) işlem yapmaz.
+
+    Args:
+        db (AsyncSession): Veritabanı oturumu; kilit, çakışma kontrolünden önce aynı transaction içinde alınmalıdır.
+        user_ids (Iterable[UUID]): Kilitlenecek kullanıcı ID'leri.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    keys = sorted({_advisory_lock_key(user_id) for user_id in user_ids})
+    if keys:
+        await db.execute(_advisory_lock_statement(keys))
+
+def _advisory_lock_statement(keys: List[int]):
+    """
+    Sıralı anahtarlar için advisory lock ifadesini üretir; birden fazla anahtar tek ifadede, dizideki sırayla kilitlenir.
+    Dizi parametresinin tipi açıkça verilir: asyncpg tipsiz bir listeyle unnest($1)'in tipini çıkaramaz.
+    """
+    if len(keys) == 1:
+        return select(func.pg_advisory_xact_lock(keys[0]))
+    return text("SELECT pg_advisory_xact_lock(k) FROM unnest(CAST(:keys AS bigint[])) AS k").bindparams(
+        bindparam("keys", value=keys, type_=ARRAY(BigInteger))
+    )
+
+@asynccontextmanager
+async def _reserve_booking(db: AsyncSession, user_ids: List[UUID]) -> AsyncIterator[None]:
+    """
+    Blok boyunca verilen kullanıcılar için süreç içi ve (PostgreSQL'de) veritabanı rezervasyon kilitlerini tutar.
+    Blok commit ile bitmelidir. Hata durumunda transaction geri alınır; böylece advisory lock'lar
+    oturum kapanmasını beklemeden hemen bırakılır.
+    """
+    async with booking_locks.hold(*user_ids):
+        try:
+            await _lock_users_for_booking(db, user_ids)
+            yield
+        except BaseException:
+            await db.rollback()
+            raise
+
+async def _get_active_services_by_ids(
+    db: AsyncSession,
+    company_id: int,
+    service_ids: List[int]
+) -> Dict[int, CompanyService]:
+    """
+    İstenen hizmetlerin şirkete ait ve aktif olduğunu şirketin hizmet kataloğu üzerinden doğrular.
+    Katalog önbellekteyse sorgu çalışmaz; değilse şirketin aktif hizmetleri tek sorguda yüklenir.
+
+    Returns:
+        Dict[int, CompanyService]: Oturuma bağlanmış (merge) hizmet nesneleri.
+    Raises:
+        ValueError: Hizmet listesi boşsa, tekrarlıysa veya bir hizmet bulunamazsa/aktif değilse.
+    """
+    if not service_ids:
+        raise ValueError("No valid services provided for the appointment.")
+    if len(set(service_ids)) != len(service_ids):
+        raise ValueError("Duplicate service found for this appointment.")
+
+    from app.crud.crud_company_service import get_active_service_catalog
+    catalog = await get_active_service_catalog(db, company_id) # Sadece şirketin aktif hizmetleri
+    services_by_id = {}
+    for service_id in service_ids:
+        if service_id not in catalog:
+            logger.warning("Service ID %s not found or inactive for company %s.", service_id, company_id)
+            raise ValueError(f"Service ID {service_id} not found or inactive for the specified company.")
+        services_by_id[service_id] = await db.merge(catalog[service_id], load=False)
+    return services_by_id
 
 async def check_appointment_conflict(
     db: AsyncSession,
@@ -103,27 +448,63 @@ async def check_appointment_conflict(
     Returns:
         bool: Çakışma varsa True, yoksa False.
     """
-    logger.debug(f"Checking for appointment conflict for user {user_id} between {appointment_time} and {end_time}")
+    logger.debug("Checking for appointment conflict for user %s between %s and %s", user_id, appointment_time, end_time)
     query = select(Appointment).filter(
-        Appointment.user_id == user_id,
-        Appointment.status != AppointmentStatus.cancelled, # İptal edilmiş randevuları dikkate alma
-        # Randevu zaman aralıklarının çakışıp çakışmadığını kontrol et
-        # (StartA < EndB) AND (EndA > StartB)
-        and_(
-            Appointment.appointment_time < end_time,
-            Appointment.end_time > appointment_time
-        )
+        _conflict_clause(user_id, appointment_time, end_time, exclude_appointment_id)
     )
-    if exclude_appointment_id:
-        query = query.filter(Appointment.id != exclude_appointment_id)
-    
     result = await db.execute(query)
     return result.scalars().first() is not None
 
+async def get_busy_intervals(
+    db: AsyncSession,
+    range_start: datetime,
+    range_end: datetime,
+    company_id: Optional[int] = None,
+    user_id: Optional[UUID] = None
+) -> Dict[UUID, List[Tuple[datetime, datetime]]]:
+    """
+    Verilen aralıkla kesişen, iptal edilmemiş randevuları tek sorguda kullanıcı bazında getirir.
+    Şirket bazlı aramada şirketin tüm aktif kullanıcıları (randevusu olmasa bile) sonuçta yer alır.
+
+    Args:
+        db (AsyncSession): Veritabanı oturumu.
+        range_start (datetime): Aralığın başlangıcı.
+        range_end (datetime): Aralığın bitişi.
+        company_id (Optional[int]): Şirketin aktif kullanıcılarının randevularını getirmek için.
+        user_id (Optional[UUID]): Tek bir kullanıcının randevularını getirmek için.
+
+    Returns:
+        Dict[UUID, List[Tuple[datetime, datetime]]]: Kullanıcı ID'sine göre dolu (başlangıç, bitiş) aralıkları.
+    """
+    logger.debug("Getting busy intervals for company_id=%s, user_id=%s between %s and %s", company_id, user_id, range_start, range_end)
+    overlap = and_(
+        Appointment.user_id == User.id,
+        NOT_CANCELLED,
+        Appointment.appointment_time < range_end,
+        Appointment.end_time > range_start
+    )
+    # Randevusu olmayan kullanıcıların da dönmesi için users üzerinden LEFT OUTER JOIN
+    query = select(User.id, Appointment.appointment_time, Appointment.end_time) \
+        .outerjoin(Appointment, overlap)
+    if company_id is not None:
+        query = query.filter(User.company_id == company_id, User.is_active == True)
+    if user_id is not None:
+        query = query.filter(User.id == user_id)
+
+    result = await db.execute(query)
+    busy_by_user: Dict[UUID, List[Tuple[datetime, datetime]]] = {}
+    for row_user_id, appointment_time, end_time in result:
+        intervals = busy_by_user.setdefault(row_user_id, [])
+        if appointment_time is not None:
+            intervals.append((appointment_time, end_time))
+    return busy_by_user
+
 async def create_appointment(db: AsyncSession, appointment_in: AppointmentCreate) -> Appointment:
     """
     Yeni bir randevu kaydı oluşturur ve ilişkili hizmetleri ekler.
     Randevu zamanı çakışması, kullanıcı ve hizmet varlığı kontrolü yapar.
+    Hizmet sayısından bağımsız olarak sabit sayıda veritabanı gidiş-dönüşüyle çalışır:
+    doğrulama sorgusu, hizmet sorgusu, randevu INSERT'i, toplu hizmet INSERT'i ve commit.
 
     Args:
         db (AsyncSession): Veritabanı oturumu.
@@ -134,83 +515,296 @@ async def create_appointment(db: AsyncSession, appointment_in: AppointmentCreate
     Raises:
         ValueError: Kullanıcı, şirket, hizmet bulunamazsa veya randevu çakışması olursa.
     """
-    logger.info(f"Attempting to create appointment for user ID: {appointment_in.user_id} at {appointment_in.appointment_time}")
-
-    # 1. Kullanıcının varlığını kontrol et
-    from app.crud.crud_user import get_user_by_id # Dairesel bağımlılığı önlemek için burada import et
-    user = await get_user_by_id(db, appointment_in.user_id)
-    if not user:
-        logger.warning(f"Appointment creation failed: User ID {appointment_in.user_id} not found.")
-        raise ValueError("User not found.")
-
-    # 2. Şirketin varlığını kontrol et (isteğe bağlı, eğer şirket ID'si doğrudan veriliyorsa)
-    from app.crud.crud_company import get_company_by_id
-    company = await get_company_by_id(db, appointment_in.company_id)
-    if not company:
-        logger.warning(f"Appointment creation failed: Company ID {appointment_in.company_id} not found.")
-        raise ValueError("Company not found.")
-
-    # 3. Randevu zamanı çakışması kontrolü
-    if await check_appointment_conflict(db, appointment_in.user_id, appointment_in.appointment_time, appointment_in.end_time):
-        logger.warning(f"Appointment creation failed: Conflict detected for user {appointment_in.user_id} at {appointment_in.appointment_time}.")
-        raise ValueError("Appointment time conflict for this user.")
-
-    # 4. Hizmetlerin varlığını ve şirkete aitliğini kontrol et
-    valid_service_ids = []
-    for service_data in appointment_in.services:
-        service = await db.execute(select(CompanyService).filter(
-            CompanyService.id == service_data.company_service_id,
-            CompanyService.company_id == appointment_in.company_id, # Hizmetin randevunun ait olduğu şirkete ait olduğunu kontrol et
-            CompanyService.is_active == True # Sadece aktif hizmetleri kabul et
-        ))
-        db_service = service.scalars().first()
-        if not db_service:
-            logger.warning(f"Appointment creation failed: Service ID {service_data.company_service_id} not found or inactive for company {appointment_in.company_id}.")
-            raise ValueError(f"Service ID {service_data.company_service_id} not found or inactive for the specified company.")
-        valid_service_ids.append(service_data) # Geçerli hizmet verilerini sakla
-
-    if not valid_service_ids:
-        raise ValueError("No valid services provided for the appointment.")
+    logger.info("Attempting to create appointment for user ID: %s at %s", appointment_in.user_id, appointment_in.appointment_time)
+
+    # Çakışma kontrolünden commit'e kadar kullanıcı için rezervasyon kilidi tutulur
+    async with _reserve_booking(db, [appointment_in.user_id]):
+        # 1. Kullanıcı, şirket varlığı ve zaman çakışması kontrolü tek sorguda
+        company_exists = select(Company.id).filter(Company.id == appointment_in.company_id).exists()
+        conflict_exists = select(Appointment.id).filter(
+            _conflict_clause(appointment_in.user_id, appointment_in.appointment_time, appointment_in.end_time)
+        ).exists()
+        result = await db.execute(
+            select(User, company_exists.label("company_exists"), conflict_exists.label("conflict_exists"))
+            .filter(User.id == appointment_in.user_id)
+        )
+        row = result.first()
+        if row is None:
+            logger.warning("Appointment creation failed: User ID %s not found.", appointment_in.user_id)
+            raise ValueError("User not found.")
+        user, company_found, has_conflict = row
+        if not company_found:
+            logger.warning("Appointment creation failed: Company ID %s not found.", appointment_in.company_id)
+            raise ValueError("Company not found.")
+        if has_conflict:
+            logger.warning("Appointment creation failed: Conflict detected for user %s at %s.", appointment_in.user_id, appointment_in.appointment_time)
+            raise ValueError("Appointment time conflict for this user.")
+
+        # 2. Hizmetlerin varlığını ve şirkete aitliğini tek sorguda kontrol et
+        services_by_id = await _get_active_services_by_ids(
+            db, appointment_in.company_id, [service_data.company_service_id for service_data in appointment_in.services]
+        )
 
-    # 5. Randevu nesnesini oluştur
-    db_appointment = Appointment(
-        user_id=appointment_in.user_id,
-        company_id=appointment_in.company_id,
-        appointment_time=appointment_in.appointment_time,
-        end_time=appointment_in.end_time,
-        notes=appointment_in.notes
-    )
-    db.add(db_appointment)
-    await db.flush() # ID'yi almak için flush et
-
-    # 6. Randevu ile hizmetleri ilişkilendir (appointment_services tablosuna ekle)
-    for service_data in valid_service_ids:
-        db_appointment_service = AppointmentService(
-            appointment_id=db_appointment.id,
-            company_service_id=service_data.company_service_id,
-            quantity=service_data.quantity,
-            price_at_booking=service_data.price_at_booking
+        # 3. Randevu ve ara tablo satırlarını oluştur.
+        # ID istemci tarafında üretilir; böylece flush beklemeden ara tablo satırları bağlanır ve
+        # commit sırasında randevu tek INSERT, hizmetler tek toplu (executemany) INSERT ile yazılır.
+        db_appointment = Appointment(
+            id=uuid4(),
+            user_id=appointment_in.user_id,
+            company_id=appointment_in.company_id,
+            appointment_time=appointment_in.appointment_time,
+            end_time=appointment_in.end_time,
+            status=AppointmentStatus.scheduled.value,
+            notes=appointment_in.notes
         )
-        db.add(db_appointment_service)
-    
-    try:
-        await db.commit()
-        await db.refresh(db_appointment)
-        # İlişkili objeleri yüklemek için (eager loading veya sonraki sorgularda join)
-        # create_appointment'tan sonra tekrar çekmek gerekebilir eğer ilişkiler commit sonrası yüklenmiyorsa
-        # veya get_appointment_by_id'yi çağırabilirsiniz.
-        created_appointment = await get_appointment_by_id(db, db_appointment.id)
-        logger.info(f"Appointment (ID: {db_appointment.id}) created successfully for user ID: {db_appointment.user_id}.")
-        return created_appointment
-    except sa_exc.IntegrityError as e:
-        await db.rollback()
-        logger.error(f"Database integrity error during appointment creation: {e}", exc_info=True)
-        # chk_appointment_time_order kontrolü burada yakalanabilir
-        if "chk_appointment_time_order" in str(e):
-            raise ValueError("Appointment end time must be after start time.")
-        raise ValueError("Database error during appointment creation.")
+        db_appointment.appointment_services = [
+            AppointmentService(
+                company_service_id=service_data.company_service_id,
+                quantity=service_data.quantity,
+                price_at_booking=service_data.price_at_booking
+            )
+            for service_data in appointment_in.services
+        ]
+        db.add(db_appointment)
+        # Commit sonrası nesne süresi dolmuş (expired) olabilir; kimlikler önceden alınır
+        appointment_id, user_id = db_appointment.id, db_appointment.user_id
+
+        # Özet tablosu aynı transaction içinde güncellenir
+        delta = RollupDelta()
+        delta.add_appointment(db_appointment, services_revenue(appointment_in.services))
+        await apply_rollup_delta(db, delta)
+
+        try:
+            await db.commit()
+        except sa_exc.IntegrityError as e:
+            await db.rollback()
+            logger.error("Database integrity error during appointment creation: %s", e, exc_info=True)
+            # chk_appointment_time_order kontrolü burada yakalanabilir
+            if "chk_appointment_time_order" in str(e):
+                raise ValueError("Appointment end time must be after start time.")
+            if NO_OVERLAP_CONSTRAINT in str(e):
+                raise ValueError("Appointment time conflict for this user.")
+            raise ValueError("Database error during appointment creation.")
+
+    # 4. Yanıt için ilişkileri zaten elimizdeki nesnelerle doldur (tekrar sorgu yok).
+    # expire_on_commit=True olan oturumlarda nesneler commit ile expire edilir; async oturumda tembel
+    # yükleme yapılamayacağından randevu ilişkileriyle birlikte tek seferde yeniden okunur.
+    if db.sync_session.expire_on_commit:
+        db_appointment = await get_appointment_by_id(db, appointment_id)
+    else:
+        set_committed_value(db_appointment, "user", user)
+        set_committed_value(db_appointment, "services", [
+            services_by_id[service_data.company_service_id] for service_data in appointment_in.services
+        ])
+    logger.info("Appointment (ID: %s) created successfully for user ID: %s.", appointment_id, user_id)
+    return db_appointment
+
+
+BULK_CHUNK_SIZE = 1000 # Toplu sorgu/INSERT başına satır sayısı (sürücü parametre limitlerinin altında)
+
+async def _select_in_chunks(db: AsyncSession, query_factory, values: List) -> List:
+    """
+    Büyük IN listelerini parça parça sorgular ve tüm satırları tek listede döndürür.
+    """
+    rows = []
+    for offset in range(0, len(values), BULK_CHUNK_SIZE):
+        result = await db.execute(query_factory(values[offset:offset + BULK_CHUNK_SIZE]))
+        rows.extend(result.all())
+    return rows
+
+async def bulk_create_appointments(
+    db: AsyncSession,
+    appointments_in: List[AppointmentCreate]
+) -> AppointmentBulkCreateResult:
+    """
+    Birden fazla randevuyu toplu olarak oluşturur (şirket taşıma / içe aktarma için).
+    Kullanıcı, şirket ve hizmetler set tabanlı sorgularla doğrulanır. Çakışmalar, hem istek içinde
+    hem de veritabanındaki randevulara karşı, kullanıcı başına tek bir sıralama ve tarama (sort-and-sweep)
+    ile bulunur. Geçerli satırlar toplu (executemany) INSERT'lerle tek transaction'da yazılır.
+
+    Args:
+        db (AsyncSession): Veritabanı oturumu.
+        appointments_in (List[AppointmentCreate]): Oluşturulacak randevular.
+
+    Returns:
+        AppointmentBulkCreateResult: Oluşturulan randevu ID'leri ve satır bazlı hatalar.
+    Raises:
+        ValueError: Veritabanı yazımı sırasında bütünlük hatası olursa (hiçbir satır yazılmaz).
+    """
+    logger.info("Attempting to bulk create %s appointments", len(appointments_in))
+    errors: Dict[int, str] = {}
+    # Satırlar naive veya farklı saat dilimlerinde olabilir; veritabanındaki (aware) randevularla
+    # ve birbirleriyle karşılaştırılabilmeleri için tüm zamanlar UTC'ye çevrilir (naive = UTC)
+    times = [(as_utc(appointment_in.appointment_time), as_utc(appointment_in.end_time)) for appointment_in in appointments_in]
+
+    # 1. Satır içi kontroller
+    for index, appointment_in in enumerate(appointments_in):
+        service_ids = [service_data.company_service_id for service_data in appointment_in.services]
+        if times[index][0] >= times[index][1]:
+            errors[index] = "Appointment end time must be after start time."
+        elif len(set(service_ids)) != len(service_ids):
+            errors[index] = "Duplicate service found for this appointment."
+
+    # 2. Kullanıcı, şirket ve hizmetlerin varlığını set tabanlı sorgularla kontrol et
+    user_ids = list({appointment_in.user_id for appointment_in in appointments_in})
+    company_ids = list({appointment_in.company_id for appointment_in in appointments_in})
+    service_ids = list({
+        service_data.company_service_id
+        for appointment_in in appointments_in for service_data in appointment_in.services
+    })
+    user_companies = {row[0]: row[1] for row in await _select_in_chunks(
+        db, lambda chunk: select(User.id, User.company_id).filter(User.id.in_(chunk)), user_ids
+    )}
+    existing_company_ids = {row[0] for row in await _select_in_chunks(
+        db, lambda chunk: select(Company.id).filter(Company.id.in_(chunk)), company_ids
+    )}
+    active_service_companies = {row[0]: row[1] for row in await _select_in_chunks(
+        db,
+        lambda chunk: select(CompanyService.id, CompanyService.company_id)
+        .filter(CompanyService.id.in_(chunk), CompanyService.is_active == True),
+        service_ids
+    )}
+
+    for index, appointment_in in enumerate(appointments_in):
+        if index in errors:
+            continue
+        if appointment_in.user_id not in user_companies:
+            errors[index] = "User not found."
+        elif appointment_in.company_id not in existing_company_ids:
+            errors[index] = "Company not found."
+        elif user_companies[appointment_in.user_id] != appointment_in.company_id:
+            errors[index] = "User does not belong to the specified company."
+        else:
+            for service_data in appointment_in.services:
+                if active_service_companies.get(service_data.company_service_id) != appointment_in.company_id:
+                    errors[index] = f"Service ID {service_data.company_service_id} not found or inactive for the specified company."
+                    break
+
+    # 3. Kullanıcı başına sort-and-sweep ile çakışma tespiti
+    candidates_by_user: Dict[UUID, List[int]] = {}
+    for index, appointment_in in enumerate(appointments_in):
+        if index not in errors:
+            candidates_by_user.setdefault(appointment_in.user_id, []).append(index)
+
+    # Mevcut randevuların okunmasından commit'e kadar partideki kullanıcılar için rezervasyon kilitleri tutulur
+    async with _reserve_booking(db, list(candidates_by_user)):
+        if candidates_by_user:
+            window_start = min(times[i][0] for indexes in candidates_by_user.values() for i in indexes)
+            window_end = max(times[i][1] for indexes in candidates_by_user.values() for i in indexes)
+            existing_by_user: Dict[UUID, List[Tuple[datetime, datetime]]] = {}
+            for row_user_id, appointment_time, end_time in await _select_in_chunks(
+                db,
+                lambda chunk: select(Appointment.user_id, Appointment.appointment_time, Appointment.end_time).filter(
+                    Appointment.user_id.in_(chunk),
+                    NOT_CANCELLED,
+                    Appointment.appointment_time < window_end,
+                    Appointment.end_time > window_start
+                ),
+                list(candidates_by_user)
+            ):
+                existing_by_user.setdefault(row_user_id, []).append((appointment_time, end_time))
+
+            for candidate_user_id, indexes in candidates_by_user.items():
+                existing = IntervalIndex(existing_by_user.get(candidate_user_id, ()))
+                indexes.sort(key=lambda i: (times[i][0], i))
+                last_end: Optional[datetime] = None
+                last_index: Optional[int] = None
+                for index in indexes:
+                    start, end = times[index]
+                    if existing.overlaps(start, end):
+                        errors[index] = "Appointment time conflict for this user."
+                    elif last_end is not None and start < last_end:
+                        # Kabul edilen aralıklar ayrık ve sıralı; en geç biteni ile çakışma kontrolü yeterli
+                        errors[index] = f"Appointment time conflicts with row {last_index} in the same batch."
+                    else:
+                        last_end, last_index = end, index
+
+        # 4. Geçerli satırları toplu INSERT'lerle yaz
+        created_ids: List[UUID] = []
+        appointment_rows: List[dict] = []
+        appointment_service_rows: List[dict] = []
+        delta = RollupDelta()
+        for index, appointment_in in enumerate(appointments_in):
+            if index in errors:
+                continue
+            appointment_id = uuid4()
+            created_ids.append(appointment_id)
+            appointment_rows.append({
+                "id": appointment_id,
+                "user_id": appointment_in.user_id,
+                "company_id": appointment_in.company_id,
+                "appointment_time": times[index][0],
+                "end_time": times[index][1],
+                "status": AppointmentStatus.scheduled.value,
+                "notes": appointment_in.notes
+            })
+            appointment_service_rows.extend(
+                {
+                    "appointment_id": appointment_id,
+                    "company_service_id": service_data.company_service_id,
+                    "quantity": service_data.quantity,
+                    "price_at_booking": service_data.price_at_booking
+                }
+                for service_data in appointment_in.services
+            )
+            delta.add(
+                appointment_in.company_id, times[index][0], times[index][1],
+                AppointmentStatus.scheduled.value, services_revenue(appointment_in.services)
+            )
+
+        try:
+            for offset in range(0, len(appointment_rows), BULK_CHUNK_SIZE):
+                await db.execute(sa_insert(Appointment), appointment_rows[offset:offset + BULK_CHUNK_SIZE])
+            for offset in range(0, len(appointment_service_rows), BULK_CHUNK_SIZE):
+                await db.execute(sa_insert(AppointmentService), appointment_service_rows[offset:offset + BULK_CHUNK_SIZE])
+            await apply_rollup_delta(db, delta)
+            await db.commit()
+        except sa_exc.IntegrityError as e:
+            await db.rollback()
+            logger.error("Database integrity error during bulk appointment creation: %s", e, exc_info=True)
+            if NO_OVERLAP_CONSTRAINT in str(e):
+                raise ValueError("Appointment time conflict detected while writing the batch; no rows were created.")
+            raise ValueError("Database error during bulk appointment creation.")
+
+    logger.info("Bulk appointment creation finished: %s created, %s rejected.", len(created_ids), len(errors))
+    return AppointmentBulkCreateResult(
+        created_count=len(created_ids),
+        created_ids=created_ids,
+        errors=[AppointmentBulkRowError(index=index, detail=detail) for index, detail in sorted(errors.items())]
+    )
 
 
+def _apply_service_diff(db_appointment: Appointment, services_in: List[AppointmentServiceSchema]) -> Tuple[int, int, int]:
+    """
+    Randevunun yüklü appointment_services koleksiyonunu istenen hizmet listesine göre fark (diff) ile günceller.
+    Yalnızca eklenen, çıkarılan veya miktarı/fiyatı değişen satırlar değişir; flush sırasında eklenenler
+    toplu INSERT, değişenler UPDATE, çıkarılanlar (delete-orphan) DELETE olarak yazılır.
+
+    Returns:
+        Tuple[int, int, int]: (eklenen, çıkarılan, değişen) satır sayıları.
+    """
+    current = {row.company_service_id: row for row in db_appointment.appointment_services}
+    rows: List[AppointmentService] = []
+    added = changed = 0
+    for service_data in services_in:
+        row = current.pop(service_data.company_service_id, None)
+        if row is None:
+            row = AppointmentService(
+                appointment_id=db_appointment.id,
+                company_service_id=service_data.company_service_id,
+                quantity=service_data.quantity,
+                price_at_booking=service_data.price_at_booking
+            )
+            added += 1
+        elif row.quantity != service_data.quantity or row.price_at_booking != service_data.price_at_booking:
+            row.quantity = service_data.quantity
+            row.price_at_booking = service_data.price_at_booking
+            changed += 1
+        rows.append(row)
+    # Koleksiyonun yeniden atanması yalnızca eklenen/çıkarılan nesneler için değişiklik üretir
+    db_appointment.appointment_services = rows
+    return added, len(current), changed
+
 async def update_appointment(
     db: AsyncSession,
     db_appointment: Appointment,
@@ -218,11 +812,16 @@ async def update_appointment(
 ) -> Appointment:
     """
     Randevu bilgilerini günceller ve ilişkili hizmetleri yönetir.
-    Randevu zamanı güncelleniyorsa çakışma kontrolü yapar.
+    Randevu zamanı güncelleniyorsa veya iptal edilmiş randevu yeniden etkinleşiyorsa,
+    kullanıcı için rezervasyon kilidi altında çakışma kontrolü yapar.
+    Hizmetler mevcut satırlarla karşılaştırılarak yalnızca değişen satırlar yazılır; yanıt,
+    commit sonrasında tekrar sorgu yapılmadan elimizdeki nesnelerle döndürülür.
 
     Args:
         db (AsyncSession): Veritabanı oturumu.
-        db_appointment (Appointment): Veritabanından çekilmiş mevcut Appointment nesnesi.
+        db_appointment (Appointment): Veritabanından çekilmiş mevcut Appointment nesnesi
+            (get_appointment_by_id(..., include=APPOINTMENT_RELATIONS) ile yüklendiyse ilişkiler için
+            ek sorgu yapılmaz; tüm sütunları yüklenmiş olmalıdır, fields ile kısıtlanmamalıdır).
         appointment_update (AppointmentUpdate): Güncellenecek verileri içeren Pydantic şeması.
 
     Returns:
@@ -230,77 +829,94 @@ async def update_appointment(
     Raises:
         ValueError: Randevu çakışması olursa veya hizmet bulunamazsa.
     """
-    logger.info(f"Updating appointment ID: {db_appointment.id}")
-    update_data = appointment_update.model_dump(exclude_unset=True)
+    logger.info("Updating appointment ID: %s", db_appointment.id)
+    update_data = appointment_update.model_dump(exclude_unset=True, exclude={"services"})
+    services_in = appointment_update.services
+
+    # Zaman, durum veya hizmetler değişiyorsa özet tablosundaki katkı da değişir;
+    # eski katkının gelirini hesaplamak için mevcut hizmet satırları gerekir
+    affects_rollup = services_in is not None or any(
+        key in update_data for key in ("appointment_time", "end_time", "status")
+    )
+
+    # Yanıt, fark ve özet hesabı için gereken ilişkiler yüklü değilse tek seferde yükle
+    unloaded = sa_inspect(db_appointment).unloaded
+    required = ["user"] + (["services"] if services_in is None else [])
+    if services_in is not None or affects_rollup:
+        required.append("appointment_services")
+    missing = [name for name in required if name in unloaded]
+    if missing:
+        await db.refresh(db_appointment, attribute_names=missing)
 
-    # Randevu zamanı güncelleniyorsa çakışma kontrolü
+    # Randevu zamanı değişiyorsa veya iptal edilmiş randevu yeniden etkinleşiyorsa çakışma kontrolü
     new_appointment_time = update_data.get("appointment_time", db_appointment.appointment_time)
     new_end_time = update_data.get("end_time", db_appointment.end_time)
+    if update_data.get("status") is not None:
+        update_data["status"] = update_data["status"].value # status sütunu string olarak saklanır
+    new_status = update_data.get("status") or db_appointment.status
+    needs_conflict_check = new_status != AppointmentStatus.cancelled.value and (
+        db_appointment.status == AppointmentStatus.cancelled.value or
+        new_appointment_time != db_appointment.appointment_time or
+        new_end_time != db_appointment.end_time
+    )
 
-    if new_appointment_time != db_appointment.appointment_time or \
-       new_end_time != db_appointment.end_time:
-        if await check_appointment_conflict(
+    # Çakışma kontrolünden commit'e kadar kullanıcı için rezervasyon kilidi tutulur
+    async with _reserve_booking(db, [db_appointment.user_id] if needs_conflict_check else []):
+        if needs_conflict_check and await check_appointment_conflict(
             db,
             db_appointment.user_id,
             new_appointment_time,
             new_end_time,
             exclude_appointment_id=db_appointment.id # Kendisini kontrol dışında bırak
         ):
-            logger.warning(f"Appointment update failed for ID {db_appointment.id}: Conflict detected with new time {new_appointment_time}.")
+            logger.warning("Appointment update failed for ID %s: Conflict detected with new time %s.", db_appointment.id, new_appointment_time)
             raise ValueError("Appointment time conflict with existing appointments.")
 
-    # Randevu ana bilgilerini güncelle
-    for key, value in update_data.items():
-        if key == "services": # Hizmetler ayrı yönetilecek
-            continue
-        setattr(db_appointment, key, value)
-    
-    # Hizmet ilişkilerini güncelle (Many-to-Many için)
-    if "services" in update_data and update_data["services"] is not None:
-        logger.debug(f"Updating services for appointment ID: {db_appointment.id}")
-        # Mevcut ilişkileri sil
-        await db.execute(sa_delete(AppointmentService).filter(
-            AppointmentService.appointment_id == db_appointment.id
-        ))
-        
-        # Yeni ilişkileri ekle
-        valid_new_services = []
-        for service_data in update_data["services"]:
-            service = await db.execute(select(CompanyService).filter(
-                CompanyService.id == service_data.company_service_id,
-                CompanyService.company_id == db_appointment.company_id, # Hizmetin aynı şirkete ait olduğunu kontrol et
-                CompanyService.is_active == True
-            ))
-            db_service = service.scalars().first()
-            if not db_service:
-                logger.warning(f"Appointment update failed: Service ID {service_data.company_service_id} not found or inactive for company {db_appointment.company_id}.")
-                raise ValueError(f"Service ID {service_data.company_service_id} not found or inactive for the specified company.")
-            
-            db_appointment_service = AppointmentService(
-                appointment_id=db_appointment.id,
-                company_service_id=service_data.company_service_id,
-                quantity=service_data.quantity,
-                price_at_booking=service_data.price_at_booking
+        # Yeni hizmet listesini tek seferde doğrula (katalog önbelleği; önbellekte yoksa tek sorgu)
+        services_by_id: Dict[int, CompanyService] = {}
+        if services_in is not None:
+            services_by_id = await _get_active_services_by_ids(
+                db, db_appointment.company_id,
+                [service_data.company_service_id for service_data in services_in]
             )
-            db.add(db_appointment_service)
-            valid_new_services.append(db_appointment_service) # Eager load için
 
-    db.add(db_appointment)
-    try:
-        await db.commit()
-        await db.refresh(db_appointment)
-        # Güncellenmiş randevuyu ilişkili objelerle birlikte tekrar çek
-        updated_appointment = await get_appointment_by_id(db, db_appointment.id)
-        logger.info(f"Appointment ID {db_appointment.id} updated successfully.")
-        return updated_appointment
-    except sa_exc.IntegrityError as e:
-        await db.rollback()
-        logger.error(f"Database integrity error during appointment update for ID {db_appointment.id}: {e}", exc_info=True)
-        if "chk_appointment_time_order" in str(e):
-            raise ValueError("Appointment end time must be after start time.")
-        if "uq_appointment_service_appointment_id_company_service_id" in str(e): # Ara tablonun unique constraint'i
-            raise ValueError("Duplicate service found for this appointment.")
-        raise ValueError("Database error during appointment update.")
+        # Özet tablosu için eski katkı, değişiklikler uygulanmadan önce alınır
+        delta = RollupDelta()
+        if affects_rollup:
+            delta.add_appointment(db_appointment, services_revenue(db_appointment.appointment_services), sign=-1)
+
+        # Randevu ana bilgilerini güncelle
+        for key, value in update_data.items():
+            setattr(db_appointment, key, value)
+
+        # Hizmet ilişkilerini fark ile güncelle
+        if services_in is not None:
+            added, removed, changed = _apply_service_diff(db_appointment, services_in)
+            logger.debug("Service diff for appointment ID %s: %s added, %s removed, %s changed", db_appointment.id, added, removed, changed)
+
+        if affects_rollup:
+            delta.add_appointment(db_appointment, services_revenue(db_appointment.appointment_services))
+            await apply_rollup_delta(db, delta)
+
+        try:
+            await db.commit()
+        except sa_exc.IntegrityError as e:
+            await db.rollback()
+            logger.error("Database integrity error during appointment update for ID %s: %s", db_appointment.id, e, exc_info=True)
+            if "chk_appointment_time_order" in str(e):
+                raise ValueError("Appointment end time must be after start time.")
+            if NO_OVERLAP_CONSTRAINT in str(e):
+                raise ValueError("Appointment time conflict with existing appointments.")
+            raise ValueError("Database error during appointment update.")
+
+    # Yanıt için hizmetleri elimizdeki katalog nesneleriyle doldur (tekrar sorgu yok).
+    # updated_at gibi sunucu tarafı değerler eager_defaults sayesinde UPDATE ... RETURNING ile gelmiştir.
+    if services_in is not None:
+        set_committed_value(db_appointment, "services", [
+            services_by_id[service_data.company_service_id] for service_data in services_in
+        ])
+    logger.info("Appointment ID %s updated successfully.", db_appointment.id)
+    return db_appointment
 
 
 async def cancel_appointment(db: AsyncSession, db_appointment: Appointment) -> Appointment:
@@ -316,17 +932,28 @@ async def cancel_appointment(db: AsyncSession, db_appointment: Appointment) -> A
     Raises:
         ValueError: Randevu zaten tamamlanmış veya iptal edilmişse.
     """
-    logger.info(f"Attempting to cancel appointment ID: {db_appointment.id}")
-    if db_appointment.status == AppointmentStatus.completed:
+    logger.info("Attempting to cancel appointment ID: %s", db_appointment.id)
+    # status sütunu string olarak saklanır
+    if db_appointment.status == AppointmentStatus.completed.value:
         raise ValueError("Cannot cancel a completed appointment.")
-    if db_appointment.status == AppointmentStatus.cancelled:
+    if db_appointment.status == AppointmentStatus.cancelled.value:
         raise ValueError("Appointment is already cancelled.")
 
-    db_appointment.status = AppointmentStatus.cancelled
+    if "appointment_services" in sa_inspect(db_appointment).unloaded:
+        await db.refresh(db_appointment, attribute_names=["appointment_services"])
+
+    # Randevunun katkısı özet tablosunda eski durumdan 'cancelled' durumuna taşınır
+    revenue = services_revenue(db_appointment.appointment_services)
+    delta = RollupDelta()
+    delta.add_appointment(db_appointment, revenue, sign=-1)
+    db_appointment.status = AppointmentStatus.cancelled.value
+    delta.add_appointment(db_appointment, revenue)
+    await apply_rollup_delta(db, delta)
+
     db.add(db_appointment)
     await db.commit()
     await db.refresh(db_appointment)
-    logger.info(f"Appointment ID {db_appointment.id} cancelled successfully.")
+    logger.info("Appointment ID %s cancelled successfully.", db_appointment.id)
     return db_appointment
 
 async def delete_appointment(db: AsyncSession, db_appointment: Appointment):
@@ -338,7 +965,15 @@ async def delete_appointment(db: AsyncSession, db_appointment: Appointment):
         db (AsyncSession): Veritabanı oturumu.
         db_appointment (Appointment): Silinecek Appointment nesnesi.
     """
-    logger.info(f"Deleting appointment ID: {db_appointment.id}")
+    logger.info("Deleting appointment ID: %s", db_appointment.id)
+    # Ara tablo satırları silme sırasında zaten yüklenir; önceden yüklemek gelir hesabına da yeter
+    if "appointment_services" in sa_inspect(db_appointment).unloaded:
+        await db.refresh(db_appointment, attribute_names=["appointment_services"])
+
+    delta = RollupDelta()
+    delta.add_appointment(db_appointment, services_revenue(db_appointment.appointment_services), sign=-1)
+    await apply_rollup_delta(db, delta)
+
     await db.delete(db_appointment)
     await db.commit()
-    logger.info(f"Appointment ID {db_appointment.id} deleted successfully.")
\ No newline at end of file
+    logger.info("Appointment ID %s deleted successfully.", db_appointment.id)
\ No newline at end of file
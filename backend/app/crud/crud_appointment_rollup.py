@@ -0,0 +1,244 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import Date, Integer, cast, func, delete as sa_delete, insert as sa_insert, text
+from app.models.appointment import Appointment, AppointmentStatus
+from app.models.appointment_rollup import AppointmentDailyRollup
+from app.models.appointment_service import AppointmentService
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal # Gelir tutarları için Decimal tipi
+import logging
+logger = logging.getLogger(__name__)
+
+# Randevu özet (rollup) tablosu: (company_id, day, status) -> sayı, dolu dakika, gelir.
+# Randevu yazan CRUD fonksiyonları, randevunun eski katkısını çıkarıp yenisini ekleyen bir
+# RollupDelta oluşturur ve apply_rollup_delta ile aynı transaction içinde tek bir upsert çalıştırır.
+# Böylece raporlar appointments tablosunu taramadan yalnızca özet satırlarını okur.
+
+RollupKey = Tuple[int, date, str]
+CENT = Decimal("0.01")
+
+def as_utc(value: datetime) -> datetime:
+    """
+    Zamanı saat dilimi bilgili (aware) UTC'ye çevirir; saat dilimi olmayan (naive) zamanlar UTC kabul edilir.
+    PostgreSQL'den aware, SQLite'tan ve istemciden naive gelebilen zamanlar karşılaştırılmadan önce kullanılır.
+    """
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+def rollup_day(appointment_time: datetime) -> date:
+    """
+    Randevunun özet tablosunda sayıldığı günü (UTC tarihi) döndürür.
+    """
+    return as_utc(appointment_time).date()
+
+def booked_minutes(appointment_time: datetime, end_time: datetime) -> int:
+    """
+    Randevunun süresini dakika olarak döndürür.
+    """
+    return round((end_time - appointment_time).total_seconds() / 60)
+
+def services_revenue(services: Iterable[Any]) -> Decimal:
+    """
+    Hizmet satırlarının (AppointmentService veya AppointmentServiceSchema) toplam tutarını döndürür.
+    """
+    total = sum(
+        (Decimal(str(service.price_at_booking)) * service.quantity for service in services),
+        Decimal("0")
+    )
+    return total.quantize(CENT)
+
+class RollupDelta:
+    """
+    Bir veya daha fazla randevu yazımının özet tablosuna etkisini (artış/azalış) biriktirir.
+    Aynı anahtara düşen artı ve eksi katkılar birbirini götürür; değişmeyen satırlar yazılmaz.
+    """
+
+    def __init__(self):
+        self._entries: Dict[RollupKey, List] = {}
+
+    def add(
+        self,
+        company_id: int,
+        appointment_time: datetime,
+        end_time: datetime,
+        status: str,
+        revenue: Decimal,
+        sign: int = 1
+    ) -> None:
+        """
+        Bir randevunun katkısını ekler (sign=1) veya çıkarır (sign=-1).
+        """
+        key = (company_id, rollup_day(appointment_time), status)
+        entry = self._entries.setdefault(key, [0, 0, Decimal("0")])
+        entry[0] += sign
+        entry[1] += sign * booked_minutes(appointment_time, end_time)
+        entry[2] += sign * revenue
+
+    def add_appointment(self, appointment: Appointment, revenue: Decimal, sign: int = 1) -> None:
+        """
+        Bir Appointment nesnesinin mevcut değerleriyle katkısını ekler veya çıkarır.
+        """
+        self.add(appointment.company_id, appointment.appointment_time, appointment.end_time, appointment.status, revenue, sign)
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """
+        Değişen özet satırlarını (company_id, day, status) sırasıyla döndürür.
+        Sıra eklenme sırasından bağımsızdır: ters yönde taşınan iki randevu (ör. scheduled -> cancelled ve
+        cancelled -> scheduled, ya da gün1 -> gün2 ve gün2 -> gün1) aynı satırları aynı sırayla kilitler; deadlock oluşmaz.
+        """
+        return [
+            {
+                "company_id": company_id, "day": day, "status": status,
+                "appointment_count": count, "booked_minutes": minutes, "revenue": revenue
+            }
+            for (company_id, day, status), (count, minutes, revenue) in sorted(self._entries.items(), key=lambda item: item[0])
+            if count or minutes or revenue
+        ]
+
+def _upsert_statement(dialect_name: str):
+    # Aynı anahtar varsa değerler artımlı eklenir; eşzamanlı yazımlar satır kilidiyle sıralanır
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise ValueError(f"Appointment rollups are not supported for the '{dialect_name}' database backend.")
+    statement = insert(AppointmentDailyRollup)
+    return statement.on_conflict_do_update(
+        index_elements=[AppointmentDailyRollup.company_id, AppointmentDailyRollup.day, AppointmentDailyRollup.status],
+        set_={
+            "appointment_count": AppointmentDailyRollup.appointment_count + statement.excluded.appointment_count,
+            "booked_minutes": AppointmentDailyRollup.booked_minutes + statement.excluded.booked_minutes,
+            "revenue": AppointmentDailyRollup.revenue + statement.excluded.revenue,
+            "updated_at": func.now(),
+        }
+    )
+
+async def apply_rollup_delta(db: AsyncSession, delta: RollupDelta) -> None:
+    """
+    Biriken değişiklikleri tek bir upsert (executemany) ile özet tablosuna yazar.
+    Commit edilmez; randevu yazımıyla aynı transaction içinde çağrılmalıdır.
+
+    Not: Güncellenen özet satırları commit'e kadar satır kilidi altında kalır. Bir şirketin aynı gündeki tüm
+    yeni rezervasyonları aynı (company_id, day, 'scheduled') satırını güncellediğinden, farklı kullanıcılar için
+    olsalar da upsert'ten commit'e kadar birbirini bekler (kullanıcı bazlı rezervasyon kilitlerinin sağladığı
+    paralelliği bu kısa aralık için kısıtlar).
+
+    Args:
+        db (AsyncSession): Randevu yazımının yapıldığı veritabanı oturumu.
+        delta (RollupDelta): Uygulanacak değişiklikler.
+    """
+    rows = delta.rows()
+    if not rows:
+        return
+    await db.execute(_upsert_statement(db.get_bind().dialect.name), rows)
+
+def _day_and_minutes(dialect_name: str):
+    # rollup_day ve booked_minutes'ın SQL karşılıkları
+    if dialect_name == "postgresql":
+        day = cast(func.timezone("UTC", Appointment.appointment_time), Date)
+        minutes = func.round(func.extract("epoch", Appointment.end_time - Appointment.appointment_time) / 60)
+    else:
+        day = func.date(Appointment.appointment_time, type_=Date)
+        minutes = func.round((func.julianday(Appointment.end_time) - func.julianday(Appointment.appointment_time)) * 1440)
+    return day, cast(minutes, Integer)
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+async def rebuild_appointment_rollups(
+    db: AsyncSession,
+    company_id: Optional[int] = None,
+    start_day: Optional[date] = None,
+    end_day: Optional[date] = None
+) -> int:
+    """
+    Özet tablosunu appointments tablosundan yeniden hesaplar (geçmiş veriler / backfill için).
+    Verilen şirket ve gün aralığındaki özet satırları silinir ve tek bir INSERT ... SELECT ile yeniden yazılır.
+    PostgreSQL'de işlem süresince özet tablosu artımlı yazımlara karşı kilitlenir; bu sırada randevu yazımları
+    rebuild tamamlanana kadar bekler, böylece hiçbir değişiklik kaybolmaz veya iki kez sayılmaz.
+
+    Args:
+        db (AsyncSession): Veritabanı oturumu.
+        company_id (Optional[int]): Yalnızca bu şirket için yeniden hesapla.
+        start_day (Optional[date]): Bu günden (dahil) itibaren yeniden hesapla.
+        end_day (Optional[date]): Bu güne (dahil) kadar yeniden hesapla.
+
+    Returns:
+        int: Yazılan özet satırı sayısı.
+    """
+    logger.info("Rebuilding appointment rollups: company_id=%s, start_day=%s, end_day=%s", company_id, start_day, end_day)
+    dialect_name = db.get_bind().dialect.name
+    if dialect_name == "postgresql":
+        await db.execute(text("LOCK TABLE appointment_daily_rollups IN EXCLUSIVE MODE"))
+
+    day, minutes = _day_and_minutes(dialect_name)
+    # Önce randevu başına süre ve gelir (ara tablo birincil anahtar indeksiyle), ardından gün/durum bazında toplam
+    per_appointment = (
+        select(
+            Appointment.company_id, day.label("day"), Appointment.status, minutes.label("booked_minutes"),
+            func.coalesce(func.sum(AppointmentService.quantity * AppointmentService.price_at_booking), 0).label("revenue")
+        )
+        .outerjoin(AppointmentService, AppointmentService.appointment_id == Appointment.id)
+        .group_by(Appointment.id)
+    )
+    clear = sa_delete(AppointmentDailyRollup)
+    if company_id:
+        per_appointment = per_appointment.filter(Appointment.company_id == company_id)
+        clear = clear.filter(AppointmentDailyRollup.company_id == company_id)
+    # Gün sınırları appointment_time üzerinde (UTC) uygulanır; böylece zaman indeksleri kullanılabilir
+    if start_day:
+        per_appointment = per_appointment.filter(Appointment.appointment_time >= _day_start(start_day))
+        clear = clear.filter(AppointmentDailyRollup.day >= start_day)
+    if end_day:
+        per_appointment = per_appointment.filter(Appointment.appointment_time < _day_start(end_day + timedelta(days=1)))
+        clear = clear.filter(AppointmentDailyRollup.day <= end_day)
+    per_appointment = per_appointment.subquery()
+    source = select(
+        per_appointment.c.company_id, per_appointment.c.day, per_appointment.c.status,
+        func.count(), func.sum(per_appointment.c.booked_minutes), func.sum(per_appointment.c.revenue)
+    ).group_by(per_appointment.c.company_id, per_appointment.c.day, per_appointment.c.status)
+
+    await db.execute(clear)
+    result = await db.execute(
+        sa_insert(AppointmentDailyRollup).from_select(
+            ["company_id", "day", "status", "appointment_count", "booked_minutes", "revenue"], source
+        )
+    )
+    await db.commit()
+    logger.info("Appointment rollups rebuilt: %s rows written.", result.rowcount)
+    return result.rowcount
+
+async def get_appointment_rollups(
+    db: AsyncSession,
+    company_id: int,
+    start_day: date,
+    end_day: date,
+    status: Optional[AppointmentStatus] = None
+) -> List[AppointmentDailyRollup]:
+    """
+    Bir şirketin verilen gün aralığındaki (iki uç dahil) özet satırlarını gün ve durum sırasıyla döndürür.
+    Yalnızca özet tablosu okunur.
+
+    Args:
+        db (AsyncSession): Veritabanı oturumu.
+        company_id (int): Şirket ID'si.
+        start_day (date): Başlangıç günü (dahil).
+        end_day (date): Bitiş günü (dahil).
+        status (Optional[AppointmentStatus]): Yalnızca bu durumdaki randevular.
+
+    Returns:
+        List[AppointmentDailyRollup]: Özet satırları.
+    """
+    logger.debug("Getting appointment rollups: company_id=%s, %s - %s, status=%s", company_id, start_day, end_day, status)
+    query = select(AppointmentDailyRollup).filter(
+        AppointmentDailyRollup.company_id == company_id,
+        AppointmentDailyRollup.day >= start_day,
+        AppointmentDailyRollup.day <= end_day
+    )
+    if status:
+        query = query.filter(AppointmentDailyRollup.status == status.value)
+    result = await db.execute(query.order_by(AppointmentDailyRollup.day, AppointmentDailyRollup.status))
+    return result.scalars().all()
@@ -0,0 +1,128 @@
+import time
+from typing import Optional
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.bussines_logics.caller_id import CallerIdDirectory, normalize_phone
+from app.core.config import get_settings
+from app.models.company import Company
+from app.models.user import User
+from app.schemas.caller_id import CallerIdResolution
+import logging
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# Gelen çağrıların numara dizini: E.164 numara -> aktif şirket / kullanıcı.
+# Uygulama başlarken yüklenir (app/main.py) ve create/update/delete_company ile create/update/delete_user
+# tarafından kayıt bazında güncel tutulur; çağrı çözümleme veritabanına gitmez.
+# Aynı veritabanına yazan diğer süreçlerin değişiklikleri CALLER_ID_DIRECTORY_TTL_SECONDS içinde görülür.
+caller_directory = CallerIdDirectory()
+
+def normalize_phone_number(raw: Optional[str]) -> Optional[str]:
+    """
+    Numarayı uygulama ayarlarındaki varsayılan ülkeye göre E.164 biçimine getirir.
+    """
+    return normalize_phone(raw, settings.PHONE_DEFAULT_COUNTRY_CODE, settings.PHONE_NATIONAL_NUMBER_LENGTH)
+
+async def load_caller_directory(db: AsyncSession) -> int:
+    """
+    Numara dizinini aktif şirket ve kullanıcıların E.164 numaralarıyla baştan kurar.
+    Yalnızca üç sütun okunur; ORM nesnesi oluşturulmaz.
+
+    Args:
+        db (AsyncSession): Veritabanı oturumu.
+
+    Returns:
+        int: Dizindeki numaralı kayıt sayısı.
+    """
+    started = time.monotonic()
+    companies = await db.execute(
+        select(Company.id, Company.phone_e164).filter(Company.is_active.is_(True), Company.phone_e164.isnot(None))
+    )
+    users = await db.execute(
+        select(User.id, User.company_id, User.phone_e164).filter(User.is_active.is_(True), User.phone_e164.isnot(None))
+    )
+    caller_directory.load(companies.all(), users.all(), loaded_at=started)
+    logger.info("Caller ID directory loaded with %s numbers in %.1f ms.", len(caller_directory), (time.monotonic() - started) * 1000)
+    return len(caller_directory)
+
+def sync_caller_company(company: Company, removed: bool = False) -> None:
+    """
+    Şirketin numarasını (yüklenmişse) numara dizinine yansıtır.
+    Silinen veya pasifleştirilen şirketler dizinden çıkarılır.
+    """
+    if caller_directory.loaded:
+        active = not removed and company.is_active
+        caller_directory.set_company(company.id, company.phone_e164 if active else None)
+
+def sync_caller_user(user: User, removed: bool = False) -> None:
+    """
+    Kullanıcının numarasını (yüklenmişse) numara dizinine yansıtır.
+    Silinen veya pasifleştirilen kullanıcılar dizinden çıkarılır.
+    """
+    if caller_directory.loaded:
+        active = not removed and user.is_active
+        caller_directory.set_user(user.id, user.company_id, user.phone_e164 if active else None)
+
+async def backfill_phone_e164(db: AsyncSession, batch_size: int = 1000) -> int:
+    """
+    phone_e164 sütunlarını phone sütunlarından yeniden hesaplar (migrations/0004_phone_e164.sql sonrası
+    ve numaralar uygulama dışından yazıldığında). Yalnızca değeri değişen satırlar, birincil anahtara göre
+    toplu UPDATE ile yazılır.
+
+    Args:
+        db (AsyncSession): Veritabanı oturumu.
+        batch_size (int): Tek UPDATE ifadesinde yazılan en fazla satır sayısı.
+
+    Returns:
+        int: Güncellenen satır sayısı.
+    """
+    updated = 0
+    for model in (Company, User):
+        result = await db.execute(select(model.id, model.phone, model.phone_e164))
+        changes = [
+            {"id": row_id, "phone_e164": e164}
+            for row_id, phone, current in result.all()
+            if (e164 := normalize_phone_number(phone)) != current
+        ]
+        for offset in range(0, len(changes), batch_size):
+            await db.execute(update(model), changes[offset:offset + batch_size])
+        updated += len(changes)
+        logger.info("Backfilled phone_e164 for %s %s rows.", len(changes), model.__tablename__)
+    await db.commit()
+    if caller_directory.loaded:
+        await load_caller_directory(db)
+    return updated
+
+async def resolve_call(db: AsyncSession, dialed: Optional[str], caller: Optional[str]) -> CallerIdResolution:
+    """
+    Gelen çağrıda aranan numaradan şirketi, arayan numaradan kayıtlı kullanıcıyı çözümler.
+    Dizin yüklü ve güncelse veritabanına gidilmez; değilse önce dizin yüklenir.
+
+    Args:
+        db (AsyncSession): Veritabanı oturumu (yalnızca dizin yüklenirken kullanılır).
+        dialed (Optional[str]): Aranan numara (herhangi bir yazımla).
+        caller (Optional[str]): Arayan numara; gizli numaralarda boş.
+
+    Returns:
+        CallerIdResolution: Normalleştirilmiş numaralar ve bulunan şirket/kullanıcı ID'leri.
+    """
+    loaded_at = caller_directory.loaded_at
+    if loaded_at is None or time.monotonic() - loaded_at >= settings.CALLER_ID_DIRECTORY_TTL_SECONDS:
+        await load_caller_directory(db)
+
+    dialed_number = normalize_phone_number(dialed)
+    caller_number = normalize_phone_number(caller)
+    company_id = caller_directory.resolve_company(dialed_number)
+    user = caller_directory.resolve_user(caller_number, company_id)
+    logger.debug("Resolved call %s -> %s: company %s, user %s", caller_number, dialed_number, company_id, user)
+    return CallerIdResolution(
+        dialed_number=dialed_number,
+        caller_number=caller_number,
+        company_id=company_id,
+        user_id=user[0] if user else None,
+        user_company_id=user[1] if user else None
+    )
@@ -4,6 +4,8 @@ from sqlalchemy import exc as sa_exc # SQLAlchemy exceptions for integrity error
 from app.models.company import Company
 from app.schemas.company import CompanyCreate, CompanyUpdate
 from typing import Optional, List
+from app.core.pagination import decode_cursor, keyset_after
+from app.crud.crud_caller_id import normalize_phone_number, sync_caller_company
 import logging
 logger = logging.getLogger(__name__)
 
@@ -18,7 +20,7 @@ async def get_company_by_id(db: AsyncSession, company_id: int) -> Optional[Compa
     Returns:
         Optional[Company]: Bulunursa Company nesnesi, aksi takdirde None.
     """
-    logger.debug(f"Getting company by ID: {company_id}")
+    logger.debug("Getting company by ID: %s", company_id)
     result = await db.execute(select(Company).filter(Company.id == company_id))
     return result.scalars().first()
 
@@ -34,7 +36,7 @@ async def get_company_by_name(db: AsyncSession, name: str) -> Optional[Company]:
     Returns:
         Optional[Company]: Bulunursa Company nesnesi, aksi takdirde None.
     """
-    logger.debug(f"Getting company by name: {name}")
+    logger.debug("Getting company by name: %s", name)
     result = await db.execute(select(Company).filter(Company.name == name))
     return result.scalars().first()
 
@@ -50,34 +52,47 @@ async def get_company_by_email(db: AsyncSession, email: str) -> Optional[Company
     Returns:
         Optional[Company]: Bulunursa Company nesnesi, aksi takdirde None.
     """
-    logger.debug(f"Getting company by email: {email}")
+    logger.debug("Getting company by email: %s", email)
     result = await db.execute(select(Company).filter(Company.email == email))
     return result.scalars().first()
 
+COMPANY_KEYSET = (Company.id,) # Keyset sayfalama sıralama anahtarı (primary key)
+COMPANY_KEYSET_PARSERS = (int,)
+
 async def get_all_companies(
     db: AsyncSession,
     skip: int = 0,
     limit: int = 100,
-    is_active: Optional[bool] = None # Aktiflik durumuna göre filtreleme eklendi
+    is_active: Optional[bool] = None, # Aktiflik durumuna göre filtreleme eklendi
+    cursor: Optional[str] = None
 ) -> List[Company]:
     """
     Şirketleri filtreleme ve sayfalama ile listeler.
+    Sonuçlar id sırasıyla döner; cursor verilirse skip yerine keyset sayfalama kullanılır.
 
     Args:
         db (AsyncSession): Veritabanı oturumu.
         skip (int): Kaç kaydın atlanacağı.
         limit (int): Kaç kaydın döndürüleceği.
         is_active (Optional[bool]): Şirketlerin aktiflik durumuna göre filtrelemek için.
+        cursor (Optional[str]): Önceki sayfanın son kaydından üretilmiş opak imleç.
 
     Returns:
         List[Company]: Şirketlerin listesi.
+    Raises:
+        ValueError: İmleç geçersizse.
     """
-    logger.debug(f"Getting all companies with skip: {skip}, limit: {limit}, is_active: {is_active}")
+    logger.debug("Getting all companies with skip: %s, limit: %s, is_active: %s, cursor: %s", skip, limit, is_active, cursor)
     query = select(Company)
     if is_active is not None:
         query = query.filter(Company.is_active == is_active)
-    
-    result = await db.execute(query.offset(skip).limit(limit))
+
+    query = query.order_by(*COMPANY_KEYSET)
+    if cursor:
+        query = query.filter(keyset_after(COMPANY_KEYSET, decode_cursor(cursor, COMPANY_KEYSET_PARSERS)))
+    else:
+        query = query.offset(skip)
+    result = await db.execute(query.limit(limit))
     return result.scalars().all()
 
 async def create_company(db: AsyncSession, company_in: CompanyCreate) -> Company:
@@ -94,19 +109,20 @@ async def create_company(db: AsyncSession, company_in: CompanyCreate) -> Company
     Raises:
         ValueError: Eğer şirket adı veya e-postası zaten mevcutsa.
     """
-    logger.info(f"Attempting to create company: {company_in.name}")
+    logger.info("Attempting to create company: %s", company_in.name)
     
     # Benzersizlik kontrolleri (DB constraint'leri olsa da, daha erken hata yakalamak için)
     if await get_company_by_name(db, company_in.name):
-        logger.warning(f"Company creation failed: Name '{company_in.name}' already exists.")
+        logger.warning("Company creation failed: Name '%s' already exists.", company_in.name)
         raise ValueError("Company with this name already exists.")
     if company_in.email and await get_company_by_email(db, company_in.email):
-        logger.warning(f"Company creation failed: Email '{company_in.email}' already exists.")
+        logger.warning("Company creation failed: Email '%s' already exists.", company_in.email)
         raise ValueError("Company with this email already exists.")
 
     db_company = Company(
         name=company_in.name,
         phone=company_in.phone,
+        phone_e164=normalize_phone_number(company_in.phone),
         email=company_in.email,
         address=company_in.address
     )
@@ -114,11 +130,12 @@ async def create_company(db: AsyncSession, company_in: CompanyCreate) -> Company
     try:
         await db.commit()
         await db.refresh(db_company)
-        logger.info(f"Company '{db_company.name}' (ID: {db_company.id}) created successfully.")
+        sync_caller_company(db_company)
+        logger.info("Company '%s' (ID: %s) created successfully.", db_company.name, db_company.id)
         return db_company
     except sa_exc.IntegrityError as e:
         await db.rollback()
-        logger.error(f"Database integrity error during company creation: {e}", exc_info=True)
+        logger.error("Database integrity error during company creation: %s", e, exc_info=True)
         # Daha spesifik bir hata mesajı için e.orig'i kontrol edebilirsiniz.
         if "unique_company_name_key" in str(e) or "company_name_key" in str(e):
             raise ValueError("Company with this name already exists.")
@@ -142,20 +159,23 @@ async def update_company(db: AsyncSession, db_company: Company, company_update:
     Raises:
         ValueError: Eğer güncellenen şirket adı veya e-postası zaten mevcutsa.
     """
-    logger.info(f"Updating company ID: {db_company.id}")
+    logger.info("Updating company ID: %s", db_company.id)
     update_data = company_update.model_dump(exclude_unset=True)
 
     # Ad veya e-posta güncelleniyorsa benzersizlik kontrolü
     if "name" in update_data and update_data["name"] != db_company.name:
         if await get_company_by_name(db, update_data["name"]):
-            logger.warning(f"Company update failed for ID {db_company.id}: Name '{update_data['name']}' already exists.")
+            logger.warning("Company update failed for ID %s: Name '%s' already exists.", db_company.id, update_data['name'])
             raise ValueError("Company with this name already exists.")
     
     if "email" in update_data and update_data["email"] != db_company.email:
         if update_data["email"] and await get_company_by_email(db, update_data["email"]):
-            logger.warning(f"Company update failed for ID {db_company.id}: Email '{update_data['email']}' already exists.")
+            logger.warning("Company update failed for ID %s: Email '%s' already exists.", db_company.id, update_data['email'])
             raise ValueError("Company with this email already exists.")
 
+    if "phone" in update_data:
+        update_data["phone_e164"] = normalize_phone_number(update_data["phone"])
+
     for key, value in update_data.items():
         setattr(db_company, key, value)
     
@@ -163,11 +183,12 @@ async def update_company(db: AsyncSession, db_company: Company, company_update:
     try:
         await db.commit()
         await db.refresh(db_company)
-        logger.info(f"Company ID {db_company.id} updated successfully.")
+        sync_caller_company(db_company)
+        logger.info("Company ID %s updated successfully.", db_company.id)
         return db_company
     except sa_exc.IntegrityError as e:
         await db.rollback()
-        logger.error(f"Database integrity error during company update for ID {db_company.id}: {e}", exc_info=True)
+        logger.error("Database integrity error during company update for ID %s: %s", db_company.id, e, exc_info=True)
         if "uq_company_name_key" in str(e) or "company_name_key" in str(e):
             raise ValueError("Company with this name already exists.")
         if "company_email_key" in str(e):
@@ -184,7 +205,8 @@ async def delete_company(db: AsyncSession, db_company: Company):
         db (AsyncSession): Veritabanı oturumu.
         db_company (Company): Silinecek Company nesnesi.
     """
-    logger.info(f"Deleting company ID: {db_company.id}")
+    logger.info("Deleting company ID: %s", db_company.id)
     await db.delete(db_company)
     await db.commit()
-    logger.info(f"Company ID {db_company.id} deleted successfully.")
\ No newline at end of file
+    sync_caller_company(db_company, removed=True)
+    logger.info("Company ID %s deleted successfully.", db_company.id)
\ No newline at end of file
@@ -2,12 +2,26 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy import exc as sa_exc # SQLAlchemy exceptions for integrity errors
 from app.models.company_service import CompanyService
-from app.schemas.company_service import CompanyServiceCreate, CompanyServiceUpdate
-from typing import Optional, List
+from app.schemas.company_service import CompanyServiceCreate, CompanyServiceMatch, CompanyServiceUpdate
+from typing import Optional, List, Dict
+from app.core.pagination import decode_cursor, keyset_after
+from app.core.cache import TTLCache, detached_copy
+from app.core.config import get_settings
+from app.bussines_logics.service_matching import ServiceNameIndex # Transkript -> hizmet adı eşleştirme
 from decimal import Decimal # Fiyatlar için Decimal tipi
 import logging
 logger = logging.getLogger(__name__)
 
+settings = get_settings()
+
+# Şirket bazlı aktif hizmet kataloğu önbelleği: company_id -> {service_id: CompanyService (detached)}
+# Hizmet oluşturma/güncelleme/silme işlemleri ilgili şirketin kaydını geçersiz kılar (write-through invalidation).
+# Birden fazla süreç çalışıyorsa diğer süreçlerdeki eskimeyi TTL sınırlar.
+service_catalog_cache = TTLCache(
+    maxsize=settings.SERVICE_CATALOG_CACHE_MAX_COMPANIES,
+    ttl=settings.SERVICE_CATALOG_CACHE_TTL_SECONDS
+)
+
 async def get_company_service_by_id(db: AsyncSession, service_id: int) -> Optional[CompanyService]:
     """
     Veritabanından ID'sine göre bir şirket hizmeti getirir.
@@ -19,7 +33,7 @@ async def get_company_service_by_id(db: AsyncSession, service_id: int) -> Option
     Returns:
         Optional[CompanyService]: Bulunursa CompanyService nesnesi, aksi takdirde None.
     """
-    logger.debug(f"Getting company service by ID: {service_id}")
+    logger.debug("Getting company service by ID: %s", service_id)
     result = await db.execute(select(CompanyService).filter(CompanyService.id == service_id))
     return result.scalars().first()
 
@@ -40,7 +54,7 @@ async def get_company_service_by_company_id_and_name(
     Returns:
         Optional[CompanyService]: Bulunursa CompanyService nesnesi, aksi takdirde None.
     """
-    logger.debug(f"Getting company service by company_id: {company_id} and name: {name}")
+    logger.debug("Getting company service by company_id: %s and name: %s", company_id, name)
     result = await db.execute(
         select(CompanyService).filter(
             CompanyService.company_id == company_id,
@@ -49,15 +63,109 @@ async def get_company_service_by_company_id_and_name(
     )
     return result.scalars().first()
 
+async def get_active_service_catalog(db: AsyncSession, company_id: int) -> Dict[int, CompanyService]:
+    """
+    Şirketin aktif hizmetlerini id sırasıyla önbellekten döndürür; önbellekte yoksa tek sorguyla yükler.
+    Dönen nesneler hiçbir oturuma bağlı değildir (detached) ve değiştirilmemelidir;
+    oturumda kullanmak için `await db.merge(service, load=False)` ile bağlanmalıdır.
+
+    Args:
+        db (AsyncSession): Veritabanı oturumu.
+        company_id (int): Şirketin ID'si.
+
+    Returns:
+        Dict[int, CompanyService]: Hizmet ID'sine göre aktif hizmetler.
+    """
+    catalog = service_catalog_cache.get(company_id)
+    if catalog is None:
+        logger.debug("Service catalog cache miss for company_id: %s", company_id)
+        result = await db.execute(
+            select(CompanyService)
+            .filter(CompanyService.company_id == company_id, CompanyService.is_active == True)
+            .order_by(CompanyService.id)
+        )
+        catalog = {service.id: detached_copy(service) for service in result.scalars()}
+        service_catalog_cache.set(company_id, catalog)
+    return catalog
+
+def invalidate_service_catalog(company_id: int) -> None:
+    """
+    Şirketin hizmet kataloğu önbellek kaydını geçersiz kılar.
+    """
+    logger.debug("Invalidating service catalog cache for company_id: %s", company_id)
+    service_catalog_cache.invalidate(company_id)
+
+# Şirket bazlı hizmet adı eşleştirme dizini: company_id -> ServiceNameIndex (aktif hizmetler).
+# Dizin ilk sorguda katalogdan kurulur; hizmet oluşturma/güncelleme/pasifleştirme/silme işlemleri yüklü dizini
+# baştan kurmadan, yalnızca ilgili hizmetin kaydını değiştirerek günceller.
+service_name_indexes = TTLCache(
+    maxsize=settings.SERVICE_CATALOG_CACHE_MAX_COMPANIES,
+    ttl=settings.SERVICE_CATALOG_CACHE_TTL_SECONDS
+)
+
+async def get_service_name_index(db: AsyncSession, company_id: int) -> ServiceNameIndex:
+    """
+    Şirketin hizmet adı eşleştirme dizinini döndürür; yüklü değilse aktif hizmet kataloğundan kurar.
+    """
+    index = service_name_indexes.get(company_id)
+    if index is None:
+        catalog = await get_active_service_catalog(db, company_id)
+        index = ServiceNameIndex((service.id, service.name) for service in catalog.values())
+        service_name_indexes.set(company_id, index)
+        logger.debug("Built service name index for company_id: %s with %s services", company_id, len(index))
+    return index
+
+async def match_company_services(
+    db: AsyncSession,
+    company_id: int,
+    query: str,
+    limit: int = 5,
+    min_score: float = 0.3
+) -> List[CompanyServiceMatch]:
+    """
+    Transkriptteki hizmet ifadesini ("saç kesim") şirketin aktif hizmetleriyle ("Saç Kesimi") eşleştirir.
+
+    Args:
+        db (AsyncSession): Veritabanı oturumu (yalnızca dizin yüklü değilse kullanılır).
+        company_id (int): Şirketin ID'si.
+        query (str): Transkript veya aranan hizmet adı.
+        limit (int): En fazla kaç aday döneceği.
+        min_score (float): En düşük benzerlik skoru (0-1).
+
+    Returns:
+        List[CompanyServiceMatch]: Skora göre azalan sırada adaylar.
+    """
+    index = await get_service_name_index(db, company_id)
+    return [
+        CompanyServiceMatch(id=service_id, name=name, score=score)
+        for service_id, name, score in index.match(query, limit=limit, min_score=min_score)
+    ]
+
+def _sync_service_name_index(service: CompanyService, removed: bool = False) -> None:
+    # Yalnızca yüklü dizin güncellenir; yüklü değilse ilk sorguda güncel katalogdan kurulur
+    index = service_name_indexes.get(service.company_id)
+    if index is None:
+        return
+    if removed or not service.is_active:
+        index.discard(service.id)
+    else:
+        index.add(service.id, service.name)
+
+COMPANY_SERVICE_KEYSET = (CompanyService.id,) # Keyset sayfalama sıralama anahtarı (primary key)
+COMPANY_SERVICE_KEYSET_PARSERS = (int,)
+
 async def get_services_by_company_id(
     db: AsyncSession,
     company_id: int,
     skip: int = 0,
     limit: int = 100,
-    is_active: Optional[bool] = None # Aktiflik durumuna göre filtreleme
+    is_active: Optional[bool] = None, # Aktiflik durumuna göre filtreleme
+    cursor: Optional[str] = None
 ) -> List[CompanyService]:
     """
     Belirli bir şirkete ait hizmetleri filtreleme ve sayfalama ile listeler.
+    Sonuçlar id sırasıyla döner; cursor verilirse skip yerine keyset sayfalama kullanılır.
+    is_active=True istendiğinde sonuçlar hizmet kataloğu önbelleğinden gelir.
 
     Args:
         db (AsyncSession): Veritabanı oturumu.
@@ -65,16 +173,34 @@ async def get_services_by_company_id(
         skip (int): Kaç kaydın atlanacağı.
         limit (int): Kaç kaydın döndürüleceği.
         is_active (Optional[bool]): Hizmetlerin aktiflik durumuna göre filtrelemek için.
+        cursor (Optional[str]): Önceki sayfanın son kaydından üretilmiş opak imleç.
 
     Returns:
         List[CompanyService]: Şirket hizmetlerinin listesi.
+    Raises:
+        ValueError: İmleç geçersizse.
     """
-    logger.debug(f"Getting services for company_id: {company_id} with skip: {skip}, limit: {limit}, is_active: {is_active}")
+    logger.debug("Getting services for company_id: %s with skip: %s, limit: %s, is_active: %s, cursor: %s", company_id, skip, limit, is_active, cursor)
+    if is_active is True:
+        # Aktif hizmetler katalog önbelleğinden, id sırasıyla sunulur
+        services = list((await get_active_service_catalog(db, company_id)).values())
+        if cursor:
+            (last_id,) = decode_cursor(cursor, COMPANY_SERVICE_KEYSET_PARSERS)
+            services = [service for service in services if service.id > last_id][:limit]
+        else:
+            services = services[skip:skip + limit]
+        return [await db.merge(service, load=False) for service in services]
+
     query = select(CompanyService).filter(CompanyService.company_id == company_id)
     if is_active is not None:
         query = query.filter(CompanyService.is_active == is_active)
-    
-    result = await db.execute(query.offset(skip).limit(limit))
+
+    query = query.order_by(*COMPANY_SERVICE_KEYSET)
+    if cursor:
+        query = query.filter(keyset_after(COMPANY_SERVICE_KEYSET, decode_cursor(cursor, COMPANY_SERVICE_KEYSET_PARSERS)))
+    else:
+        query = query.offset(skip)
+    result = await db.execute(query.limit(limit))
     return result.scalars().all()
 
 async def create_company_service(db: AsyncSession, service_in: CompanyServiceCreate) -> CompanyService:
@@ -91,11 +217,11 @@ async def create_company_service(db: AsyncSession, service_in: CompanyServiceCre
     Raises:
         ValueError: Eğer aynı şirkette aynı isimde bir hizmet zaten mevcutsa.
     """
-    logger.info(f"Attempting to create service '{service_in.name}' for company ID: {service_in.company_id}")
+    logger.info("Attempting to create service '%s' for company ID: %s", service_in.name, service_in.company_id)
     
     # Benzersizlik kontrolü (DB constraint'i olsa da, daha erken hata yakalamak için)
     if await get_company_service_by_company_id_and_name(db, service_in.company_id, service_in.name):
-        logger.warning(f"Service creation failed: Service '{service_in.name}' already exists for company ID {service_in.company_id}.")
+        logger.warning("Service creation failed: Service '%s' already exists for company ID %s.", service_in.name, service_in.company_id)
         raise ValueError("Service with this name already exists for this company.")
 
     db_service = CompanyService(
@@ -109,11 +235,13 @@ async def create_company_service(db: AsyncSession, service_in: CompanyServiceCre
     try:
         await db.commit()
         await db.refresh(db_service)
-        logger.info(f"Service '{db_service.name}' (ID: {db_service.id}) created successfully for company ID: {db_service.company_id}.")
+        invalidate_service_catalog(db_service.company_id)
+        _sync_service_name_index(db_service)
+        logger.info("Service '%s' (ID: %s) created successfully for company ID: %s.", db_service.name, db_service.id, db_service.company_id)
         return db_service
     except sa_exc.IntegrityError as e:
         await db.rollback()
-        logger.error(f"Database integrity error during service creation: {e}", exc_info=True)
+        logger.error("Database integrity error during service creation: %s", e, exc_info=True)
         # Benzersiz kısıtlama adını kontrol edin (SQL'deki 'uq_company_service_name_company_id')
         if "uq_company_service_name_company_id" in str(e):
             raise ValueError("Service with this name already exists for this company.")
@@ -135,13 +263,13 @@ async def update_company_service(db: AsyncSession, db_service: CompanyService, s
     Raises:
         ValueError: Eğer güncellenen hizmet adı aynı şirkette zaten mevcutsa.
     """
-    logger.info(f"Updating service ID: {db_service.id} for company ID: {db_service.company_id}")
+    logger.info("Updating service ID: %s for company ID: %s", db_service.id, db_service.company_id)
     update_data = service_update.model_dump(exclude_unset=True)
 
     # Ad güncelleniyorsa benzersizlik kontrolü
     if "name" in update_data and update_data["name"] != db_service.name:
         if await get_company_service_by_company_id_and_name(db, db_service.company_id, update_data["name"]):
-            logger.warning(f"Service update failed for ID {db_service.id}: Name '{update_data['name']}' already exists for company ID {db_service.company_id}.")
+            logger.warning("Service update failed for ID %s: Name '%s' already exists for company ID %s.", db_service.id, update_data['name'], db_service.company_id)
             raise ValueError("Service with this name already exists for this company.")
 
     for key, value in update_data.items():
@@ -151,11 +279,13 @@ async def update_company_service(db: AsyncSession, db_service: CompanyService, s
     try:
         await db.commit()
         await db.refresh(db_service)
-        logger.info(f"Service ID {db_service.id} updated successfully.")
+        invalidate_service_catalog(db_service.company_id)
+        _sync_service_name_index(db_service)
+        logger.info("Service ID %s updated successfully.", db_service.id)
         return db_service
     except sa_exc.IntegrityError as e:
         await db.rollback()
-        logger.error(f"Database integrity error during service update for ID {db_service.id}: {e}", exc_info=True)
+        logger.error("Database integrity error during service update for ID %s: %s", db_service.id, e, exc_info=True)
         if "uq_company_service_name_company_id" in str(e):
             raise ValueError("Service with this name already exists for this company.")
         raise ValueError("Database error during service update.")
@@ -173,14 +303,16 @@ async def delete_company_service(db: AsyncSession, db_service: CompanyService):
     Raises:
         ValueError: Eğer hizmete bağlı randevular varsa silinemez.
     """
-    logger.info(f"Deleting company service ID: {db_service.id}")
+    logger.info("Deleting company service ID: %s", db_service.id)
     try:
         await db.delete(db_service)
         await db.commit()
-        logger.info(f"Company service ID {db_service.id} deleted successfully.")
+        invalidate_service_catalog(db_service.company_id)
+        _sync_service_name_index(db_service, removed=True)
+        logger.info("Company service ID %s deleted successfully.", db_service.id)
     except sa_exc.IntegrityError as e:
         await db.rollback()
-        logger.error(f"Database integrity error during service deletion for ID {db_service.id}: {e}", exc_info=True)
+        logger.error("Database integrity error during service deletion for ID %s: %s", db_service.id, e, exc_info=True)
         # fk_app_service_company_service kısıtlamasını kontrol edin
         if "fk_app_service_company_service" in str(e):
             raise ValueError("Cannot delete service because it is linked to existing appointments. Please remove all associated appointments first.")
@@ -3,15 +3,28 @@ from sqlalchemy.future import select
 from app.models.user import User, UserRole
 from app.schemas.user import UserCreate, UserUpdate # UserCreate şeması artık password içermeyecek (aşağıda güncellenecek)
 from typing import Optional, List
+from app.core.pagination import decode_cursor, keyset_after
+from app.core.cache import TTLCache, detached_copy
+from app.core.config import get_settings
+from app.crud.crud_caller_id import normalize_phone_number, sync_caller_user
 from uuid import UUID
 import logging
 logger = logging.getLogger(__name__)
 
+settings = get_settings()
+
+# Kimlik doğrulama zincirinde çözümlenen kullanıcıların kısa ömürlü önbelleği: user_id -> User (detached)
+# update_user ve delete_user ilgili kaydı geçersiz kılar; böylece rol ve is_active değişiklikleri hemen etkili olur.
+user_cache = TTLCache(
+    maxsize=settings.AUTH_USER_CACHE_MAX_ENTRIES,
+    ttl=settings.AUTH_USER_CACHE_TTL_SECONDS
+)
+
 async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
     """
     Veritabanından e-posta adresine göre bir kullanıcıyı getirir.
     """
-    logger.debug(f"Getting user by email: {email}")
+    logger.debug("Getting user by email: %s", email)
     result = await db.execute(select(User).filter(User.email == email))
     return result.scalars().first()
 
@@ -19,49 +32,89 @@ async def get_user_by_id(db: AsyncSession, user_id: UUID) -> Optional[User]:
     """
     Veritabanından UUID ID'sine göre bir kullanıcıyı getirir.
     """
-    logger.debug(f"Getting user by ID: {user_id}")
+    logger.debug("Getting user by ID: %s", user_id)
     result = await db.execute(select(User).filter(User.id == user_id))
     return result.scalars().first()
 
+async def get_user_by_id_cached(db: AsyncSession, user_id: UUID) -> Optional[User]:
+    """
+    Kullanıcıyı önce önbellekten, yoksa veritabanından getirir.
+    Önbellekteki kopya sorgu çalıştırılmadan oturuma bağlanır (merge, load=False).
+    Bulunamayan kullanıcılar önbelleğe alınmaz.
+
+    Args:
+        db (AsyncSession): Veritabanı oturumu.
+        user_id (UUID): Kullanıcının ID'si.
+
+    Returns:
+        Optional[User]: Bulunursa oturuma bağlı User nesnesi, aksi takdirde None.
+    """
+    snapshot = user_cache.get(user_id)
+    if snapshot is not None:
+        return await db.merge(snapshot, load=False)
+
+    user = await get_user_by_id(db, user_id=user_id)
+    if user is not None:
+        user_cache.set(user_id, detached_copy(user))
+    return user
+
+def invalidate_cached_user(user_id: UUID) -> None:
+    """
+    Kullanıcının önbellekteki kaydını geçersiz kılar.
+    """
+    user_cache.invalidate(user_id)
+
 async def create_user(db: AsyncSession, user_in: UserCreate, supabase_user_id: UUID) -> User:
     """
     Yeni bir kullanıcı kaydı oluşturur ve Supabase Auth ID'si ile eşleştirir.
     Parola hash'i Supabase Auth tarafından yönetilir ve yerel DB'de saklanmaz.
     """
-    logger.info(f"Creating user in local DB for Supabase user ID: {supabase_user_id}")
+    logger.info("Creating user in local DB for Supabase user ID: %s", supabase_user_id)
     db_user = User(
         id=supabase_user_id, # Supabase Auth'tan gelen UUID'yi kullanın
         name=user_in.name,
         email=user_in.email,
         # hashed_password alanı modelden kaldırıldığı için burada atama yapılmaz.
         phone=user_in.phone,
+        phone_e164=normalize_phone_number(user_in.phone),
         company_id=user_in.company_id,
         role=user_in.role.value
     )
     db.add(db_user)
     await db.commit()
     await db.refresh(db_user)
-    logger.info(f"User created in local DB: {db_user.email} (ID: {db_user.id})")
+    sync_caller_user(db_user)
+    logger.info("User created in local DB: %s (ID: %s)", db_user.email, db_user.id)
     return db_user
 
+USER_KEYSET = (User.id,) # Keyset sayfalama sıralama anahtarı (primary key)
+USER_KEYSET_PARSERS = (UUID,)
+
 async def get_all_users(
     db: AsyncSession,
     skip: int = 0,
     limit: int = 100,
     company_id: Optional[int] = None,
-    role: Optional[UserRole] = None
+    role: Optional[UserRole] = None,
+    cursor: Optional[str] = None
 ) -> List[User]:
     """
     Kullanıcıları filtreleme ve sayfalama ile listeler.
+    Sonuçlar id sırasıyla döner; cursor verilirse skip yerine keyset sayfalama kullanılır.
     """
-    logger.debug(f"Getting all users with skip: {skip}, limit: {limit}, company_id: {company_id}, role: {role}")
+    logger.debug("Getting all users with skip: %s, limit: %s, company_id: %s, role: %s, cursor: %s", skip, limit, company_id, role, cursor)
     query = select(User)
     if company_id:
         query = query.filter(User.company_id == company_id)
     if role:
-        query = query.filter(User.role == role)
-    
-    result = await db.execute(query.offset(skip).limit(limit))
+        query = query.filter(User.role == role.value)
+
+    query = query.order_by(*USER_KEYSET)
+    if cursor:
+        query = query.filter(keyset_after(USER_KEYSET, decode_cursor(cursor, USER_KEYSET_PARSERS)))
+    else:
+        query = query.offset(skip)
+    result = await db.execute(query.limit(limit))
     return result.scalars().all()
 
 async def update_user(db: AsyncSession, db_user: User, user_update: UserUpdate) -> User:
@@ -69,25 +122,34 @@ async def update_user(db: AsyncSession, db_user: User, user_update: UserUpdate)
     Kullanıcı bilgilerini günceller.
     Parola güncellemesi bu fonksiyon tarafından yapılmaz, Supabase Auth üzerinden yönetilir.
     """
-    logger.info(f"Updating user ID: {db_user.id}")
+    logger.info("Updating user ID: %s", db_user.id)
     # user_update.model_dump() çağrılırken, password alanı UserUpdate şemasından kaldırılacak.
     # Bu nedenle burada 'if "password" in update_data:' kontrolüne gerek kalmayacak.
     update_data = user_update.model_dump(exclude_unset=True)
+    if update_data.get("role") is not None:
+        update_data["role"] = update_data["role"].value # role sütunu string olarak saklanır
+    if "phone" in update_data:
+        update_data["phone_e164"] = normalize_phone_number(update_data["phone"])
 
     for key, value in update_data.items():
         setattr(db_user, key, value)
     
     db.add(db_user)
     await db.commit()
+    invalidate_cached_user(db_user.id)
     await db.refresh(db_user)
-    logger.info(f"User ID {db_user.id} updated successfully.")
+    sync_caller_user(db_user)
+    logger.info("User ID %s updated successfully.", db_user.id)
     return db_user
 
 async def delete_user(db: AsyncSession, db_user: User):
     """
     Belirtilen kullanıcıyı veritabanından siler.
     """
-    logger.info(f"Deleting user ID: {db_user.id}")
+    logger.info("Deleting user ID: %s", db_user.id)
+    user_id = db_user.id
     await db.delete(db_user)
     await db.commit()
-    logger.info(f"User ID {db_user.id} deleted successfully.")
\ No newline at end of file
+    invalidate_cached_user(user_id)
+    sync_caller_user(db_user, removed=True)
+    logger.info("User ID %s deleted successfully.", user_id)
\ No newline at end of file
@@ -6,17 +6,19 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.encoders import jsonable_encoder # ValidationError detaylarını JSON'a çevirmek için
 from pydantic import ValidationError # Pydantic validasyon hatalarını yakalamak için
 import logging
-from logging.config import dictConfig
 
 # Uygulama içi modüllerin importları
 from app.core.config import get_settings 
-from app.core.logging_config import LOGGING_CONFIG # Loglama yapılandırması için
+from app.core.logging_config import setup_logging, shutdown_logging # Loglama yapılandırması için
+from app.core.compression import CompressionMiddleware # Büyük yanıtları gzip/brotli ile sıkıştırmak için
+from app.core.responses import FastJSONResponse # orjson tabanlı varsayılan yanıt sınıfı
 from app.api import api_router # API router'larını dahil etmek için
 from app.schemas.common import ErrorResponseSchema # Ortak hata yanıt şeması için
 
 # Loglama yapılandırmasını yükle
 # Bu, FastAPI uygulaması başlatılmadan önce yapılmalıdır.
-dictConfig(LOGGING_CONFIG)
+# Handler'lar kuyruk arkasında çalışır; dosya G/Ç'si event loop'u bloklamaz.
+setup_logging()
 logger = logging.getLogger("app") # Uygulama genelinde kullanılacak logger
 
 # Ayarları yükle
@@ -31,7 +33,8 @@ app = FastAPI(
     # OpenAPI (Swagger/Redoc) için ek meta veriler
     openapi_url="/openapi.json",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=FastJSONResponse # Yanıtlar json.dumps yerine orjson ile kodlanır
 )
 
 # --- CORS (Cross-Origin Resource Sharing) Ayarları ---
@@ -53,6 +56,15 @@ app.add_middleware(
     allow_headers=["*"], # Tüm başlıklara izin ver
 )
 
+# --- Yanıt Sıkıştırma ---
+# Eşiği aşan yanıtlar istemci destekliyorsa brotli, değilse gzip ile sıkıştırılır.
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.RESPONSE_COMPRESSION_MIN_BYTES,
+    gzip_level=settings.RESPONSE_GZIP_LEVEL,
+    brotli_quality=settings.RESPONSE_BROTLI_QUALITY,
+)
+
 # --- API Router'larını Dahil Etme ---
 # app/api/v1/__init__.py dosyasında tanımlanan tüm router'ları buraya dahil ediyoruz.
 # Tüm endpoint'ler "/api/v1" prefix'i ile başlayacaktır.
@@ -66,7 +78,7 @@ async def validation_exception_handler(request: Request, exc: ValidationError):
     """
     Pydantic (veri doğrulama) hatalarını yakalar ve daha okunabilir bir JSON yanıtı döner.
     """
-    logger.warning(f"Validation error occurred for request: {request.url}. Details: {exc.errors()}")
+    logger.warning("Validation error occurred for request: %s. Details: %s", request.url, exc.errors())
     return JSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content=jsonable_encoder(
@@ -79,7 +91,7 @@ async def value_error_handler(request: Request, exc: ValueError):
     """
     CRUD katmanından fırlatılan özel ValueError'ları yakalar ve HTTP 400 Bad Request döner.
     """
-    logger.warning(f"Value error occurred for request: {request.url}. Details: {exc}")
+    logger.warning("Value error occurred for request: %s. Details: %s", request.url, exc)
     return JSONResponse(
         status_code=status.HTTP_400_BAD_REQUEST,
         content=jsonable_encoder(
@@ -93,7 +105,7 @@ async def general_exception_handler(request: Request, exc: Exception):
     Uygulama genelindeki beklenmedik tüm hataları yakalar ve HTTP 500 Internal Server Error döner.
     Üretimde hassas bilgilerin (stack trace) istemciye gitmesini engeller.
     """
-    logger.error(f"Unhandled exception for request: {request.url}. Details: {exc}", exc_info=True)
+    logger.error("Unhandled exception for request: %s. Details: %s", request.url, exc, exc_info=True)
     return JSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={"detail": "An unexpected error occurred.", "error_code": "UNEXPECTED_ERROR"},
@@ -108,6 +120,14 @@ async def startup_event():
     Uygulama başladığında çalışacak olaylar.
     """
     logger.info("FastAPI application is starting up.")
+    # Gelen çağrı numara dizinini ilk çağrıdan önce yükle; veritabanına ulaşılamazsa ilk çözümlemede yüklenir.
+    from app.core.database.database import AsyncSessionLocal
+    from app.crud.crud_caller_id import load_caller_directory
+    try:
+        async with AsyncSessionLocal() as session:
+            await load_caller_directory(session)
+    except Exception as e:
+        logger.error("Caller ID directory could not be loaded at startup: %s", e, exc_info=True)
     # Veritabanı bağlantılarını kontrol edebilir, başlangıç verilerini yükleyebilirsiniz.
     # Örneğin:
     # from app.core.database import engine
@@ -121,4 +141,9 @@ async def shutdown_event():
     Uygulama kapatıldığında çalışacak olaylar.
     """
     logger.info("FastAPI application is shutting down.")
+    # Supabase istemcisinin bağlantı havuzunu kapat
+    from app.core.supabase_client import close_supabase_client
+    await close_supabase_client()
+    # Kuyrukta bekleyen log kayıtlarını yaz ve dinleyicileri durdur
+    shutdown_logging()
     # Açık veritabanı bağlantılarını, Redis bağlantılarını vb. kapatabilirsiniz.
\ No newline at end of file
@@ -1,7 +1,7 @@
 #Henüz importlama
 
 import enum
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, CheckConstraint
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, CheckConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
@@ -29,9 +29,27 @@ class Appointment(Base):
     updated_at = Column(DateTime(timezone=True), nullable=False, default=func.now(), onupdate=func.now())
 
     # Check constraint: appointment_time < end_time
+    # İndeksler sık kullanılan sorgu koşullarına göre seçilmiştir; SQL karşılıkları
+    # app/core/database/migrations/0001_appointment_time_indexes.sql içindedir.
     __table_args__ = (
         CheckConstraint(appointment_time < end_time, name='chk_appointment_time_order'),
+        # Kullanıcı ve şirket bazlı liste ve zaman aralığı filtreleri (get_appointments);
+        # sondaki id, (appointment_time, id) keyset sıralamasını ek sıralama yapmadan karşılar
+        Index("ix_appointments_user_id_appointment_time", user_id, appointment_time, id),
+        Index("ix_appointments_company_id_appointment_time", company_id, appointment_time, id),
+        # Filtresiz keyset sayfalama: ORDER BY appointment_time, id
+        Index("ix_appointments_appointment_time_id", appointment_time, id),
+        # Çakışma kontrolü ve doluluk aralıkları yalnızca iptal edilmemiş randevulara bakar.
+        # end_time indekste tutulduğu için çakışma koşulu tabloya gitmeden değerlendirilir.
+        Index(
+            "ix_appointments_active_user_id_appointment_time", user_id, appointment_time, end_time,
+            postgresql_where=status != AppointmentStatus.cancelled.value,
+            sqlite_where=status != AppointmentStatus.cancelled.value
+        ),
     )
+    # created_at/updated_at gibi sunucu tarafı değerler INSERT/UPDATE ... RETURNING ile aynı
+    # gidiş-dönüşte alınır; yanıt için ayrıca refresh gerekmez.
+    __mapper_args__ = {"eager_defaults": True}
 
     # İlişkiler
     user = relationship("User", back_populates="appointments_created")
@@ -0,0 +1,27 @@
+# app/models/appointment_rollup.py
+
+from sqlalchemy import Column, Integer, String, Date, Numeric, DateTime, ForeignKey, PrimaryKeyConstraint
+from sqlalchemy.sql import func
+
+from app.models.base import Base
+
+class AppointmentDailyRollup(Base):
+    """
+    Şirket, gün (UTC) ve randevu durumu bazında önceden toplanmış randevu sayısı, dolu dakika ve gelir.
+    Randevu yazımlarıyla aynı transaction içinde artımlı (increment) güncellenir
+    (app/crud/crud_appointment_rollup.py); geçmiş veriler rebuild_appointment_rollups ile yeniden hesaplanır.
+    """
+    __tablename__ = "appointment_daily_rollups"
+
+    company_id = Column(Integer, ForeignKey("companies.id", ondelete="CASCADE"), nullable=False)
+    day = Column(Date, nullable=False) # appointment_time'ın UTC tarihi
+    status = Column(String(20), nullable=False)
+    appointment_count = Column(Integer, nullable=False, default=0)
+    booked_minutes = Column(Integer, nullable=False, default=0) # Randevu süreleri toplamı (doluluk)
+    revenue = Column(Numeric(14, 2), nullable=False, default=0) # Toplam quantity * price_at_booking
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=func.now(), onupdate=func.now())
+
+    # Raporlar şirket ve tarih aralığına göre okunur; birincil anahtar bu sorguları karşılar
+    __table_args__ = (
+        PrimaryKeyConstraint(company_id, day, status, name="pk_appointment_daily_rollups"),
+    )
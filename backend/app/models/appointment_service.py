@@ -1,6 +1,6 @@
 #Henüz importlama
 
-from sqlalchemy import Column, Integer, Numeric, ForeignKey, PrimaryKeyConstraint
+from sqlalchemy import Column, Integer, Numeric, ForeignKey, PrimaryKeyConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 
@@ -16,6 +16,12 @@ class AppointmentService(Base):
     quantity = Column(Integer, nullable=False, default=1)
     price_at_booking = Column(Numeric(10, 2), nullable=False) # SQL'de default yok, burada da olmasın
 
+    # Birincil anahtar appointment_id ile başladığı için hizmet tarafındaki aramalar
+    # (ve ON DELETE RESTRICT kontrolü) için ayrı bir indeks gerekir
+    __table_args__ = (
+        Index("ix_appointment_service_company_service_id", company_service_id),
+    )
+
     appointment = relationship("Appointment", back_populates="appointment_services")
     service = relationship("CompanyService", back_populates="appointment_services")
 
@@ -1,5 +1,5 @@
 # app/models/company.py
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -11,12 +11,24 @@ class Company(Base):
     id = Column(Integer, primary_key=True, autoincrement=True) # serial -> autoincrement
     name = Column(String(100), nullable=False, unique=True)
     phone = Column(String(20), nullable=True)
+    # phone'un E.164 biçimi ("+902121234567"); gelen çağrıda aranan numaradan şirket bu sütunla bulunur.
+    # phone ile birlikte CRUD katmanında yazılır (app/bussines_logics/caller_id.py: normalize_phone).
+    phone_e164 = Column(String(16), nullable=True)
     email = Column(String(255), nullable=True, unique=True)
     address = Column(String(255), nullable=True)
     is_active = Column(Boolean, nullable=False, default=True)
     created_at = Column(DateTime(timezone=True), nullable=False, default=func.now())
     updated_at = Column(DateTime(timezone=True), nullable=False, default=func.now(), onupdate=func.now())
 
+    # SQL karşılığı: app/core/database/migrations/0004_phone_e164.sql
+    __table_args__ = (
+        Index(
+            "ix_companies_phone_e164", phone_e164,
+            postgresql_where=phone_e164.isnot(None),
+            sqlite_where=phone_e164.isnot(None)
+        ),
+    )
+
     # İlişkiler
     # Bir şirketin birden fazla kullanıcısı (One-to-Many)
     users = relationship("User", back_populates="company")
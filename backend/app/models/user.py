@@ -1,6 +1,6 @@
 # app/models/user.py
 import enum
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func # CURRENT_TIMESTAMP ve onupdate için
@@ -22,6 +22,8 @@ class User(Base):
     email = Column(String(255), nullable=False, unique=True)
     # Hashed password sütunu kaldırıldı, çünkü Supabase Auth bunu yönetiyor.
     phone = Column(String(20), nullable=True)
+    # phone'un E.164 biçimi; gelen çağrıda arayan numaradan kullanıcı bu sütunla bulunur.
+    phone_e164 = Column(String(16), nullable=True)
     company_id = Column(Integer, ForeignKey("companies.id", ondelete="RESTRICT"), nullable=False)
     # Role Enum olarak tanımlanır
     role = Column(String(20), default=UserRole.employee.value, nullable=False) # Enum olarak saklanacak
@@ -29,6 +31,15 @@ class User(Base):
     created_at = Column(DateTime(timezone=True), nullable=False, default=func.now())
     updated_at = Column(DateTime(timezone=True), nullable=False, default=func.now(), onupdate=func.now())
 
+    # SQL karşılığı: app/core/database/migrations/0004_phone_e164.sql
+    __table_args__ = (
+        Index(
+            "ix_users_phone_e164", phone_e164,
+            postgresql_where=phone_e164.isnot(None),
+            sqlite_where=phone_e164.isnot(None)
+        ),
+    )
+
     # İlişkiler
     company = relationship("Company", back_populates="users")
     # Bir kullanıcının oluşturduğu randevular (One-to-Many)
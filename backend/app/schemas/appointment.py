@@ -71,3 +71,61 @@ class AppointmentRead(BaseModel):
     services: List[CompanyServiceRead] = Field([], description="Randevu kapsamında alınan hizmetlerin detayları.")
 
     model_config = ConfigDict(from_attributes=True) # ORM modundan okumak için
+
+# Seçili alanlarla (sparse fieldset) randevu okuma şeması
+class AppointmentPartialRead(BaseModel):
+    """
+    fields/include parametreleriyle istenen alanları döndüren randevu şeması.
+    Yalnızca yüklenen alanlar yanıta yazılır (response_model_exclude_unset ile kullanılır).
+    """
+    id: UUID = Field(..., description="Randevunun benzersiz ID'si.")
+    user_id: Optional[UUID] = Field(None, description="Randevuyu oluşturan kullanıcının ID'si.")
+    company_id: Optional[int] = Field(None, description="Randevunun ait olduğu şirketin ID'si.")
+    appointment_time: Optional[datetime] = Field(None, description="Randevunun başlangıç zamanı.")
+    end_time: Optional[datetime] = Field(None, description="Randevunun bitiş zamanı.")
+    status: Optional[AppointmentStatus] = Field(None, description="Randevunun durumu.")
+    notes: Optional[str] = Field(None, description="Randevu ile ilgili notlar.")
+    created_at: Optional[datetime] = Field(None, description="Randevu kaydının oluşturulma zamanı.")
+    updated_at: Optional[datetime] = Field(None, description="Randevu kaydının son güncellenme zamanı.")
+    user: Optional[UserRead] = Field(None, description="Randevunun sahibi olan kullanıcının detayları.")
+    services: Optional[List[CompanyServiceRead]] = Field(None, description="Randevu kapsamında alınan hizmetlerin detayları.")
+    appointment_services: Optional[List[AppointmentServiceSchema]] = Field(None, description="Randevu anındaki fiyat ve miktar bilgileri.")
+
+# Takvim görünümü şeması
+class AppointmentCalendarItem(BaseModel):
+    """
+    Takvim ızgaralarında kullanılan, yalnızca zaman ve durum bilgisini içeren randevu şeması.
+    """
+    id: UUID = Field(..., description="Randevunun benzersiz ID'si.")
+    user_id: UUID = Field(..., description="Randevunun sahibi olan kullanıcının ID'si.")
+    appointment_time: datetime = Field(..., description="Randevunun başlangıç zamanı.")
+    end_time: datetime = Field(..., description="Randevunun bitiş zamanı.")
+    status: AppointmentStatus = Field(..., description="Randevunun durumu.")
+
+    model_config = ConfigDict(from_attributes=True) # Satır (Row) nesnelerinden okumak için
+
+# Toplu randevu oluşturma (içe aktarma) şeması
+class AppointmentBulkCreate(BaseModel):
+    """
+    Birden fazla randevuyu tek istekte oluşturmak için kullanılan şema.
+    Yeni bir şirketin mevcut randevularını taşırken kullanılır.
+    """
+    appointments: List[AppointmentCreate] = Field(..., min_length=1, description="Oluşturulacak randevuların listesi.")
+
+# Toplu oluşturmada satır bazlı hata şeması
+class AppointmentBulkRowError(BaseModel):
+    """
+    Toplu oluşturmada reddedilen bir satırın sırasını ve nedenini tanımlar.
+    """
+    index: int = Field(..., example=3, description="Reddedilen satırın istekteki sırası (0'dan başlar).")
+    detail: str = Field(..., example="Appointment time conflict for this user.", description="Satırın reddedilme nedeni.")
+
+# Toplu oluşturma sonucu şeması
+class AppointmentBulkCreateResult(BaseModel):
+    """
+    Toplu randevu oluşturma işleminin özetini döndürür.
+    Geçerli satırlar oluşturulur, geçersiz satırlar hata listesinde raporlanır.
+    """
+    created_count: int = Field(..., description="Oluşturulan randevu sayısı.")
+    created_ids: List[UUID] = Field([], description="Oluşturulan randevuların ID'leri (istekteki sırayla).")
+    errors: List[AppointmentBulkRowError] = Field([], description="Reddedilen satırlar ve nedenleri.")
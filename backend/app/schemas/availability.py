@@ -0,0 +1,13 @@
+from pydantic import BaseModel, Field
+from typing import List
+from datetime import datetime
+from uuid import UUID
+
+# Boş randevu slotu şeması
+class AvailableSlot(BaseModel):
+    """
+    Belirli bir süre için uygun olan boş randevu slotunu tanımlar.
+    """
+    start_time: datetime = Field(..., description="Slotun başlangıç zamanı.")
+    end_time: datetime = Field(..., description="Slotun bitiş zamanı.")
+    user_ids: List[UUID] = Field(..., description="Bu slotta boş olan kullanıcıların ID'leri.")
@@ -0,0 +1,15 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from uuid import UUID
+
+# Gelen çağrı numara çözümleme sonucu şeması
+class CallerIdResolution(BaseModel):
+    """
+    Gelen bir çağrıda aranan numaranın şirketini ve arayan numaranın kayıtlı kullanıcısını tanımlar.
+    Numara tanınmazsa ilgili ID alanları boş döner.
+    """
+    dialed_number: Optional[str] = Field(None, example="+902121234567", description="Aranan numaranın E.164 biçimi; geçersizse boş.")
+    caller_number: Optional[str] = Field(None, example="+905551234567", description="Arayan numaranın E.164 biçimi; gizli veya geçersizse boş.")
+    company_id: Optional[int] = Field(None, example=1, description="Aranan numaranın ait olduğu aktif şirketin ID'si.")
+    user_id: Optional[UUID] = Field(None, description="Arayan numaranın ait olduğu aktif kullanıcının ID'si.")
+    user_company_id: Optional[int] = Field(None, example=1, description="Arayan kullanıcının bağlı olduğu şirketin ID'si.")
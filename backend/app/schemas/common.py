@@ -1,11 +1,20 @@
 # app/schemas/common.py
 
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
 
 class ErrorResponseSchema(BaseModel):
     """
     API'den dönen standart hata yanıtı şeması.
     """
     detail: str = Field(..., example="Kullanıcı bulunamadı.", description="Hatanın kısa açıklaması.")
-    error_code: Optional[str] = Field(None, example="USER_NOT_FOUND", description="Hatanın özel kodu (isteğe bağlı).")
\ No newline at end of file
+    error_code: Optional[str] = Field(None, example="USER_NOT_FOUND", description="Hatanın özel kodu (isteğe bağlı).")
+
+class CursorPage(BaseModel, Generic[T]):
+    """
+    Keyset (cursor) sayfalamalı liste yanıtları için ortak şema.
+    """
+    items: List[T] = Field(..., description="Sayfadaki kayıtlar.")
+    next_cursor: Optional[str] = Field(None, description="Bir sonraki sayfa için opak imleç; son sayfada boştur.")
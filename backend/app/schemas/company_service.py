@@ -43,3 +43,12 @@ class CompanyServiceRead(BaseModel):
 
     # ORM modundan (SQLAlchemy modellerinden) veri okumak için bu ayar gereklidir.
     model_config = ConfigDict(from_attributes=True)
+
+# Hizmet adı eşleştirme sonucu
+class CompanyServiceMatch(BaseModel):
+    """
+    Transkript veya serbest metinle eşleşen hizmet adayı.
+    """
+    id: int = Field(..., example=101, description="Hizmetin ID'si.")
+    name: str = Field(..., example="Saç Kesimi", description="Hizmetin adı.")
+    score: float = Field(..., ge=0, le=1, example=0.86, description="Benzerlik skoru (1 = birebir aynı).")
@@ -0,0 +1,21 @@
+from pydantic import BaseModel, Field
+
+# Veritabanı bağlantı havuzu metrikleri şeması
+class PoolMetrics(BaseModel):
+    """
+    Bağlantı havuzunun anlık durumu ve bağlantı bekleme istatistikleri.
+    wait_ms_* değerleri yüksek, sorgu süreleri normalse havuz yetersizdir (starvation).
+    """
+    pool_size: int = Field(..., description="Havuzda sürekli açık tutulan bağlantı sayısı.")
+    max_overflow: int = Field(..., description="Açılabilecek en fazla ek bağlantı sayısı.")
+    checked_out: int = Field(..., description="Şu an kullanımda olan bağlantı sayısı.")
+    idle: int = Field(..., description="Havuzda boşta bekleyen bağlantı sayısı.")
+    overflow: int = Field(..., description="Şu an açık olan ek (taşma) bağlantı sayısı.")
+    overflow_high_water: int = Field(..., description="Süreç başladığından beri görülen en yüksek taşma bağlantı sayısı.")
+    acquisitions: int = Field(..., description="Havuzdan alınan toplam bağlantı sayısı.")
+    exhausted_waits: int = Field(..., description="Havuz tükendiği için bağlantı beklemek zorunda kalan istek sayısı.")
+    timeouts: int = Field(..., description="Bağlantı beklerken zaman aşımına uğrayan istek sayısı.")
+    wait_ms_avg: float = Field(..., description="Ortalama bağlantı alma süresi (ms).")
+    wait_ms_p50: float = Field(..., description="Son isteklerde bağlantı alma süresinin medyanı (ms).")
+    wait_ms_p99: float = Field(..., description="Son isteklerde bağlantı alma süresinin 99. yüzdeliği (ms).")
+    wait_ms_max: float = Field(..., description="Görülen en uzun bağlantı alma süresi (ms).")
@@ -0,0 +1,41 @@
+from pydantic import BaseModel, Field, ConfigDict
+from typing import List
+from datetime import date
+from decimal import Decimal
+
+from app.models.appointment import AppointmentStatus
+
+# Günlük randevu özeti şeması
+class AppointmentDailyRollupRead(BaseModel):
+    """
+    Bir şirketin bir gündeki (UTC) belirli durumdaki randevularının özeti.
+    """
+    day: date = Field(..., description="Randevuların başladığı gün (UTC).")
+    status: AppointmentStatus = Field(..., description="Randevu durumu.")
+    appointment_count: int = Field(..., description="Randevu sayısı.")
+    booked_minutes: int = Field(..., description="Randevu sürelerinin toplamı (dakika); doluluk ölçüsü.")
+    revenue: Decimal = Field(..., description="Toplam gelir (quantity * price_at_booking).")
+
+    model_config = ConfigDict(from_attributes=True) # ORM'den okumak için
+
+# Durum bazında dönem toplamı şeması
+class AppointmentStatusTotal(BaseModel):
+    """
+    Rapor dönemindeki bir randevu durumunun toplamları.
+    """
+    status: AppointmentStatus = Field(..., description="Randevu durumu.")
+    appointment_count: int = Field(..., description="Randevu sayısı.")
+    booked_minutes: int = Field(..., description="Randevu sürelerinin toplamı (dakika).")
+    revenue: Decimal = Field(..., description="Toplam gelir.")
+
+# Gelir ve doluluk raporu şeması
+class AppointmentRollupReport(BaseModel):
+    """
+    Bir şirketin tarih aralığındaki günlük ve durum bazında randevu, doluluk ve gelir raporu.
+    Yalnızca özet (rollup) tablosundan üretilir.
+    """
+    company_id: int = Field(..., description="Şirket ID'si.")
+    start_day: date = Field(..., description="Raporun ilk günü (dahil).")
+    end_day: date = Field(..., description="Raporun son günü (dahil).")
+    days: List[AppointmentDailyRollupRead] = Field([], description="Gün ve durum bazında özet satırları.")
+    totals: List[AppointmentStatusTotal] = Field([], description="Dönem boyunca durum bazında toplamlar.")
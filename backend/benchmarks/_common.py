@@ -0,0 +1,149 @@
+# benchmarks/_common.py
+#
+# Benchmark scriptlerinin ortak yardımcıları.
+# Scriptler backend dizininden `python -m benchmarks.<isim>` ile çalıştırılır.
+# DATABASE_URL verilmezse in-memory SQLite (aiosqlite) kullanılır.
+
+import os
+
+# Ayarlar (Settings) app import edilmeden önce tanımlı olmalı
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:54321")
+os.environ.setdefault("SUPABASE_KEY", "benchmark-anon-key")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret")
+
+import random
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Iterator, List
+from uuid import uuid4
+
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app  # noqa: F401  Tüm modellerin metadata'ya kaydolması için
+from app.models.base import Base
+from app.models.company import Company
+from app.models.company_service import CompanyService
+from app.models.user import User
+
+MONTH_START = datetime(2025, 1, 1)
+
+
+async def create_engine_with_schema(url: str = "sqlite+aiosqlite://"):
+    """
+    Şemayı oluşturulmuş bir benchmark motoru döndürür.
+    In-memory SQLite için tek bağlantı paylaşılır (StaticPool).
+    """
+    kwargs = {"poolclass": StaticPool} if url.endswith("://") or ":memory:" in url else {}
+    engine = create_async_engine(url, echo=False, **kwargs)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return engine
+
+
+def session_factory(engine):
+    """
+    Uygulamadaki AsyncSessionLocal ile aynı ayarlara sahip bir oturum fabrikası döndürür.
+    """
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+
+class StatementCounter:
+    """
+    Motor üzerinde çalıştırılan SQL ifadelerini ve commit'leri sayar (executemany tek ifade sayılır).
+    """
+
+    def __init__(self, engine):
+        self.statements: List[str] = []
+        self.commits = 0
+        self._engine = engine.sync_engine
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def _on_commit(self, conn):
+        self.commits += 1
+
+    def __enter__(self):
+        self.statements.clear()
+        self.commits = 0
+        event.listen(self._engine, "before_cursor_execute", self._on_execute)
+        event.listen(self._engine, "commit", self._on_commit)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self._engine, "before_cursor_execute", self._on_execute)
+        event.remove(self._engine, "commit", self._on_commit)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def round_trips(self) -> int:
+        return len(self.statements) + self.commits
+
+
+@contextmanager
+def timed(label: str, results: dict) -> Iterator[None]:
+    started = time.perf_counter()
+    yield
+    results[label] = time.perf_counter() - started
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def seed_company(session: AsyncSession, staff_count: int, service_count: int = 5, name: str = "Benchmark Salon"):
+    """
+    Bir şirket, aktif çalışanları ve hizmetlerini oluşturur.
+
+    Returns:
+        (Company, List[User], List[CompanyService])
+    """
+    company = Company(name=name, phone="+902120000000", email=f"{uuid4().hex[:8]}@example.com")
+    session.add(company)
+    await session.flush()
+    users = [
+        User(id=uuid4(), name=f"Staff {i}", email=f"staff{i}-{uuid4().hex[:8]}@example.com", company_id=company.id, role="employee")
+        for i in range(staff_count)
+    ]
+    services = [
+        CompanyService(company_id=company.id, name=f"Service {i}", price=Decimal("100.00") + i, duration_minutes=30 + 15 * (i % 3))
+        for i in range(service_count)
+    ]
+    session.add_all(users + services)
+    await session.commit()
+    return company, users, services
+
+
+def generate_day_schedule(rng: random.Random, day: datetime, per_day: int, open_hour: int = 9, close_hour: int = 21):
+    """
+    Bir çalışan için gün içinde çakışmayan (başlangıç, bitiş) aralıkları üretir.
+    """
+    cursor = day.replace(hour=open_hour)
+    closing = day.replace(hour=close_hour)
+    intervals = []
+    for _ in range(per_day):
+        cursor += timedelta(minutes=rng.choice((0, 0, 15, 30)))
+        end = cursor + timedelta(minutes=rng.choice((30, 30, 45, 60)))
+        if end > closing:
+            break
+        intervals.append((cursor, end))
+        cursor = end
+    return intervals
+
+
+async def bulk_insert(session: AsyncSession, model, rows: List[dict], chunk_size: int = 5000):
+    for offset in range(0, len(rows), chunk_size):
+        await session.execute(insert(model), rows[offset:offset + chunk_size])
@@ -0,0 +1,114 @@
+# benchmarks/bench_appointment_projection.py
+#
+# Randevu listesinin bir sayfası için farklı projeksiyonların çalıştırdığı SQL ifadesi sayısını,
+# süreyi ve sayfayı yükleyip yanıt şemasına çevirirken ayrılan en yüksek belleği (tracemalloc) karşılaştırır.
+#   - legacy:      eski davranış; user, services ve appointment_services ayrı ayrı selectinload
+#   - default:     include verilmediğinde (user + services)
+#   - sparse:      fields=appointment_time,end_time,status ve ilişki yok
+#   - calendar:    get_appointment_calendar, yalnızca sütun seçen hızlı yol
+#
+#   python -m benchmarks.bench_appointment_projection [--page-size 200] [--services 3]
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+from datetime import timedelta
+from uuid import uuid4
+
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from benchmarks._common import MONTH_START, StatementCounter, bulk_insert, create_engine_with_schema, seed_company, session_factory
+from app.api.endpoints.v1.appointments import _project
+from app.crud.crud_appointment import APPOINTMENT_KEYSET, get_appointment_calendar, get_appointments
+from app.models.appointment import Appointment
+from app.models.appointment_service import AppointmentService
+from app.schemas.appointment import AppointmentCalendarItem, AppointmentPartialRead, AppointmentRead
+from app.schemas.common import CursorPage
+
+
+async def legacy_page(session, limit):
+    result = await session.execute(
+        select(Appointment)
+        .options(selectinload(Appointment.user))
+        .options(selectinload(Appointment.services))
+        .options(selectinload(Appointment.appointment_services))
+        .order_by(*APPOINTMENT_KEYSET).limit(limit)
+    )
+    appointments = result.scalars().all()
+    return CursorPage[AppointmentRead](items=appointments).model_dump(mode="json")
+
+
+async def projected_page(session, limit, fields=None, include=None):
+    appointments = await get_appointments(session, limit=limit, fields=fields, include=include)
+    converted = {}
+    items = [_project(appointment, fields, include, converted) for appointment in appointments]
+    return CursorPage[AppointmentPartialRead](items=items).model_dump(mode="json", exclude_unset=True)
+
+
+async def calendar_page(session, limit):
+    rows = await get_appointment_calendar(session, limit=limit)
+    return CursorPage[AppointmentCalendarItem](items=rows).model_dump(mode="json")
+
+
+async def measure(engine, Session, load):
+    # Isınma (derlenmiş sorgu önbelleği vb.)
+    async with Session() as session:
+        await load(session)
+    async with Session() as session:
+        with StatementCounter(engine) as counter:
+            tracemalloc.start()
+            started = time.perf_counter()
+            page = await load(session)
+            elapsed = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+    return counter.count, elapsed, peak, len(page["items"])
+
+
+async def main(page_size: int, service_count: int):
+    engine = await create_engine_with_schema()
+    Session = session_factory(engine)
+    async with Session() as session:
+        company, users, services = await seed_company(session, staff_count=20, service_count=max(service_count, 5))
+        appointments, links = [], []
+        for i in range(page_size * 2):
+            start = MONTH_START + timedelta(minutes=30 * (i // len(users)))
+            appointment_id = uuid4()
+            appointments.append({
+                "id": appointment_id, "user_id": users[i % len(users)].id, "company_id": company.id,
+                "appointment_time": start, "end_time": start + timedelta(minutes=30), "status": "scheduled",
+                "notes": "Benchmark appointment " * 5,
+            })
+            links.extend(
+                {"appointment_id": appointment_id, "company_service_id": service.id, "quantity": 1, "price_at_booking": service.price}
+                for service in services[:service_count]
+            )
+        await bulk_insert(session, Appointment, appointments)
+        await bulk_insert(session, AppointmentService, links)
+        await session.commit()
+
+    scenarios = {
+        "legacy (3 selectinloads)": lambda session: legacy_page(session, page_size),
+        "default (user, services)": lambda session: projected_page(session, page_size),
+        "sparse fields, no relations": lambda session: projected_page(
+            session, page_size, fields=["appointment_time", "end_time", "status"], include=[]
+        ),
+        "calendar fast path": lambda session: calendar_page(session, page_size),
+    }
+    print(f"Page size {page_size}, {service_count} services per appointment")
+    print(f"{'projection':30s} {'statements':>10} {'ms':>8} {'peak KiB':>10}")
+    for label, load in scenarios.items():
+        statements, elapsed, peak, items = await measure(engine, Session, load)
+        assert items == page_size, f"{label}: expected {page_size} items, got {items}"
+        print(f"{label:30s} {statements:>10d} {elapsed * 1000:8.2f} {peak / 1024:10.1f}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--page-size", type=int, default=200)
+    parser.add_argument("--services", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.page_size, args.services))
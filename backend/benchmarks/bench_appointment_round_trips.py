@@ -0,0 +1,70 @@
+# benchmarks/bench_appointment_round_trips.py
+#
+# Randevu yazma yolunun çalıştırdığı SQL ifadelerini sayar.
+# Gidiş-dönüş sayısının hizmet sayısıyla büyümediğini doğrular (aksi halde çıkış kodu 1).
+#
+#   python -m benchmarks.bench_appointment_round_trips [--services 1 3 10] [--verbose]
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import timedelta
+
+from benchmarks._common import MONTH_START, StatementCounter, create_engine_with_schema, seed_company, session_factory
+from app.crud.crud_appointment import create_appointment
+from app.schemas.appointment import AppointmentCreate, AppointmentRead, AppointmentServiceSchema
+
+
+async def main(service_counts, iterations: int, verbose: bool) -> int:
+    engine = await create_engine_with_schema()
+    Session = session_factory(engine)
+    async with Session() as session:
+        company, users, services = await seed_company(session, staff_count=1, service_count=max(service_counts))
+    user = users[0]
+
+    round_trips = {}
+    slot = MONTH_START.replace(hour=9)
+    for count in service_counts:
+        payload_services = [
+            AppointmentServiceSchema(company_service_id=service.id, quantity=1, price_at_booking=float(service.price))
+            for service in services[:count]
+        ]
+        elapsed = 0.0
+        for _ in range(iterations):
+            appointment_in = AppointmentCreate(
+                user_id=user.id, company_id=company.id,
+                appointment_time=slot, end_time=slot + timedelta(minutes=30),
+                services=payload_services,
+            )
+            slot += timedelta(minutes=30)
+            async with Session() as session:
+                with StatementCounter(engine) as counter:
+                    started = time.perf_counter()
+                    created = await create_appointment(session, appointment_in)
+                    # Yanıt şeması ilişkilere erişir; burada ek sorgu çıkmamalı
+                    response = AppointmentRead.model_validate(created)
+                    elapsed += time.perf_counter() - started
+            assert len(response.services) == count
+        round_trips[count] = (counter.count, counter.round_trips)
+        print(f"services={count:3d}: {counter.count} statements + {counter.commits} commit = "
+              f"{counter.round_trips} round trips, {elapsed / iterations * 1000:.2f} ms/booking")
+        if verbose:
+            for statement in counter.statements:
+                print("    " + " ".join(statement.split())[:140])
+
+    await engine.dispose()
+    if len(set(round_trips.values())) != 1:
+        print("FAIL: round trips grow with the number of services", file=sys.stderr)
+        return 1
+    print("OK: constant round-trip count")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--services", type=int, nargs="+", default=[1, 3, 10])
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.services, args.iterations, args.verbose)))
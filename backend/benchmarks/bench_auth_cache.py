@@ -0,0 +1,94 @@
+# benchmarks/bench_auth_cache.py
+#
+# Kimlik doğrulama bağımlılık zincirinin (JWT doğrulama + kullanıcı çözümleme) istek başına
+# maliyetini önbelleksiz ve önbellekli olarak ölçer; update_user sonrası rol ve is_active
+# değişikliklerinin hemen görüldüğünü doğrular (aksi halde çıkış kodu 1).
+#
+#   python -m benchmarks.bench_auth_cache [--iterations 2000]
+
+import argparse
+import asyncio
+import sys
+import time
+
+from jose import jwt
+
+from benchmarks._common import StatementCounter, create_engine_with_schema, seed_company, session_factory
+from app.core.config import get_settings
+from app.core.security import get_current_active_user, get_current_manager_user, get_current_user, token_cache
+from app.crud.crud_user import update_user, user_cache
+from app.schemas.user import UserUpdate
+from app.models.user import UserRole
+
+
+def issue_token(user_id, lifetime_seconds: int = 3600) -> str:
+    settings = get_settings()
+    claims = {"sub": str(user_id), "aud": "authenticated", "exp": int(time.time()) + lifetime_seconds}
+    return jwt.encode(claims, settings.JWT_SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+async def measure(Session, engine, token: str, iterations: int, cold: bool):
+    elapsed = 0.0
+    statements = 0
+    for _ in range(iterations):
+        if cold:
+            token_cache.clear()
+            user_cache.clear()
+        async with Session() as session:
+            with StatementCounter(engine) as counter:
+                started = time.perf_counter()
+                user = await get_current_user(token=token, db=session)
+                await get_current_active_user(current_user=user)
+                elapsed += time.perf_counter() - started
+            statements += counter.count
+    return elapsed / iterations, statements / iterations
+
+
+async def check_invalidation(Session, token: str) -> bool:
+    async with Session() as session:
+        user = await get_current_user(token=token, db=session)
+        await update_user(session, user, UserUpdate(role=UserRole.manager))
+    async with Session() as session:
+        user = await get_current_user(token=token, db=session)
+        try:
+            await get_current_manager_user(current_user=await get_current_active_user(current_user=user))
+        except Exception:
+            print("FAIL: role change not visible after update_user")
+            return False
+        await update_user(session, user, UserUpdate(is_active=False))
+    async with Session() as session:
+        user = await get_current_user(token=token, db=session)
+        try:
+            await get_current_active_user(current_user=user)
+        except Exception:
+            return True
+    print("FAIL: deactivated user still accepted after update_user")
+    return False
+
+
+async def main(iterations: int) -> int:
+    engine = await create_engine_with_schema()
+    Session = session_factory(engine)
+    async with Session() as session:
+        _, users, _ = await seed_company(session, staff_count=1, service_count=1)
+    token = issue_token(users[0].id)
+
+    cold_s, cold_statements = await measure(Session, engine, token, iterations, cold=True)
+    warm_s, warm_statements = await measure(Session, engine, token, iterations, cold=False)
+    print(f"auth chain cold: {cold_s * 1e6:8.1f} us ({cold_statements:.0f} stmt)   "
+          f"warm: {warm_s * 1e6:8.1f} us ({warm_statements:.0f} stmt)")
+    print(f"token cache: {token_cache.stats()}")
+    print(f"user cache:  {user_cache.stats()}")
+
+    ok = await check_invalidation(Session, token)
+    await engine.dispose()
+    if ok:
+        print("OK: role and is_active changes take effect immediately")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.iterations)))
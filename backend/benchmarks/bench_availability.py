@@ -0,0 +1,98 @@
+# benchmarks/bench_availability.py
+#
+# Yoğun bir kuaför senaryosu: ayda ~10k randevu, 25 çalışan.
+# Bir aylık şirket müsaitliğini tek sorgu + bellek içi aralık hesabıyla,
+# check_appointment_conflict ile slot slot yoklamaya (probe) karşı ölçer.
+#
+#   python -m benchmarks.bench_availability [--staff 25] [--per-day 17] [--days 30]
+
+import argparse
+import asyncio
+import random
+from datetime import timedelta
+from uuid import uuid4
+
+from benchmarks._common import (
+    MONTH_START, bulk_insert, create_engine_with_schema, generate_day_schedule,
+    seed_company, session_factory, timed, StatementCounter,
+)
+from app.bussines_logics.availability import IntervalIndex, find_free_slots, get_available_slots
+from app.crud.crud_appointment import check_appointment_conflict, get_busy_intervals
+from app.models.appointment import Appointment
+
+
+async def main(staff: int, per_day: int, days: int, duration_minutes: int, step_minutes: int):
+    engine = await create_engine_with_schema()
+    Session = session_factory(engine)
+    rng = random.Random(42)
+
+    async with Session() as session:
+        company, users, _ = await seed_company(session, staff_count=staff)
+        rows = []
+        for day_offset in range(days):
+            day = MONTH_START + timedelta(days=day_offset)
+            for user in users:
+                for start, end in generate_day_schedule(rng, day, per_day):
+                    rows.append({
+                        "id": uuid4(), "user_id": user.id, "company_id": company.id,
+                        "appointment_time": start, "end_time": end,
+                        "status": "cancelled" if rng.random() < 0.05 else "scheduled",
+                    })
+        await bulk_insert(session, Appointment, rows)
+        await session.commit()
+    print(f"Seeded {len(rows)} appointments ({staff} staff, {days} days)")
+
+    range_start, range_end = MONTH_START, MONTH_START + timedelta(days=days)
+    duration, step = timedelta(minutes=duration_minutes), timedelta(minutes=step_minutes)
+    results = {}
+
+    async with Session() as session:
+        with StatementCounter(engine) as counter, timed("engine_total", results):
+            slots = await get_available_slots(
+                session, range_start, range_end, duration_minutes,
+                company_id=company.id, slot_step_minutes=step_minutes,
+            )
+        engine_statements = counter.count
+
+        with timed("load_query", results):
+            busy_by_user = await get_busy_intervals(session, range_start, range_end, company_id=company.id)
+        with timed("build_indexes", results):
+            indexes = {user_id: IntervalIndex(intervals) for user_id, intervals in busy_by_user.items()}
+        with timed("compute_slots", results):
+            slot_count = sum(
+                1 for index in indexes.values()
+                for _ in find_free_slots(index, range_start, range_end, duration, step)
+            )
+
+        # Eski yöntem: tek bir çalışan ve tek bir gün için her aday slotu veritabanına sor
+        probe_user = users[0].id
+        probe_day_end = range_start + timedelta(days=1)
+        probes = 0
+        with timed("probe_one_user_one_day", results):
+            candidate = range_start
+            while candidate + duration <= probe_day_end:
+                await check_appointment_conflict(session, probe_user, candidate, candidate + duration)
+                candidate += step
+                probes += 1
+
+    per_probe = results["probe_one_user_one_day"] / probes
+    estimated_probe_month = per_probe * probes * days * staff
+    print(f"Free slots (company, any staff):  {len(slots)} distinct starts, {slot_count} user-slots")
+    print(f"Engine end-to-end:                {results['engine_total'] * 1000:8.2f} ms  ({engine_statements} SQL statement(s))")
+    print(f"  load query:                     {results['load_query'] * 1000:8.2f} ms")
+    print(f"  build interval indexes:         {results['build_indexes'] * 1000:8.2f} ms")
+    print(f"  compute slots in memory:        {results['compute_slots'] * 1000:8.2f} ms")
+    print(f"Probing baseline:                 {per_probe * 1e6:8.1f} us/probe ({probes} probes for 1 user-day)")
+    print(f"  estimated for the same month:   {estimated_probe_month * 1000:8.2f} ms  ({probes * days * staff} round trips)")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--staff", type=int, default=25)
+    parser.add_argument("--per-day", type=int, default=17)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--duration", type=int, default=45, help="Requested service duration (minutes)")
+    parser.add_argument("--step", type=int, default=15, help="Slot grid step (minutes)")
+    args = parser.parse_args()
+    asyncio.run(main(args.staff, args.per_day, args.days, args.duration, args.step))
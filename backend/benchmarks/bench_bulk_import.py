@@ -0,0 +1,91 @@
+# benchmarks/bench_bulk_import.py
+#
+# Toplu randevu içe aktarma verimini 10k, 100k ve 1M satırda ölçer ve
+# satır satır create_appointment ile karşılaştırır. Satırların ~%1'i bilerek
+# çakışmalı üretilir (hata raporlamasını da ölçüme katmak için).
+#
+#   python -m benchmarks.bench_bulk_import [--sizes 10000 100000 1000000] [--batch-size 100000]
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import timedelta
+
+from benchmarks._common import MONTH_START, create_engine_with_schema, seed_company, session_factory
+from app.crud.crud_appointment import bulk_create_appointments, create_appointment
+from app.schemas.appointment import AppointmentCreate, AppointmentServiceSchema
+
+
+def generate_rows(rng: random.Random, company, users, services, count: int, conflict_ratio: float = 0.01):
+    """
+    Her çalışan için ardışık 30 dakikalık randevular üretir; bir kısmı bir öncekiyle çakışır.
+    """
+    cursors = {user.id: MONTH_START for user in users}
+    rows = []
+    for i in range(count):
+        user = users[i % len(users)]
+        start = cursors[user.id]
+        if rows and rng.random() < conflict_ratio:
+            start -= timedelta(minutes=15) # Bir önceki randevuyla çakıştır
+        end = start + timedelta(minutes=30)
+        cursors[user.id] = end
+        service = services[i % len(services)]
+        rows.append(AppointmentCreate(
+            user_id=user.id, company_id=company.id, appointment_time=start, end_time=end,
+            services=[AppointmentServiceSchema(company_service_id=service.id, price_at_booking=float(service.price))],
+        ))
+    return rows
+
+
+async def run_size(size: int, batch_size: int, staff: int):
+    engine = await create_engine_with_schema()
+    Session = session_factory(engine)
+    async with Session() as session:
+        company, users, services = await seed_company(session, staff_count=staff)
+    rows = generate_rows(random.Random(size), company, users, services, size)
+
+    created = rejected = 0
+    started = time.perf_counter()
+    for offset in range(0, size, batch_size):
+        async with Session() as session:
+            result = await bulk_create_appointments(session, rows[offset:offset + batch_size])
+        created += result.created_count
+        rejected += len(result.errors)
+    elapsed = time.perf_counter() - started
+    await engine.dispose()
+    return created, rejected, elapsed
+
+
+async def run_row_by_row(sample: int, staff: int):
+    engine = await create_engine_with_schema()
+    Session = session_factory(engine)
+    async with Session() as session:
+        company, users, services = await seed_company(session, staff_count=staff)
+    rows = generate_rows(random.Random(0), company, users, services, sample, conflict_ratio=0.0)
+    started = time.perf_counter()
+    for row in rows:
+        async with Session() as session:
+            await create_appointment(session, row)
+    elapsed = time.perf_counter() - started
+    await engine.dispose()
+    return elapsed
+
+
+async def main(sizes, batch_size: int, staff: int, row_sample: int):
+    per_row = await run_row_by_row(row_sample, staff) / row_sample
+    print(f"row-by-row create_appointment: {1 / per_row:10.0f} rows/s ({row_sample} row sample)")
+    for size in sizes:
+        created, rejected, elapsed = await run_size(size, batch_size, staff)
+        print(f"bulk {size:>9,d} rows: {elapsed:8.2f} s, {size / elapsed:10.0f} rows/s, "
+              f"{created} created, {rejected} rejected (row-by-row estimate: {per_row * size:8.1f} s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--batch-size", type=int, default=100_000, help="Rows per bulk_create_appointments call")
+    parser.add_argument("--staff", type=int, default=200)
+    parser.add_argument("--row-sample", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.batch_size, args.staff, args.row_sample))
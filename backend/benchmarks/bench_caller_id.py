@@ -0,0 +1,228 @@
+# benchmarks/bench_caller_id.py
+#
+# Gelen çağrı numara çözümlemesini ölçer (varsayılan: 10k şirket, 200k kullanıcı).
+#   1. normalize_phone: farklı yazımların aynı E.164 numaraya inmesi ve çağrı başına maliyeti.
+#   2. Numara dizininin yüklenme süresi ve bellek kullanımı.
+#   3. resolve_call gecikmesi p50/p99 ve çağrı başına veritabanı gidiş-dönüşü (beklenen: 0);
+#      karşılaştırma: phone_e164 indeksleriyle her çağrıda iki sorgu ve indekssiz phone sütunu taraması.
+#   4. create/update/delete_company ve create/update/delete_user sonrası dizinin sorgusuz güncel kalması.
+# Normalleştirme tablosu veya senkronizasyon kontrolleri başarısızsa çıkış kodu 1.
+#
+#   python -m benchmarks.bench_caller_id [--companies 10000] [--users 200000] [--calls 20000]
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+import tracemalloc
+from uuid import uuid4
+
+from sqlalchemy import text
+from sqlalchemy.future import select
+
+from benchmarks._common import StatementCounter, bulk_insert, create_engine_with_schema, percentile, session_factory
+from app.bussines_logics.caller_id import CallerIdDirectory
+from app.crud.crud_caller_id import caller_directory, load_caller_directory, normalize_phone_number, resolve_call
+from app.crud.crud_company import create_company, delete_company, update_company
+from app.crud.crud_user import create_user, delete_user, update_user
+from app.models.company import Company
+from app.models.user import User
+from app.schemas.company import CompanyCreate, CompanyUpdate
+from app.schemas.user import UserCreate, UserUpdate
+
+NORMALIZATION_CASES = [
+    ("+90 555 123 45 67", "+905551234567"),
+    ("0555 123 45 67", "+905551234567"),
+    ("(0555) 123-45-67", "+905551234567"),
+    ("5551234567", "+905551234567"),
+    ("905551234567", "+905551234567"),
+    ("00905551234567", "+905551234567"),
+    ("sip:+905551234567@pbx.example.com", "+905551234567"),
+    ("tel:+90-212-123-45-67;ext=12", "+902121234567"),
+    ("0212 123 45 67 ext. 204", "+902121234567"),
+    ("+44 20 7946 0958", "+442079460958"),
+    ("+1 (415) 555-0100", "+14155550100"),
+    ("anonymous", None),
+    ("", None),
+    ("123", None),
+]
+
+
+def national_number(rng: random.Random, mobile: bool) -> str:
+    prefix = rng.choice(("532", "533", "542", "555", "505")) if mobile else rng.choice(("212", "216", "312", "232"))
+    return prefix + f"{rng.randrange(10 ** 7):07d}"
+
+
+def spoken_format(rng: random.Random, number: str) -> str:
+    # Ağ geçitlerinin ve formların ürettiği farklı yazımlar
+    style = rng.randrange(5)
+    if style == 0:
+        return "+90" + number
+    if style == 1:
+        return "0" + number
+    if style == 2:
+        return f"+90 ({number[:3]}) {number[3:6]}-{number[6:8]}-{number[8:]}"
+    if style == 3:
+        return f"sip:90{number}@gw.example.com"
+    return number
+
+
+def check_normalization() -> bool:
+    ok = True
+    for raw, expected in NORMALIZATION_CASES:
+        actual = normalize_phone_number(raw)
+        if actual != expected:
+            print(f"  normalize_phone({raw!r}) = {actual!r}, expected {expected!r}")
+            ok = False
+    samples = [spoken_format(random.Random(index), "5551234567") for index in range(10000)]
+    started = time.perf_counter()
+    for raw in samples:
+        normalize_phone_number(raw)
+    elapsed = time.perf_counter() - started
+    print(f"normalize    {len(NORMALIZATION_CASES)} cases {'ok' if ok else 'FAILED'}  {elapsed / len(samples) * 1e6:.2f} us/number")
+    return ok
+
+
+async def seed(Session, rng: random.Random, companies: int, users: int):
+    company_numbers = rng.sample(range(10 ** 7), companies)
+    company_rows = []
+    for index, suffix in enumerate(company_numbers):
+        national = "212" + f"{suffix:07d}"
+        company_rows.append({
+            "name": f"Company {index}", "email": f"company{index}@example.com", "is_active": index % 50 != 0,
+            "phone": spoken_format(rng, national), "phone_e164": "+90" + national
+        })
+    user_rows = []
+    for index in range(users):
+        national = national_number(rng, mobile=True)
+        user_id = uuid4()
+        user_rows.append({
+            "id": user_id, "name": f"User {index}", "email": f"user{index}@example.com", "company_id": rng.randrange(companies) + 1,
+            "role": "employee", "is_active": index % 40 != 0, "phone": spoken_format(rng, national), "phone_e164": "+90" + national
+        })
+    async with Session() as session:
+        await bulk_insert(session, Company, company_rows)
+        await bulk_insert(session, User, user_rows)
+        await session.commit()
+    return company_rows, user_rows
+
+
+async def measure(engine, Session, rng: random.Random, company_rows, user_rows, calls: int) -> None:
+    async with Session() as session:
+        started = time.perf_counter()
+        await load_caller_directory(session)
+        load = time.perf_counter() - started
+        companies = (await session.execute(select(Company.id, Company.phone_e164).filter(Company.is_active.is_(True)))).all()
+        users = (await session.execute(select(User.id, User.company_id, User.phone_e164).filter(User.is_active.is_(True)))).all()
+    # Bellek: aynı satırlardan ikinci bir dizin kurulur; satırların kendisi ölçüme dahil edilmez
+    tracemalloc.start()
+    directory = CallerIdDirectory()
+    directory.load(companies, users, loaded_at=0.0)
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(
+        f"load         {len(caller_directory)} numbers in {load * 1000:.0f} ms (query + build)  "
+        f"{held / 2 ** 20:.1f} MiB held ({held / len(directory):.0f} B/number)"
+    )
+
+    workload = []
+    for _ in range(calls):
+        company = rng.choice(company_rows)
+        user = rng.choice(user_rows) if rng.random() < 0.7 else None
+        caller = spoken_format(rng, user["phone_e164"][3:]) if user else spoken_format(rng, national_number(rng, mobile=True))
+        workload.append((spoken_format(rng, company["phone_e164"][3:]), caller))
+
+    latencies, resolved = [], 0
+    async with Session() as session:
+        with StatementCounter(engine) as counter:
+            for dialed, caller in workload:
+                started = time.perf_counter()
+                result = await resolve_call(session, dialed, caller)
+                latencies.append(time.perf_counter() - started)
+                resolved += result.company_id is not None
+        round_trips = counter.round_trips
+    print(
+        f"directory    {calls} calls  p50 {percentile(latencies, 50) * 1e6:6.1f} us  p99 {percentile(latencies, 99) * 1e6:6.1f} us  "
+        f"round trips {round_trips}  companies resolved {resolved / calls:.3f}"
+    )
+
+    async with Session() as session:
+        plan = await session.execute(text("EXPLAIN QUERY PLAN SELECT id FROM users WHERE phone_e164 = '+905551234567'"))
+        print(f"query plan   {' / '.join(row[-1] for row in plan)}")
+        latencies = []
+        for dialed, caller in workload[:min(calls, 5000)]:
+            started = time.perf_counter()
+            dialed_number, caller_number = normalize_phone_number(dialed), normalize_phone_number(caller)
+            await session.execute(select(Company.id).filter(Company.phone_e164 == dialed_number, Company.is_active.is_(True)))
+            await session.execute(select(User.id, User.company_id).filter(User.phone_e164 == caller_number, User.is_active.is_(True)))
+            latencies.append(time.perf_counter() - started)
+        print(f"indexed DB   {len(latencies)} calls  p50 {percentile(latencies, 50) * 1e6:6.1f} us  p99 {percentile(latencies, 99) * 1e6:6.1f} us  round trips 2/call")
+        latencies = []
+        for dialed, caller in workload[:200]:
+            started = time.perf_counter()
+            await session.execute(select(Company.id).filter(Company.phone == dialed))
+            await session.execute(select(User.id).filter(User.phone == caller))
+            latencies.append(time.perf_counter() - started)
+        print(f"raw phone    {len(latencies)} calls  p50 {percentile(latencies, 50) * 1e6:6.1f} us  p99 {percentile(latencies, 99) * 1e6:6.1f} us  (full scan, exact spelling only)")
+
+
+async def check_sync(engine, Session) -> bool:
+    ok = True
+    async with Session() as session:
+        company = await create_company(session, CompanyCreate(name="Caller Salon", phone="0 216 555 00 11"))
+        user = await create_user(
+            session, UserCreate(name="Caller", email="caller@example.com", password="benchmark-pass", phone="+90 (532) 999 88 77", company_id=company.id),
+            supabase_user_id=uuid4()
+        )
+        with StatementCounter(engine) as counter:
+            result = await resolve_call(session, "+902165550011", "05329998877")
+            ok &= (result.company_id, result.user_id, result.user_company_id) == (company.id, user.id, company.id)
+
+            await update_company(session, company, CompanyUpdate(phone="+90 216 555 00 22"))
+            await update_user(session, user, UserUpdate(phone="0532 111 22 33"))
+            counter.statements.clear()
+            counter.commits = 0
+            old = await resolve_call(session, "02165550011", "05329998877")
+            new = await resolve_call(session, "02165550022", "05321112233")
+            ok &= (old.company_id, old.user_id) == (None, None)
+            ok &= (new.company_id, new.user_id) == (company.id, user.id)
+
+            await update_company(session, company, CompanyUpdate(is_active=False))
+            await update_user(session, user, UserUpdate(is_active=False))
+            counter.statements.clear()
+            counter.commits = 0
+            inactive = await resolve_call(session, "02165550022", "05321112233")
+            ok &= (inactive.company_id, inactive.user_id) == (None, None)
+
+            await update_user(session, user, UserUpdate(is_active=True))
+            await delete_user(session, user)
+            await delete_company(session, company)
+            counter.statements.clear()
+            counter.commits = 0
+            deleted = await resolve_call(session, "02165550022", "05321112233")
+            ok &= (deleted.company_id, deleted.user_id) == (None, None)
+            ok &= counter.round_trips == 0
+    print(f"CRUD create / update / deactivate / delete reflected without queries: {ok}")
+    return ok
+
+
+async def main(companies: int, users: int, calls: int) -> int:
+    ok = check_normalization()
+    rng = random.Random(11)
+    engine = await create_engine_with_schema()
+    Session = session_factory(engine)
+    company_rows, user_rows = await seed(Session, rng, companies, users)
+    await measure(engine, Session, rng, company_rows, user_rows, calls)
+    ok &= await check_sync(engine, Session)
+    await engine.dispose()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--companies", type=int, default=10000)
+    parser.add_argument("--users", type=int, default=200000)
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.companies, args.users, args.calls)))
@@ -0,0 +1,110 @@
+# benchmarks/bench_export.py
+#
+# Randevu dışa aktarmasının (stream_appointment_export + CSV/NDJSON kodlama) bellek profilini ölçer.
+# Veritabanı bellek kullanımını ölçümden ayırmak için geçici dosya tabanlı SQLite kullanılır.
+# Dışa aktarma ilerledikçe süreç RSS değeri örneklenir; RSS, ilk parçadan sonraki değere göre
+# --max-growth-mb'den fazla artarsa (bellek satır sayısıyla büyüyorsa) çıkış kodu 1'dir.
+#
+#   python -m benchmarks.bench_export [--rows 1000000] [--format csv|ndjson]
+#   python -m benchmarks.bench_export --rows 5000000
+
+import argparse
+import asyncio
+import os
+import resource
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from uuid import uuid4
+
+from benchmarks._common import MONTH_START, bulk_insert, create_engine_with_schema, seed_company, session_factory
+from app.bussines_logics.appointment_export import EXPORT_FORMATS
+from app.crud.crud_appointment import stream_appointment_export
+from app.models.appointment import Appointment
+from app.models.appointment_service import AppointmentService
+
+
+def rss_mb() -> float:
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * resource.getpagesize() / 2**20
+
+
+async def seed(Session, rows: int):
+    async with Session() as session:
+        company, users, services = await seed_company(session, staff_count=50, service_count=6)
+        appointments, links = [], []
+        for i in range(rows):
+            start = MONTH_START + timedelta(minutes=15 * (i // len(users)))
+            appointment_id = uuid4()
+            appointments.append({
+                "id": appointment_id, "user_id": users[i % len(users)].id, "company_id": company.id,
+                "appointment_time": start, "end_time": start + timedelta(minutes=15), "status": "completed",
+            })
+            for service in (services[i % 6], services[(i + 1) % 6]):
+                links.append({"appointment_id": appointment_id, "company_service_id": service.id, "quantity": 1, "price_at_booking": service.price})
+            if len(appointments) == 50_000:
+                await bulk_insert(session, Appointment, appointments)
+                await bulk_insert(session, AppointmentService, links)
+                appointments.clear()
+                links.clear()
+        await bulk_insert(session, Appointment, appointments)
+        await bulk_insert(session, AppointmentService, links)
+        await session.commit()
+
+
+async def main(rows: int, export_format: str, batch_size: int, max_growth_mb: float) -> int:
+    with tempfile.TemporaryDirectory() as directory:
+        engine = await create_engine_with_schema(f"sqlite+aiosqlite:///{os.path.join(directory, 'export.db')}")
+        Session = session_factory(engine)
+        started = time.perf_counter()
+        await seed(Session, rows)
+        print(f"Seeded {rows:,d} appointments in {time.perf_counter() - started:.0f}s; exporting as {export_format}, batch {batch_size}")
+
+        encode, _ = EXPORT_FORMATS[export_format]
+        exported_rows = 0
+        exported_bytes = 0
+        samples = []
+        next_sample = 0
+        started = time.perf_counter()
+        with open(os.devnull, "wb") as sink:
+            async with Session() as session:
+                async def counted():
+                    nonlocal exported_rows
+                    async for batch in stream_appointment_export(session, batch_size=batch_size):
+                        exported_rows += len(batch)
+                        yield batch
+
+                async for chunk in encode(counted()):
+                    sink.write(chunk)
+                    exported_bytes += len(chunk)
+                    if exported_rows >= next_sample:
+                        samples.append((exported_rows, rss_mb()))
+                        next_sample += max(rows // 10, 1)
+        elapsed = time.perf_counter() - started
+        samples.append((exported_rows, rss_mb()))
+        await engine.dispose()
+
+    print(f"{'rows exported':>14} {'RSS MB':>8}")
+    for count, rss in samples:
+        print(f"{count:>14,d} {rss:8.1f}")
+    growth = max(rss for _, rss in samples) - samples[0][1]
+    print(f"{exported_rows:,d} rows, {exported_bytes / 2**20:.0f} MiB in {elapsed:.1f}s ({exported_rows / elapsed:,.0f} rows/s); RSS growth {growth:.1f} MB")
+    if exported_rows != rows:
+        print(f"FAIL: exported {exported_rows} of {rows} rows")
+        return 1
+    if growth > max_growth_mb:
+        print(f"FAIL: memory grew by more than {max_growth_mb} MB during the export")
+        return 1
+    print("OK: flat memory profile")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="csv")
+    parser.add_argument("--batch-size", type=int, default=2000)
+    parser.add_argument("--max-growth-mb", type=float, default=32.0)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.rows, args.format, args.batch_size, args.max_growth_mb)))
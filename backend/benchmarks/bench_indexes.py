@@ -0,0 +1,158 @@
+# benchmarks/bench_indexes.py
+#
+# Randevu tablosunun sıcak yol sorgularını büyük bir veri setinde, indeksler olmadan ve
+# 0001_appointment_time_indexes migration'ındaki indekslerle çalıştırır; her sorgu için
+# sorgu planını ve gecikmeyi yazdırır.
+#
+#   python -m benchmarks.bench_indexes [--rows 500000] [--staff 200] [--repeats 20]
+#
+# DATABASE_URL bir PostgreSQL adresi ise (boş bir veritabanı) planlar EXPLAIN ile alınır.
+
+import argparse
+import asyncio
+import os
+import random
+import time
+from datetime import timedelta
+from uuid import uuid4
+
+from sqlalchemy import event, text
+
+from benchmarks._common import MONTH_START, bulk_insert, create_engine_with_schema, percentile, seed_company, session_factory
+from app.crud.crud_appointment import check_appointment_conflict, get_appointments, get_busy_intervals
+from app.models.appointment import Appointment
+from app.models.appointment_service import AppointmentService
+
+INDEXED_TABLES = (Appointment.__table__, AppointmentService.__table__)
+
+
+class MainStatement:
+    """
+    reset() sonrası motorda çalıştırılan ilk SELECT ifadesini ve parametrelerini yakalar (plan almak için).
+    İlişki yüklemeleri (selectinload) gibi sonraki ifadeler yok sayılır.
+    """
+
+    def __init__(self, engine):
+        self.statement = None
+        self.parameters = None
+        event.listen(engine.sync_engine, "before_cursor_execute", self._capture)
+
+    def reset(self):
+        self.statement = None
+        self.parameters = None
+
+    def _capture(self, conn, cursor, statement, parameters, context, executemany):
+        if self.statement is None and statement.lstrip().upper().startswith("SELECT"):
+            self.statement, self.parameters = statement, parameters
+
+
+async def seed(Session, rows: int, staff: int):
+    rng = random.Random(7)
+    async with Session() as session:
+        company, users, _ = await seed_company(session, staff_count=staff)
+        # Gürültü: aynı tabloda başka şirketlerin randevuları
+        other, other_users, _ = await seed_company(session, staff_count=staff, name="Other Salon")
+        batch = []
+        per_user_slots = rows // (2 * staff)
+        for owner_company, owners in ((company, users), (other, other_users)):
+            for user in owners:
+                for slot in range(per_user_slots):
+                    start = MONTH_START + timedelta(minutes=30 * slot)
+                    batch.append({
+                        "id": uuid4(), "user_id": user.id, "company_id": owner_company.id,
+                        "appointment_time": start, "end_time": start + timedelta(minutes=30),
+                        "status": "cancelled" if rng.random() < 0.1 else "scheduled",
+                    })
+                    if len(batch) == 50_000:
+                        await bulk_insert(session, Appointment, batch)
+                        batch.clear()
+        await bulk_insert(session, Appointment, batch)
+        await session.commit()
+    horizon = MONTH_START + timedelta(minutes=30 * per_user_slots)
+    return company, users, horizon
+
+
+def workload(company, users, horizon):
+    rng = random.Random(11)
+
+    def random_time():
+        return MONTH_START + (horizon - MONTH_START) * rng.random()
+
+    def conflict(session):
+        start = random_time()
+        return check_appointment_conflict(session, rng.choice(users).id, start, start + timedelta(minutes=45))
+
+    def company_range(session):
+        start = random_time()
+        return get_appointments(session, company_id=company.id, start_date=start, end_date=start + timedelta(days=1), limit=100)
+
+    def user_range(session):
+        start = random_time()
+        return get_appointments(session, user_id=rng.choice(users).id, start_date=start, end_date=start + timedelta(days=7), limit=100)
+
+    def busy_day(session):
+        start = random_time()
+        return get_busy_intervals(session, start, start + timedelta(days=1), user_id=rng.choice(users).id)
+
+    return {
+        "check_appointment_conflict": conflict,
+        "get_appointments(company, 1 day)": company_range,
+        "get_appointments(user, 7 days)": user_range,
+        "get_busy_intervals(user, 1 day)": busy_day,
+    }
+
+
+async def explain(engine, captured: MainStatement) -> str:
+    async with engine.connect() as conn:
+        if engine.dialect.name == "sqlite":
+            rows = await conn.exec_driver_sql("EXPLAIN QUERY PLAN " + captured.statement, captured.parameters)
+            return "; ".join(row[-1] for row in rows)
+        rows = await conn.exec_driver_sql("EXPLAIN " + captured.statement, captured.parameters)
+        return "; ".join(row[0].strip() for row in rows)
+
+
+async def run_workload(Session, engine, captured, queries, repeats: int):
+    for label, query in queries.items():
+        samples = []
+        for _ in range(repeats):
+            captured.reset()
+            async with Session() as session:
+                started = time.perf_counter()
+                await query(session)
+                samples.append(time.perf_counter() - started)
+        plan = await explain(engine, captured)
+        print(f"  {label:34s} p50 {percentile(samples, 50) * 1000:8.2f} ms   p99 {percentile(samples, 99) * 1000:8.2f} ms")
+        print(f"  {'':34s} plan: {plan}")
+
+
+async def main(rows: int, staff: int, repeats: int):
+    engine = await create_engine_with_schema(os.environ.get("DATABASE_URL", "sqlite+aiosqlite://"))
+    Session = session_factory(engine)
+    captured = MainStatement(engine)
+
+    indexes = [index for table in INDEXED_TABLES for index in table.indexes]
+    async with engine.begin() as conn:
+        for index in indexes:
+            await conn.run_sync(lambda sync_conn: index.drop(sync_conn))
+    company, users, horizon = await seed(Session, rows, staff)
+    print(f"Seeded {rows:,d} appointments for {2 * staff} staff (~10% cancelled)")
+
+    print("without indexes:")
+    await run_workload(Session, engine, captured, workload(company, users, horizon), repeats)
+
+    async with engine.begin() as conn:
+        for index in indexes:
+            await conn.run_sync(lambda sync_conn: index.create(sync_conn))
+        await conn.execute(text("ANALYZE"))
+    print("with 0001_appointment_time_indexes:")
+    await run_workload(Session, engine, captured, workload(company, users, horizon), repeats)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--staff", type=int, default=200)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.staff, args.repeats))
@@ -0,0 +1,114 @@
+# benchmarks/bench_logging.py
+#
+# Loglama kapalıyken, handler'lar doğrudan (senkron) çalışırken ve kuyruk arkasında
+# (QueueListener + DEBUG örnekleme) çalışırken istek hızını karşılaştırır.
+# Log dosyaları geçici bir dizine yazılır. --slow-disk-ms ile her dosya yazımına gecikme eklenerek
+# yavaş disk / ağ dosya sistemi taklit edilir; senkron handler'lar bu gecikmeyi event loop'ta öder.
+#
+#   python -m benchmarks.bench_logging [--requests 2000] [--concurrency 20] [--slow-disk-ms 0]
+
+import os
+import tempfile
+
+os.environ.setdefault("LOG_DIR", tempfile.mkdtemp(prefix="bench-logs-"))
+
+import argparse
+import asyncio
+import copy
+import logging
+import time
+
+import httpx
+from jose import jwt
+
+from benchmarks._common import create_engine_with_schema, percentile, seed_company, session_factory
+from app.core.config import get_settings
+from app.core.database.database import get_db
+from app.core.logging_config import LOG_DIR, LOGGING_CONFIG, setup_logging, shutdown_logging
+
+
+class SlowDisk(logging.Filter):
+    """
+    Dosya handler'ına takılan ve her kayıtta bekleyerek yavaş depolamayı taklit eden filtre.
+    """
+
+    def __init__(self, delay_ms: float):
+        super().__init__()
+        self.delay = delay_ms / 1000
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        time.sleep(self.delay)
+        return True
+
+
+def logging_config(slow_disk_ms: float) -> dict:
+    config = copy.deepcopy(LOGGING_CONFIG)
+    if slow_disk_ms > 0:
+        config.setdefault("filters", {})["slow_disk"] = {"()": SlowDisk, "delay_ms": slow_disk_ms}
+        config["handlers"]["file"]["filters"] = ["slow_disk"]
+    return config
+
+
+async def run_requests(client: httpx.AsyncClient, token: str, count: int, concurrency: int):
+    samples = []
+    semaphore = asyncio.Semaphore(concurrency)
+    paths = ("/api/v1/auth/me", "/api/v1/appointments?limit=20")
+
+    async def one(index: int):
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.get(paths[index % len(paths)], headers={"Authorization": f"Bearer {token}"})
+            samples.append(time.perf_counter() - started)
+            response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(count)))
+    return count / (time.perf_counter() - started), samples
+
+
+async def main(request_count: int, concurrency: int, slow_disk_ms: float):
+    from app.main import app
+    engine = await create_engine_with_schema()
+    Session = session_factory(engine)
+    async with Session() as session:
+        _, users, _ = await seed_company(session, staff_count=1, service_count=1)
+
+    async def override_get_db():
+        async with Session() as session:
+            yield session
+    app.dependency_overrides[get_db] = override_get_db
+
+    settings = get_settings()
+    token = jwt.encode(
+        {"sub": str(users[0].id), "aud": "authenticated", "exp": int(time.time()) + 3600},
+        settings.JWT_SECRET_KEY, algorithm=settings.ALGORITHM
+    )
+
+    config = logging_config(slow_disk_ms)
+    modes = {
+        "off": lambda: logging.disable(logging.CRITICAL),
+        "sync handlers": lambda: setup_logging(config, queued=False),
+        "queued": lambda: setup_logging(config, queued=True),
+    }
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        for label, configure in modes.items():
+            logging.disable(logging.NOTSET)
+            configure()
+            await run_requests(client, token, 100, concurrency)  # Isınma
+            throughput, samples = await run_requests(client, token, request_count, concurrency)
+            shutdown_logging()
+            print(f"logging {label:14s} {throughput:8.0f} req/s   p50: {percentile(samples, 50) * 1000:6.2f} ms   "
+                  f"p99: {percentile(samples, 99) * 1000:6.2f} ms")
+
+    await engine.dispose()
+    print(f"log files written to {LOG_DIR}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--slow-disk-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.slow_disk_ms))
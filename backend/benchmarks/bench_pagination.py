@@ -0,0 +1,81 @@
+# benchmarks/bench_pagination.py
+#
+# Milyon satırlık randevu tablosunda OFFSET ve keyset (cursor) sayfalamanın
+# sayfa başına gecikmesini farklı derinliklerde karşılaştırır.
+# Keyset sorgusu modelde tanımlı (appointment_time, id) indeksini kullanır.
+#
+#   python -m benchmarks.bench_pagination [--rows 1000000] [--page-size 100]
+
+import argparse
+import asyncio
+import time
+from datetime import timedelta
+from uuid import uuid4
+
+from sqlalchemy import select
+
+from benchmarks._common import MONTH_START, bulk_insert, create_engine_with_schema, seed_company, session_factory
+from app.core.pagination import cursor_for
+from app.crud.crud_appointment import APPOINTMENT_KEYSET, get_appointments
+from app.models.appointment import Appointment
+
+
+async def time_page(Session, repeats: int, **kwargs) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        async with Session() as session:
+            started = time.perf_counter()
+            page = await get_appointments(session, **kwargs)
+            best = min(best, time.perf_counter() - started)
+        assert page, "empty page"
+    return best
+
+
+async def main(rows: int, page_size: int, repeats: int):
+    engine = await create_engine_with_schema()
+    Session = session_factory(engine)
+    async with Session() as session:
+        company, users, _ = await seed_company(session, staff_count=50)
+        batch = []
+        for i in range(rows):
+            start = MONTH_START + timedelta(minutes=15 * (i // len(users)))
+            batch.append({
+                "id": uuid4(), "user_id": users[i % len(users)].id, "company_id": company.id,
+                "appointment_time": start, "end_time": start + timedelta(minutes=15), "status": "scheduled",
+            })
+            if len(batch) == 50_000:
+                await bulk_insert(session, Appointment, batch)
+                batch.clear()
+        await bulk_insert(session, Appointment, batch)
+        await session.commit()
+    print(f"Seeded {rows:,d} appointments, page size {page_size}")
+    print(f"{'depth (rows)':>14} {'offset ms':>10} {'cursor ms':>10}")
+
+    depth = 0
+    depths = []
+    while depth < rows - page_size:
+        depths.append(depth)
+        depth = depth * 10 if depth else page_size
+    depths.append(rows - page_size)
+
+    for depth in depths:
+        offset_s = await time_page(Session, repeats, skip=depth, limit=page_size)
+        cursor = None
+        if depth:
+            async with Session() as session:
+                previous = (await session.execute(
+                    select(Appointment).order_by(*APPOINTMENT_KEYSET).offset(depth - 1).limit(1)
+                )).scalars().one()
+                cursor = cursor_for(previous, APPOINTMENT_KEYSET)
+        cursor_s = await time_page(Session, repeats, cursor=cursor, limit=page_size)
+        print(f"{depth:>14,d} {offset_s * 1000:10.2f} {cursor_s * 1000:10.2f}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.page_size, args.repeats))
@@ -0,0 +1,59 @@
+# benchmarks/bench_pool_starvation.py
+#
+# Bağlantı havuzu metriklerinin, havuz tükenmesini (bağlantı beklemek) yavaş sorgulardan
+# ayırt edebildiğini gösterir. Aynı iş yükü iki senaryoda çalıştırılır:
+#   starved:      küçük havuz, çok sayıda eşzamanlı kısa istek -> bekleme süresi yüksek
+#   slow queries: yeterli havuz, her istek bağlantıyı uzun tutar -> bekleme süresi düşük
+#
+#   python -m benchmarks.bench_pool_starvation [--requests 200] [--hold-ms 20]
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from benchmarks._common import percentile
+from app.core.database.pool import InstrumentedAsyncQueuePool
+
+
+async def run_scenario(label: str, pool_size: int, max_overflow: int, requests: int, hold_ms: float):
+    path = os.path.join(tempfile.mkdtemp(), "pool.db")
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{path}",
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=30,
+    )
+    latencies = []
+
+    async def one_request():
+        started = time.perf_counter()
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await asyncio.sleep(hold_ms / 1000)  # Bağlantıyı tutan sorgu süresi
+        latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(one_request() for _ in range(requests)))
+    metrics = engine.pool.metrics()
+    await engine.dispose()
+    print(f"{label:13s} pool={pool_size}+{max_overflow:<3d} request p99: {percentile(latencies, 99) * 1000:8.1f} ms   "
+          f"wait p99: {metrics['wait_ms_p99']:8.1f} ms   exhausted_waits: {metrics['exhausted_waits']:4d}   "
+          f"overflow_high_water: {metrics['overflow_high_water']}")
+
+
+async def main(requests: int, hold_ms: float):
+    await run_scenario("starved", pool_size=2, max_overflow=0, requests=requests, hold_ms=hold_ms)
+    await run_scenario("slow queries", pool_size=requests, max_overflow=0, requests=requests, hold_ms=hold_ms * 10)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--hold-ms", type=float, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.hold_ms))
@@ -0,0 +1,113 @@
+# benchmarks/bench_response_encoding.py
+#
+# 1.000 randevuluk bir liste sayfasını (kullanıcı ve hizmetleriyle) JSON'a çevirmenin CPU süresini karşılaştırır:
+#   - before: FastAPI'nin varsayılan yolu (response_model doğrulaması + jsonable_encoder + json.dumps)
+#   - after:  önceden oluşturulmuş TypeAdapter ile tek adımda doğrulama ve JSON üretimi (adapter_response)
+# Ardından aynı gövdenin gzip ve (kuruluysa) brotli ile sıkıştırılma süresi ve boyutu raporlanır.
+#
+#   python -m benchmarks.bench_response_encoding [--page-size 1000] [--repeats 20]
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import timedelta
+from uuid import uuid4
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from benchmarks._common import MONTH_START, bulk_insert, create_engine_with_schema, seed_company, session_factory
+from app.api.endpoints.v1.appointments import APPOINTMENT_PAGE_ADAPTER, _project
+from app.core.compression import _BrotliEncoder, _GzipEncoder, brotli
+from app.core.responses import adapter_response
+from app.crud.crud_appointment import get_appointments
+from app.models.appointment import Appointment
+from app.models.appointment_service import AppointmentService
+from app.schemas.appointment import AppointmentRead
+from app.schemas.common import CursorPage
+
+
+def cpu_ms(repeats: int, func) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.process_time()
+        func()
+        best = min(best, time.process_time() - started)
+    return best * 1000
+
+
+async def cpu_ms_async(repeats: int, func) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.process_time()
+        await func()
+        best = min(best, time.process_time() - started)
+    return best * 1000
+
+
+async def main(page_size: int, repeats: int):
+    engine = await create_engine_with_schema()
+    Session = session_factory(engine)
+    async with Session() as session:
+        company, users, services = await seed_company(session, staff_count=20, service_count=5)
+        appointments, links = [], []
+        for i in range(page_size):
+            start = MONTH_START + timedelta(minutes=30 * (i // len(users)))
+            appointment_id = uuid4()
+            appointments.append({
+                "id": appointment_id, "user_id": users[i % len(users)].id, "company_id": company.id,
+                "appointment_time": start, "end_time": start + timedelta(minutes=30), "status": "scheduled",
+                "notes": "Benchmark appointment",
+            })
+            links.extend(
+                {"appointment_id": appointment_id, "company_service_id": service.id, "quantity": 1, "price_at_booking": service.price}
+                for service in services[:3]
+            )
+        await bulk_insert(session, Appointment, appointments)
+        await bulk_insert(session, AppointmentService, links)
+        await session.commit()
+
+    async with Session() as session:
+        page = await get_appointments(session, limit=page_size)
+    await engine.dispose()
+
+    legacy_field = create_response_field(name="Response", type_=CursorPage[AppointmentRead])
+
+    async def before():
+        content = await serialize_response(field=legacy_field, response_content=CursorPage[AppointmentRead](items=page))
+        return JSONResponse(content).body
+
+    def after():
+        converted = {}
+        items = [_project(appointment, None, None, converted) for appointment in page]
+        return adapter_response(APPOINTMENT_PAGE_ADAPTER, {"items": items, "next_cursor": None}, exclude_unset=True).body
+
+    before_body = await before()
+    after_body = after()
+    assert json.loads(before_body) == json.loads(after_body), "encoded pages differ"
+
+    before_ms = await cpu_ms_async(repeats, before)
+    after_ms = cpu_ms(repeats, after)
+    print(f"Page of {page_size} appointments ({len(after_body) / 1024:.0f} KiB JSON), best CPU time of {repeats}")
+    print(f"{'before (jsonable_encoder)':28s} {before_ms:8.2f} ms")
+    print(f"{'after (TypeAdapter)':28s} {after_ms:8.2f} ms   ({before_ms / after_ms:.1f}x)")
+
+    encoders = {"gzip level 6": lambda: _GzipEncoder(6)}
+    if brotli is not None:
+        encoders["brotli quality 4"] = lambda: _BrotliEncoder(4)
+    for label, make_encoder in encoders.items():
+        compressed = make_encoder().finish(after_body)
+        elapsed = cpu_ms(repeats, lambda: make_encoder().finish(after_body))
+        print(f"{label:28s} {elapsed:8.2f} ms   {len(compressed) / 1024:.0f} KiB ({len(compressed) / len(after_body):.0%})")
+    if brotli is None:
+        print("brotli not installed; only gzip is used")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.page_size, args.repeats))
@@ -0,0 +1,145 @@
+# benchmarks/bench_rollups.py
+#
+# Randevu özet (rollup) tablosunun artımlı güncellemelerinin doğruluğunu ve rapor hızını ölçer.
+#   1. Randevular toplu içe aktarılır, ardından rastgele bir kısmı CRUD fonksiyonlarıyla güncellenir
+#      (zaman, hizmet listesi, durum), iptal edilir veya silinir.
+#   2. Artımlı olarak tutulan özet satırları, rebuild_appointment_rollups'ın sıfırdan hesapladığı
+#      satırlarla karşılaştırılır; fark varsa çıkış kodu 1'dir.
+#   3. Bir aylık şirket raporu için özet tablosunu okumak ile appointments üzerinde anlık toplama karşılaştırılır.
+#
+#   python -m benchmarks.bench_rollups [--appointments 50000] [--changes 500]
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from datetime import timedelta
+
+from sqlalchemy import func, select
+
+from benchmarks._common import MONTH_START, create_engine_with_schema, seed_company, session_factory
+from benchmarks.bench_bulk_import import generate_rows
+from app.crud.crud_appointment import (
+    bulk_create_appointments, cancel_appointment, delete_appointment, get_appointment_by_id, update_appointment
+)
+from app.crud.crud_appointment_rollup import get_appointment_rollups, rebuild_appointment_rollups
+from app.models.appointment import Appointment, AppointmentStatus
+from app.models.appointment_rollup import AppointmentDailyRollup
+from app.models.appointment_service import AppointmentService
+from app.schemas.appointment import AppointmentServiceSchema, AppointmentUpdate
+
+
+async def snapshot(Session):
+    async with Session() as session:
+        rows = (await session.execute(
+            select(
+                AppointmentDailyRollup.company_id, AppointmentDailyRollup.day, AppointmentDailyRollup.status,
+                AppointmentDailyRollup.appointment_count, AppointmentDailyRollup.booked_minutes, AppointmentDailyRollup.revenue
+            )
+        )).all()
+    # Tamamen sıfırlanmış satırlar (ör. tüm randevuları silinen gün) rebuild'de hiç oluşmaz
+    return {tuple(row[:3]): tuple(row[3:]) for row in rows if any(row[3:])}
+
+
+async def apply_changes(Session, rng: random.Random, services, changes: int):
+    async with Session() as session:
+        ids = (await session.execute(select(Appointment.id))).scalars().all()
+    counts = {"time": 0, "services": 0, "status": 0, "cancel": 0, "delete": 0}
+    for appointment_id in rng.sample(ids, min(changes, len(ids))):
+        action = rng.choice(list(counts))
+        async with Session() as session:
+            appointment = await get_appointment_by_id(session, appointment_id)
+            if appointment is None or appointment.status == AppointmentStatus.cancelled.value:
+                continue
+            try:
+                if action == "time":
+                    # Günler arası taşıma; çakışan taşımalar ValueError ile reddedilir ve özeti değiştirmez
+                    shift = timedelta(days=rng.randint(1, 40), hours=-appointment.appointment_time.hour)
+                    await update_appointment(session, appointment, AppointmentUpdate(
+                        appointment_time=appointment.appointment_time + shift, end_time=appointment.end_time + shift
+                    ))
+                elif action == "services":
+                    chosen = rng.sample(services, rng.randint(1, 3))
+                    await update_appointment(session, appointment, AppointmentUpdate(services=[
+                        AppointmentServiceSchema(company_service_id=service.id, quantity=rng.randint(1, 3), price_at_booking=float(service.price) + rng.randint(0, 50))
+                        for service in chosen
+                    ]))
+                elif action == "status":
+                    await update_appointment(session, appointment, AppointmentUpdate(status=AppointmentStatus.completed))
+                elif action == "cancel":
+                    await cancel_appointment(session, appointment)
+                else:
+                    await delete_appointment(session, appointment)
+                counts[action] += 1
+            except ValueError:
+                pass # Çakışma veya geçersiz durum geçişi; özet tablosu değişmemelidir
+    return counts
+
+
+async def main(appointment_count: int, changes: int) -> int:
+    engine = await create_engine_with_schema()
+    Session = session_factory(engine)
+    rng = random.Random(16)
+    async with Session() as session:
+        company, users, services = await seed_company(session, staff_count=100, service_count=8)
+    rows = generate_rows(rng, company, users, services, appointment_count, conflict_ratio=0)
+    started = time.perf_counter()
+    for offset in range(0, len(rows), 10_000):
+        async with Session() as session:
+            await bulk_create_appointments(session, rows[offset:offset + 10_000])
+    print(f"Imported {appointment_count:,d} appointments in {time.perf_counter() - started:.1f}s (rollups maintained)")
+
+    counts = await apply_changes(Session, rng, services, changes)
+    print("Applied changes: " + ", ".join(f"{name}={count}" for name, count in counts.items()))
+
+    incremental = await snapshot(Session)
+    async with Session() as session:
+        started = time.perf_counter()
+        await rebuild_appointment_rollups(session)
+        rebuild_s = time.perf_counter() - started
+    rebuilt = await snapshot(Session)
+    mismatches = [key for key in incremental.keys() | rebuilt.keys() if incremental.get(key) != rebuilt.get(key)]
+    print(f"Rollup rows: incremental={len(incremental)}, rebuilt={len(rebuilt)} (rebuild took {rebuild_s * 1000:.0f} ms), mismatches={len(mismatches)}")
+    for key in sorted(mismatches)[:10]:
+        print(f"  {key}: incremental={incremental.get(key)} rebuilt={rebuilt.get(key)}")
+
+    # Bir aylık rapor: özet tablosu ve anlık toplama
+    start_day = MONTH_START.date()
+    end_day = start_day + timedelta(days=30)
+    async with Session() as session:
+        started = time.perf_counter()
+        report = await get_appointment_rollups(session, company.id, start_day, end_day)
+        rollup_ms = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        revenue = select(
+            AppointmentService.appointment_id,
+            func.sum(AppointmentService.quantity * AppointmentService.price_at_booking).label("revenue")
+        ).group_by(AppointmentService.appointment_id).subquery()
+        live = (await session.execute(
+            select(func.date(Appointment.appointment_time), Appointment.status, func.count(), func.sum(revenue.c.revenue))
+            .outerjoin(revenue, revenue.c.appointment_id == Appointment.id)
+            .filter(
+                Appointment.company_id == company.id,
+                Appointment.appointment_time >= MONTH_START,
+                Appointment.appointment_time < MONTH_START + timedelta(days=31)
+            )
+            .group_by(func.date(Appointment.appointment_time), Appointment.status)
+        )).all()
+        live_ms = (time.perf_counter() - started) * 1000
+    print(f"Monthly report: rollups {rollup_ms:.2f} ms ({len(report)} rows), on-the-fly aggregate {live_ms:.2f} ms ({len(live)} rows)")
+    await engine.dispose()
+
+    if mismatches:
+        print("FAIL: incremental rollups differ from a full rebuild")
+        return 1
+    print("OK: incremental rollups match a full rebuild")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--appointments", type=int, default=50_000)
+    parser.add_argument("--changes", type=int, default=500)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.appointments, args.changes)))
@@ -0,0 +1,58 @@
+# benchmarks/bench_service_catalog.py
+#
+# Hizmet kataloğu önbelleğinin etkisini ölçer: hizmet listeleme ve randevu
+# oluşturma doğrulaması için soğuk (önbelleksiz) ve sıcak (önbellekli) gecikme,
+# SQL ifade sayıları ve isabet/ıska sayaçları.
+#
+#   python -m benchmarks.bench_service_catalog [--services 40] [--iterations 500]
+
+import argparse
+import asyncio
+import time
+
+from benchmarks._common import StatementCounter, create_engine_with_schema, seed_company, session_factory
+from app.crud.crud_company_service import get_services_by_company_id, invalidate_service_catalog, service_catalog_cache
+from app.crud.crud_appointment import _get_active_services_by_ids
+
+
+async def measure(Session, engine, company_id: int, iterations: int, operation, cold: bool):
+    elapsed = 0.0
+    statements = 0
+    for _ in range(iterations):
+        if cold:
+            invalidate_service_catalog(company_id)
+        async with Session() as session:
+            with StatementCounter(engine) as counter:
+                started = time.perf_counter()
+                await operation(session)
+                elapsed += time.perf_counter() - started
+            statements += counter.count
+    return elapsed / iterations, statements / iterations
+
+
+async def main(service_count: int, iterations: int):
+    engine = await create_engine_with_schema()
+    Session = session_factory(engine)
+    async with Session() as session:
+        company, _, services = await seed_company(session, staff_count=1, service_count=service_count)
+    requested = [service.id for service in services[:3]]
+
+    operations = {
+        "list active services": lambda session: get_services_by_company_id(session, company.id, is_active=True),
+        "validate 3 booked services": lambda session: _get_active_services_by_ids(session, company.id, requested),
+    }
+    for label, operation in operations.items():
+        cold_s, cold_statements = await measure(Session, engine, company.id, iterations, operation, cold=True)
+        warm_s, warm_statements = await measure(Session, engine, company.id, iterations, operation, cold=False)
+        print(f"{label:28s} cold: {cold_s * 1e6:8.1f} us ({cold_statements:.0f} stmt)   "
+              f"warm: {warm_s * 1e6:8.1f} us ({warm_statements:.0f} stmt)")
+    print(f"cache stats: {service_catalog_cache.stats()}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--services", type=int, default=40)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.services, args.iterations))
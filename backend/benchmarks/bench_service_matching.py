@@ -0,0 +1,199 @@
+# benchmarks/bench_service_matching.py
+#
+# Hizmet adı eşleştirme dizinini ölçer (varsayılan: 1k şirkette toplam 10k hizmet).
+#   1. Tüm şirketlerin dizinlerinin kurulma süresi ve tek hizmet ekleme/yeniden adlandırma/çıkarma maliyeti.
+#   2. Konuşma tanıma çıktısına benzeyen bozulmuş sorgularla (küçük harf, Türkçe karaktersiz yazım,
+#      kesik ek, harf hatası, cümle içinde geçme) eşleşme gecikmesi p50/p99 ve top-1 / top-3 doğruluğu.
+#      Karşılaştırma: şirketin tüm hizmetlerini difflib ile taramak.
+#   3. Veritabanı üzerinden uçtan uca: match_company_services ilk (katalog + dizin kurulumu) ve sonraki çağrılar;
+#      CRUD ile oluşturulan, yeniden adlandırılan ve pasifleştirilen hizmetlerin dizine anında yansıması.
+#
+#   python -m benchmarks.bench_service_matching [--companies 1000] [--services 10000] [--queries 20000]
+
+import argparse
+import asyncio
+import difflib
+import random
+import sys
+import time
+from decimal import Decimal
+from typing import List
+
+from benchmarks._common import bulk_insert, create_engine_with_schema, percentile, seed_company, session_factory
+from app.bussines_logics.service_matching import ServiceNameIndex, normalize_service_name
+from app.crud.crud_company_service import (
+    create_company_service, match_company_services, service_catalog_cache, service_name_indexes, update_company_service
+)
+from app.models.company import Company
+from app.models.company_service import CompanyService
+from app.schemas.company_service import CompanyServiceCreate, CompanyServiceUpdate
+
+BASES = [
+    "Saç Kesimi", "Sakal Tıraşı", "Saç Boyama", "Fön", "Manikür", "Pedikür", "Cilt Bakımı", "Kaş Alımı", "Ağda",
+    "Masaj", "Keratin Bakımı", "Perma", "Gelin Başı", "Makyaj", "Lazer Epilasyon", "Diş Temizliği", "Muayene",
+    "Kontrol Muayenesi", "Botoks", "Dolgu", "Röfle", "Ombre", "Kalıcı Oje", "Protez Tırnak", "Yüz Temizliği",
+    "Aromaterapi Masajı", "İsveç Masajı", "Sıcak Taş Masajı", "Kirpik Lifting", "İpek Kirpik",
+]
+PREFIXES = ["", "", "Erkek", "Kadın", "Çocuk", "Premium"]
+SUFFIXES = ["", "", "Paketi", "(Uzun Saç)", "- 60 dk"]
+SENTENCES = ["yarın {} için randevu istiyorum", "{} yaptırmak istiyorum", "{} randevusu alabilir miyim"]
+_ASCII = str.maketrans("çğıöşüÇĞİÖŞÜ", "cgiosuCGIOSU")
+
+
+def generate_catalog(rng: random.Random, companies: int, services: int) -> List[List[str]]:
+    names = [" ".join(part for part in (prefix, base, suffix) if part) for prefix in PREFIXES for base in BASES for suffix in SUFFIXES]
+    names = sorted(set(names))
+    per_company = [services // companies + (1 if index < services % companies else 0) for index in range(companies)]
+    return [rng.sample(names, count) for count in per_company]
+
+
+def asr_variant(rng: random.Random, name: str) -> str:
+    """
+    Hizmet adından konuşma tanıma çıktısına benzeyen bir sorgu üretir.
+    """
+    text = name.lower() if rng.random() < 0.8 else name
+    if rng.random() < 0.5:
+        text = text.translate(_ASCII)
+    words = text.split()
+    if rng.random() < 0.4 and len(words[-1]) > 4:
+        words[-1] = words[-1][:-1] # "kesimi" -> "kesim"
+    if rng.random() < 0.3:
+        word = rng.randrange(len(words))
+        if len(words[word]) > 3:
+            position = rng.randrange(1, len(words[word]) - 1)
+            words[word] = words[word][:position] + words[word][position + 1:] # harf düşmesi
+    text = " ".join(words)
+    if rng.random() < 0.3:
+        text = rng.choice(SENTENCES).format(text)
+    return text
+
+
+def measure_index(catalog: List[List[str]], queries: int, rng: random.Random) -> bool:
+    started = time.perf_counter()
+    indexes = [ServiceNameIndex(enumerate(names)) for names in catalog]
+    build = time.perf_counter() - started
+    total = sum(len(names) for names in catalog)
+    print(f"build        {len(catalog)} company indexes, {total} services in {build * 1000:.1f} ms ({build / total * 1e6:.1f} us/service)")
+
+    index = indexes[0]
+    samples = {"add": [], "rename": [], "discard": []}
+    for step in range(1000):
+        service_id = 10_000 + step
+        started = time.perf_counter()
+        index.add(service_id, f"Yeni Hizmet {step}")
+        samples["add"].append(time.perf_counter() - started)
+        started = time.perf_counter()
+        index.add(service_id, f"Yeniden Adlandırılmış Hizmet {step}")
+        samples["rename"].append(time.perf_counter() - started)
+        started = time.perf_counter()
+        index.discard(service_id)
+        samples["discard"].append(time.perf_counter() - started)
+    print("incremental  " + "  ".join(f"{label} p50 {percentile(values, 50) * 1e6:.1f} us" for label, values in samples.items()))
+
+    workload = []
+    for _ in range(queries):
+        company = rng.randrange(len(catalog))
+        service_id = rng.randrange(len(catalog[company]))
+        workload.append((company, service_id, asr_variant(rng, catalog[company][service_id])))
+
+    latencies, top1, top3 = [], 0, 0
+    for company, expected, query in workload:
+        started = time.perf_counter()
+        result = indexes[company].match(query, limit=3)
+        latencies.append(time.perf_counter() - started)
+        ids = [service_id for service_id, _, _ in result]
+        top1 += bool(ids) and ids[0] == expected
+        top3 += expected in ids
+    print(
+        f"n-gram index {queries} queries  p50 {percentile(latencies, 50) * 1e6:6.1f} us  p99 {percentile(latencies, 99) * 1e6:6.1f} us  "
+        f"top-1 {top1 / queries:.3f}  top-3 {top3 / queries:.3f}"
+    )
+
+    normalized = [[normalize_service_name(name) for name in names] for names in catalog]
+    latencies, top1 = [], 0
+    for company, expected, query in workload[:min(queries, 5000)]:
+        started = time.perf_counter()
+        target = normalize_service_name(query)
+        scores = [difflib.SequenceMatcher(None, target, name).ratio() for name in normalized[company]]
+        best = max(range(len(scores)), key=scores.__getitem__)
+        latencies.append(time.perf_counter() - started)
+        top1 += best == expected
+    print(
+        f"difflib scan {len(latencies)} queries  p50 {percentile(latencies, 50) * 1e6:6.1f} us  p99 {percentile(latencies, 99) * 1e6:6.1f} us  "
+        f"top-1 {top1 / len(latencies):.3f}"
+    )
+
+    # Büyük katalog: üretilebilen tüm farklı adlar tek şirkette
+    flat = sorted({name for names in catalog for name in names})
+    big = ServiceNameIndex(enumerate(flat))
+    latencies = []
+    for _ in range(2000):
+        query = asr_variant(rng, rng.choice(flat))
+        started = time.perf_counter()
+        big.match(query, limit=3)
+        latencies.append(time.perf_counter() - started)
+    print(f"one company with {len(big)} services  p50 {percentile(latencies, 50) * 1e6:6.1f} us  p99 {percentile(latencies, 99) * 1e6:6.1f} us")
+    return top3 / queries > 0.9
+
+
+async def measure_database(catalog: List[List[str]], rng: random.Random) -> bool:
+    engine = await create_engine_with_schema()
+    Session = session_factory(engine)
+    async with Session() as session:
+        await bulk_insert(session, Company, [
+            {"name": f"Company {index}", "email": f"company{index}@example.com", "is_active": True} for index in range(len(catalog))
+        ])
+        await bulk_insert(session, CompanyService, [
+            {"company_id": company + 1, "name": name, "price": Decimal("100.00"), "duration_minutes": 30, "is_active": True}
+            for company, names in enumerate(catalog) for name in names
+        ])
+        await session.commit()
+
+    first, warm = [], []
+    for company_id in range(1, min(len(catalog), 200) + 1):
+        query = asr_variant(rng, catalog[company_id - 1][0])
+        async with Session() as session:
+            started = time.perf_counter()
+            await match_company_services(session, company_id, query)
+            first.append(time.perf_counter() - started)
+            for _ in range(10):
+                started = time.perf_counter()
+                await match_company_services(session, company_id, query)
+                warm.append(time.perf_counter() - started)
+    print(
+        f"match_company_services  first call (catalog query + build) p50 {percentile(first, 50) * 1000:.2f} ms  "
+        f"cached p50 {percentile(warm, 50) * 1e6:.1f} us  p99 {percentile(warm, 99) * 1e6:.1f} us"
+    )
+
+    ok = True
+    async with Session() as session:
+        company, _, _ = await seed_company(session, staff_count=0, service_count=0, name="Matching Salon")
+        await match_company_services(session, company.id, "saç") # Dizini yükle
+        service = await create_company_service(session, CompanyServiceCreate(company_id=company.id, name="Saç Kesimi", price=Decimal("150.00")))
+        ok &= [match.id for match in await match_company_services(session, company.id, "sac kesim")] == [service.id]
+        await update_company_service(session, service, CompanyServiceUpdate(name="Sakal Tıraşı"))
+        ok &= [match.id for match in await match_company_services(session, company.id, "sakal tirasi")] == [service.id]
+        ok &= not await match_company_services(session, company.id, "sac kesim")
+        await update_company_service(session, service, CompanyServiceUpdate(is_active=False))
+        ok &= not await match_company_services(session, company.id, "sakal tirasi")
+    print(f"CRUD create / rename / deactivate reflected in the loaded index: {ok}")
+    print(f"index cache {service_name_indexes.stats()}  catalog cache {service_catalog_cache.stats()}")
+    await engine.dispose()
+    return ok
+
+
+async def main(companies: int, services: int, queries: int) -> int:
+    rng = random.Random(7)
+    catalog = generate_catalog(rng, companies, services)
+    ok = measure_index(catalog, queries, rng)
+    ok &= await measure_database(catalog, rng)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--companies", type=int, default=1000)
+    parser.add_argument("--services", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=20000)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.companies, args.services, args.queries)))
@@ -0,0 +1,89 @@
+# benchmarks/bench_update_appointment.py
+#
+# update_appointment'ın hizmet listesi güncellemelerinde çalıştırdığı SQL ifadelerini sayar ve
+# sonucun veritabanındaki hizmet satırlarıyla birebir aynı olduğunu doğrular (aksi halde çıkış kodu 1).
+# Senaryolar: yalnızca not değişikliği, tek fiyat değişikliği, bir ekleme + bir çıkarma, tüm listenin değişmesi.
+#
+#   python -m benchmarks.bench_update_appointment [--services 10] [--verbose]
+
+import argparse
+import asyncio
+import sys
+from datetime import timedelta
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from benchmarks._common import MONTH_START, StatementCounter, create_engine_with_schema, seed_company, session_factory
+from app.crud.crud_appointment import APPOINTMENT_RELATIONS, create_appointment, get_appointment_by_id, update_appointment
+from app.models.appointment_service import AppointmentService
+from app.schemas.appointment import AppointmentCreate, AppointmentRead, AppointmentServiceSchema, AppointmentUpdate
+
+
+def service_payload(services, prices=None):
+    prices = prices or {}
+    return [
+        AppointmentServiceSchema(company_service_id=service.id, quantity=1, price_at_booking=prices.get(service.id, service.price))
+        for service in services
+    ]
+
+
+async def main(service_count: int, verbose: bool) -> int:
+    engine = await create_engine_with_schema()
+    Session = session_factory(engine)
+    async with Session() as session:
+        company, users, services = await seed_company(session, staff_count=1, service_count=2 * service_count)
+    booked = services[:service_count]
+
+    scenarios = {
+        "notes only": lambda: AppointmentUpdate(notes="updated"),
+        "one price changed": lambda: AppointmentUpdate(services=service_payload(booked, {booked[0].id: Decimal("1.00")})),
+        "one added, one removed": lambda: AppointmentUpdate(services=service_payload(booked[1:] + [services[service_count]])),
+        "all replaced": lambda: AppointmentUpdate(services=service_payload(services[service_count:])),
+    }
+    failed = False
+    slot = MONTH_START.replace(hour=9)
+    for label, make_update in scenarios.items():
+        async with Session() as session:
+            created = await create_appointment(session, AppointmentCreate(
+                user_id=users[0].id, company_id=company.id,
+                appointment_time=slot, end_time=slot + timedelta(minutes=30),
+                services=service_payload(booked),
+            ))
+        slot += timedelta(hours=1)
+        appointment_update = make_update()
+
+        async with Session() as session:
+            db_appointment = await get_appointment_by_id(session, created.id, include=APPOINTMENT_RELATIONS)
+            with StatementCounter(engine) as counter:
+                updated = await update_appointment(session, db_appointment, appointment_update)
+                response = AppointmentRead.model_validate(updated)
+
+        async with Session() as session:
+            stored = (await session.execute(
+                select(AppointmentService.company_service_id, AppointmentService.price_at_booking)
+                .filter(AppointmentService.appointment_id == created.id)
+            )).all()
+        expected_services = appointment_update.services or service_payload(booked)
+        expected = sorted((s.company_service_id, Decimal(str(s.price_at_booking))) for s in expected_services)
+        ok = sorted((sid, Decimal(str(price))) for sid, price in stored) == expected and \
+            sorted(s.id for s in response.services) == sorted(sid for sid, _ in expected)
+        failed |= not ok
+        print(f"{label:24s} {counter.count} statements + {counter.commits} commit   {'OK' if ok else 'MISMATCH'}")
+        if verbose:
+            for statement in counter.statements:
+                print("    " + " ".join(statement.split())[:140])
+
+    await engine.dispose()
+    if failed:
+        print("FAIL: stored services do not match the update", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--services", type=int, default=10)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.services, args.verbose)))
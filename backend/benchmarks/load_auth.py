@@ -0,0 +1,157 @@
+# benchmarks/load_auth.py
+#
+# Yavaş Supabase Auth çağrıları sürerken /auth/me gecikmesinin etkilenmediğini gösteren yük testi.
+# Ayrı bir thread'de, her login isteğine --login-delay kadar geç cevap veren yerel bir
+# Auth (GoTrue) taklidi çalıştırılır. Uygulama aynı event loop içinde ASGI üzerinden çağrılır:
+# login çağrıları loop'u bloklasaydı /auth/me istekleri de login süresi kadar beklerdi.
+#
+#   python -m benchmarks.load_auth [--requests 500] [--logins 40] [--login-delay 1.0]
+#
+# /auth/me p99 değeri, yavaş login'ler sürerken --max-slowdown katını aşarsa çıkış kodu 1'dir.
+
+import os
+import socket
+
+# Stand-in sunucunun portu ayarlar yüklenmeden belirlenmeli
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+AUTH_PORT = _free_port()
+os.environ["SUPABASE_URL"] = f"http://127.0.0.1:{AUTH_PORT}"
+
+import argparse
+import asyncio
+import sys
+import threading
+import time
+from uuid import uuid4
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Request
+from jose import jwt
+
+from benchmarks._common import create_engine_with_schema, percentile, seed_company, session_factory
+from app.core.config import get_settings
+from app.core.database.database import get_db
+from app.core.supabase_client import close_supabase_client
+
+
+def build_stand_in_auth(login_delay: float) -> FastAPI:
+    """
+    sign_in_with_password'un kullandığı /auth/v1/token uç noktasını taklit eden uygulama.
+    """
+    stand_in = FastAPI()
+
+    @stand_in.post("/auth/v1/token")
+    async def token(request: Request):
+        await asyncio.sleep(login_delay)
+        user_id = str(uuid4())
+        return {
+            "access_token": "stand-in-access-token",
+            "refresh_token": "stand-in-refresh-token",
+            "token_type": "bearer",
+            "expires_in": 3600,
+            "expires_at": int(time.time()) + 3600,
+            "user": {
+                "id": user_id,
+                "aud": "authenticated",
+                "role": "authenticated",
+                "email": "someone@example.com",
+                "app_metadata": {},
+                "user_metadata": {},
+                "created_at": "2025-01-01T00:00:00Z",
+            },
+        }
+
+    return stand_in
+
+
+def start_stand_in_auth(login_delay: float) -> uvicorn.Server:
+    config = uvicorn.Config(build_stand_in_auth(login_delay), host="127.0.0.1", port=AUTH_PORT, log_level="warning")
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+
+async def measure_me(client: httpx.AsyncClient, token: str, count: int, concurrency: int = 10):
+    samples = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {token}"})
+            samples.append(time.perf_counter() - started)
+            response.raise_for_status()
+
+    await asyncio.gather(*(one() for _ in range(count)))
+    return samples
+
+
+async def main(request_count: int, login_count: int, login_delay: float, max_slowdown: float) -> int:
+    server = start_stand_in_auth(login_delay)
+
+    from app.main import app
+    engine = await create_engine_with_schema()
+    Session = session_factory(engine)
+    async with Session() as session:
+        _, users, _ = await seed_company(session, staff_count=1, service_count=1)
+
+    async def override_get_db():
+        async with Session() as session:
+            yield session
+    app.dependency_overrides[get_db] = override_get_db
+
+    settings = get_settings()
+    token = jwt.encode(
+        {"sub": str(users[0].id), "aud": "authenticated", "exp": int(time.time()) + 3600},
+        settings.JWT_SECRET_KEY, algorithm=settings.ALGORITHM
+    )
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        await measure_me(client, token, 50)  # Isınma
+        baseline = await measure_me(client, token, request_count)
+
+        async def login():
+            response = await client.post("/api/v1/auth/login", json={"email": "someone@example.com", "password": "secret123"})
+            return response.status_code
+
+        started = time.perf_counter()
+        login_tasks = [asyncio.create_task(login()) for _ in range(login_count)]
+        await asyncio.sleep(0.05)  # Login'lerin Auth sunucusunda beklemeye başlaması için
+        under_load = await measure_me(client, token, request_count)
+        statuses = await asyncio.gather(*login_tasks)
+        login_elapsed = time.perf_counter() - started
+
+    await close_supabase_client()
+    await engine.dispose()
+    server.should_exit = True
+
+    base_p99 = percentile(baseline, 99) * 1000
+    load_p99 = percentile(under_load, 99) * 1000
+    print(f"/auth/me p50/p99 idle:           {percentile(baseline, 50) * 1000:7.2f} / {base_p99:7.2f} ms")
+    print(f"/auth/me p50/p99 during logins:  {percentile(under_load, 50) * 1000:7.2f} / {load_p99:7.2f} ms")
+    print(f"{login_count} logins x {login_delay:.2f}s delay finished in {login_elapsed:.2f}s, statuses: {sorted(set(statuses))}")
+
+    # Küçük mutlak değerlerde gürültüyü tolere etmek için 5 ms taban eklenir
+    if load_p99 > base_p99 * max_slowdown + 5:
+        print("FAIL: /auth/me p99 degraded while logins were slow")
+        return 1
+    print("OK: /auth/me p99 unaffected by slow logins")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--login-delay", type=float, default=1.0)
+    parser.add_argument("--max-slowdown", type=float, default=4.0)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.requests, args.logins, args.login_delay, args.max_slowdown)))
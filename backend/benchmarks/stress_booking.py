@@ -0,0 +1,172 @@
+# benchmarks/stress_booking.py
+#
+# Yüzlerce eşzamanlı rezervasyon coroutine'i ile çift rezervasyon stres testi.
+# Her coroutine kendi oturumuyla, az sayıda kullanıcı ve birbiriyle çakışan aday slotlar arasından
+# rastgele bir randevu oluşturmaya çalışır. Sonunda aynı kullanıcının iptal edilmemiş randevuları
+# arasında hiç çakışma olmadığı doğrulanır (aksi halde çıkış kodu 1) ve rezervasyon hızı raporlanır.
+#
+#   python -m benchmarks.stress_booking [--bookings 500] [--users 20] [--processes 1] [--bulk-size 1] [--unsafe]
+#
+# --unsafe rezervasyon kilitlerini devre dışı bırakır; check-then-act yarışını göstermek içindir.
+# --processes N rezervasyonları N ayrı süreçten gönderir; süreç içi kilitler birbirini görmediğinden
+# çift rezervasyonu yalnızca PostgreSQL advisory lock'ları önler (SQLite ile çalıştırılmaz).
+# --bulk-size K rezervasyonları K satırlık (birden fazla kullanıcıyı kapsayan) toplu içe aktarmalar halinde gönderir;
+# PostgreSQL'de çok anahtarlı advisory lock yolu böyle sınanır.
+# DATABASE_URL verilmezse geçici bir SQLite dosyası kullanılır (PostgreSQL'de advisory lock'lar da devreye girer).
+
+import argparse
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+import random
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from datetime import timedelta
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from benchmarks._common import MONTH_START, create_engine_with_schema, seed_company, session_factory
+from app.crud import crud_appointment
+from app.crud.crud_appointment import bulk_create_appointments, create_appointment
+from app.models.appointment import Appointment
+from app.schemas.appointment import AppointmentCreate, AppointmentServiceSchema
+
+
+def count_overlaps(rows) -> int:
+    overlaps = 0
+    last_end_by_user = {}
+    for user_id, start, end in sorted(rows):
+        last_end = last_end_by_user.get(user_id)
+        if last_end is not None and start < last_end:
+            overlaps += 1
+        last_end_by_user[user_id] = max(end, last_end) if last_end is not None else end
+    return overlaps
+
+
+def disable_reservation() -> None:
+    @asynccontextmanager
+    async def no_reservation(db, user_ids):
+        yield
+    crud_appointment._reserve_booking = no_reservation
+
+
+async def book_all(Session, requests, bulk_size: int) -> dict:
+    """
+    Rezervasyonları eşzamanlı coroutine'lerle gönderir; bulk_size > 1 ise toplu içe aktarma kullanılır.
+    """
+    outcomes = {"created": 0, "conflict": 0, "error": 0}
+
+    async def book(appointment_in: AppointmentCreate):
+        async with Session() as session:
+            try:
+                await create_appointment(session, appointment_in)
+                outcomes["created"] += 1
+            except ValueError as e:
+                outcomes["conflict" if "conflict" in str(e).lower() else "error"] += 1
+
+    async def book_batch(batch):
+        async with Session() as session:
+            try:
+                result = await bulk_create_appointments(session, batch)
+            except ValueError:
+                outcomes["error"] += len(batch)
+                return
+            outcomes["created"] += result.created_count
+            for row_error in result.errors:
+                outcomes["conflict" if "conflict" in row_error.detail.lower() else "error"] += 1
+
+    if bulk_size > 1:
+        await asyncio.gather(*(book_batch(requests[i:i + bulk_size]) for i in range(0, len(requests), bulk_size)))
+    else:
+        await asyncio.gather(*(book(appointment_in) for appointment_in in requests))
+    return outcomes
+
+
+def run_worker(url: str, requests, bulk_size: int, unsafe: bool) -> dict:
+    # Ayrı süreçte kendi motoru ve olay döngüsüyle çalışır
+    if unsafe:
+        disable_reservation()
+
+    async def run():
+        engine = create_async_engine(url)
+        try:
+            return await book_all(session_factory(engine), requests, bulk_size)
+        finally:
+            await engine.dispose()
+    return asyncio.run(run())
+
+
+async def main(bookings: int, user_count: int, unsafe: bool, processes: int, bulk_size: int) -> int:
+    url = os.environ.get("DATABASE_URL", "sqlite+aiosqlite://")
+    if url == "sqlite+aiosqlite://":
+        url = f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'stress.db')}"
+    engine = await create_engine_with_schema(url)
+    if processes > 1 and engine.dialect.name != "postgresql":
+        print("--processes requires PostgreSQL: cross-process safety relies on advisory locks; set DATABASE_URL", file=sys.stderr)
+        await engine.dispose()
+        return 2
+    Session = session_factory(engine)
+    async with Session() as session:
+        company, users, services = await seed_company(session, staff_count=user_count, service_count=3)
+
+    if unsafe:
+        disable_reservation()
+
+    rng = random.Random(3)
+    # Her kullanıcı için 15 dakika arayla başlayan 45 dakikalık adaylar: komşu adaylar birbiriyle çakışır
+    candidate_starts = [MONTH_START + timedelta(hours=9, minutes=15 * i) for i in range(16)]
+    requests = []
+    for _ in range(bookings):
+        start = rng.choice(candidate_starts)
+        service = rng.choice(services)
+        requests.append(AppointmentCreate(
+            user_id=rng.choice(users).id,
+            company_id=company.id,
+            appointment_time=start,
+            end_time=start + timedelta(minutes=45),
+            services=[AppointmentServiceSchema(company_service_id=service.id, quantity=1, price_at_booking=service.price)]
+        ))
+
+    started = time.perf_counter()
+    if processes > 1:
+        loop = asyncio.get_running_loop()
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = await asyncio.gather(*(
+                loop.run_in_executor(pool, run_worker, url, requests[index::processes], bulk_size, unsafe)
+                for index in range(processes)
+            ))
+        outcomes = {key: sum(result[key] for result in results) for key in results[0]}
+    else:
+        outcomes = await book_all(Session, requests, bulk_size)
+    elapsed = time.perf_counter() - started
+
+    async with Session() as session:
+        rows = (await session.execute(
+            select(Appointment.user_id, Appointment.appointment_time, Appointment.end_time)
+            .filter(crud_appointment.NOT_CANCELLED)
+        )).all()
+    await engine.dispose()
+
+    overlaps = count_overlaps(rows)
+    print(f"{bookings} concurrent bookings across {user_count} users from {processes} process(es), bulk size {bulk_size}, "
+          f"in {elapsed:.2f}s ({bookings / elapsed:,.0f} attempts/s): {outcomes}")
+    print(f"overlapping pairs: {overlaps}")
+    if overlaps:
+        print("FAIL: double booking detected")
+        return 1
+    print("OK: zero overlaps")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bookings", type=int, default=500)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--bulk-size", type=int, default=1)
+    parser.add_argument("--unsafe", action="store_true")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.bookings, args.users, args.unsafe, args.processes, args.bulk_size)))
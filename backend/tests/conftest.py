@@ -4,13 +4,15 @@ import pytest
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool # In-memory veritabanını tek bağlantıda paylaşmak için
 from unittest.mock import MagicMock, patch # Mocking için
 from uuid import uuid4 # Sahte UUID'ler oluşturmak için
 from datetime import datetime, timedelta
 
 # Ana FastAPI uygulamanızı ve veritabanı/model base'inizi import edin
 from app.main import app
-from app.core.database.database import get_db, Base
+from app.core.database.database import get_db
+from app.models.base import Base # Modellerin kayıtlı olduğu metadata
 from app.core.config import get_settings # Ayarları mock'lamak için
 
 # Testler için kullanılacak in-memory SQLite veritabanı URL'si
@@ -25,8 +27,8 @@ async def test_engine_fixture():
     Testler için asenkron bir SQLAlchemy motoru oluşturur ve yönetir.
     Her test oturumu için temiz bir veritabanı sağlar.
     """
-    # In-memory SQLite motorunu oluştur
-    engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+    # In-memory SQLite motorunu oluştur; her bağlantı ayrı bir boş veritabanı açacağından tek bağlantı paylaşılır
+    engine = create_async_engine(TEST_DATABASE_URL, echo=False, poolclass=StaticPool)
     
     # Tüm tabloları oluştur
     async with engine.begin() as conn:
@@ -0,0 +1,50 @@
+# tests/test_availability.py
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.bussines_logics.availability import IntervalIndex, find_free_slots, get_available_slots
+
+UTC = timezone.utc
+DAY = datetime(2025, 1, 6, tzinfo=UTC)
+
+
+def at(hour: int, minute: int = 0) -> datetime:
+    return DAY.replace(hour=hour, minute=minute)
+
+
+def test_interval_index_merges_and_finds_gaps():
+    busy = IntervalIndex([(at(10), at(11)), (at(9), at(10)), (at(10, 30), at(12)), (at(14), at(15))])
+    assert len(busy) == 2 # 09-12 (uç uca ve üst üste binenler birleşir) ve 14-15
+    assert list(busy.gaps(at(8), at(16))) == [(at(8), at(9)), (at(12), at(14)), (at(15), at(16))]
+    assert list(busy.gaps(at(9, 30), at(14, 30))) == [(at(12), at(14))]
+    assert busy.overlaps(at(11, 59), at(13))
+    assert not busy.overlaps(at(12), at(14)) # Uç uca değmek çakışma değildir
+
+
+def test_find_free_slots_aligns_to_the_grid():
+    busy = IntervalIndex([(at(9, 10), at(9, 50))])
+    slots = list(find_free_slots(busy, at(9), at(11), timedelta(minutes=30), timedelta(minutes=15)))
+    # 09:00 başlangıcı 09:10'daki randevuya çarpar; boşluk 09:50'de başlar, ızgaradaki sonraki nokta 10:00
+    assert slots == [(at(10), at(10, 30)), (at(10, 15), at(10, 45)), (at(10, 30), at(11))]
+
+
+def test_naive_range_is_compared_as_utc_against_aware_intervals():
+    """
+    PostgreSQL aware, istemci naive zaman verebilir; karşılaştırma TypeError vermemeli, naive zaman UTC sayılmalı.
+    """
+    istanbul = timezone(timedelta(hours=3))
+    busy = IntervalIndex([(datetime(2025, 1, 6, 12, 0, tzinfo=istanbul), datetime(2025, 1, 6, 13, 0, tzinfo=istanbul))]) # 09-10 UTC
+    naive_start, naive_end = datetime(2025, 1, 6, 8, 0), datetime(2025, 1, 6, 11, 0)
+    slots = list(find_free_slots(busy, naive_start, naive_end, timedelta(hours=1), timedelta(hours=1)))
+    assert slots == [(at(8), at(9)), (at(10), at(11))]
+    # Naive (SQLite) aralıklar da UTC kabul edilir
+    assert IntervalIndex([(datetime(2025, 1, 6, 9, 0), datetime(2025, 1, 6, 10, 0))]).overlaps(at(9, 30), at(9, 45))
+
+
+@pytest.mark.parametrize("days, step_minutes", [(32, 15), (31, 1)])
+async def test_get_available_slots_rejects_oversized_ranges(days, step_minutes):
+    # Sınır sorgudan önce kontrol edilir; veritabanı oturumu gerekmez
+    with pytest.raises(ValueError):
+        await get_available_slots(None, DAY, DAY + timedelta(days=days), 30, company_id=1, slot_step_minutes=step_minutes)
@@ -0,0 +1,155 @@
+# tests/test_crud_appointment.py
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import ARRAY, BigInteger, event
+from sqlalchemy.dialects.postgresql import asyncpg
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.crud.crud_appointment import _advisory_lock_statement, bulk_create_appointments, create_appointment
+from app.crud.crud_company_service import invalidate_service_catalog
+from app.models.company import Company
+from app.models.company_service import CompanyService
+from app.models.user import User
+from app.schemas.appointment import AppointmentCreate, AppointmentRead, AppointmentServiceSchema
+
+DAY = datetime(2025, 1, 6, 9, 0)
+
+# --- Yardımcılar ---
+
+class StatementCounter:
+    """
+    Motor üzerinde çalıştırılan SQL ifadelerini sayar (executemany tek ifade sayılır).
+    """
+
+    def __init__(self, engine):
+        self.engine = engine.sync_engine
+        self.statements = []
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+async def seed(db: AsyncSession, service_count: int = 5):
+    company = Company(name=f"Test Salon {uuid4().hex[:8]}", phone="+902120000000", email=f"{uuid4().hex[:8]}@example.com")
+    db.add(company)
+    await db.flush()
+    user = User(id=uuid4(), name="Staff", email=f"{uuid4().hex[:8]}@example.com", company_id=company.id, role="employee")
+    services = [
+        CompanyService(company_id=company.id, name=f"Service {i}", price=Decimal("100.00") + i, duration_minutes=30)
+        for i in range(service_count)
+    ]
+    db.add_all([user, *services])
+    await db.flush()
+    ids = company.id, user.id, [service.id for service in services]
+    await db.commit()
+    invalidate_service_catalog(ids[0]) # Önceki testlerden kalmış katalog kullanılmasın
+    return ids
+
+
+def booking(company_id: int, user_id, service_ids, start: datetime) -> AppointmentCreate:
+    return AppointmentCreate(
+        user_id=user_id, company_id=company_id,
+        appointment_time=start, end_time=start + timedelta(minutes=30),
+        services=[
+            AppointmentServiceSchema(company_service_id=service_id, quantity=1, price_at_booking=100.0)
+            for service_id in service_ids
+        ],
+    )
+
+
+async def count_statements_per_booking(engine, db: AsyncSession, service_counts):
+    company_id, user_id, service_ids = await seed(db, max(service_counts))
+    # İlk rezervasyon şirketin hizmet kataloğunu önbelleğe alır
+    await create_appointment(db, booking(company_id, user_id, service_ids[:1], DAY))
+    counts = {}
+    for index, count in enumerate(service_counts, start=1):
+        with StatementCounter(engine) as counter:
+            created = await create_appointment(db, booking(company_id, user_id, service_ids[:count], DAY + timedelta(hours=index)))
+            response = AppointmentRead.model_validate(created)
+        assert len(response.services) == count
+        assert response.user.id == user_id
+        counts[count] = len(counter.statements)
+    return counts
+
+# --- Testler ---
+
+@pytest.mark.parametrize("expire_on_commit", [False, True])
+async def test_create_appointment_statement_count_is_constant(test_engine, expire_on_commit):
+    """
+    create_appointment'ın çalıştırdığı SQL ifadesi sayısı hizmet sayısıyla büyümemeli;
+    oturumun expire_on_commit ayarından bağımsız olarak yanıt tembel yükleme olmadan üretilmeli.
+    """
+    Session = sessionmaker(bind=test_engine, class_=AsyncSession, autoflush=False, expire_on_commit=expire_on_commit)
+    async with Session() as db:
+        counts = await count_statements_per_booking(test_engine, db, [1, 3, 10])
+    assert len(set(counts.values())) == 1, counts
+    if not expire_on_commit:
+        # Doğrulama SELECT'i, özet tablosu upsert'i, randevu INSERT'i ve toplu hizmet INSERT'i
+        assert counts[1] == 4, counts
+
+
+async def test_create_appointment_with_default_test_session(test_engine, test_db):
+    """
+    conftest'teki test_db oturumu (varsayılan expire_on_commit=True) ile de randevu oluşturulabilmeli.
+    """
+    counts = await count_statements_per_booking(test_engine, test_db, [1, 5])
+    assert counts[1] == counts[5], counts
+
+
+def test_advisory_lock_statement_binds_typed_array():
+    """
+    Çok kullanıcılı kilit ifadesi asyncpg'ye tipli bir bigint dizisi göndermeli (tipsiz liste unnest($1)'de hata verir).
+    """
+    compiled = _advisory_lock_statement([-5, 1, 42]).compile(dialect=asyncpg.dialect())
+    assert "bigint[]" in compiled.string.lower()
+    bind_type = compiled.binds["keys"].type
+    assert isinstance(bind_type, ARRAY) and isinstance(bind_type.item_type, BigInteger)
+    assert compiled.construct_params()["keys"] == [-5, 1, 42]
+
+
+async def test_bulk_create_rejects_users_of_another_company(test_db):
+    """
+    Toplu içe aktarmada satırın kullanıcısı satırın şirketine ait olmalı; başka şirketin çalışanı için randevu oluşturulmaz.
+    """
+    company_id, user_id, service_ids = await seed(test_db, 1)
+    _, other_user_id, _ = await seed(test_db, 1)
+    result = await bulk_create_appointments(test_db, [
+        booking(company_id, user_id, service_ids, DAY),
+        booking(company_id, other_user_id, service_ids, DAY),
+    ])
+    assert result.created_count == 1
+    assert [(error.index, error.detail) for error in result.errors] == [(1, "User does not belong to the specified company.")]
+
+
+async def test_bulk_create_compares_naive_and_aware_times_in_utc(test_db):
+    """
+    Satır zamanları naive (UTC kabul edilir) veya farklı saat dilimlerinde olabilir; mevcut randevularla ve
+    birbirleriyle karşılaştırma TypeError yerine satır bazlı sonuç üretmeli.
+    """
+    company_id, user_id, service_ids = await seed(test_db, 1)
+    await create_appointment(test_db, booking(company_id, user_id, service_ids, DAY)) # 09:00-09:30 UTC
+    istanbul = timezone(timedelta(hours=3))
+    result = await bulk_create_appointments(test_db, [
+        booking(company_id, user_id, service_ids, DAY), # Mevcut randevuyla aynı an
+        booking(company_id, user_id, service_ids, DAY.replace(hour=12, minute=15, tzinfo=istanbul)), # 09:15 UTC
+        booking(company_id, user_id, service_ids, DAY.replace(hour=13, tzinfo=istanbul)), # 10:00 UTC
+        booking(company_id, user_id, service_ids, DAY.replace(hour=10, minute=15)), # 2. satırla çakışır
+    ])
+    assert result.created_count == 1
+    assert [(error.index, error.detail) for error in result.errors] == [
+        (0, "Appointment time conflict for this user."),
+        (1, "Appointment time conflict for this user."),
+        (3, "Appointment time conflicts with row 2 in the same batch."),
+    ]
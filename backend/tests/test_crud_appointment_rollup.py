@@ -0,0 +1,34 @@
+# tests/test_crud_appointment_rollup.py
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from app.crud.crud_appointment_rollup import RollupDelta
+
+DAY_1 = datetime(2025, 1, 6, 9, 0)
+DAY_2 = DAY_1 + timedelta(days=1)
+
+
+def move(delta: RollupDelta, old_start: datetime, old_status: str, new_start: datetime, new_status: str) -> None:
+    # update_appointment'ın yaptığı gibi eski katkıyı çıkarıp yenisini ekler
+    delta.add(1, old_start, old_start + timedelta(minutes=30), old_status, Decimal("100.00"), sign=-1)
+    delta.add(1, new_start, new_start + timedelta(minutes=30), new_status, Decimal("100.00"))
+
+
+def keys(delta: RollupDelta):
+    return [(row["company_id"], row["day"], row["status"]) for row in delta.rows()]
+
+
+def test_rollup_rows_are_ordered_independently_of_direction():
+    """
+    Ters yönde taşınan randevular özet satırlarını aynı sırayla yazmalı (aksi halde eşzamanlı güncellemeler deadlock olur).
+    """
+    cancel, reactivate = RollupDelta(), RollupDelta()
+    move(cancel, DAY_1, "scheduled", DAY_1, "cancelled")
+    move(reactivate, DAY_1, "cancelled", DAY_1, "scheduled")
+    assert keys(cancel) == keys(reactivate)
+
+    forward, backward = RollupDelta(), RollupDelta()
+    move(forward, DAY_1, "scheduled", DAY_2, "scheduled")
+    move(backward, DAY_2, "scheduled", DAY_1, "scheduled")
+    assert keys(forward) == keys(backward) == [(1, DAY_1.date(), "scheduled"), (1, DAY_2.date(), "scheduled")]
@@ -0,0 +1,50 @@
+# tests/test_security.py
+
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.security import scope_company_id, scope_user_id
+from app.models.company import Company
+from app.models.user import User, UserRole
+
+
+def make_user(role: UserRole, company_id: int = 1) -> User:
+    return User(id=uuid4(), name="Test", email="test@example.com", company_id=company_id, role=role.value, is_active=True)
+
+
+@pytest.mark.parametrize("role", [UserRole.employee, UserRole.manager])
+def test_scope_company_id_limits_non_admins_to_their_company(role):
+    user = make_user(role, company_id=7)
+    assert scope_company_id(user, None) == 7
+    assert scope_company_id(user, 7) == 7
+    with pytest.raises(HTTPException) as excinfo:
+        scope_company_id(user, 8)
+    assert excinfo.value.status_code == 403
+
+
+def test_scope_company_id_lets_admins_choose_any_company():
+    admin = make_user(UserRole.admin, company_id=7)
+    assert scope_company_id(admin, 8) == 8
+    assert scope_company_id(admin, None) is None
+
+
+async def test_scope_user_id_limits_non_admins_to_their_company_staff(test_db):
+    companies = [Company(name=f"Salon {uuid4().hex[:8]}", phone="+902120000000", email=f"{uuid4().hex[:8]}@example.com") for _ in range(2)]
+    test_db.add_all(companies)
+    await test_db.flush()
+    own_id, other_id = companies[0].id, companies[1].id
+    colleague, stranger = make_user(UserRole.employee, own_id), make_user(UserRole.employee, other_id)
+    colleague.email, stranger.email = f"{uuid4().hex[:8]}@example.com", f"{uuid4().hex[:8]}@example.com"
+    colleague_id, stranger_id = colleague.id, stranger.id
+    test_db.add_all([colleague, stranger])
+    await test_db.commit()
+
+    manager = make_user(UserRole.manager, own_id)
+    assert await scope_user_id(test_db, manager, colleague_id) == colleague_id
+    for user_id in (stranger_id, uuid4()):
+        with pytest.raises(HTTPException) as excinfo:
+            await scope_user_id(test_db, manager, user_id)
+        assert excinfo.value.status_code == 403
+    assert await scope_user_id(test_db, make_user(UserRole.admin, own_id), stranger_id) == stranger_id